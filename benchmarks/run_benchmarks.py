@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Capture Path Benchmarks
+
+Drives NetworkSniffer._extract_packet_info and NetworkSniffer._packet_handler
+with synthetic traffic and reports packets per second, per-packet latency
+percentiles, memory per stored packet and garbage collector pauses. Results
+are compared against a baseline file with regression thresholds.
+
+بنچمارک‌های مسیر ضبط
+این اسکریپت متدهای _extract_packet_info و _packet_handler را با ترافیک مصنوعی
+اجرا کرده و تعداد بسته در ثانیه، صدک‌های تأخیر هر بسته، حافظه هر بسته ذخیره شده
+و توقف‌های جمع‌آوری زباله را گزارش می‌کند و نتایج را با فایل پایه مقایسه می‌کند.
+
+Usage:
+    python benchmarks/run_benchmarks.py
+    python benchmarks/run_benchmarks.py --update-baseline
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scapy.layers.l2 import Ether
+
+from synthetic import generate_frames
+from src.network.sniffer import NetworkSniffer
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+# Direction in which each reported metric improves
+# جهت بهبود هر معیار گزارش شده
+HIGHER_IS_BETTER = {'packets_per_sec'}
+LOWER_IS_BETTER = {'p50_us', 'p90_us', 'p99_us', 'max_us', 'bytes_per_packet', 'gc_max_pause_ms'}
+
+
+class GCPauseRecorder:
+    """
+    Records garbage collector pauses through gc.callbacks
+
+    ثبت توقف‌های جمع‌آوری زباله از طریق gc.callbacks
+    """
+
+    def __init__(self):
+        self.pauses = []
+        self._start = None
+
+    def __enter__(self):
+        gc.callbacks.append(self._callback)
+        return self
+
+    def __exit__(self, *exc):
+        gc.callbacks.remove(self._callback)
+
+    def _callback(self, phase, info):
+        if phase == 'start':
+            self._start = time.perf_counter_ns()
+        elif self._start is not None:
+            self.pauses.append(time.perf_counter_ns() - self._start)
+            self._start = None
+
+    def summary(self):
+        return {
+            'gc_collections': len(self.pauses),
+            'gc_total_ms': sum(self.pauses) / 1e6,
+            'gc_max_pause_ms': max(self.pauses) / 1e6 if self.pauses else 0.0
+        }
+
+
+def _percentiles(samples_ns):
+    samples = sorted(samples_ns)
+    count = len(samples)
+
+    def pick(fraction):
+        return samples[min(count - 1, int(fraction * count))] / 1000.0
+
+    return {
+        'p50_us': pick(0.50),
+        'p90_us': pick(0.90),
+        'p99_us': pick(0.99),
+        'max_us': samples[-1] / 1000.0
+    }
+
+
+def _new_sniffer(packets):
+    sniffer = NetworkSniffer(max_packets=packets, max_new_packets=packets)
+    sniffer.sniffing = True
+    return sniffer
+
+
+def bench_extract(packets):
+    """Benchmark NetworkSniffer._extract_packet_info
+
+    بنچمارک متد _extract_packet_info
+    """
+    sniffer = _new_sniffer(len(packets))
+    extract = sniffer._extract_packet_info
+    perf_counter_ns = time.perf_counter_ns
+    samples = []
+
+    with GCPauseRecorder() as gc_recorder:
+        started = perf_counter_ns()
+        for packet in packets:
+            start = perf_counter_ns()
+            extract(packet)
+            samples.append(perf_counter_ns() - start)
+        elapsed = perf_counter_ns() - started
+
+    result = {'packets_per_sec': len(packets) / (elapsed / 1e9)}
+    result.update(_percentiles(samples))
+    result.update(gc_recorder.summary())
+    return result
+
+
+def bench_handler(packets):
+    """Benchmark NetworkSniffer._packet_handler including storage
+
+    بنچمارک متد _packet_handler به همراه ذخیره‌سازی
+    """
+    sniffer = _new_sniffer(len(packets))
+    handler = sniffer._packet_handler
+    perf_counter_ns = time.perf_counter_ns
+    samples = []
+
+    with GCPauseRecorder() as gc_recorder:
+        started = perf_counter_ns()
+        for packet in packets:
+            start = perf_counter_ns()
+            handler(packet)
+            samples.append(perf_counter_ns() - start)
+        elapsed = perf_counter_ns() - started
+
+    result = {'packets_per_sec': len(packets) / (elapsed / 1e9)}
+    result.update(_percentiles(samples))
+    result.update(gc_recorder.summary())
+    return result
+
+
+def bench_memory(packets):
+    """Measure memory retained per stored packet
+
+    The frames themselves are allocated before measuring, so the figure is
+    what the sniffer adds on top of the packet objects it is handed.
+
+    اندازه‌گیری حافظه نگه‌داشته شده برای هر بسته ذخیره شده
+    """
+    sniffer = _new_sniffer(len(packets))
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    for packet in packets:
+        sniffer._packet_handler(packet)
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return {'bytes_per_packet': (after - before) / len(packets)}
+
+
+def _best_of(runs):
+    best = dict(runs[0])
+    for result in runs[1:]:
+        for name, value in result.items():
+            if name in HIGHER_IS_BETTER:
+                best[name] = max(best[name], value)
+            else:
+                best[name] = min(best[name], value)
+    return best
+
+
+def run(count, flows, seed, repeat=3):
+    """Run all benchmarks
+
+    Each benchmark is repeated and the best value of every metric is kept,
+    which filters out most of the noise from other processes.
+
+    اجرای تمام بنچمارک‌ها
+
+    Args:
+        count (int): Number of frames per benchmark
+                     تعداد فریم‌ها در هر بنچمارک
+        flows (int): Number of distinct flows
+                     تعداد جریان‌های متمایز
+        seed (int): Random seed
+                    بذر تصادفی
+        repeat (int): Number of repetitions of each benchmark
+                      تعداد تکرار هر بنچمارک
+
+    Returns:
+        dict: Results keyed by benchmark name
+              نتایج به تفکیک نام بنچمارک
+    """
+    frames = generate_frames(count, flows=flows, seed=seed)
+    # Dissect with scapy up front, the way sniff() hands packets over
+    packets = [Ether(frame) for frame in frames]
+
+    benchmarks = {
+        'extract_packet_info': bench_extract,
+        'packet_handler': bench_handler,
+        'storage': bench_memory
+    }
+    return {
+        name: _best_of([bench(packets) for _ in range(max(1, repeat))])
+        for name, bench in benchmarks.items()
+    }
+
+
+def compare(results, baseline):
+    """Compare results with a baseline
+
+    مقایسه نتایج با فایل پایه
+
+    Args:
+        results (dict): Current results
+                        نتایج فعلی
+        baseline (dict): Baseline file contents
+                         محتوای فایل پایه
+
+    Returns:
+        list: Descriptions of the regressions found
+              توضیحات پسرفت‌های یافت شده
+    """
+    tolerance = baseline.get('thresholds', {}).get('tolerance', 0.25)
+    overrides = baseline.get('thresholds', {}).get('metrics', {})
+    regressions = []
+
+    for bench, metrics in baseline.get('results', {}).items():
+        for name, expected in metrics.items():
+            actual = results.get(bench, {}).get(name)
+            if actual is None or not expected:
+                continue
+            allowed = overrides.get(f"{bench}.{name}", tolerance)
+            if name in HIGHER_IS_BETTER and actual < expected * (1 - allowed):
+                regressions.append(f"{bench}.{name}: {actual:.2f} < {expected:.2f} (-{allowed:.0%})")
+            elif name in LOWER_IS_BETTER and actual > expected * (1 + allowed):
+                regressions.append(f"{bench}.{name}: {actual:.2f} > {expected:.2f} (+{allowed:.0%})")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the packet dissect and storage path")
+    parser.add_argument('--packets', type=int, default=20000, help="frames per benchmark")
+    parser.add_argument('--flows', type=int, default=2000, help="distinct flows in the mix")
+    parser.add_argument('--seed', type=int, default=1, help="random seed")
+    parser.add_argument('--repeat', type=int, default=3, help="repetitions per benchmark, best is kept")
+    parser.add_argument('--baseline', default=BASELINE_PATH, help="baseline file to compare with")
+    parser.add_argument('--update-baseline', action='store_true', help="write the results as the new baseline")
+    parser.add_argument('--output', help="also write the results to this JSON file")
+    args = parser.parse_args()
+
+    results = run(args.packets, args.flows, args.seed, args.repeat)
+
+    report = {
+        'environment': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'packets': args.packets,
+            'flows': args.flows,
+            'seed': args.seed,
+            'repeat': args.repeat
+        },
+        'results': results
+    }
+    print(json.dumps(report, indent=2))
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+    if args.update_baseline:
+        thresholds = {'tolerance': 0.25, 'metrics': {}}
+        if os.path.exists(args.baseline):
+            with open(args.baseline, encoding='utf-8') as f:
+                thresholds = json.load(f).get('thresholds', thresholds)
+        report['thresholds'] = thresholds
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print("No baseline found; run with --update-baseline to create one")
+        return 0
+
+    with open(args.baseline, encoding='utf-8') as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline)
+    if regressions:
+        print("Performance regressions:")
+        for regression in regressions:
+            print(f"  {regression}")
+        return 1
+    print("No performance regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
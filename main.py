@@ -10,6 +10,7 @@ A professional network packet analyzer with bilingual (English/Persian) support
 
 import sys
 import os
+import argparse
 import logging
 from PyQt6.QtWidgets import QApplication, QMessageBox
 from PyQt6.QtCore import Qt
@@ -31,10 +32,106 @@ def setup_logging():
         ]
     )
 
+def parse_address(value, default_host):
+    """Parse a [HOST:]PORT argument
+    تجزیه آرگومان [HOST:]PORT
+    """
+    host, _, port = value.rpartition(':')
+    return host or default_host, int(port)
+
+def megabytes(value):
+    """Convert megabytes to bytes, keeping None
+    تبدیل مگابایت به بایت
+    """
+    return None if value is None else value * 1024 * 1024
+
+def parse_args():
+    """Parse command line arguments
+    تجزیه آرگومان‌های خط فرمان
+    """
+    from src.network.remote import DEFAULT_PORT
+    from src.network.capture import SNAPLEN_HEADERS
+    
+    parser = argparse.ArgumentParser(description="Network Full Sniffer")
+    parser.add_argument('--sensor', metavar='HOST[:PORT]',
+                        help="run headless and stream captured packets to a collector")
+    parser.add_argument('--collect', metavar='[HOST:]PORT', nargs='?', const=str(DEFAULT_PORT),
+                        help=f"accept remote sensors (default port {DEFAULT_PORT}) and show their packets")
+    parser.add_argument('--headless', action='store_true',
+                        help="with --collect, run without the GUI and log sensor statistics")
+    parser.add_argument('--interface', type=int, action='append', default=None,
+                        help="interface index used by --sensor (default 0); repeat to capture several")
+    parser.add_argument('--filter', default=None, help="BPF filter used by --sensor")
+    parser.add_argument('--snaplen', type=int, default=None,
+                        help="bytes kept of every frame captured by --sensor (default: whole frames)")
+    parser.add_argument('--headers-only', dest='snaplen', action='store_const', const=SNAPLEN_HEADERS,
+                        help=f"with --sensor, keep only the first {SNAPLEN_HEADERS} bytes (the headers) of every frame")
+    parser.add_argument('--geoip', metavar='MMDB', action='append', default=[],
+                        help="MaxMind country/ASN database used to tag addresses; repeat for several")
+    parser.add_argument('--session', metavar='FILE', default=None,
+                        help="session file (.nss) to open in the GUI")
+    parser.add_argument('--pcap', metavar='FILE', default=None,
+                        help="pcap/pcapng file to browse in the GUI; indexed in the background")
+    parser.add_argument('--name', default=None, help="sensor name (default: host name)")
+    parser.add_argument('--max-packets', type=int, default=100000,
+                        help="packets kept in memory by a sensor or collector")
+    parser.add_argument('--memory-budget', type=int, metavar='MB', default=None,
+                        help="memory for packets of a sensor or collector; older packets move to disk")
+    return parser.parse_args()
+
+def run_sensor_mode(args):
+    """Capture headless and stream to a collector
+    ضبط بدون رابط کاربری و ارسال به جمع‌آوری‌کننده
+    """
+    from src.network.sniffer import NetworkSniffer
+    from src.network.remote import DEFAULT_PORT, run_sensor
+    
+    if ':' in args.sensor:
+        host, port = parse_address(args.sensor, None)
+    else:
+        host, port = args.sensor, DEFAULT_PORT
+    sniffer = NetworkSniffer(max_packets=args.max_packets, snaplen=args.snaplen,
+                             memory_budget=megabytes(args.memory_budget))
+    sniffer.start_sniffing(args.interface or [0], args.filter)
+    run_sensor(sniffer, host, port, args.name)
+
+def run_headless_collector(args):
+    """Collect from remote sensors without the GUI
+    جمع‌آوری از حسگرهای راه دور بدون رابط کاربری
+    """
+    import time
+    from src.network.sniffer import NetworkSniffer
+    from src.network.remote import Collector
+    
+    logger = logging.getLogger(__name__)
+    host, port = parse_address(args.collect, '0.0.0.0')
+    sniffer = NetworkSniffer(max_packets=args.max_packets, memory_budget=megabytes(args.memory_budget))
+    collector = Collector(sniffer, host, port).start()
+    try:
+        while True:
+            time.sleep(10)
+            sniffer.get_new_packets()
+            logger.info(f"Sensors: {collector.get_sensors()}")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        collector.stop()
+
 def main():
     """Main application entry point
     نقطه ورود اصلی برنامه
     """
+    args = parse_args()
+    
+    # Headless modes do not need Qt
+    if args.sensor or (args.collect and args.headless):
+        setup_logging()
+        if args.sensor:
+            run_sensor_mode(args)
+        else:
+            run_headless_collector(args)
+        return
+    
     # Initialize the application
     app = QApplication(sys.argv)
     
@@ -55,6 +152,20 @@ def main():
         window = NetworkSnifferApp()
         window.show()
         
+        for path in args.geoip:
+            window.sniffer.load_geoip_database(path)
+        if args.session:
+            window.open_session(args.session)
+        if args.pcap:
+            window.open_capture_file(args.pcap)
+        
+        # Merge packets streamed by remote sensors into the window's sniffer
+        if args.collect:
+            from src.network.remote import Collector
+            host, port = parse_address(args.collect, '0.0.0.0')
+            collector = Collector(window.sniffer, host, port).start()
+            app.aboutToQuit.connect(collector.stop)
+        
         # Start the application event loop
         sys.exit(app.exec())
         
@@ -8,23 +8,67 @@ This module contains the main window class for the Network Sniffer application.
 """
 
 from PyQt6.QtWidgets import (
-    QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
-    QTabWidget, QLabel, QComboBox, QTableWidget, QTableWidgetItem,
+    QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
+    QTabWidget, QLabel, QComboBox, QTableWidget, QTableWidgetItem, QTableView,
     QHeaderView, QStatusBar, QMessageBox, QSplitter, QGroupBox,
-    QFormLayout, QLineEdit, QCompleter, QMenuBar, QMenu, QFileDialog
+    QFormLayout, QLineEdit, QCompleter, QMenuBar, QMenu, QFileDialog, QToolButton,
+    QProgressDialog
 )
-from PyQt6.QtCore import Qt, QTimer, QSize
-from PyQt6.QtGui import QAction, QIcon, QFont, QPixmap, QColor
+from PyQt6.QtCore import Qt, QSize
+from PyQt6.QtGui import QAction, QActionGroup, QIcon, QFont, QPixmap, QColor
 import pyqtgraph as pg
 import psutil
 import platform
 import socket
 import time
+import logging
 from datetime import datetime
 import os
 
 from ..network.sniffer import NetworkSniffer
+from ..network.ring import OVERFLOW_POLICIES
+from .packet_model import PacketTableModel
+from .search_dialog import PayloadSearchDialog
+from .packet_details import PacketDetailView
+from .refresh import (
+    RefreshScheduler, sync_table, REFRESH_INTERACTIVE, REFRESH_NORMAL, REFRESH_LOW_CPU
+)
+from ..network.sampling import SAMPLING_NONE, SAMPLING_EVERY_NTH, SAMPLING_FLOW, SAMPLING_ADAPTIVE
+from ..network.capture import SNAPLEN_HEADERS
+from ..network.details import PacketDetailCache
+from ..network.conversations import (
+    ENDPOINTS_IP, ENDPOINTS_MAC, CONVERSATIONS_IP, CONVERSATIONS_TCP, CONVERSATIONS_UDP, SORT_KEYS
+)
 from ..utils.translator import Translator
+from ..utils.decimation import MinMaxPyramid
+
+logger = logging.getLogger(__name__)
+
+# Per-second traffic samples kept for the traffic graph (one week)
+TRAFFIC_HISTORY_SECONDS = 7 * 24 * 3600
+
+# Rows shown in the endpoints and conversations tabs
+TOP_ROWS = 100
+
+def format_bytes(count):
+    """Format a byte count with a binary unit, e.g. '12.3 MB'
+    
+    قالب‌بندی تعداد بایت با واحد مناسب
+    """
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if count < 1024 or unit == 'GB':
+            return f"{count:.0f} {unit}" if unit == 'B' else f"{count:.1f} {unit}"
+        count /= 1024
+
+def format_endpoint(key):
+    """Format an endpoint key, an address or an (address, port) pair
+    
+    قالب‌بندی کلید نقطه پایانی، یک آدرس یا جفت (آدرس، پورت)
+    """
+    if isinstance(key, tuple):
+        address, port = key
+        return f"[{address}]:{port}" if ':' in address else f"{address}:{port}"
+    return str(key)
 
 class NetworkSnifferApp(QMainWindow):
     """
@@ -33,6 +77,12 @@ class NetworkSnifferApp(QMainWindow):
     پنجره اصلی برنامه شبکه اسنیفر
     """
     
+    # Packets kept in memory are limited by the memory budget; older packets
+    # move to disk until the disk budget is used up
+    MAX_PACKETS = 1000000
+    MEMORY_BUDGET = 256 * 1024 * 1024
+    DISK_BUDGET = 4 * 1024 * 1024 * 1024
+    
     def __init__(self):
         """Initialize the main window
         
@@ -44,7 +94,14 @@ class NetworkSnifferApp(QMainWindow):
         self.translator = Translator()
         
         # Network sniffer instance
-        self.sniffer = NetworkSniffer()
+        self.sniffer = NetworkSniffer(max_packets=self.MAX_PACKETS, memory_budget=self.MEMORY_BUDGET,
+                                      disk_budget=self.DISK_BUDGET)
+        self.search_dialog = None
+        self._alerts_seen = 0
+        
+        # Capture file being browsed, and the progress of its indexing
+        self.capture_file = None
+        self.index_progress = None
         
         # UI setup
         self.init_ui()
@@ -52,10 +109,23 @@ class NetworkSnifferApp(QMainWindow):
         # Update UI with current language
         self.retranslate_ui()
         
-        # Start update timer for real-time data
-        self.update_timer = QTimer(self)
-        self.update_timer.timeout.connect(self.update_stats)
-        self.update_timer.start(1000)  # Update every second
+        # Single refresh timer: always drain new packets, redraw only the visible tab
+        self.refresh_scheduler = RefreshScheduler(
+            self.tab_widget,
+            on_refresh=self.sniffer.record_gui_refresh,
+            parent=self
+        )
+        self.refresh_scheduler.add_always(self.update_packet_table)
+        self.refresh_scheduler.add_always(self.update_drop_counts)
+        self.refresh_scheduler.add_always(self.sample_traffic)
+        self.refresh_scheduler.add_always(self.update_alerts)
+        self.refresh_scheduler.add_always(self.update_capture_file)
+        self.refresh_scheduler.add_view(self.stats_tab, self.update_stats_tables)
+        self.refresh_scheduler.add_view(self.graph_tab, self.update_traffic_graph)
+        self.refresh_scheduler.add_view(self.diagnostics_tab, self.update_diagnostics)
+        self.refresh_scheduler.add_view(self.endpoints_tab, self.update_endpoints)
+        self.refresh_scheduler.add_view(self.conversations_tab, self.update_conversations)
+        self.refresh_scheduler.start()
     
     def init_ui(self):
         """Initialize the user interface
@@ -81,6 +151,14 @@ class NetworkSnifferApp(QMainWindow):
         self.status_bar = QStatusBar()
         self.setStatusBar(self.status_bar)
         
+        # Dropped packet counters
+        self.drops_label = QLabel()
+        self.status_bar.addPermanentWidget(self.drops_label)
+        
+        # Memory and disk usage per tier
+        self.memory_label = QLabel()
+        self.status_bar.addPermanentWidget(self.memory_label)
+        
         # Create main content area
         content_splitter = QSplitter(Qt.Orientation.Vertical)
         
@@ -95,10 +173,19 @@ class NetworkSnifferApp(QMainWindow):
         self.packets_tab = self.create_packets_tab()
         self.stats_tab = self.create_stats_tab()
         self.graph_tab = self.create_graph_tab()
+        self.diagnostics_tab = self.create_diagnostics_tab()
+        self.alerts_tab = self.create_alerts_tab()
+        self.endpoints_tab = self.create_endpoints_tab()
+        self.conversations_tab = self.create_conversations_tab()
+        self.retranslate_top_tables()
         
         self.tab_widget.addTab(self.packets_tab, self.tr("Packets"))
         self.tab_widget.addTab(self.stats_tab, self.tr("Statistics"))
         self.tab_widget.addTab(self.graph_tab, self.tr("Graphs"))
+        self.tab_widget.addTab(self.diagnostics_tab, self.tr("Diagnostics"))
+        self.tab_widget.addTab(self.alerts_tab, self.tr("Alerts"))
+        self.tab_widget.addTab(self.endpoints_tab, self.translator.tr("Endpoints"))
+        self.tab_widget.addTab(self.conversations_tab, self.translator.tr("Conversations"))
         
         content_splitter.addWidget(self.tab_widget)
         
@@ -131,6 +218,34 @@ class NetworkSnifferApp(QMainWindow):
         language_menu.addAction(self.english_action)
         language_menu.addAction(self.persian_action)
         
+        # Capture file action
+        self.open_file_action = QAction(self.translator.tr("Open &Capture File..."), self)
+        self.open_file_action.triggered.connect(lambda: self.open_capture_file())
+        file_menu.addAction(self.open_file_action)
+        
+        # Session actions
+        self.open_session_action = QAction(self.translator.tr("&Open Session..."), self)
+        self.open_session_action.setShortcut('Ctrl+O')
+        self.open_session_action.triggered.connect(lambda: self.open_session())
+        file_menu.addAction(self.open_session_action)
+        
+        self.save_session_action = QAction(self.translator.tr("&Save Session..."), self)
+        self.save_session_action.setShortcut('Ctrl+S')
+        self.save_session_action.triggered.connect(self.save_session)
+        file_menu.addAction(self.save_session_action)
+        
+        # Export action
+        self.export_action = QAction(self.translator.tr("&Export..."), self)
+        self.export_action.setShortcut('Ctrl+E')
+        self.export_action.triggered.connect(self.export_packets)
+        file_menu.addAction(self.export_action)
+        
+        # GeoIP database action
+        self.geoip_action = QAction(self.translator.tr("Load &GeoIP Database..."), self)
+        self.geoip_action.triggered.connect(self.load_geoip_database)
+        file_menu.addAction(self.geoip_action)
+        file_menu.addSeparator()
+        
         # Exit action
         exit_action = QAction(self.tr("E&xit"), self)
         exit_action.setShortcut('Ctrl+Q')
@@ -140,9 +255,92 @@ class NetworkSnifferApp(QMainWindow):
         # View menu
         view_menu = menubar.addMenu(self.tr("&View"))
         
+        # Refresh rate submenu
+        self.refresh_menu = view_menu.addMenu(self.translator.tr("Refresh Rate"))
+        self.refresh_group = QActionGroup(self)
+        self.refresh_actions = []
+        refresh_options = [
+            ("Interactive", REFRESH_INTERACTIVE),
+            ("Normal", REFRESH_NORMAL),
+            ("Low CPU", REFRESH_LOW_CPU)
+        ]
+        for label, mode in refresh_options:
+            action = QAction(self.translator.tr(label), self, checkable=True)
+            action.setChecked(mode == REFRESH_NORMAL)
+            action.triggered.connect(lambda checked, m=mode: self.refresh_scheduler.set_mode(m))
+            self.refresh_group.addAction(action)
+            self.refresh_menu.addAction(action)
+            self.refresh_actions.append((label, action))
+        
         # Tools menu
         tools_menu = menubar.addMenu(self.tr("&Tools"))
         
+        # Payload search
+        self.search_action = QAction(self.translator.tr("Search Payloads..."), self)
+        self.search_action.setShortcut('Ctrl+F')
+        self.search_action.triggered.connect(self.show_payload_search)
+        tools_menu.addAction(self.search_action)
+        tools_menu.addSeparator()
+        
+        # Queue overflow policy submenu
+        self.overflow_menu = tools_menu.addMenu(self.translator.tr("Queue Overflow Policy"))
+        self.overflow_group = QActionGroup(self)
+        self.overflow_actions = {}
+        for policy in OVERFLOW_POLICIES:
+            action = QAction(self.translator.tr(policy), self, checkable=True)
+            action.setChecked(policy == self.sniffer.new_packets.policy)
+            action.triggered.connect(lambda checked, p=policy: self.sniffer.set_overflow_policy(p))
+            self.overflow_group.addAction(action)
+            self.overflow_menu.addAction(action)
+            self.overflow_actions[policy] = action
+        
+        # Sampling submenu
+        self.sampling_menu = tools_menu.addMenu(self.translator.tr("Sampling"))
+        self.sampling_group = QActionGroup(self)
+        self.sampling_actions = []
+        sampling_options = [
+            ("Off", SAMPLING_NONE, 1),
+            ("1 in 10 packets", SAMPLING_EVERY_NTH, 10),
+            ("1 in 100 packets", SAMPLING_EVERY_NTH, 100),
+            ("1 in 10 flows", SAMPLING_FLOW, 10),
+            ("1 in 100 flows", SAMPLING_FLOW, 100),
+            ("Adaptive", SAMPLING_ADAPTIVE, 1)
+        ]
+        for label, mode, rate in sampling_options:
+            action = QAction(self.translator.tr(label), self, checkable=True)
+            action.setChecked(mode == SAMPLING_NONE)
+            action.triggered.connect(lambda checked, m=mode, r=rate: self.sniffer.set_sampling(m, r))
+            self.sampling_group.addAction(action)
+            self.sampling_menu.addAction(action)
+            self.sampling_actions.append((label, action))
+        
+        # Memory budget submenu
+        self.memory_menu = tools_menu.addMenu(self.translator.tr("Memory Budget"))
+        self.memory_group = QActionGroup(self)
+        for megabytes in (64, 256, 1024, 4096):
+            label = f"{megabytes // 1024} GB" if megabytes >= 1024 else f"{megabytes} MB"
+            action = QAction(label, self, checkable=True)
+            action.setChecked(megabytes * 1024 * 1024 == self.MEMORY_BUDGET)
+            action.triggered.connect(lambda checked, m=megabytes: self.sniffer.set_memory_budget(m * 1024 * 1024))
+            self.memory_group.addAction(action)
+            self.memory_menu.addAction(action)
+        
+        # Capture length submenu
+        self.snaplen_menu = tools_menu.addMenu(self.translator.tr("Capture Length"))
+        self.snaplen_group = QActionGroup(self)
+        self.snaplen_actions = []
+        snaplen_options = [
+            ("Full frames", None),
+            ("Headers only (128 bytes)", SNAPLEN_HEADERS)
+        ]
+        for label, snaplen in snaplen_options:
+            action = QAction(self.translator.tr(label), self, checkable=True)
+            action.setChecked(snaplen == self.sniffer.snaplen)
+            action.triggered.connect(lambda checked, n=snaplen: self.sniffer.set_snaplen(n))
+            self.snaplen_group.addAction(action)
+            self.snaplen_menu.addAction(action)
+            self.snaplen_actions.append((label, action))
+        
         # Help menu
         help_menu = menubar.addMenu(self.tr("&Help"))
         about_action = QAction(self.tr("&About"), self)
@@ -161,12 +359,19 @@ class NetworkSnifferApp(QMainWindow):
         interface_layout = QHBoxLayout()
         interface_label = QLabel(self.tr("Interface:"))
         self.interface_combo = QComboBox()
+        
+        # Extra interfaces captured together with the selected one
+        self.extra_interfaces_button = QToolButton()
+        self.extra_interfaces_button.setPopupMode(QToolButton.ToolButtonPopupMode.InstantPopup)
+        self.extra_interfaces_menu = QMenu(self.extra_interfaces_button)
+        self.extra_interfaces_button.setMenu(self.extra_interfaces_menu)
         self.populate_interfaces()
         
         # Filter input
         filter_label = QLabel(self.tr("Filter:"))
         self.filter_edit = QLineEdit()
         self.filter_edit.setPlaceholderText(self.tr("e.g., tcp port 80"))
+        self.filter_edit.returnPressed.connect(self.apply_filter)
         
         # Control buttons
         self.start_button = QPushButton()
@@ -182,6 +387,7 @@ class NetworkSnifferApp(QMainWindow):
         # Add widgets to layout
         interface_layout.addWidget(interface_label)
         interface_layout.addWidget(self.interface_combo)
+        interface_layout.addWidget(self.extra_interfaces_button)
         interface_layout.addStretch()
         interface_layout.addWidget(filter_label)
         interface_layout.addWidget(self.filter_edit)
@@ -201,10 +407,8 @@ class NetworkSnifferApp(QMainWindow):
         tab = QWidget()
         layout = QVBoxLayout(tab)
         
-        # Create packet table
-        self.packet_table = QTableWidget()
-        self.packet_table.setColumnCount(7)
-        self.packet_table.setHorizontalHeaderLabels([
+        # Create packet table; cells are formatted only when they are shown
+        self.packet_model = PacketTableModel(self.sniffer.format_packet, [
             self.tr("No."),
             self.tr("Time"),
             self.tr("Source"),
@@ -212,12 +416,16 @@ class NetworkSnifferApp(QMainWindow):
             self.tr("Protocol"),
             self.tr("Length"),
             self.tr("Info")
-        ])
+        ], parent=self)
+        self.packet_table = QTableView()
+        self.packet_table.setModel(self.packet_model)
         
         # Configure table properties
-        self.packet_table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
-        self.packet_table.setSelectionMode(QTableWidget.SelectionMode.SingleSelection)
-        self.packet_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.packet_table.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
+        self.packet_table.setSelectionMode(QTableView.SelectionMode.SingleSelection)
+        self.packet_table.setEditTriggers(QTableView.EditTrigger.NoEditTriggers)
+        self.packet_table.verticalHeader().setVisible(False)
+        self.packet_table.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
         
         # Set column widths
         header = self.packet_table.horizontalHeader()
@@ -229,11 +437,61 @@ class NetworkSnifferApp(QMainWindow):
         header.setSectionResizeMode(5, QHeaderView.ResizeMode.ResizeToContents)  # Length
         header.setSectionResizeMode(6, QHeaderView.ResizeMode.Stretch)  # Info
         
-        # Add table to layout
-        layout.addWidget(self.packet_table)
+        # Detail pane for the selected packet, dissected on demand
+        self.detail_cache = PacketDetailCache()
+        self.packet_details = PacketDetailView(self.translator)
+        self.packet_table.selectionModel().currentRowChanged.connect(self.show_packet_details)
+        self.packet_model.modelReset.connect(self.clear_packet_details)
+        
+        # Add table and details to layout
+        splitter = QSplitter(Qt.Orientation.Vertical)
+        splitter.addWidget(self.packet_table)
+        splitter.addWidget(self.packet_details)
+        splitter.setStretchFactor(0, 3)
+        splitter.setStretchFactor(1, 2)
+        layout.addWidget(splitter)
         
         return tab
     
+    def show_packet_details(self, current, previous=None):
+        """Show the layers, fields and bytes of the selected packet
+        
+        نمایش لایه‌ها، فیلدها و بایت‌های بسته انتخاب شده
+        
+        Args:
+            current (QModelIndex): Index of the selected row
+                                   اندیس سطر انتخاب شده
+            previous (QModelIndex): Index of the previously selected row
+                                    اندیس سطر انتخاب شده قبلی
+        """
+        info = self.packet_model.packet_at(current.row()) if current.isValid() else None
+        if info is None:
+            self.packet_details.clear()
+            return
+        packet = info.get('raw')
+        if packet is None and self.capture_file is None and 'seq' in info:
+            # Moved to disk since the row was added; read it back
+            stored = self.sniffer.get_packet(info['seq'])
+            packet = stored.get('raw') if stored is not None else None
+        if packet is None:
+            self.packet_details.clear()
+            return
+        try:
+            details = self.detail_cache.get(info.get('seq', id(info)), packet)
+        except Exception as e:
+            logger.warning(f"Failed to dissect packet details: {str(e)}")
+            self.packet_details.clear()
+            return
+        self.packet_details.show_details(details, info)
+    
+    def clear_packet_details(self):
+        """Clear the detail pane and forget the cached details
+        
+        پاک کردن بخش جزئیات و فراموش کردن جزئیات ذخیره شده
+        """
+        self.detail_cache.clear()
+        self.packet_details.clear()
+    
     def create_stats_tab(self):
         """Create the statistics tab
         
@@ -242,6 +500,10 @@ class NetworkSnifferApp(QMainWindow):
         tab = QWidget()
         layout = QVBoxLayout(tab)
         
+        # Estimated totals (scaled up when sampling is enabled)
+        self.estimate_label = QLabel()
+        layout.addWidget(self.estimate_label)
+        
         # Create a splitter for the stats view
         splitter = QSplitter(Qt.Orientation.Vertical)
         
@@ -330,11 +592,14 @@ class NetworkSnifferApp(QMainWindow):
             name=self.tr("ارسالی")
         )
         
-        # Data for plotting
-        self.time_data = []
-        self.recv_data = []
-        self.send_data = []
-        self.max_points = 60  # Show last 60 seconds
+        # Traffic history with min/max pyramids; only about two points per
+        # pixel of the visible range are handed to pyqtgraph
+        self.traffic_start = None
+        self._last_net_io = None
+        self.recv_series = MinMaxPyramid(max_samples=TRAFFIC_HISTORY_SECONDS)
+        self.send_series = MinMaxPyramid(max_samples=TRAFFIC_HISTORY_SECONDS)
+        self._plotted_traffic_samples = 0
+        self.traffic_plot.getViewBox().sigXRangeChanged.connect(self._on_traffic_range_changed)
         
         traffic_layout.addWidget(self.traffic_plot)
         
@@ -365,19 +630,186 @@ class NetworkSnifferApp(QMainWindow):
         # Add splitter to main layout
         layout.addWidget(splitter)
         
-        # Start update timer for graphs
-        self.graph_timer = QTimer(self)
-        self.graph_timer.timeout.connect(self.update_traffic_graph)
-        self.graph_timer.start(1000)  # Update every second
+        # Last protocol counts drawn, to skip redrawing unchanged bars
+        self._plotted_protocol_counts = None
+        
+        return tab
+    
+    def create_diagnostics_tab(self):
+        """Create the diagnostics tab showing capture pipeline metrics
+        
+        ایجاد تب عیب‌یابی برای نمایش معیارهای خط لوله ضبط
+        """
+        tab = QWidget()
+        layout = QVBoxLayout(tab)
+        
+        splitter = QSplitter(Qt.Orientation.Vertical)
+        
+        # Counters and gauges
+        counters_group = QGroupBox(self.translator.tr("Counters"))
+        counters_layout = QVBoxLayout(counters_group)
+        self.counters_table = QTableWidget()
+        self.counters_table.setColumnCount(3)
+        self.counters_table.setHorizontalHeaderLabels([
+            self.translator.tr("Metric"),
+            self.translator.tr("Value"),
+            self.translator.tr("Max")
+        ])
+        self.counters_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.counters_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        counters_layout.addWidget(self.counters_table)
+        
+        # Latency histograms
+        latency_group = QGroupBox(self.translator.tr("Latency (µs)"))
+        latency_layout = QVBoxLayout(latency_group)
+        self.latency_table = QTableWidget()
+        self.latency_table.setColumnCount(7)
+        self.latency_table.setHorizontalHeaderLabels([
+            self.translator.tr("Metric"),
+            self.translator.tr("Count"),
+            self.translator.tr("Mean"),
+            "p50", "p90", "p99",
+            self.translator.tr("Max")
+        ])
+        self.latency_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.latency_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        latency_layout.addWidget(self.latency_table)
+        
+        # Per-protocol dissector counters
+        dissectors_group = QGroupBox(self.translator.tr("Dissectors"))
+        dissectors_layout = QVBoxLayout(dissectors_group)
+        self.dissectors_table = QTableWidget()
+        self.dissectors_table.setColumnCount(4)
+        self.dissectors_table.setHorizontalHeaderLabels([
+            self.translator.tr("Protocol"),
+            self.translator.tr("Hits"),
+            self.translator.tr("Errors"),
+            self.translator.tr("Mean (µs)")
+        ])
+        self.dissectors_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.dissectors_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        dissectors_layout.addWidget(self.dissectors_table)
+        
+        splitter.addWidget(counters_group)
+        splitter.addWidget(latency_group)
+        splitter.addWidget(dissectors_group)
+        
+        layout.addWidget(splitter)
         
         return tab
     
+    def create_alerts_tab(self):
+        """Create the alerts tab listing scan and flood detections
+        
+        ایجاد تب هشدارها برای نمایش پویش‌ها و سیل‌های تشخیص داده شده
+        """
+        tab = QWidget()
+        layout = QVBoxLayout(tab)
+        
+        self.alerts_table = QTableWidget()
+        self.alerts_table.setColumnCount(5)
+        self.alerts_table.setHorizontalHeaderLabels([
+            self.translator.tr("Time"),
+            self.translator.tr("Type"),
+            self.translator.tr("Source"),
+            self.translator.tr("Target"),
+            self.translator.tr("Count")
+        ])
+        self.alerts_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.alerts_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        layout.addWidget(self.alerts_table)
+        
+        return tab
+    
+    def _create_top_table_tab(self, kinds):
+        # Kind and sort selectors above a table of the busiest entries
+        tab = QWidget()
+        layout = QVBoxLayout(tab)
+        
+        controls = QHBoxLayout()
+        kind_label = QLabel()
+        kind_combo = QComboBox()
+        for label, kind in kinds:
+            kind_combo.addItem(label, kind)
+        sort_label = QLabel()
+        sort_combo = QComboBox()
+        for sort in SORT_KEYS:
+            sort_combo.addItem(sort, sort)
+        controls.addWidget(kind_label)
+        controls.addWidget(kind_combo)
+        controls.addWidget(sort_label)
+        controls.addWidget(sort_combo)
+        controls.addStretch()
+        layout.addLayout(controls)
+        
+        table = QTableWidget()
+        table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        layout.addWidget(table)
+        
+        return tab, kind_label, kind_combo, sort_label, sort_combo, table
+    
+    def create_endpoints_tab(self):
+        """Create the endpoints tab listing the busiest addresses
+        
+        ایجاد تب نقاط پایانی برای نمایش پرترافیک‌ترین آدرس‌ها
+        """
+        (tab, self.endpoints_kind_label, self.endpoints_kind_combo, self.endpoints_sort_label,
+         self.endpoints_sort_combo, self.endpoints_table) = self._create_top_table_tab(
+            [("IPv4/IPv6", ENDPOINTS_IP), ("Ethernet", ENDPOINTS_MAC)]
+        )
+        self.endpoints_table.setColumnCount(9)
+        self.endpoints_kind_combo.currentIndexChanged.connect(self.update_endpoints)
+        self.endpoints_sort_combo.currentIndexChanged.connect(self.update_endpoints)
+        return tab
+    
+    def create_conversations_tab(self):
+        """Create the conversations tab listing the busiest address and port pairs
+        
+        ایجاد تب مکالمه‌ها برای نمایش پرترافیک‌ترین جفت‌های آدرس و پورت
+        """
+        (tab, self.conversations_kind_label, self.conversations_kind_combo, self.conversations_sort_label,
+         self.conversations_sort_combo, self.conversations_table) = self._create_top_table_tab(
+            [("IPv4/IPv6", CONVERSATIONS_IP), ("TCP", CONVERSATIONS_TCP), ("UDP", CONVERSATIONS_UDP)]
+        )
+        self.conversations_table.setColumnCount(10)
+        self.conversations_kind_combo.currentIndexChanged.connect(self.update_conversations)
+        self.conversations_sort_combo.currentIndexChanged.connect(self.update_conversations)
+        return tab
+    
+    def retranslate_top_tables(self):
+        """Retranslate the endpoints and conversations tabs
+        
+        ترجمه مجدد تب‌های نقاط پایانی و مکالمه‌ها
+        """
+        tr = self.translator.tr
+        for kind_label, sort_label, sort_combo in (
+            (self.endpoints_kind_label, self.endpoints_sort_label, self.endpoints_sort_combo),
+            (self.conversations_kind_label, self.conversations_sort_label, self.conversations_sort_combo)
+        ):
+            kind_label.setText(tr("Type") + ":")
+            sort_label.setText(tr("Sort by") + ":")
+            for index, label in enumerate(("Bytes", "Packets", "Rate")):
+                sort_combo.setItemText(index, tr(label))
+        
+        self.endpoints_table.setHorizontalHeaderLabels([
+            tr("Address"), tr("Packets"), tr("Bytes"),
+            tr("Tx Packets"), tr("Tx Bytes"), tr("Rx Packets"), tr("Rx Bytes"),
+            tr("Duration"), tr("Rate")
+        ])
+        self.conversations_table.setHorizontalHeaderLabels([
+            "A", "B", tr("Packets"), tr("Bytes"),
+            tr("Packets A → B"), tr("Bytes A → B"), tr("Packets B → A"), tr("Bytes B → A"),
+            tr("Duration"), tr("Rate")
+        ])
+    
     def populate_interfaces(self):
         """Populate the network interfaces dropdown with friendly names
         
         پر کردن منوی کشویی رابط‌های شبکه با نام‌های خوانا
         """
         self.interface_combo.clear()
+        self.extra_interfaces_menu.clear()
         interfaces = self.sniffer.get_network_interfaces()
         
         if not interfaces:
@@ -392,6 +824,8 @@ class NetworkSnifferApp(QMainWindow):
             
             # Add to combo box
             self.interface_combo.addItem(display_text, iface['name'])
+            action = self.extra_interfaces_menu.addAction(display_text)
+            action.setCheckable(True)
             
             # Set tooltip with more details
             tooltip = (
@@ -426,14 +860,40 @@ class NetworkSnifferApp(QMainWindow):
             QMessageBox.warning(self, self.tr("Error"), self.tr("No network interface selected!"))
             return
         
+        # Capture the checked extra interfaces alongside the selected one
+        indices = [iface_index] + [
+            index for index, action in enumerate(self.extra_interfaces_menu.actions())
+            if action.isChecked() and index != iface_index
+        ]
+        
         filter_text = self.filter_edit.text().strip()
         
+        # Live packets replace a browsed capture file
+        self.close_capture_file()
+        
         try:
-            self.sniffer.start_sniffing(iface_index, filter_text)
+            self.sniffer.start_sniffing(indices, filter_text)
             self.update_status(True)
         except Exception as e:
             QMessageBox.critical(self, self.tr("Error"), self.tr(f"Failed to start sniffing: {str(e)}"))
     
+    def apply_filter(self):
+        """Swap the BPF filter of the running capture without restarting it
+        
+        تعویض فیلتر BPF ضبط در حال اجرا بدون راه‌اندازی مجدد
+        """
+        if not self.sniffer.is_sniffing():
+            return
+        
+        filter_text = self.filter_edit.text().strip()
+        try:
+            self.sniffer.set_filter(filter_text)
+        except Exception as e:
+            QMessageBox.warning(self, self.translator.tr("Error"),
+                                f"{self.translator.tr('Failed to apply filter:')} {e}")
+            return
+        self.status_bar.showMessage(f"{self.translator.tr('Filter applied')}: {filter_text or '-'}", 3000)
+    
     def stop_sniffing(self):
         """Stop packet sniffing
         
@@ -447,39 +907,244 @@ class NetworkSnifferApp(QMainWindow):
         
         پاک کردن بسته‌های ضبط شده
         """
+        self.close_capture_file()
         self.sniffer.clear_packets()
-        self.packet_table.setRowCount(0)
+        self.packet_model.clear()
+        self.update_alerts()
+    
+    def export_packets(self):
+        """Export captured packet metadata to a Parquet or Arrow file
+        
+        خروجی گرفتن از فراداده بسته‌های ضبط شده در فایل Parquet یا Arrow
+        """
+        path, _ = QFileDialog.getSaveFileName(
+            self,
+            self.translator.tr("Export Packets"),
+            "capture.parquet",
+            "Parquet (*.parquet);;Arrow IPC (*.arrow)"
+        )
+        if not path:
+            return
+        
+        QApplication.setOverrideCursor(Qt.CursorShape.WaitCursor)
+        try:
+            count = self.sniffer.export_packets(path)
+            self.status_bar.showMessage(
+                f"{self.translator.tr('Exported')} {count} {self.translator.tr('packets')}: {path}", 5000)
+        except Exception as e:
+            logger.error(f"Export failed: {e}", exc_info=True)
+            QMessageBox.critical(self, self.translator.tr("Error"), f"{self.translator.tr('Export failed:')} {e}")
+        finally:
+            QApplication.restoreOverrideCursor()
+    
+    def save_session(self):
+        """Save the capture session to a session file
+        
+        ذخیره نشست ضبط در یک فایل نشست
+        """
+        path, _ = QFileDialog.getSaveFileName(
+            self,
+            self.translator.tr("Save Session"),
+            "capture.nss",
+            "NetScope Session (*.nss)"
+        )
+        if not path:
+            return
+        
+        QApplication.setOverrideCursor(Qt.CursorShape.WaitCursor)
+        try:
+            count = self.sniffer.save_session(path)
+            self.status_bar.showMessage(
+                f"{self.translator.tr('Saved')} {count} {self.translator.tr('packets')}: {path}", 5000)
+        except Exception as e:
+            logger.error(f"Saving session failed: {e}", exc_info=True)
+            QMessageBox.critical(self, self.translator.tr("Error"),
+                                 f"{self.translator.tr('Saving session failed:')} {e}")
+        finally:
+            QApplication.restoreOverrideCursor()
+    
+    def open_session(self, path=None):
+        """Open a saved session file in place of the current packets
+        
+        باز کردن یک فایل نشست ذخیره شده به جای بسته‌های فعلی
+        
+        Args:
+            path (str): Session file, or None to ask for one
+                        فایل نشست، یا None برای انتخاب توسط کاربر
+        """
+        if self.sniffer.is_sniffing():
+            QMessageBox.warning(self, self.translator.tr("Error"),
+                                self.translator.tr("Stop the capture before opening a session"))
+            return
+        if path is None:
+            path, _ = QFileDialog.getOpenFileName(
+                self,
+                self.translator.tr("Open Session"),
+                "",
+                "NetScope Session (*.nss)"
+            )
+            if not path:
+                return
+        
+        try:
+            count = self.sniffer.load_session(path)
+        except Exception as e:
+            logger.error(f"Opening session failed: {e}", exc_info=True)
+            QMessageBox.critical(self, self.translator.tr("Error"),
+                                 f"{self.translator.tr('Opening session failed:')} {e}")
+            return
+        
+        # Rows are dissected from the session file when they are first shown
+        self.close_capture_file()
+        first_seq = self.sniffer.store.first_seq
+        self.packet_model.set_source(count, lambda row: self.sniffer.get_packet(first_seq + row))
+        self.update_alerts(reload=True)
+        self.update_stats()
+        self.status_bar.showMessage(
+            f"{self.translator.tr('Opened')} {count} {self.translator.tr('packets')}: {path}", 5000)
+    
+    def open_capture_file(self, path=None):
+        """Browse a pcap/pcapng file of any size in the packet table
+        
+        The file is indexed in the background; rows appear as soon as they
+        are indexed and are read from the file when shown.
+        
+        مرور یک فایل pcap/pcapng با هر اندازه در جدول بسته‌ها
+        
+        Args:
+            path (str): Capture file, or None to ask for one
+                        فایل ضبط، یا None برای انتخاب توسط کاربر
+        """
+        if self.sniffer.is_sniffing():
+            QMessageBox.warning(self, self.translator.tr("Error"),
+                                self.translator.tr("Stop the capture before opening a file"))
+            return
+        if path is None:
+            path, _ = QFileDialog.getOpenFileName(
+                self,
+                self.translator.tr("Open Capture File"),
+                "",
+                "Capture Files (*.pcap *.pcapng *.cap);;All Files (*)"
+            )
+            if not path:
+                return
+        
+        self.close_capture_file()
+        try:
+            self.capture_file = self.sniffer.open_capture_file(path)
+        except Exception as e:
+            logger.error(f"Opening capture file failed: {e}", exc_info=True)
+            QMessageBox.critical(self, self.translator.tr("Error"),
+                                 f"{self.translator.tr('Opening capture file failed:')} {e}")
+            return
+        
+        self.packet_model.set_source(0, self.capture_file.packet)
+        self.index_progress = QProgressDialog(
+            f"{self.translator.tr('Indexing')} {os.path.basename(path)}...",
+            self.translator.tr("Cancel"), 0, 1000, self)
+        self.index_progress.setWindowTitle(self.translator.tr("Open Capture File"))
+        self.index_progress.setWindowModality(Qt.WindowModality.NonModal)
+        self.index_progress.setMinimumDuration(500)
+        self.index_progress.canceled.connect(self.capture_file.cancel)
+        self.update_capture_file()
+    
+    def update_capture_file(self):
+        """Show newly indexed rows of the capture file and the progress
+        
+        نمایش سطرهای تازه فهرست شده فایل ضبط و میزان پیشرفت
+        """
+        capture_file = self.capture_file
+        if capture_file is None or self.index_progress is None:
+            return
+        self.packet_model.extend_source(len(capture_file))
+        if not capture_file.is_done():
+            self.index_progress.setValue(int(1000 * capture_file.bytes_indexed / max(1, capture_file.size)))
+            return
+        
+        progress, self.index_progress = self.index_progress, None
+        progress.canceled.disconnect()
+        progress.close()
+        if capture_file.error is not None:
+            QMessageBox.warning(self, self.translator.tr("Error"),
+                                f"{self.translator.tr('Indexing stopped:')} {capture_file.error}")
+        self.status_bar.showMessage(
+            f"{self.translator.tr('Opened')} {len(capture_file)} {self.translator.tr('packets')}: "
+            f"{capture_file.path}", 5000)
+    
+    def close_capture_file(self):
+        """Stop browsing the capture file, if any, and empty the table
+        
+        پایان مرور فایل ضبط در صورت وجود و خالی کردن جدول
+        """
+        if self.index_progress is not None:
+            self.index_progress.canceled.disconnect()
+            self.index_progress.close()
+            self.index_progress = None
+        if self.capture_file is not None:
+            self.packet_model.clear()
+            self.capture_file.close()
+            self.capture_file = None
+    
+    def load_geoip_database(self):
+        """Load MaxMind country/ASN databases for tagging addresses
+        
+        بارگذاری پایگاه‌های داده کشور و ASN با قالب MaxMind برای برچسب‌گذاری آدرس‌ها
+        """
+        paths, _ = QFileDialog.getOpenFileNames(
+            self,
+            self.translator.tr("Load GeoIP Database"),
+            "",
+            "MaxMind DB (*.mmdb)"
+        )
+        if not paths:
+            return
+        
+        try:
+            for path in paths:
+                self.sniffer.load_geoip_database(path)
+            self.status_bar.showMessage(
+                f"{self.translator.tr('GeoIP database loaded')}: {', '.join(paths)}", 5000)
+        except Exception as e:
+            logger.error(f"Loading GeoIP database failed: {e}", exc_info=True)
+            QMessageBox.critical(self, self.translator.tr("Error"),
+                                 f"{self.translator.tr('Loading GeoIP database failed:')} {e}")
+        # Visible rows pick up the locations on their next repaint
+        self.packet_table.viewport().update()
+    
+    def show_payload_search(self):
+        """Show the payload search dialog
+        
+        نمایش پنجره جستجوی محتوای بسته‌ها
+        """
+        if self.search_dialog is None:
+            self.search_dialog = PayloadSearchDialog(self.sniffer, self.translator, self)
+        self.search_dialog.show()
+        self.search_dialog.raise_()
+        self.search_dialog.activateWindow()
     
     def update_status(self, is_sniffing):
         """Update UI status
         
         به‌روزرسانی وضعیت رابط کاربری
         """
+        self.interface_combo.setEnabled(not is_sniffing)
+        self.extra_interfaces_button.setEnabled(not is_sniffing)
         if is_sniffing:
             self.start_button.setEnabled(False)
             self.stop_button.setEnabled(True)
-            self.status_bar.showMessage(self.tr("Sniffing..."))
+            interfaces = ", ".join(self.sniffer.interfaces)
+            self.status_bar.showMessage(f"{self.tr('Sniffing...')} ({interfaces})")
         else:
             self.start_button.setEnabled(True)
             self.stop_button.setEnabled(False)
             self.status_bar.showMessage(self.tr("Ready"))
     
     def update_stats(self):
-        """Update statistics and graphs
+        """Update the packet table and the visible statistics view now
         
-        به‌روزرسانی آمار و نمودارها
+        به‌روزرسانی فوری جدول بسته‌ها و نمای آمار قابل مشاهده
         """
-        try:
-            # Update packet table
-            self.update_packet_table()
-            
-            # Update statistics tables
-            self.update_stats_tables()
-            
-            # The traffic graph is updated by its own timer
-            # to maintain smooth animation
-        except Exception as e:
-            print(f"Error in update_stats: {e}")
+        self.refresh_scheduler.refresh()
     
     def update_packet_table(self):
         """Update the packet table with new packets
@@ -490,18 +1155,7 @@ class NetworkSnifferApp(QMainWindow):
         if not new_packets:
             return
         
-        current_row = self.packet_table.rowCount()
-        self.packet_table.setRowCount(current_row + len(new_packets))
-        
-        for i, packet in enumerate(new_packets):
-            row = current_row + i
-            self.packet_table.setItem(row, 0, QTableWidgetItem(str(row + 1)))
-            self.packet_table.setItem(row, 1, QTableWidgetItem(packet['time']))
-            self.packet_table.setItem(row, 2, QTableWidgetItem(packet['source']))
-            self.packet_table.setItem(row, 3, QTableWidgetItem(packet['destination']))
-            self.packet_table.setItem(row, 4, QTableWidgetItem(packet['protocol']))
-            self.packet_table.setItem(row, 5, QTableWidgetItem(str(packet['length'])))
-            self.packet_table.setItem(row, 6, QTableWidgetItem(packet['info']))
+        self.packet_model.append_packets(new_packets)
         
         # Auto-scroll to the bottom
         self.packet_table.scrollToBottom()
@@ -514,67 +1168,236 @@ class NetworkSnifferApp(QMainWindow):
         try:
             # Update protocol distribution table
             protocol_counts = self.sniffer.get_protocol_counts()
-            self.protocol_table.setRowCount(len(protocol_counts))
+            sync_table(self.protocol_table, [(protocol, str(count)) for protocol, count in protocol_counts.items()])
             
-            for row, (protocol, count) in enumerate(protocol_counts.items()):
-                self.protocol_table.setItem(row, 0, QTableWidgetItem(protocol))
-                self.protocol_table.setItem(row, 1, QTableWidgetItem(str(count)))
+            # Update estimated totals
+            totals = self.sniffer.get_estimated_totals()
+            text = (f"{self.translator.tr('Estimated total')}: {totals['packets']} "
+                    f"{self.translator.tr('packets')}, {totals['bytes']} {self.translator.tr('bytes')}")
+            if totals['mode'] != SAMPLING_NONE:
+                text += f" ({self.translator.tr('Sampling')}: 1/{totals['rate']})"
+            self.estimate_label.setText(text)
             
-            # Update interface statistics table
-            interfaces = self.sniffer.get_network_interfaces()
-            self.iface_stats_table.setRowCount(len(interfaces))
-            
-            for row, iface in enumerate(interfaces):
-                self.iface_stats_table.setItem(row, 0, QTableWidgetItem(iface['friendly_name']))
-                self.iface_stats_table.setItem(row, 1, QTableWidgetItem(iface['status']))
-                self.iface_stats_table.setItem(row, 2, QTableWidgetItem(iface['ip']))
-                self.iface_stats_table.setItem(row, 3, QTableWidgetItem(iface['mac']))
-                
-                # Get interface speed if available
-                speed = "N/A"
-                if 'speed' in iface and iface['speed']:
-                    speed = f"{iface['speed']} Mbps"
-                self.iface_stats_table.setItem(row, 4, QTableWidgetItem(speed))
+            # Update interface statistics table; enumerating interfaces is
+            # slow (WMI on Windows), so it is done at most every few seconds
+            now = time.monotonic()
+            if now - getattr(self, '_iface_stats_time', 0.0) >= 5.0:
+                self._iface_stats_time = now
+                rows = []
+                for iface in self.sniffer.get_network_interfaces():
+                    # Get interface speed if available
+                    speed = "N/A"
+                    if 'speed' in iface and iface['speed']:
+                        speed = f"{iface['speed']} Mbps"
+                    rows.append((iface['friendly_name'], iface['status'], iface['ip'], iface['mac'], speed))
+                sync_table(self.iface_stats_table, rows)
                 
         except Exception as e:
-            print(f"Error updating stats tables: {e}")
+            logger.error(f"Error updating stats tables: {e}", exc_info=True)
+    
+    def update_drop_counts(self):
+        """Show the new-packet queue drop counters in the status bar
+        
+        نمایش شمارنده‌های بسته‌های حذف شده صف در نوار وضعیت
+        """
+        drops = self.sniffer.get_drop_counts()
+        text = " | ".join(f"{self.translator.tr(policy)}: {count}" for policy, count in drops.items())
+        self.drops_label.setText(f"{self.translator.tr('Dropped')}: {text}")
+        
+        # Highlight the counters once anything has been dropped
+        self.drops_label.setStyleSheet("color: red;" if any(drops.values()) else "")
+        
+        # Memory per tier; the disk tier holds packets evicted from memory
+        usage = self.sniffer.memory_usage()
+        total = format_bytes(usage['total'])
+        if usage['budget'] is not None:
+            total += f" / {format_bytes(usage['budget'])}"
+        text = (f"{self.translator.tr('Memory')}: {total} "
+                f"({self.translator.tr('packets')} {format_bytes(usage['hot']['bytes'])}, "
+                f"{self.translator.tr('flows')} {format_bytes(usage['flows'])}, "
+                f"{self.translator.tr('caches')} {format_bytes(usage['caches'] + usage['buffers'])})")
+        disk = usage['disk']
+        if disk['segments']:
+            text += (f" | {self.translator.tr('Disk')}: {format_bytes(disk['bytes'])} "
+                     f"({disk['packets']} {self.translator.tr('packets')})")
+        self.memory_label.setText(text)
+    
+    def update_alerts(self, reload=False):
+        """Append newly raised alerts to the alerts tab
+        
+        افزودن هشدارهای جدید به تب هشدارها
+        
+        Args:
+            reload (bool): Rebuild the whole table, e.g. after a language change
+                           بازسازی کامل جدول، برای مثال پس از تغییر زبان
+        """
+        count = self.sniffer.get_alert_count()
+        if reload or count < self._alerts_seen:
+            self.alerts_table.setRowCount(0)
+            self._alerts_seen = 0
+        if count != self._alerts_seen:
+            alerts = self.sniffer.get_alerts(self._alerts_seen)
+            self._alerts_seen = count
             
-    def update_traffic_graph(self):
-        """Update the traffic graph and protocol distribution
+            first_row = self.alerts_table.rowCount()
+            self.alerts_table.setRowCount(first_row + len(alerts))
+            for row, alert in enumerate(alerts, first_row):
+                values = [
+                    datetime.fromtimestamp(alert['time']).strftime('%H:%M:%S'),
+                    self.translator.tr(alert['kind']),
+                    str(alert['source']),
+                    str(alert['target']),
+                    str(alert['count'])
+                ]
+                for column, value in enumerate(values):
+                    self.alerts_table.setItem(row, column, QTableWidgetItem(value))
+            
+            # Keep as many rows as the detector keeps alerts
+            excess = self.alerts_table.rowCount() - self.sniffer.detector.alerts.maxlen
+            for _ in range(max(excess, 0)):
+                self.alerts_table.removeRow(0)
+            
+            if alerts and not reload:
+                latest = alerts[-1]
+                self.status_bar.showMessage(
+                    f"{self.translator.tr('Alert')}: {self.translator.tr(latest['kind'])} "
+                    f"{latest['source']} -> {latest['target']}", 10000)
+        
+        title = self.translator.tr("Alerts")
+        self.tab_widget.setTabText(4, f"{title} ({count})" if count else title)
+    
+    def update_endpoints(self):
+        """Show the busiest endpoints from the incrementally kept tables
         
-        به‌روزرسانی نمودار ترافیک و توزیع پروتکل‌ها
+        نمایش پرترافیک‌ترین نقاط پایانی از جدول‌های تدریجی
+        """
+        endpoints = self.sniffer.get_top_endpoints(
+            self.endpoints_kind_combo.currentData(), TOP_ROWS, self.endpoints_sort_combo.currentData()
+        )
+        sync_table(self.endpoints_table, [
+            (format_endpoint(entry['key']), str(entry['packets']), format_bytes(entry['bytes']),
+             str(entry['tx_packets']), format_bytes(entry['tx_bytes']),
+             str(entry['rx_packets']), format_bytes(entry['rx_bytes']),
+             f"{entry['duration']:.1f} s", f"{format_bytes(entry['rate'])}/s")
+            for entry in endpoints
+        ])
+    
+    def update_conversations(self):
+        """Show the busiest conversations from the incrementally kept tables
+        
+        نمایش پرترافیک‌ترین مکالمه‌ها از جدول‌های تدریجی
+        """
+        conversations = self.sniffer.get_top_conversations(
+            self.conversations_kind_combo.currentData(), TOP_ROWS, self.conversations_sort_combo.currentData()
+        )
+        sync_table(self.conversations_table, [
+            (format_endpoint(entry['key'][0]), format_endpoint(entry['key'][1]),
+             str(entry['packets']), format_bytes(entry['bytes']),
+             str(entry['ab_packets']), format_bytes(entry['ab_bytes']),
+             str(entry['ba_packets']), format_bytes(entry['ba_bytes']),
+             f"{entry['duration']:.1f} s", f"{format_bytes(entry['rate'])}/s")
+            for entry in conversations
+        ])
+    
+    def update_diagnostics(self):
+        """Update the diagnostics tables with the current pipeline metrics
+        
+        به‌روزرسانی جداول عیب‌یابی با معیارهای فعلی خط لوله
+        """
+        metrics = self.sniffer.metrics()
+        
+        # Counters and gauges
+        rows = [(name, str(value), '') for name, value in metrics['counters'].items()]
+        rows += [(name, str(gauge['value']), str(gauge['max'])) for name, gauge in metrics['gauges'].items()]
+        for subscription in metrics['subscriptions']:
+            name = subscription['name'] or 'subscription'
+            rows.append((f"{name}_lag", str(subscription['lag']), ''))
+            rows.append((f"{name}_drops", str(sum(subscription['drops'].values())), ''))
+        sync_table(self.counters_table, rows)
+        
+        # Latency histograms
+        rows = []
+        for name, hist in metrics['histograms'].items():
+            rows.append((
+                name,
+                str(hist['count']),
+                f"{hist['mean_us']:.1f}",
+                f"{hist['p50_us']:.1f}",
+                f"{hist['p90_us']:.1f}",
+                f"{hist['p99_us']:.1f}",
+                f"{hist['max_us']:.1f}"
+            ))
+        sync_table(self.latency_table, rows)
+        
+        # Dissectors
+        rows = [
+            (name, str(stats['hits']), str(stats['errors']), f"{stats['mean_us']:.1f}")
+            for name, stats in metrics['dissectors'].items()
+        ]
+        sync_table(self.dissectors_table, rows)
+            
+    def sample_traffic(self):
+        """Record the network I/O rate once per second for the traffic graph
+        
+        ثبت نرخ ورودی/خروجی شبکه در هر ثانیه برای نمودار ترافیک
         """
-        # Update traffic graph
         current_time = time.time()
+        if self._last_net_io and current_time - self._last_net_io[0] < 1.0:
+            return
         
         # Get network I/O stats
         net_io = psutil.net_io_counters()
-        bytes_sent = net_io.bytes_sent
-        bytes_recv = net_io.bytes_recv
-        
-        # Update time data (x-axis)
-        self.time_data.append(current_time)
-        
-        # Update data points
-        self.recv_data.append(bytes_recv)
-        self.send_data.append(bytes_sent)
+        sample = (current_time, net_io.bytes_recv, net_io.bytes_sent)
+        previous, self._last_net_io = self._last_net_io, sample
+        if previous is None:
+            self.traffic_start = current_time
+            return
         
-        # Keep only the last max_points data points
-        if len(self.time_data) > self.max_points:
-            self.time_data = self.time_data[-self.max_points:]
-            self.recv_data = self.recv_data[-self.max_points:]
-            self.send_data = self.send_data[-self.max_points:]
+        # Bytes per second since the previous sample
+        elapsed = current_time - previous[0]
+        x = current_time - self.traffic_start
+        self.recv_series.append(x, max(sample[1] - previous[1], 0) / elapsed)
+        self.send_series.append(x, max(sample[2] - previous[2], 0) / elapsed)
+    
+    def redraw_traffic_plot(self):
+        """Draw the visible part of the traffic history at screen resolution
         
-        # Calculate time differences for x-axis
-        time_diffs = [t - self.time_data[0] for t in self.time_data]
+        رسم بخش قابل مشاهده تاریخچه ترافیک با دقت صفحه نمایش
+        """
+        view = self.traffic_plot.getViewBox()
+        pixels = max(int(view.width()), 100)
+        if view.autoRangeEnabled()[0]:
+            start = end = None
+        else:
+            # Include one view width on either side so panning shows data
+            # until the next redraw
+            start, end = view.viewRange()[0]
+            width = end - start
+            start, end = start - width, end + width
+            pixels *= 3
+        for series, curve in ((self.recv_series, self.recv_curve), (self.send_series, self.send_curve)):
+            x, y = series.decimate(start, end, pixels)
+            curve.setData(x, y)
+        self._plotted_traffic_samples = len(self.recv_series)
+    
+    def _on_traffic_range_changed(self, *args):
+        # Zoom and pan: resample for the new range. While auto-ranging the
+        # range only follows the data, which is already drawn in full
+        if not self.traffic_plot.getViewBox().autoRangeEnabled()[0]:
+            self.redraw_traffic_plot()
+    
+    def update_traffic_graph(self):
+        """Update the traffic graph and protocol distribution
         
-        # Update traffic plot
-        self.recv_curve.setData(time_diffs, self.recv_data)
-        self.send_curve.setData(time_diffs, self.send_data)
+        به‌روزرسانی نمودار ترافیک و توزیع پروتکل‌ها
+        """
+        if len(self.recv_series) != self._plotted_traffic_samples:
+            self.redraw_traffic_plot()
         
         # Update protocol distribution
         protocol_counts = self.sniffer.get_protocol_counts()
-        if protocol_counts:
+        if protocol_counts and protocol_counts != self._plotted_protocol_counts:
+            self._plotted_protocol_counts = protocol_counts
             protocols = list(protocol_counts.keys())
             counts = list(protocol_counts.values())
             
@@ -615,15 +1438,76 @@ class NetworkSnifferApp(QMainWindow):
         self.menuBar().actions()[2].setText(self.translator.tr("&Tools"))  # Tools menu
         self.menuBar().actions()[3].setText(self.translator.tr("&Help"))  # Help menu
         
+        # Update file menu
+        self.open_file_action.setText(self.translator.tr("Open &Capture File..."))
+        self.open_session_action.setText(self.translator.tr("&Open Session..."))
+        self.save_session_action.setText(self.translator.tr("&Save Session..."))
+        self.export_action.setText(self.translator.tr("&Export..."))
+        self.geoip_action.setText(self.translator.tr("Load &GeoIP Database..."))
+        
+        # Update tools menu
+        self.search_action.setText(self.translator.tr("Search Payloads..."))
+        
         # Update buttons
         self.start_button.setText(self.translator.tr("Start"))
         self.stop_button.setText(self.translator.tr("Stop"))
         self.clear_button.setText(self.translator.tr("Clear"))
+        self.extra_interfaces_button.setText(self.translator.tr("More Interfaces"))
+        self.extra_interfaces_button.setToolTip(self.translator.tr("Also capture on these interfaces"))
+        
+        self.packet_details.retranslate()
+        
+        # Update packet table headers
+        self.packet_model.set_headers([
+            self.translator.tr("No."),
+            self.translator.tr("Time"),
+            self.translator.tr("Source"),
+            self.translator.tr("Destination"),
+            self.translator.tr("Protocol"),
+            self.translator.tr("Length"),
+            self.translator.tr("Info")
+        ])
         
         # Update tab names
         self.tab_widget.setTabText(0, self.translator.tr("Packets"))
         self.tab_widget.setTabText(1, self.translator.tr("Statistics"))
         self.tab_widget.setTabText(2, self.translator.tr("Graphs"))
+        self.tab_widget.setTabText(3, self.translator.tr("Diagnostics"))
+        self.alerts_table.setHorizontalHeaderLabels([
+            self.translator.tr("Time"),
+            self.translator.tr("Type"),
+            self.translator.tr("Source"),
+            self.translator.tr("Target"),
+            self.translator.tr("Count")
+        ])
+        self.update_alerts(reload=True)
+        self.tab_widget.setTabText(5, self.translator.tr("Endpoints"))
+        self.tab_widget.setTabText(6, self.translator.tr("Conversations"))
+        self.retranslate_top_tables()
+        
+        # Update overflow policy menu
+        self.overflow_menu.setTitle(self.translator.tr("Queue Overflow Policy"))
+        for policy, action in self.overflow_actions.items():
+            action.setText(self.translator.tr(policy))
+        self.update_drop_counts()
+        
+        # Update refresh rate menu
+        self.refresh_menu.setTitle(self.translator.tr("Refresh Rate"))
+        for label, action in self.refresh_actions:
+            action.setText(self.translator.tr(label))
+        
+        # Update sampling menu
+        self.sampling_menu.setTitle(self.translator.tr("Sampling"))
+        for label, action in self.sampling_actions:
+            action.setText(self.translator.tr(label))
+        
+        # Update memory budget menu
+        self.memory_menu.setTitle(self.translator.tr("Memory Budget"))
+        
+        # Update capture length menu
+        self.snaplen_menu.setTitle(self.translator.tr("Capture Length"))
+        for label, action in self.snaplen_actions:
+            action.setText(self.translator.tr(label))
         
         # Update status bar
         if self.sniffer.is_sniffing():
@@ -668,8 +1552,10 @@ class NetworkSnifferApp(QMainWindow):
             
             if reply == QMessageBox.StandardButton.Yes:
                 self.sniffer.stop_sniffing()
+                self.close_capture_file()
                 event.accept()
             else:
                 event.ignore()
         else:
+            self.close_capture_file()
             event.accept()
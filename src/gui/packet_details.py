@@ -0,0 +1,259 @@
+"""
+Packet Detail View
+
+This module contains the pane below the packet table that shows the selected
+packet as a tree of protocol layers and fields next to a hex dump of the
+frame. Selecting a field highlights its bytes in the hex dump, and clicking
+a byte selects the field it belongs to.
+
+ماژول نمای جزئیات بسته
+این ماژول شامل بخشی در زیر جدول بسته‌ها است که بسته انتخاب شده را به صورت درختی
+از لایه‌ها و فیلدهای پروتکل در کنار نمایش هگز فریم نشان می‌دهد. انتخاب یک فیلد
+بایت‌های آن را در نمایش هگز برجسته کرده و کلیک روی یک بایت فیلد مربوط به آن را
+انتخاب می‌کند.
+"""
+
+from PyQt6.QtWidgets import QSplitter, QTreeWidget, QTreeWidgetItem, QPlainTextEdit, QTextEdit
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QFont, QTextCursor, QTextCharFormat
+
+BYTES_PER_LINE = 16
+
+# Hex dump line: "0000  " offset, "xx " per byte, a space, then the ASCII
+# column; every line is padded to the same width so positions are computable
+_HEX_COLUMN = 6
+_ASCII_COLUMN = _HEX_COLUMN + 3 * BYTES_PER_LINE + 1
+_LINE_WIDTH = _ASCII_COLUMN + BYTES_PER_LINE + 1
+
+# Item data role holding (offset, length) of a tree item's bytes
+_RANGE_ROLE = Qt.ItemDataRole.UserRole
+
+
+def hex_dump(data):
+    """Format bytes as a hex dump with an ASCII column
+
+    قالب‌بندی بایت‌ها به صورت نمایش هگز همراه با ستون ASCII
+
+    Args:
+        data (bytes): Bytes to format
+                      بایت‌های مورد قالب‌بندی
+
+    Returns:
+        str: One line per 16 bytes
+             یک خط برای هر ۱۶ بایت
+    """
+    lines = []
+    for start in range(0, len(data), BYTES_PER_LINE):
+        chunk = data[start:start + BYTES_PER_LINE]
+        hex_part = ' '.join(f"{byte:02x}" for byte in chunk)
+        text = ''.join(chr(byte) if 32 <= byte < 127 else '.' for byte in chunk)
+        # Offsets past 0xffff (loopback frames can be larger) take the space
+        lines.append(f"{start:04x}".ljust(_HEX_COLUMN - 1) + f" {hex_part:<{3 * BYTES_PER_LINE}} {text:<{BYTES_PER_LINE}}")
+    return '\n'.join(lines)
+
+
+def hex_dump_ranges(offset, length):
+    """Get the text ranges of a byte range in a hex_dump() text
+
+    دریافت محدوده‌های متنی یک محدوده بایت در متن hex_dump()
+
+    Args:
+        offset (int): First byte
+                      اولین بایت
+        length (int): Number of bytes
+                      تعداد بایت‌ها
+
+    Returns:
+        list: (start, end) character positions, in the hex and ASCII columns
+              of every line the bytes span
+              موقعیت‌های (شروع، پایان) کاراکترها
+    """
+    ranges = []
+    end = offset + length
+    while offset < end:
+        line, column = divmod(offset, BYTES_PER_LINE)
+        count = min(BYTES_PER_LINE - column, end - offset)
+        base = line * _LINE_WIDTH
+        ranges.append((base + _HEX_COLUMN + 3 * column, base + _HEX_COLUMN + 3 * (column + count) - 1))
+        ranges.append((base + _ASCII_COLUMN + column, base + _ASCII_COLUMN + column + count))
+        offset += count
+    return ranges
+
+
+def hex_dump_offset(position):
+    """Get the byte at a character position of a hex_dump() text
+
+    دریافت بایت متناظر با یک موقعیت کاراکتر در متن hex_dump()
+
+    Args:
+        position (int): Character position
+                        موقعیت کاراکتر
+
+    Returns:
+        int: Byte offset, or None outside the hex and ASCII columns
+             موقعیت بایت، یا None خارج از ستون‌های هگز و ASCII
+    """
+    line, column = divmod(position, _LINE_WIDTH)
+    if _HEX_COLUMN <= column < _ASCII_COLUMN - 1:
+        return line * BYTES_PER_LINE + (column - _HEX_COLUMN) // 3
+    if _ASCII_COLUMN <= column < _ASCII_COLUMN + BYTES_PER_LINE:
+        return line * BYTES_PER_LINE + column - _ASCII_COLUMN
+    return None
+
+
+class PacketDetailView(QSplitter):
+    """
+    Layer/field tree of one packet with a synchronized hex dump
+
+    درخت لایه/فیلد یک بسته همراه با نمایش هگز هماهنگ
+    """
+
+    def __init__(self, translator, parent=None):
+        """Initialize the view
+
+        مقداردهی اولیه نما
+
+        Args:
+            translator (Translator): Translator for UI strings
+                                     مترجم رشته‌های رابط کاربری
+            parent (QWidget): Parent widget
+                              ویجت والد
+        """
+        super().__init__(Qt.Orientation.Horizontal, parent)
+        self.translator = translator
+        self._frame_length = 0
+        self._syncing = False
+
+        self.tree = QTreeWidget()
+        self.tree.setColumnCount(2)
+        self.tree.setUniformRowHeights(True)
+        self.tree.currentItemChanged.connect(self._on_item_changed)
+
+        self.hex_view = QPlainTextEdit()
+        self.hex_view.setReadOnly(True)
+        self.hex_view.setLineWrapMode(QPlainTextEdit.LineWrapMode.NoWrap)
+        font = QFont("Monospace")
+        font.setStyleHint(QFont.StyleHint.TypeWriter)
+        self.hex_view.setFont(font)
+        self.hex_view.cursorPositionChanged.connect(self._on_cursor_moved)
+
+        self.addWidget(self.tree)
+        self.addWidget(self.hex_view)
+        self.setStretchFactor(0, 3)
+        self.setStretchFactor(1, 2)
+        self.retranslate()
+
+    def retranslate(self):
+        """Retranslate the column headers
+
+        ترجمه مجدد سرستون‌ها
+        """
+        tr = self.translator.tr
+        self.tree.setHeaderLabels([tr("Field"), tr("Value")])
+
+    def clear(self):
+        """Show no packet
+
+        عدم نمایش هیچ بسته
+        """
+        self._syncing = True
+        self.tree.clear()
+        self.hex_view.clear()
+        self._frame_length = 0
+        self._syncing = False
+
+    def show_details(self, details, info=None):
+        """Show a dissected packet
+
+        نمایش یک بسته تشریح شده
+
+        Args:
+            details (dict): Packet details, as returned by dissect_details()
+                            جزئیات بسته
+            info (dict): Packet information dictionary, for the frame summary
+                         دیکشنری اطلاعات بسته برای خلاصه فریم
+        """
+        tr = self.translator.tr
+        frame = details['frame']
+        self._syncing = True
+        self.tree.clear()
+
+        wire_length = info.get('length', len(frame)) if info else len(frame)
+        frame_item = QTreeWidgetItem([
+            tr("Frame"),
+            f"{wire_length} {tr('bytes on wire')}, {len(frame)} {tr('bytes captured')}"
+        ])
+        frame_item.setData(0, _RANGE_ROLE, (0, len(frame)))
+        self.tree.addTopLevelItem(frame_item)
+
+        for layer in details['layers']:
+            layer_item = QTreeWidgetItem([layer['name'], ''])
+            layer_item.setData(0, _RANGE_ROLE, (layer['offset'], layer['length']))
+            self._add_fields(layer_item, layer['fields'])
+            self.tree.addTopLevelItem(layer_item)
+            layer_item.setExpanded(True)
+
+        self.tree.resizeColumnToContents(0)
+        self.hex_view.setPlainText(hex_dump(frame))
+        self._frame_length = len(frame)
+        self._syncing = False
+
+    def _add_fields(self, parent, fields):
+        for field in fields:
+            item = QTreeWidgetItem([field['name'], field['value']])
+            if field['offset'] is not None and field['length']:
+                item.setData(0, _RANGE_ROLE, (field['offset'], field['length']))
+            if field['children']:
+                self._add_fields(item, field['children'])
+            parent.addChild(item)
+
+    def _highlight(self, offset, length):
+        selections = []
+        color = self.palette().highlight().color()
+        text_color = self.palette().highlightedText().color()
+        for start, end in hex_dump_ranges(offset, min(length, self._frame_length - offset)):
+            selection = QTextEdit.ExtraSelection()
+            cursor = self.hex_view.textCursor()
+            cursor.setPosition(start)
+            cursor.setPosition(end, QTextCursor.MoveMode.KeepAnchor)
+            text_format = QTextCharFormat()
+            text_format.setBackground(color)
+            text_format.setForeground(text_color)
+            selection.cursor = cursor
+            selection.format = text_format
+            selections.append(selection)
+        self.hex_view.setExtraSelections(selections)
+
+    def _on_item_changed(self, current, previous):
+        if self._syncing:
+            return
+        byte_range = current.data(0, _RANGE_ROLE) if current is not None else None
+        if byte_range is None:
+            self.hex_view.setExtraSelections([])
+            return
+        self._highlight(*byte_range)
+
+    def _on_cursor_moved(self):
+        if self._syncing or not self._frame_length:
+            return
+        offset = hex_dump_offset(self.hex_view.textCursor().position())
+        if offset is None or offset >= self._frame_length:
+            return
+        # The smallest range holding the byte is the most specific field
+        best = None
+        best_length = None
+        stack = [self.tree.topLevelItem(index) for index in range(self.tree.topLevelItemCount())]
+        while stack:
+            item = stack.pop()
+            byte_range = item.data(0, _RANGE_ROLE)
+            if byte_range is not None:
+                start, length = byte_range
+                if start <= offset < start + length and (best is None or length < best_length):
+                    best, best_length = item, length
+            stack.extend(item.child(index) for index in range(item.childCount()))
+        if best is not None:
+            self._syncing = True
+            self.tree.setCurrentItem(best)
+            self.tree.scrollToItem(best)
+            self._syncing = False
+            self._highlight(*best.data(0, _RANGE_ROLE))
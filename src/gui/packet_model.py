@@ -0,0 +1,183 @@
+"""
+Packet Table Model
+
+This module contains the Qt item model behind the packet table. Rows keep a
+reference to the captured packet and display strings are only built when
+the view asks for a visible cell. The first rows may come from a lazy source,
+such as an opened session, whose packets are fetched on first display.
+
+ماژول مدل جدول بسته‌ها
+این ماژول شامل مدل Qt پشت جدول بسته‌ها است. هر سطر فقط به بسته ضبط شده اشاره
+می‌کند و رشته‌های نمایشی تنها زمانی ساخته می‌شوند که نما یک خانه قابل مشاهده را
+درخواست کند.
+"""
+
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex
+
+
+class PacketTableModel(QAbstractTableModel):
+    """
+    Table model presenting captured packets with lazily formatted cells
+
+    مدل جدولی برای نمایش بسته‌های ضبط شده با قالب‌بندی تنبل خانه‌ها
+    """
+
+    def __init__(self, formatter, headers, max_rows=100000, parent=None):
+        """Initialize the model
+
+        مقداردهی اولیه مدل
+
+        Args:
+            formatter (callable): Function returning the display strings of a
+                                  packet (time, source, destination, protocol,
+                                  length, info)
+                                  تابعی که رشته‌های نمایشی یک بسته را برمی‌گرداند
+            headers (list): Column header labels
+                            برچسب‌های سرستون‌ها
+            max_rows (int): Maximum number of rows kept; the oldest rows are
+                            removed first
+                            حداکثر تعداد سطرهای نگه‌داشته شده
+            parent (QObject): Parent object
+                              شیء والد
+        """
+        super().__init__(parent)
+        self.formatter = formatter
+        self.headers = list(headers)
+        self.max_rows = max_rows
+        self._packets = []
+        self._first_number = 1
+        # Rows before the appended packets, fetched on demand
+        self._source = None
+        self._source_rows = 0
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._source_rows + len(self._packets)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.headers)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole or not index.isValid():
+            return None
+        row = index.row()
+        column = index.column()
+        if column == 0:
+            return str(self._first_number + row)
+        packet = self.packet_at(row)
+        if packet is None:
+            return None
+        return self.formatter(packet)[column - 1]
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.headers[section]
+        return super().headerData(section, orientation, role)
+
+    def set_headers(self, headers):
+        """Replace the column header labels
+
+        جایگزینی برچسب‌های سرستون‌ها
+
+        Args:
+            headers (list): Column header labels
+                            برچسب‌های سرستون‌ها
+        """
+        self.headers = list(headers)
+        self.headerDataChanged.emit(Qt.Orientation.Horizontal, 0, len(self.headers) - 1)
+
+    def append_packets(self, packets):
+        """Append packets at the end of the table
+
+        افزودن بسته‌ها به انتهای جدول
+
+        Args:
+            packets (list): Packet information dictionaries
+                            دیکشنری‌های اطلاعات بسته‌ها
+        """
+        if not packets:
+            return
+
+        first = self.rowCount()
+        self.beginInsertRows(QModelIndex(), first, first + len(packets) - 1)
+        self._packets.extend(packets)
+        self.endInsertRows()
+
+        # Trim in batches so removing from the front stays cheap; the source
+        # rows are older than any appended packet and go first
+        excess = len(self._packets) - self.max_rows
+        if excess > self.max_rows // 10:
+            removed = self._source_rows + excess
+            self.beginRemoveRows(QModelIndex(), 0, removed - 1)
+            del self._packets[:excess]
+            self._source = None
+            self._source_rows = 0
+            self._first_number += removed
+            self.endRemoveRows()
+
+    def set_source(self, rows, fetch):
+        """Show rows fetched on demand, replacing all rows
+
+        Packets appended afterwards are shown after these rows.
+
+        نمایش سطرهایی که در صورت نیاز دریافت می‌شوند به جای تمام سطرها
+
+        Args:
+            rows (int): Number of rows
+                        تعداد سطرها
+            fetch (callable): Called with a row index, returns the packet
+                              information dictionary or None
+                              تابعی که با اندیس سطر فراخوانی شده و بسته را برمی‌گرداند
+        """
+        self.beginResetModel()
+        self._packets = []
+        self._first_number = 1
+        self._source = fetch
+        self._source_rows = rows
+        self.endResetModel()
+
+    def extend_source(self, rows):
+        """Show more rows of the lazy source, e.g. as a file is indexed
+
+        نمایش سطرهای بیشتری از منبع تنبل، برای مثال هنگام فهرست‌سازی یک فایل
+
+        Args:
+            rows (int): New number of source rows
+                        تعداد جدید سطرهای منبع
+        """
+        if self._source is None or rows <= self._source_rows:
+            return
+        self.beginInsertRows(QModelIndex(), self._source_rows, rows - 1)
+        self._source_rows = rows
+        self.endInsertRows()
+
+    def packet_at(self, row):
+        """Get the packet shown in a row
+
+        دریافت بسته نمایش داده شده در یک سطر
+
+        Args:
+            row (int): Row index
+                       اندیس سطر
+
+        Returns:
+            dict: Packet information dictionary, or None for an invalid row
+                  دیکشنری اطلاعات بسته، یا None برای سطر نامعتبر
+        """
+        if 0 <= row < self._source_rows:
+            return self._source(row)
+        row -= self._source_rows
+        if 0 <= row < len(self._packets):
+            return self._packets[row]
+        return None
+
+    def clear(self):
+        """Remove all rows
+
+        حذف تمام سطرها
+        """
+        self.beginResetModel()
+        self._packets = []
+        self._first_number = 1
+        self._source = None
+        self._source_rows = 0
+        self.endResetModel()
@@ -0,0 +1,192 @@
+"""
+GUI Refresh Scheduler
+
+This module contains the single timer that drives all periodic GUI updates.
+On every tick it runs the handful of cheap callbacks that must always run and
+then refreshes only the tab that is currently visible. The tick interval
+follows the selected refresh mode and stretches automatically when refreshes
+get expensive.
+
+ماژول زمان‌بند به‌روزرسانی رابط کاربری
+این ماژول شامل تنها تایمری است که تمام به‌روزرسانی‌های دوره‌ای رابط کاربری را
+اجرا می‌کند. در هر تیک، چند فراخوانی کم‌هزینه ضروری اجرا شده و سپس فقط تب
+قابل مشاهده به‌روزرسانی می‌شود. فاصله تیک‌ها بر اساس حالت انتخاب شده تعیین
+شده و در صورت پرهزینه شدن به‌روزرسانی‌ها به طور خودکار افزایش می‌یابد.
+"""
+
+import logging
+import time
+
+from PyQt6.QtCore import QObject, QTimer
+from PyQt6.QtWidgets import QTableWidgetItem
+
+logger = logging.getLogger(__name__)
+
+# Refresh modes and their base intervals in milliseconds
+# حالت‌های به‌روزرسانی و فاصله پایه آن‌ها بر حسب میلی‌ثانیه
+REFRESH_INTERACTIVE = 'interactive'
+REFRESH_NORMAL = 'normal'
+REFRESH_LOW_CPU = 'low-cpu'
+
+REFRESH_INTERVALS = {
+    REFRESH_INTERACTIVE: 250,
+    REFRESH_NORMAL: 1000,
+    REFRESH_LOW_CPU: 3000
+}
+
+
+def sync_table(table, rows):
+    """Update a QTableWidget so it shows ``rows``, touching only changed cells
+
+    به‌روزرسانی یک QTableWidget برای نمایش ``rows`` با تغییر فقط خانه‌های تغییر یافته
+
+    Args:
+        table (QTableWidget): The table to update
+                              جدولی که باید به‌روزرسانی شود
+        rows (list): List of rows, each a sequence of cell strings
+                     لیستی از سطرها که هر کدام دنباله‌ای از رشته‌های خانه‌ها است
+    """
+    if table.rowCount() != len(rows):
+        table.setRowCount(len(rows))
+
+    for row, values in enumerate(rows):
+        for column, value in enumerate(values):
+            item = table.item(row, column)
+            if item is None:
+                table.setItem(row, column, QTableWidgetItem(value))
+            elif item.text() != value:
+                item.setText(value)
+
+
+class RefreshScheduler(QObject):
+    """
+    Single, visibility-aware and load-adaptive refresh timer
+
+    تایمر واحد به‌روزرسانی با آگاهی از تب قابل مشاهده و تطبیق با بار
+    """
+
+    def __init__(self, tab_widget, mode=REFRESH_NORMAL, budget=0.2, on_refresh=None, parent=None):
+        """Initialize the scheduler
+
+        مقداردهی اولیه زمان‌بند
+
+        Args:
+            tab_widget (QTabWidget): Tab widget whose current tab is refreshed
+                                     ویجت تبی که تب جاری آن به‌روزرسانی می‌شود
+            mode (str): Initial refresh mode
+                        حالت اولیه به‌روزرسانی
+            budget (float): Fraction of the interval a refresh may take before
+                            the interval is stretched
+                            سهم مجاز زمان به‌روزرسانی از فاصله تیک‌ها
+            on_refresh (callable): Called with the duration of every refresh in nanoseconds
+                                   تابعی که با مدت زمان هر به‌روزرسانی فراخوانی می‌شود
+            parent (QObject): Parent object
+                              شیء والد
+        """
+        super().__init__(parent)
+        self.tab_widget = tab_widget
+        self.budget = budget
+        self.on_refresh = on_refresh
+        self._always = []
+        self._views = {}
+        self.mode = mode
+        self.base_interval = REFRESH_INTERVALS[mode]
+
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.refresh)
+        self.tab_widget.currentChanged.connect(lambda index: self.refresh())
+
+    @property
+    def interval(self):
+        """Current tick interval in milliseconds
+
+        فاصله فعلی تیک‌ها بر حسب میلی‌ثانیه
+        """
+        return self.timer.interval()
+
+    def add_always(self, callback):
+        """Register a callback that runs on every tick
+
+        ثبت تابعی که در هر تیک اجرا می‌شود
+
+        Args:
+            callback (callable): Callback without arguments
+                                 تابع بدون آرگومان
+        """
+        self._always.append(callback)
+
+    def add_view(self, widget, callback):
+        """Register the refresh callback of a tab
+
+        ثبت تابع به‌روزرسانی یک تب
+
+        Args:
+            widget (QWidget): The tab page
+                              صفحه تب
+            callback (callable): Callback without arguments
+                                 تابع بدون آرگومان
+        """
+        self._views[widget] = callback
+
+    def set_mode(self, mode):
+        """Change the refresh mode
+
+        تغییر حالت به‌روزرسانی
+
+        Args:
+            mode (str): REFRESH_INTERACTIVE, REFRESH_NORMAL or REFRESH_LOW_CPU
+                        حالت به‌روزرسانی
+        """
+        if mode not in REFRESH_INTERVALS:
+            raise ValueError(f"Unknown refresh mode: {mode}")
+        self.mode = mode
+        self.base_interval = REFRESH_INTERVALS[mode]
+        self.timer.setInterval(self.base_interval)
+
+    def start(self):
+        """Start the timer
+
+        شروع تایمر
+        """
+        self.timer.start(self.base_interval)
+
+    def stop(self):
+        """Stop the timer
+
+        توقف تایمر
+        """
+        self.timer.stop()
+
+    def refresh(self):
+        """Run the always-on callbacks and refresh the visible tab
+
+        اجرای فراخوانی‌های همیشگی و به‌روزرسانی تب قابل مشاهده
+        """
+        start = time.perf_counter_ns()
+        for callback in self._always:
+            self._run(callback)
+        callback = self._views.get(self.tab_widget.currentWidget())
+        if callback is not None:
+            self._run(callback)
+        duration = time.perf_counter_ns() - start
+
+        if self.on_refresh is not None:
+            self.on_refresh(duration)
+        self._adapt(duration / 1e6)
+
+    def _run(self, callback):
+        try:
+            callback()
+        except Exception as e:
+            logger.error(f"Error in refresh callback {getattr(callback, '__name__', callback)}: {e}",
+                         exc_info=True)
+
+    def _adapt(self, duration_ms):
+        # Back off while refreshes eat more than the budget, recover when cheap
+        interval = self.timer.interval()
+        if duration_ms > interval * self.budget:
+            interval = min(int(interval * 1.5), self.base_interval * 4)
+        elif duration_ms < interval * self.budget / 4 and interval > self.base_interval:
+            interval = max(int(interval / 1.5), self.base_interval)
+        if interval != self.timer.interval():
+            self.timer.setInterval(interval)
@@ -0,0 +1,180 @@
+"""
+Payload Search Dialog
+
+This module contains the dialog used to search captured packet bytes for a
+list of patterns. The search runs in a background worker; the dialog polls
+it for progress and new matches and can cancel it at any time.
+
+ماژول پنجره جستجوی محتوای بسته‌ها
+این ماژول شامل پنجره‌ای برای جستجوی فهرستی از الگوها در بایت‌های بسته‌های ضبط شده
+است. جستجو در یک نخ پس‌زمینه اجرا شده و پنجره به صورت دوره‌ای پیشرفت و تطابق‌های
+جدید را دریافت می‌کند و هر زمان می‌تواند آن را لغو کند.
+"""
+
+from PyQt6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QPlainTextEdit, QPushButton, QProgressBar,
+    QTableWidget, QTableWidgetItem, QHeaderView, QLabel, QMessageBox
+)
+from PyQt6.QtCore import QTimer
+
+from ..network.search import parse_patterns
+
+
+class PayloadSearchDialog(QDialog):
+    """
+    Dialog for multi-pattern search over captured packet bytes
+
+    پنجره جستجوی چندالگویی در بایت‌های بسته‌های ضبط شده
+    """
+
+    POLL_INTERVAL = 100
+    ROWS_PER_POLL = 2000
+
+    def __init__(self, sniffer, translator, parent=None):
+        """Initialize the dialog
+
+        مقداردهی اولیه پنجره
+
+        Args:
+            sniffer (NetworkSniffer): Sniffer whose stored packets are searched
+                                      اسنیفری که بسته‌های ذخیره شده آن جستجو می‌شود
+            translator (Translator): Translator for UI strings
+                                     مترجم رشته‌های رابط کاربری
+            parent (QWidget): Parent widget
+                              ویجت والد
+        """
+        super().__init__(parent)
+        self.sniffer = sniffer
+        self.translator = translator
+        self.search = None
+        self._shown_matches = 0
+
+        tr = self.translator.tr
+        self.setWindowTitle(tr("Search Payloads"))
+        self.resize(700, 500)
+        layout = QVBoxLayout(self)
+
+        layout.addWidget(QLabel(tr("Patterns (one per line, prefix byte sequences with hex:)")))
+        self.patterns_edit = QPlainTextEdit()
+        self.patterns_edit.setPlaceholderText("evil.example.com\nhex:de ad be ef")
+        layout.addWidget(self.patterns_edit)
+
+        controls = QHBoxLayout()
+        self.search_button = QPushButton(tr("Search"))
+        self.search_button.clicked.connect(self.start_search)
+        self.cancel_button = QPushButton(tr("Cancel"))
+        self.cancel_button.setEnabled(False)
+        self.cancel_button.clicked.connect(self.cancel_search)
+        self.progress_bar = QProgressBar()
+        self.status_label = QLabel()
+        controls.addWidget(self.search_button)
+        controls.addWidget(self.cancel_button)
+        controls.addWidget(self.progress_bar)
+        layout.addLayout(controls)
+        layout.addWidget(self.status_label)
+
+        self.results_table = QTableWidget(0, 6)
+        self.results_table.setHorizontalHeaderLabels([
+            tr("Packet"), tr("Time"), tr("Source"), tr("Destination"), tr("Pattern"), tr("Offset")
+        ])
+        self.results_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.results_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        layout.addWidget(self.results_table)
+
+        self.poll_timer = QTimer(self)
+        self.poll_timer.timeout.connect(self.poll)
+
+    def start_search(self):
+        """Compile the patterns and start a new search
+
+        کامپایل الگوها و شروع جستجوی جدید
+        """
+        try:
+            patterns = parse_patterns(self.patterns_edit.toPlainText())
+        except ValueError as e:
+            QMessageBox.warning(self, self.translator.tr("Error"), f"{self.translator.tr('Invalid pattern:')} {e}")
+            return
+        if not patterns:
+            return
+
+        self.cancel_search()
+        self.results_table.setRowCount(0)
+        self._shown_matches = 0
+        self.search = self.sniffer.search_payloads(patterns)
+        self.progress_bar.setRange(0, max(self.search.total, 1))
+        self.progress_bar.setValue(0)
+        self.search_button.setEnabled(False)
+        self.cancel_button.setEnabled(True)
+        self.poll_timer.start(self.POLL_INTERVAL)
+
+    def cancel_search(self):
+        """Cancel the running search
+
+        لغو جستجوی در حال اجرا
+        """
+        if self.search is not None and not self.search.is_done():
+            self.search.cancel()
+
+    def poll(self):
+        """Show progress and matches found since the last poll
+
+        نمایش پیشرفت و تطابق‌های یافت شده از آخرین بررسی
+        """
+        search = self.search
+        if search is None:
+            return
+
+        done = search.is_done()
+        self.progress_bar.setValue(search.scanned)
+        new_matches = search.matches[self._shown_matches:self._shown_matches + self.ROWS_PER_POLL]
+        if new_matches:
+            self._append_matches(new_matches)
+        self._shown_matches += len(new_matches)
+
+        tr = self.translator.tr
+        status = f"{tr('Matches')}: {self._shown_matches}  |  {tr('Scanned')}: {search.scanned}/{search.total}"
+        if search.truncated:
+            status += f"  |  {tr('Match limit reached')}"
+        if done and search.cancelled:
+            status += f"  |  {tr('Cancelled')}"
+        if search.error is not None:
+            status += f"  |  {tr('Error')}: {search.error}"
+        self.status_label.setText(status)
+
+        if done and self._shown_matches == len(search.matches):
+            self.poll_timer.stop()
+            self.search_button.setEnabled(True)
+            self.cancel_button.setEnabled(False)
+
+    def _append_matches(self, matches):
+        patterns = self.search.patterns
+        first_row = self.results_table.rowCount()
+        self.results_table.setRowCount(first_row + len(matches))
+        for row, match in enumerate(matches, first_row):
+            pattern = patterns[match['pattern']]
+            try:
+                pattern_text = pattern.decode('utf-8')
+            except UnicodeDecodeError:
+                pattern_text = 'hex:' + pattern.hex(' ')
+            # Packets of an opened session are dissected only when matched
+            packet = match['packet'] or self.sniffer.get_packet(match['seq'])
+            time_text, source, destination = self.sniffer.format_packet(packet)[:3]
+            values = [
+                str(match['seq'] + 1),
+                time_text,
+                source,
+                destination,
+                pattern_text,
+                str(match['offset'])
+            ]
+            for column, value in enumerate(values):
+                self.results_table.setItem(row, column, QTableWidgetItem(value))
+
+    def closeEvent(self, event):
+        """Cancel any running search when the dialog is closed
+
+        لغو جستجوی در حال اجرا هنگام بستن پنجره
+        """
+        self.cancel_search()
+        self.poll_timer.stop()
+        super().closeEvent(event)
@@ -0,0 +1,415 @@
+"""
+Capture File Index
+
+This module opens pcap and pcapng files of any size without loading them.
+A background thread reads the file once, in large blocks, and records only
+where every packet starts (about 10 bytes per packet), with progress
+reporting and cancellation. Packets that are already indexed can be read at
+any time by seeking to them, and recently dissected packets are kept in an
+LRU cache so scrolling back and forth costs nothing.
+
+ماژول فهرست فایل ضبط
+این ماژول فایل‌های pcap و pcapng با هر اندازه‌ای را بدون بارگذاری کامل باز می‌کند.
+یک نخ پس‌زمینه فایل را یک بار در بلوک‌های بزرگ می‌خواند و فقط محل شروع هر بسته
+(حدود ۱۰ بایت برای هر بسته) را با گزارش پیشرفت و امکان لغو ثبت می‌کند. بسته‌های
+فهرست شده در هر زمان با پرش به محل آن‌ها خوانده می‌شوند و بسته‌های اخیراً تشریح
+شده در یک حافظه نهان LRU نگه‌داری می‌شوند.
+"""
+
+import logging
+import os
+import struct
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BLOCK_SIZE = 4 * 1024 * 1024
+DEFAULT_CACHE_SIZE = 4096
+
+FORMAT_PCAP = 'pcap'
+FORMAT_PCAPNG = 'pcapng'
+
+# Classic pcap magic numbers: (byte order, timestamp units per second)
+# اعداد جادویی pcap کلاسیک
+_PCAP_MAGICS = {
+    b'\xd4\xc3\xb2\xa1': ('<', 1e6),
+    b'\xa1\xb2\xc3\xd4': ('>', 1e6),
+    b'\x4d\x3c\xb2\xa1': ('<', 1e9),
+    b'\xa1\xb2\x3c\x4d': ('>', 1e9)
+}
+_PCAP_HEADER_SIZE = 24
+_PCAP_RECORD_SIZE = 16
+
+# pcapng block types
+_SHB = 0x0A0D0D0A
+_IDB = 0x00000001
+_OPB = 0x00000002
+_SPB = 0x00000003
+_EPB = 0x00000006
+_BYTE_ORDER_MAGIC = 0x1A2B3C4D
+_OPTION_TSRESOL = 9
+
+_INITIAL_PACKETS = 65536
+
+
+def _parse_tsresol(options, order):
+    # Walk the IDB options for if_tsresol; microseconds when absent
+    position = 0
+    while position + 4 <= len(options):
+        code, length = struct.unpack_from(order + 'HH', options, position)
+        if code == 0:
+            break
+        if code == _OPTION_TSRESOL and length >= 1:
+            value = options[position + 4]
+            return float(2 ** (value & 0x7F)) if value & 0x80 else float(10 ** value)
+        position += 4 + ((length + 3) & ~3)
+    return 1e6
+
+
+class CaptureFileIndex:
+    """
+    Packet offset index over a pcap/pcapng file, built in the background
+
+    فهرست محل بسته‌ها در یک فایل pcap/pcapng که در پس‌زمینه ساخته می‌شود
+    """
+
+    def __init__(self, path, dissect=None, cache_size=DEFAULT_CACHE_SIZE, block_size=DEFAULT_BLOCK_SIZE,
+                 progress=None):
+        """Open a capture file; call start() to index it
+
+        باز کردن یک فایل ضبط؛ برای فهرست‌سازی start() را فراخوانی کنید
+
+        Args:
+            path (str): pcap or pcapng file
+                        فایل pcap یا pcapng
+            dissect (callable): Called with (index, record) to turn a record
+                                returned by read() into a packet dictionary;
+                                its results are cached by packet()
+                                تابع تبدیل یک رکورد به دیکشنری بسته
+            cache_size (int): Dissected packets kept by packet()
+                              تعداد بسته‌های تشریح شده نگه‌داشته شده
+            block_size (int): Bytes read at a time while indexing
+                              تعداد بایت‌های خوانده شده در هر نوبت فهرست‌سازی
+            progress (callable): Called from the indexing thread with
+                                 (packets, bytes indexed, file size) after
+                                 every block
+                                 تابعی که پس از هر بلوک با (بسته‌ها، بایت‌ها، اندازه فایل) فراخوانی می‌شود
+
+        Raises:
+            ValueError: If the file is neither pcap nor pcapng
+                        در صورتی که فایل pcap یا pcapng نباشد
+            OSError: If the file cannot be read
+                     در صورت عدم امکان خواندن فایل
+        """
+        self.path = path
+        self.dissect = dissect
+        self.cache_size = cache_size
+        self.block_size = block_size
+        self.progress = progress
+        self.size = os.path.getsize(path)
+
+        self._file = open(path, 'rb')
+        head = self._file.read(_PCAP_HEADER_SIZE)
+        if head[:4] in _PCAP_MAGICS:
+            self.format = FORMAT_PCAP
+            self._order, self._pcap_resolution = _PCAP_MAGICS[head[:4]]
+            if len(head) < _PCAP_HEADER_SIZE:
+                self._file.close()
+                raise ValueError(f"{path} is truncated")
+            linktype = struct.unpack_from(self._order + 'I', head, 20)[0] & 0xFFFF
+            # (link type, timestamp units per second, byte order) per interface
+            self._interfaces = [(linktype, self._pcap_resolution, self._order)]
+        elif len(head) >= 12 and struct.unpack_from('<I', head)[0] == _SHB:
+            self.format = FORMAT_PCAPNG
+            self._interfaces = []
+        else:
+            self._file.close()
+            raise ValueError(f"{path} is not a pcap or pcapng file")
+
+        # Per packet: offset of its record or block, and its interface
+        self._offsets = np.empty(_INITIAL_PACKETS, dtype=np.uint64)
+        self._interface_ids = np.empty(_INITIAL_PACKETS, dtype=np.uint16)
+        self.count = 0
+        self.bytes_indexed = 0
+        self.error = None
+
+        self._lock = threading.Lock()
+        self._read_lock = threading.Lock()
+        self._cache = OrderedDict()
+        self._cancel = threading.Event()
+        self._done = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Start indexing in a background thread
+
+        شروع فهرست‌سازی در یک نخ پس‌زمینه
+
+        Returns:
+            CaptureFileIndex: This index, for chaining
+                              همین فهرست
+        """
+        self._thread = threading.Thread(target=self.run, name='capture-file-index', daemon=True)
+        self._thread.start()
+        return self
+
+    def run(self):
+        """Index the whole file in the calling thread
+
+        فهرست‌سازی کل فایل در نخ فراخوانی کننده
+        """
+        try:
+            with open(self.path, 'rb') as f:
+                if self.format == FORMAT_PCAP:
+                    self._index_pcap(f)
+                else:
+                    self._index_pcapng(f)
+        except Exception as e:
+            self.error = e
+            logger.error(f"Indexing {self.path} failed: {e}", exc_info=True)
+        finally:
+            self._report()
+            self._done.set()
+            logger.info(f"Indexed {self.count} packets of {self.path}")
+
+    def _blocks(self, f, start):
+        # Yields (buffer, file offset of the buffer); the consumer sends back
+        # how many bytes it used and the rest is carried over to the next one
+        f.seek(start)
+        offset = start
+        carry = b''
+        while not self._cancel.is_set():
+            data = f.read(self.block_size)
+            if not data:
+                return
+            buffer = carry + data if carry else data
+            used = yield buffer, offset
+            carry = buffer[used:]
+            offset += used
+            self.bytes_indexed = offset
+            self._report()
+
+    def _report(self):
+        if self.progress is not None:
+            self.progress(self.count, self.bytes_indexed, self.size)
+
+    def _append(self, offsets, interface_ids):
+        # Publish a block of indexed packets
+        count = len(offsets)
+        if not count:
+            return
+        with self._lock:
+            end = self.count + count
+            if end > len(self._offsets):
+                allocated = max(end, 2 * len(self._offsets))
+                self._offsets = np.resize(self._offsets, allocated)
+                self._interface_ids = np.resize(self._interface_ids, allocated)
+            self._offsets[self.count:end] = offsets
+            self._interface_ids[self.count:end] = interface_ids
+            self.count = end
+
+    def _index_pcap(self, f):
+        unpack_length = struct.Struct(self._order + 'I').unpack_from
+        blocks = self._blocks(f, _PCAP_HEADER_SIZE)
+        try:
+            buffer, base = next(blocks)
+            while True:
+                offsets = []
+                position = 0
+                end = len(buffer)
+                while position + _PCAP_RECORD_SIZE <= end:
+                    record_end = position + _PCAP_RECORD_SIZE + unpack_length(buffer, position + 8)[0]
+                    if record_end > end:
+                        break
+                    offsets.append(base + position)
+                    position = record_end
+                self._append(offsets, 0)
+                buffer, base = blocks.send(position)
+        except StopIteration:
+            pass
+
+    def _index_pcapng(self, f):
+        order = '<'
+        unpack_header = struct.Struct(order + 'II').unpack_from
+        unpack_u32 = struct.Struct(order + 'I').unpack_from
+        first_interface = 0
+        blocks = self._blocks(f, 0)
+        try:
+            buffer, base = next(blocks)
+            while True:
+                offsets = []
+                interface_ids = []
+                position = 0
+                end = len(buffer)
+                while position + 12 <= end:
+                    block_type, block_length = unpack_header(buffer, position)
+                    if block_type == _SHB:
+                        # A new section may switch the byte order; its
+                        # interfaces are numbered after the earlier ones
+                        magic = struct.unpack_from('<I', buffer, position + 8)[0]
+                        new_order = '<' if magic == _BYTE_ORDER_MAGIC else '>'
+                        block_length = struct.unpack_from(new_order + 'I', buffer, position + 4)[0]
+                        if new_order != order:
+                            order = new_order
+                            unpack_header = struct.Struct(order + 'II').unpack_from
+                            unpack_u32 = struct.Struct(order + 'I').unpack_from
+                        first_interface = len(self._interfaces)
+                    if block_length < 12:
+                        raise ValueError(f"Corrupt pcapng block at offset {base + position}")
+                    if position + block_length > end:
+                        break
+                    if block_type == _EPB:
+                        offsets.append(base + position)
+                        interface_ids.append(first_interface + unpack_u32(buffer, position + 8)[0])
+                    elif block_type == _SPB:
+                        offsets.append(base + position)
+                        interface_ids.append(first_interface)
+                    elif block_type == _OPB:
+                        offsets.append(base + position)
+                        interface_ids.append(first_interface + struct.unpack_from(order + 'H', buffer, position + 8)[0])
+                    elif block_type == _IDB:
+                        linktype = struct.unpack_from(order + 'H', buffer, position + 8)[0]
+                        options = buffer[position + 16:position + block_length - 4]
+                        self._interfaces.append((linktype, _parse_tsresol(options, order), order))
+                    position += block_length
+                self._append(offsets, interface_ids)
+                buffer, base = blocks.send(position)
+        except StopIteration:
+            pass
+
+    def cancel(self):
+        """Stop indexing after the current block; indexed packets stay readable
+
+        توقف فهرست‌سازی پس از بلوک جاری؛ بسته‌های فهرست شده قابل خواندن می‌مانند
+        """
+        self._cancel.set()
+
+    @property
+    def cancelled(self):
+        """Whether cancellation was requested
+
+        آیا لغو درخواست شده است
+        """
+        return self._cancel.is_set()
+
+    def is_done(self):
+        """Check whether indexing has finished, was cancelled or failed
+
+        بررسی پایان، لغو یا شکست فهرست‌سازی
+        """
+        return self._done.is_set()
+
+    def wait(self, timeout=None):
+        """Wait for indexing to finish
+
+        انتظار برای پایان فهرست‌سازی
+
+        Args:
+            timeout (float): Maximum seconds to wait, or None
+                             حداکثر مدت انتظار بر حسب ثانیه
+
+        Returns:
+            bool: True if indexing has finished
+                  در صورت پایان فهرست‌سازی True
+        """
+        return self._done.wait(timeout)
+
+    def __len__(self):
+        return self.count
+
+    def read(self, index):
+        """Read one indexed packet from the file
+
+        خواندن یک بسته فهرست شده از فایل
+
+        Args:
+            index (int): Packet index, below ``count``
+                         اندیس بسته
+
+        Returns:
+            dict: Record with ``timestamp``, ``linktype``, ``interface``
+                  (interface number in the file), ``data`` (captured bytes) and
+                  ``length`` (original length)
+                  رکورد شامل زمان، نوع لایه پیوند، رابط، بایت‌های ضبط شده و طول اصلی
+
+        Raises:
+            IndexError: If the packet is not indexed (yet)
+                        در صورتی که بسته (هنوز) فهرست نشده باشد
+        """
+        with self._lock:
+            if not 0 <= index < self.count:
+                raise IndexError(f"Packet {index} is not indexed")
+            offset = int(self._offsets[index])
+            interface = int(self._interface_ids[index])
+        linktype, resolution, order = self._interfaces[interface]
+        with self._read_lock:
+            f = self._file
+            f.seek(offset)
+            if self.format == FORMAT_PCAP:
+                seconds, fraction, captured, length = struct.unpack(order + 'IIII', f.read(_PCAP_RECORD_SIZE))
+                data = f.read(captured)
+                timestamp = seconds + fraction / resolution
+            else:
+                block_type, block_length = struct.unpack(order + 'II', f.read(8))
+                body = f.read(block_length - 12)
+                if block_type == _SPB:
+                    length = struct.unpack_from(order + 'I', body)[0]
+                    data = body[4:4 + length]
+                    # Simple packet blocks carry no timestamp
+                    timestamp = 0.0
+                else:
+                    # Enhanced and obsolete packet blocks share this layout
+                    high, low, captured, length = struct.unpack_from(order + 'IIII', body, 4)
+                    data = body[20:20 + captured]
+                    timestamp = ((high << 32) | low) / resolution
+        return {
+            'timestamp': timestamp,
+            'linktype': linktype,
+            'interface': interface,
+            'data': data,
+            'length': length
+        }
+
+    def packet(self, index):
+        """Get a dissected packet, from the cache when possible
+
+        دریافت یک بسته تشریح شده، در صورت امکان از حافظه نهان
+
+        Args:
+            index (int): Packet index
+                         اندیس بسته
+
+        Returns:
+            dict: Packet information dictionary made by ``dissect``, or None
+                  if the packet is not indexed
+                  دیکشنری اطلاعات بسته، یا None اگر بسته فهرست نشده باشد
+        """
+        cache = self._cache
+        with self._read_lock:
+            info = cache.get(index)
+            if info is not None:
+                cache.move_to_end(index)
+                return info
+        if not 0 <= index < self.count:
+            return None
+        info = self.dissect(index, self.read(index))
+        with self._read_lock:
+            cache[index] = info
+            if len(cache) > self.cache_size:
+                cache.popitem(last=False)
+        return info
+
+    def close(self):
+        """Stop indexing and close the file
+
+        توقف فهرست‌سازی و بستن فایل
+        """
+        self.cancel()
+        if self._thread is not None:
+            self._thread.join()
+        with self._read_lock:
+            self._file.close()
+            self._cache.clear()
@@ -0,0 +1,400 @@
+"""
+Application Protocol Classification
+
+This module names the application protocol of TCP and UDP flows (TLS, SSH,
+QUIC, HTTP, ...) from payload signatures and well-known ports. Only the
+first few packets of a flow are inspected; the verdict is then kept in a
+bounded, flow-keyed LRU table, so every later packet of the flow costs a
+single table lookup.
+
+ماژول طبقه‌بندی پروتکل‌های کاربردی
+این ماژول پروتکل کاربردی جریان‌های TCP و UDP (TLS، SSH، QUIC، HTTP و ...) را از
+روی امضای محتوا و پورت‌های شناخته شده تعیین می‌کند. فقط چند بسته اول هر جریان
+بررسی شده و نتیجه در یک جدول LRU محدود با کلید جریان نگه‌داشته می‌شود، بنابراین
+هزینه هر بسته بعدی جریان تنها یک جستجو در جدول است.
+"""
+
+from collections import OrderedDict
+
+from scapy.layers.inet import TCP, UDP
+from scapy.packet import NoPayload, Padding
+
+TRANSPORTS = {6: 'TCP', 17: 'UDP'}
+
+_TRANSPORT_LAYERS = {'TCP': TCP, 'UDP': UDP}
+
+# Memory of one tracked flow (key and table entry), measured with
+# tracemalloc; its state is a small int or a shared verdict string
+_FLOW_STATE_BYTES = 190
+
+# Server ports of well-known services, per transport
+# پورت‌های سرویس‌های شناخته شده به تفکیک پروتکل انتقال
+WELL_KNOWN_PORTS = {
+    'TCP': {
+        20: 'FTP', 21: 'FTP', 22: 'SSH', 23: 'Telnet', 25: 'SMTP', 80: 'HTTP', 110: 'POP3',
+        143: 'IMAP', 179: 'BGP', 443: 'TLS', 445: 'SMB', 465: 'TLS', 587: 'SMTP', 853: 'TLS',
+        993: 'TLS', 995: 'TLS', 1883: 'MQTT', 3306: 'MySQL', 3389: 'RDP', 5222: 'XMPP',
+        5432: 'PostgreSQL', 6379: 'Redis', 8080: 'HTTP', 8443: 'TLS', 8883: 'TLS'
+    },
+    'UDP': {
+        67: 'DHCP', 68: 'DHCP', 123: 'NTP', 137: 'NetBIOS', 138: 'NetBIOS', 161: 'SNMP',
+        162: 'SNMP', 443: 'QUIC', 500: 'IKE', 514: 'Syslog', 1194: 'OpenVPN', 1900: 'SSDP',
+        3478: 'STUN', 4500: 'IKE', 5060: 'SIP', 5355: 'LLMNR', 51820: 'WireGuard'
+    }
+}
+
+_HTTP_METHODS = (b'GET ', b'POST ', b'HEAD ', b'PUT ', b'DELETE ', b'OPTIONS ', b'PATCH ',
+                 b'CONNECT ', b'TRACE ', b'HTTP/1.')
+
+
+def _transport_payload(packet, cls):
+    # Payload bytes of the innermost TCP/UDP layer, without link padding
+    layer = None
+    current = packet
+    while current.__class__ is not NoPayload:
+        if isinstance(current, cls):
+            layer = current
+        current = current.payload
+    if layer is None:
+        return b''
+    payload = layer.payload
+    if isinstance(payload, (NoPayload, Padding)):
+        return b''
+    data = getattr(payload, 'original', None)
+    return data if data is not None else bytes(payload)
+
+
+def _first_line(data, limit=100):
+    line = data.split(b'\r\n', 1)[0].split(b'\n', 1)[0]
+    return line[:limit].decode('latin-1')
+
+
+def tls_server_name(data):
+    """Get the server name (SNI) of a TLS ClientHello record
+
+    دریافت نام سرور (SNI) از رکورد ClientHello در TLS
+
+    Args:
+        data (bytes): TCP payload starting with a TLS record
+                      محتوای TCP که با یک رکورد TLS شروع می‌شود
+
+    Returns:
+        str: Server name, or None if absent or not a ClientHello
+             نام سرور، یا None در صورت نبود
+    """
+    try:
+        # Record header (5) and handshake header (4): ClientHello is type 1
+        if data[0] != 0x16 or data[5] != 0x01:
+            return None
+        # Client version (2) and random (32), then session id
+        position = 9 + 2 + 32
+        position += 1 + data[position]
+        position += 2 + int.from_bytes(data[position:position + 2], 'big')
+        position += 1 + data[position]
+        end = position + 2 + int.from_bytes(data[position:position + 2], 'big')
+        position += 2
+        while position + 4 <= min(end, len(data)):
+            kind = int.from_bytes(data[position:position + 2], 'big')
+            length = int.from_bytes(data[position + 2:position + 4], 'big')
+            position += 4
+            if kind == 0:
+                # server_name list: list length (2), name type (1), name length (2)
+                if data[position + 2] != 0:
+                    return None
+                name_length = int.from_bytes(data[position + 3:position + 5], 'big')
+                name = data[position + 5:position + 5 + name_length]
+                return name.decode('ascii', errors='replace') if name else None
+            position += length
+    except IndexError:
+        pass
+    return None
+
+
+class FlowClassifier:
+    """
+    Application protocol classifier with a per-flow verdict cache
+
+    ``classify()`` takes no lock: the flow table must be used from one
+    thread at a time, as the sniffer does under its handler lock.
+    ``reset()`` and ``describe()`` may be called from any thread.
+
+    طبقه‌بند پروتکل‌های کاربردی با حافظه نهان نتیجه برای هر جریان
+    متد classify قفلی نمی‌گیرد و جدول جریان‌ها باید هر بار تنها از یک نخ استفاده شود.
+    """
+
+    def __init__(self, inspect_packets=4, max_packets=16, max_flows=65536):
+        """Initialize the classifier
+
+        مقداردهی اولیه طبقه‌بند
+
+        Args:
+            inspect_packets (int): Packets with payload inspected per flow
+                                   before settling for the port-based name
+                                   تعداد بسته‌های دارای محتوا که در هر جریان بررسی می‌شوند
+            max_packets (int): Packets of a flow after which it is settled
+                               even if none carried payload
+                               تعداد بسته‌هایی که پس از آن نتیجه جریان قطعی می‌شود
+            max_flows (int): Maximum flows tracked; the least recently seen
+                             are forgotten first
+                             حداکثر تعداد جریان‌های ردیابی شده
+        """
+        self.inspect_packets = inspect_packets
+        self.max_packets = max_packets
+        self.max_flows = max_flows
+        # In-progress flows count their packets plus this step per packet
+        # with payload in one small int, which needs no allocation
+        self._payload_step = max_packets + 1
+        self.enabled = True
+        # Transport -> [(name, func)], in registration order
+        self._signatures = {}
+        self.reset()
+
+    def reset(self):
+        """Forget all flows
+
+        فراموش کردن تمام جریان‌ها
+        """
+        # Flow key -> verdict once settled, before that the packet count
+        # (see _payload_step). A packet being classified meanwhile updates
+        # the old table, which is dropped
+        self._flows = OrderedDict()
+        self.signature_matches = 0
+        self.port_matches = 0
+
+    def signature(self, name, transports=('TCP',)):
+        """Decorator registering a payload signature
+
+        Signatures are tried in registration order on the first packets of
+        a flow that carry payload.
+
+        دکوراتور ثبت یک امضای محتوا
+
+        Args:
+            name (str): Protocol name given to matching flows
+                        نام پروتکل جریان‌های منطبق
+            transports (tuple): Transports the signature applies to
+                                پروتکل‌های انتقالی که امضا برای آن‌ها به کار می‌رود
+
+        Returns:
+            callable: Decorator returning the original function, which is
+                      called as ``func(payload, info)`` and returns True on a
+                      match; it may add an ``app_info`` text to ``info``
+                      دکوراتوری که تابع اصلی را برمی‌گرداند
+        """
+        def decorator(func):
+            for transport in transports:
+                self._signatures.setdefault(transport, []).append((name, func))
+            return func
+
+        return decorator
+
+    def port_name(self, transport, sport, dport):
+        """Get the well-known service name of a port pair
+
+        دریافت نام سرویس شناخته شده یک جفت پورت
+
+        Args:
+            transport (str): 'TCP' or 'UDP'
+                             پروتکل انتقال
+            sport (int): Source port
+                         پورت مبدأ
+            dport (int): Destination port
+                         پورت مقصد
+
+        Returns:
+            str: Service name, or None
+                 نام سرویس، یا None
+        """
+        ports = WELL_KNOWN_PORTS.get(transport, {})
+        return ports.get(dport) or ports.get(sport)
+
+    @staticmethod
+    def _match(signatures, payload, info):
+        for name, func in signatures:
+            try:
+                if func(payload, info):
+                    return name
+            except (IndexError, ValueError):
+                continue
+        return None
+
+    def classify(self, packet, info, track=True):
+        """Name the application protocol of a dissected TCP/UDP packet
+
+        ``info['protocol']`` is replaced by the application protocol when
+        one is known; packets already named by a dissector (DNS, VXLAN, ...)
+        are left alone.
+
+        تعیین پروتکل کاربردی یک بسته TCP/UDP تشریح شده
+
+        Args:
+            packet: The scapy packet
+                    بسته scapy
+            info (dict): Packet information dictionary, as filled by the
+                         dissectors
+                         دیکشنری اطلاعات بسته
+            track (bool): Use and update the flow table; when False the
+                          packet is classified on its own, e.g. for packets
+                          read back from a file in any order
+                          استفاده از جدول جریان‌ها و به‌روزرسانی آن
+        """
+        if not self.enabled:
+            return
+        transport = TRANSPORTS.get(info.get('ip_proto'))
+        if transport is None or info.get('protocol') != transport or 'sport' not in info:
+            return
+        sport = info['sport']
+        dport = info['dport']
+
+        signatures = self._signatures.get(transport)
+        if not signatures:
+            # Only ports to go by: no payload to inspect, no flow to track
+            name = self.port_name(transport, sport, dport)
+            if name:
+                info['protocol'] = name
+            return
+
+        if not track:
+            payload = _transport_payload(packet, _TRANSPORT_LAYERS[transport])
+            name = (self._match(signatures, payload, info) if payload else None) or \
+                self.port_name(transport, sport, dport)
+            if name:
+                info['protocol'] = name
+            return
+
+        # Both directions share one flat entry
+        source = info['source']
+        destination = info['destination']
+        if source < destination or (source == destination and sport <= dport):
+            key = (transport, source, sport, destination, dport)
+        else:
+            key = (transport, destination, dport, source, sport)
+        flows = self._flows
+        state = flows.get(key)
+        if state is None:
+            state = 0
+        elif isinstance(state, str):
+            # Settled: the verdict replaced the state
+            flows.move_to_end(key)
+            info['protocol'] = state
+            return
+
+        state += 1
+        payload = _transport_payload(packet, _TRANSPORT_LAYERS[transport])
+        name = None
+        if payload:
+            state += self._payload_step
+            name = self._match(signatures, payload, info)
+        if name is not None:
+            flows[key] = name
+            self.signature_matches += 1
+        else:
+            name = self.port_name(transport, sport, dport)
+            if state >= self.inspect_packets * self._payload_step or \
+                    state % self._payload_step >= self.max_packets:
+                # Nothing recognised in time: settle for the port, if any
+                flows[key] = name or transport
+                if name:
+                    self.port_matches += 1
+            else:
+                flows[key] = state
+        flows.move_to_end(key)
+        if len(flows) > self.max_flows:
+            flows.popitem(last=False)
+        if name:
+            info['protocol'] = name
+
+    def describe(self):
+        """Get the number of tracked flows and how they were classified
+
+        دریافت تعداد جریان‌های ردیابی شده و نحوه طبقه‌بندی آن‌ها
+
+        Returns:
+            dict: ``flows`` tracked, flows classified by ``signature`` and by
+                  ``port``
+                  تعداد جریان‌ها و تعداد طبقه‌بندی شده با امضا و با پورت
+        """
+        return {
+            'flows': len(self._flows),
+            'signature': self.signature_matches,
+            'port': self.port_matches
+        }
+
+    def estimate_memory(self):
+        """Estimate the memory taken by the tracked flows
+
+        تخمین حافظه مصرفی جریان‌های ردیابی شده
+
+        Returns:
+            int: Estimated bytes
+                 حجم تخمینی بر حسب بایت
+        """
+        return len(self._flows) * _FLOW_STATE_BYTES
+
+
+def create_default_classifier(**kwargs):
+    """Create a classifier with the built-in payload signatures
+
+    ایجاد یک طبقه‌بند شامل امضاهای داخلی
+
+    Args:
+        **kwargs: Arguments passed to FlowClassifier
+                  آرگومان‌های ارسالی به FlowClassifier
+
+    Returns:
+        FlowClassifier: The classifier
+                        طبقه‌بند
+    """
+    classifier = FlowClassifier(**kwargs)
+
+    # TLS record: content type 20-23, version 3.x
+    @classifier.signature('TLS')
+    def match_tls(payload, info):
+        if len(payload) < 5 or not 0x14 <= payload[0] <= 0x17 or payload[1] != 3 or payload[2] > 4:
+            return False
+        server_name = tls_server_name(payload)
+        if server_name:
+            info['app_info'] = f"SNI: {server_name}"
+        return True
+
+    @classifier.signature('SSH')
+    def match_ssh(payload, info):
+        if not payload.startswith(b'SSH-'):
+            return False
+        info['app_info'] = _first_line(payload)
+        return True
+
+    @classifier.signature('HTTP/2')
+    def match_http2(payload, info):
+        return payload.startswith(b'PRI * HTTP/2.0')
+
+    @classifier.signature('HTTP')
+    def match_http(payload, info):
+        if not payload.startswith(_HTTP_METHODS):
+            return False
+        info['app_info'] = _first_line(payload)
+        return True
+
+    # SMB over the NetBIOS session service header
+    @classifier.signature('SMB')
+    def match_smb(payload, info):
+        return payload[4:8] in (b'\xffSMB', b'\xfeSMB')
+
+    @classifier.signature('BitTorrent')
+    def match_bittorrent(payload, info):
+        return payload.startswith(b'\x13BitTorrent protocol')
+
+    # QUIC long header: form and fixed bits set, then a known version
+    @classifier.signature('QUIC', ('UDP',))
+    def match_quic(payload, info):
+        if len(payload) < 7 or payload[0] & 0xc0 != 0xc0:
+            return False
+        version = int.from_bytes(payload[1:5], 'big')
+        return version in (0, 0x00000001, 0x6b3343cf) or version >> 8 == 0xff0000
+
+    # DHCP: BOOTP message with the DHCP magic cookie
+    @classifier.signature('DHCP', ('UDP',))
+    def match_dhcp(payload, info):
+        return payload[236:240] == b'\x63\x82\x53\x63'
+
+    return classifier
@@ -0,0 +1,384 @@
+"""
+Endpoint and Conversation Statistics
+
+This module keeps per-endpoint (IP and MAC address) and per-conversation
+(IP pair, TCP and UDP port pair) packet and byte counters. The tables are
+updated incrementally from batches of stored packet columns, so the capture
+path pays nothing per packet and every packet is counted once. They are
+ordered by last activity so idle entries are evicted from the front in
+O(1), and bounded in size; top-N views are read from the tables and never
+rescan the stored packets.
+
+ماژول آمار نقاط پایانی و مکالمه‌ها
+این ماژول شمارنده‌های بسته و بایت را برای هر نقطه پایانی (آدرس IP و MAC) و هر
+مکالمه (جفت IP و جفت پورت TCP و UDP) نگه می‌دارد. جدول‌ها به صورت تدریجی از
+دسته‌هایی از ستون‌های بسته‌های ذخیره شده به‌روزرسانی می‌شوند، بنابراین مسیر ضبط
+برای هر بسته هزینه‌ای نمی‌پردازد و هر بسته یک بار شمرده می‌شود. جدول‌ها بر اساس
+آخرین فعالیت مرتب هستند تا ورودی‌های بیکار با هزینه O(1) از ابتدا حذف شوند و
+اندازه آن‌ها محدود است؛ نماهای N مورد برتر از همین جدول‌ها خوانده شده و هرگز
+بسته‌های ذخیره شده را دوباره پیمایش نمی‌کنند.
+"""
+
+import heapq
+import threading
+from collections import OrderedDict
+from operator import attrgetter
+
+import numpy as np
+
+# Table names
+# نام جدول‌ها
+ENDPOINTS_IP = 'ip'
+ENDPOINTS_MAC = 'mac'
+CONVERSATIONS_IP = 'ip'
+CONVERSATIONS_TCP = 'tcp'
+CONVERSATIONS_UDP = 'udp'
+
+ENDPOINT_TABLES = (ENDPOINTS_IP, ENDPOINTS_MAC)
+CONVERSATION_TABLES = (CONVERSATIONS_IP, CONVERSATIONS_TCP, CONVERSATIONS_UDP)
+
+# Sort keys of the top-N views
+# کلیدهای مرتب‌سازی نماهای N مورد برتر
+SORT_KEYS = ('bytes', 'packets', 'rate')
+
+# Packet columns update() reads, as named by the packet store
+# ستون‌های بسته که update() می‌خواند
+STATISTICS_COLUMNS = ('timestamp', 'length', 'weight', 'ip_proto', 'sport', 'dport',
+                      'source', 'destination', 'src_mac', 'dst_mac')
+
+_PORT_TABLES = {6: CONVERSATIONS_TCP, 17: CONVERSATIONS_UDP}
+
+# Address ids are shifted left by this many bits to make room for the port
+_PORT_BITS = 16
+_PORT_MASK = (1 << _PORT_BITS) - 1
+
+# Memory of one table entry with its key, measured with tracemalloc
+_ENTRY_BYTES = 250
+
+
+class _Entry:
+    """Counters of one endpoint or conversation"""
+
+    # Forward: sent by the endpoint, or from A to B. The key is kept so top-N
+    # views can rank the entries without building (key, entry) pairs
+    __slots__ = ('packets', 'bytes', 'forward_packets', 'forward_bytes', 'first', 'last', 'key')
+
+    def __init__(self, key, first, last):
+        self.key = key
+        self.packets = 0
+        self.bytes = 0
+        self.forward_packets = 0
+        self.forward_bytes = 0
+        self.first = first
+        self.last = last
+
+
+class _ActivityTable(OrderedDict):
+    """Counter entries ordered by last activity, with idle and size eviction"""
+
+    def __init__(self, max_entries, idle_timeout):
+        super().__init__()
+        self.max_entries = max_entries
+        self.idle_timeout = idle_timeout
+        self.evicted = 0
+
+    def add(self, key, first, last, packets, length, forward_packets, forward_bytes):
+        entry = self.get(key)
+        if entry is None:
+            entry = self[key] = _Entry(key, first, last)
+            if len(self) > self.max_entries:
+                self.popitem(last=False)
+                self.evicted += 1
+        else:
+            self.move_to_end(key)
+            if last > entry.last:
+                entry.last = last
+            if first < entry.first:
+                entry.first = first
+        entry.packets += packets
+        entry.bytes += length
+        entry.forward_packets += forward_packets
+        entry.forward_bytes += forward_bytes
+
+    def expire(self, now):
+        # The front holds the least recently active entries
+        horizon = now - self.idle_timeout
+        while self:
+            key, entry = next(iter(self.items()))
+            if entry.last >= horizon:
+                break
+            del self[key]
+            self.evicted += 1
+
+
+def _unify(*columns):
+    # Map the codes of string columns, each coded by its own string table, to
+    # shared ids so equal strings get equal ids; -1 stays missing
+    ids = {}
+    unified = []
+    for codes, categories in columns:
+        used, inverse = np.unique(codes, return_inverse=True)
+        mapping = np.array([ids.setdefault(categories[code], len(ids)) if code >= 0 else -1
+                            for code in used.tolist()], dtype=np.int64)
+        unified.append(mapping[inverse.reshape(-1)])
+    return unified, list(ids)
+
+
+def _totals(keys, weights, sizes, timestamps, forward):
+    # Per distinct key (a value, or a row of a 2-D array): first and last
+    # activity, packets, bytes, forward packets and forward bytes; ordered
+    # by last activity so the tables keep their order
+    unique, inverse = np.unique(keys, axis=0, return_inverse=True)
+    inverse = inverse.reshape(-1)
+    count = len(unique)
+    first = np.full(count, np.inf)
+    np.minimum.at(first, inverse, timestamps)
+    last = np.full(count, -np.inf)
+    np.maximum.at(last, inverse, timestamps)
+    sums = [np.bincount(inverse, weights=values, minlength=count).astype(np.int64)
+            for values in (weights, sizes, weights * forward, sizes * forward)]
+    order = np.argsort(last, kind='stable')
+    return zip(unique[order].tolist(), first[order].tolist(), last[order].tolist(),
+               *(values[order].tolist() for values in sums))
+
+
+def _rate(entry):
+    duration = entry.last - entry.first
+    return entry.bytes / duration if duration > 0 else 0.0
+
+
+_SORT_FUNCTIONS = {
+    'bytes': attrgetter('bytes'),
+    'packets': attrgetter('packets'),
+    'rate': _rate
+}
+
+
+class TrafficStatistics:
+    """
+    Incrementally maintained endpoint and conversation tables
+
+    جدول‌های نقاط پایانی و مکالمه‌ها که به صورت تدریجی نگهداری می‌شوند
+    """
+
+    def __init__(self, max_entries=20000, idle_timeout=600.0):
+        """Initialize the statistics
+
+        مقداردهی اولیه آمار
+
+        Args:
+            max_entries (int): Maximum entries per table; the least recently
+                               active are evicted first
+                               حداکثر تعداد ورودی‌های هر جدول
+            idle_timeout (float): Seconds without packets after which an entry
+                                  is evicted, on the capture clock
+                                  مدت بیکاری بر حسب ثانیه که پس از آن ورودی حذف می‌شود
+        """
+        self.max_entries = max_entries
+        self.idle_timeout = idle_timeout
+        self.enabled = True
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Forget all endpoints and conversations
+
+        فراموش کردن تمام نقاط پایانی و مکالمه‌ها
+        """
+        with self._lock:
+            self._endpoints = {
+                name: _ActivityTable(self.max_entries, self.idle_timeout) for name in ENDPOINT_TABLES
+            }
+            self._conversations = {
+                name: _ActivityTable(self.max_entries, self.idle_timeout) for name in CONVERSATION_TABLES
+            }
+
+    def update(self, arrays):
+        """Count a batch of packets
+
+        Every packet must be passed once; batches are counted in order.
+
+        شمارش دسته‌ای از بسته‌ها
+
+        Args:
+            arrays (dict): The STATISTICS_COLUMNS of the packets, oldest
+                           first, with the ``<name>_categories`` of the string
+                           columns, as returned by PacketStore.arrays()
+                           ستون‌های بسته‌ها به همراه جدول دسته‌های ستون‌های متنی
+        """
+        timestamps = arrays['timestamp']
+        if not self.enabled or not len(timestamps):
+            return
+        weights = arrays['weight'].astype(np.float64)
+        sizes = weights * arrays['length']
+        (src_mac, dst_mac), macs = _unify((arrays['src_mac'], arrays['src_mac_categories']),
+                                          (arrays['dst_mac'], arrays['dst_mac_categories']))
+        # ARP and other non-IP frames carry addresses too; count IP frames only
+        (source, destination), addresses = _unify(
+            (arrays['source'], arrays['source_categories']),
+            (arrays['destination'], arrays['destination_categories']))
+        ip = (arrays['ip_proto'] >= 0) & (source >= 0) & (destination >= 0)
+
+        with self._lock:
+            sent = src_mac >= 0
+            self._count_endpoints(self._endpoints[ENDPOINTS_MAC], macs, src_mac, dst_mac,
+                                  sent, sent & (dst_mac >= 0), weights, sizes, timestamps)
+            self._count_endpoints(self._endpoints[ENDPOINTS_IP], addresses, source, destination,
+                                  ip, ip, weights, sizes, timestamps)
+            self._count_conversations(self._conversations[CONVERSATIONS_IP], addresses,
+                                      source[ip], destination[ip], weights[ip], sizes[ip],
+                                      timestamps[ip])
+            for ip_proto, name in _PORT_TABLES.items():
+                rows = ip & (arrays['ip_proto'] == ip_proto) & (arrays['sport'] >= 0)
+                self._count_conversations(self._conversations[name], addresses,
+                                          source[rows], destination[rows], weights[rows],
+                                          sizes[rows], timestamps[rows],
+                                          arrays['sport'][rows], arrays['dport'][rows])
+
+            now = float(timestamps.max())
+            for table in self._endpoints.values():
+                table.expire(now)
+            for table in self._conversations.values():
+                table.expire(now)
+
+    @staticmethod
+    def _count_endpoints(table, names, source, destination, sent, received, weights, sizes, timestamps):
+        # A packet sent to its own source is counted once, as sent
+        received = received & (destination != source)
+        keys = np.concatenate((source[sent], destination[received]))
+        forward = np.concatenate((np.ones(np.count_nonzero(sent)), np.zeros(np.count_nonzero(received))))
+        for key, first, last, *counts in _totals(
+                keys, np.concatenate((weights[sent], weights[received])),
+                np.concatenate((sizes[sent], sizes[received])),
+                np.concatenate((timestamps[sent], timestamps[received])), forward):
+            table.add(names[key], first, last, *counts)
+
+    @staticmethod
+    def _count_conversations(table, names, source, destination, weights, sizes, timestamps,
+                             sport=None, dport=None):
+        if sport is not None:
+            # One id per (address, port) endpoint
+            source = (source << _PORT_BITS) | sport
+            destination = (destination << _PORT_BITS) | dport
+        low = np.minimum(source, destination)
+        # Both directions share one entry
+        pairs = np.stack((low, np.maximum(source, destination)), axis=1)
+        for (low, high), first, last, packets, length, low_packets, low_bytes in _totals(
+                pairs, weights, sizes, timestamps, (source == low).astype(np.float64)):
+            if sport is None:
+                low, high = (names[low],), (names[high],)
+            else:
+                low = (names[low >> _PORT_BITS], low & _PORT_MASK)
+                high = (names[high >> _PORT_BITS], high & _PORT_MASK)
+            # A is the smaller endpoint; flat (A, B) or (A, port A, B, port B)
+            if low <= high:
+                table.add(low + high, first, last, packets, length, low_packets, low_bytes)
+            else:
+                table.add(high + low, first, last, packets, length,
+                          packets - low_packets, length - low_bytes)
+
+    @staticmethod
+    def _rows(table, n, sort, forward_name, backward_name, port_pairs=False):
+        if sort not in _SORT_FUNCTIONS:
+            raise ValueError(f"Unknown sort key: {sort}")
+        rows = []
+        # Plain dict iteration skips the LRU links and is much faster
+        for entry in heapq.nlargest(n, dict.values(table), key=_SORT_FUNCTIONS[sort]):
+            key = entry.key
+            if port_pairs:
+                key = ((key[0], key[1]), (key[2], key[3]))
+            rows.append({
+                'key': key,
+                'packets': entry.packets,
+                'bytes': entry.bytes,
+                f'{forward_name}_packets': entry.forward_packets,
+                f'{forward_name}_bytes': entry.forward_bytes,
+                f'{backward_name}_packets': entry.packets - entry.forward_packets,
+                f'{backward_name}_bytes': entry.bytes - entry.forward_bytes,
+                'first': entry.first,
+                'duration': entry.last - entry.first,
+                'rate': _rate(entry)
+            })
+        return rows
+
+    def top_endpoints(self, kind=ENDPOINTS_IP, n=100, sort='bytes'):
+        """Get the busiest endpoints
+
+        دریافت پرترافیک‌ترین نقاط پایانی
+
+        Args:
+            kind (str): ENDPOINTS_IP or ENDPOINTS_MAC
+                        نوع نقطه پایانی
+            n (int): Number of endpoints
+                     تعداد نقاط پایانی
+            sort (str): One of SORT_KEYS
+                        کلید مرتب‌سازی
+
+        Returns:
+            list: Dictionaries with the ``key`` (address), ``packets``,
+                  ``bytes``, ``tx_packets``, ``tx_bytes``, ``rx_packets``,
+                  ``rx_bytes``, ``first`` seen, ``duration`` in seconds and
+                  ``rate`` in bytes per second, busiest first
+                  دیکشنری‌های آمار نقاط پایانی از پرترافیک‌ترین
+        """
+        with self._lock:
+            return self._rows(self._endpoints[kind], n, sort, 'tx', 'rx')
+
+    def top_conversations(self, kind=CONVERSATIONS_IP, n=100, sort='bytes'):
+        """Get the busiest conversations
+
+        دریافت پرترافیک‌ترین مکالمه‌ها
+
+        Args:
+            kind (str): CONVERSATIONS_IP, CONVERSATIONS_TCP or CONVERSATIONS_UDP
+                        نوع مکالمه
+            n (int): Number of conversations
+                     تعداد مکالمه‌ها
+            sort (str): One of SORT_KEYS
+                        کلید مرتب‌سازی
+
+        Returns:
+            list: Dictionaries with the ``key`` ((A, B) addresses, or
+                  ((address, port), (address, port)) for TCP and UDP),
+                  ``packets``, ``bytes``, ``ab_packets``, ``ab_bytes``,
+                  ``ba_packets``, ``ba_bytes``, ``first`` seen, ``duration``
+                  in seconds and ``rate`` in bytes per second, busiest first
+                  دیکشنری‌های آمار مکالمه‌ها از پرترافیک‌ترین
+        """
+        with self._lock:
+            return self._rows(self._conversations[kind], n, sort, 'ab', 'ba', kind in _PORT_TABLES.values())
+
+    def describe(self):
+        """Get the entry and eviction counts of every table
+
+        دریافت تعداد ورودی‌ها و حذف‌های هر جدول
+
+        Returns:
+            dict: ``endpoints`` and ``conversations``, each mapping a table
+                  name to its ``entries`` and ``evicted`` counts
+                  تعداد ورودی‌ها و حذف‌های هر جدول
+        """
+        with self._lock:
+            return {
+                'endpoints': {
+                    name: {'entries': len(table), 'evicted': table.evicted}
+                    for name, table in self._endpoints.items()
+                },
+                'conversations': {
+                    name: {'entries': len(table), 'evicted': table.evicted}
+                    for name, table in self._conversations.items()
+                }
+            }
+
+    def estimate_memory(self):
+        """Estimate the memory taken by the tables
+
+        تخمین حافظه مصرفی جدول‌ها
+
+        Returns:
+            int: Estimated bytes
+                 حجم تخمینی بر حسب بایت
+        """
+        entries = sum(len(table) for table in self._endpoints.values())
+        entries += sum(len(table) for table in self._conversations.values())
+        return entries * _ENTRY_BYTES
@@ -0,0 +1,193 @@
+"""
+Packet Detail Dissection
+
+This module breaks one captured packet into its protocol layers and fields,
+with the byte range every layer and field occupies in the frame, for the
+packet detail view. The work is done only for packets that are looked at,
+and the results of recently viewed packets are kept in a small LRU cache,
+so capturing never pays for it.
+
+ماژول تشریح جزئیات بسته
+این ماژول یک بسته ضبط شده را به لایه‌ها و فیلدهای پروتکل آن همراه با محدوده
+بایت‌های هر لایه و فیلد در فریم تجزیه می‌کند تا در نمای جزئیات بسته نمایش داده
+شود. این کار فقط برای بسته‌هایی که مشاهده می‌شوند انجام شده و نتایج بسته‌های اخیر
+در یک حافظه نهان LRU کوچک نگه‌داشته می‌شود، بنابراین ضبط هزینه‌ای برای آن نمی‌پردازد.
+"""
+
+from collections import OrderedDict
+
+from scapy.packet import NoPayload, Packet
+
+from .search import frame_bytes
+
+DEFAULT_DETAIL_CACHE_SIZE = 64
+
+
+def _remaining(data):
+    # Field parsers return bytes, or (bytes, bits consumed of the first byte)
+    # inside bit fields
+    if isinstance(data, tuple):
+        return data[0], data[1]
+    return data, 0
+
+
+def _field_value(layer, field, value):
+    try:
+        return field.i2repr(layer, value)
+    except Exception:
+        return repr(value)
+
+
+def _nested_fields(value):
+    # Packets carried inside a field (DNS records, options, ...) have no byte
+    # ranges of their own here
+    packets = value if isinstance(value, list) else [value]
+    children = []
+    for packet in packets:
+        if not isinstance(packet, Packet):
+            return []
+        children.append({
+            'name': packet.name,
+            'value': '',
+            'offset': None,
+            'length': 0,
+            'children': [
+                {
+                    'name': field.name,
+                    'value': _field_value(packet, field, packet.getfieldval(field.name)),
+                    'offset': None,
+                    'length': 0,
+                    'children': _nested_fields(packet.getfieldval(field.name))
+                }
+                for field in packet.fields_desc
+            ]
+        })
+    return children
+
+
+def _dissect_layer(layer, data, offset):
+    # Parse the layer's own bytes again field by field to find where every
+    # field starts and ends; returns the fields and the header length
+    fields = []
+    remaining = data
+    for field in layer.fields_desc:
+        value = layer.getfieldval(field.name)
+        start = length = None
+        if remaining is not None:
+            before, _ = _remaining(remaining)
+            try:
+                remaining, _ = field.getfield(layer, remaining)
+            except Exception:
+                # Malformed or unusual field: keep the values, drop the ranges
+                remaining = None
+            else:
+                after, bits = _remaining(remaining)
+                start = len(data) - len(before)
+                # A field ending inside a byte covers that byte
+                length = len(data) - len(after) + (1 if bits else 0) - start
+        fields.append({
+            'name': field.name,
+            'value': _field_value(layer, field, value),
+            'offset': None if start is None else offset + start,
+            'length': length or 0,
+            'children': _nested_fields(value)
+        })
+    if remaining is None:
+        # Fall back on the bytes the payload was built from
+        payload = getattr(layer.payload, 'original', None) or b''
+        return fields, max(len(data) - len(payload), 0)
+    return fields, len(data) - len(_remaining(remaining)[0])
+
+
+def dissect_details(packet):
+    """Break a packet into layers and fields with their byte ranges
+
+    تجزیه یک بسته به لایه‌ها و فیلدها همراه با محدوده بایت‌های آن‌ها
+
+    Args:
+        packet (Packet): The captured scapy packet
+                         بسته scapy ضبط شده
+
+    Returns:
+        dict: ``frame`` (the frame bytes) and ``layers``, a list of
+              dictionaries with ``name``, ``offset``, ``length`` and
+              ``fields``; every field has ``name``, ``value``, ``offset``
+              (None when unknown), ``length`` and nested ``children``
+              بایت‌های فریم و فهرست لایه‌ها با فیلدهای آن‌ها
+    """
+    frame = frame_bytes(packet)
+    layers = []
+    offset = 0
+    layer = packet
+    while layer is not None and not isinstance(layer, NoPayload):
+        # Every dissected layer remembers the bytes it was built from; this
+        # bounds it before any trailing padding
+        original = getattr(layer, 'original', None)
+        if original is None:
+            data = frame[offset:]
+        else:
+            data = frame[offset:offset + len(original)]
+        fields, header_length = _dissect_layer(layer, data, offset)
+        layers.append({
+            'name': layer.name,
+            'offset': offset,
+            'length': header_length,
+            'fields': fields
+        })
+        offset += header_length
+        layer = layer.payload
+    return {'frame': frame, 'layers': layers}
+
+
+class PacketDetailCache:
+    """
+    LRU cache of dissected packet details
+
+    حافظه نهان LRU جزئیات تشریح شده بسته‌ها
+    """
+
+    def __init__(self, size=DEFAULT_DETAIL_CACHE_SIZE):
+        """Initialize the cache
+
+        مقداردهی اولیه حافظه نهان
+
+        Args:
+            size (int): Number of packets kept
+                        تعداد بسته‌های نگه‌داشته شده
+        """
+        self.size = size
+        self._details = OrderedDict()
+
+    def __len__(self):
+        return len(self._details)
+
+    def get(self, key, packet):
+        """Get the details of a packet, dissecting it on a cache miss
+
+        دریافت جزئیات یک بسته و تشریح آن در صورت نبود در حافظه نهان
+
+        Args:
+            key: Key identifying the packet, e.g. its sequence number
+                 کلید شناسایی بسته، مانند شماره ترتیب آن
+            packet (Packet): The captured scapy packet
+                             بسته scapy ضبط شده
+
+        Returns:
+            dict: Packet details, as returned by dissect_details()
+                  جزئیات بسته
+        """
+        details = self._details.get(key)
+        if details is not None:
+            self._details.move_to_end(key)
+            return details
+        details = self._details[key] = dissect_details(packet)
+        if len(self._details) > self.size:
+            self._details.popitem(last=False)
+        return details
+
+    def clear(self):
+        """Forget all cached details
+
+        فراموش کردن تمام جزئیات ذخیره شده
+        """
+        self._details.clear()
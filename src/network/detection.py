@@ -0,0 +1,387 @@
+"""
+Streaming Threat Detection Module
+
+This module raises alerts for port scans, SYN floods and ARP storms while
+packets are captured. Every detector keeps sliding-window state per key
+(source, source/destination pair, ...) in a bounded LRU table, so memory is
+capped and each packet costs O(1) amortized work.
+
+ماژول تشخیص جریانی تهدیدها
+این ماژول در حین ضبط بسته‌ها برای پویش پورت، سیل SYN و طوفان ARP هشدار تولید
+می‌کند. هر تشخیص‌دهنده وضعیت پنجره لغزان را برای هر کلید در یک جدول LRU محدود
+نگه می‌دارد، بنابراین حافظه محدود بوده و هزینه هر بسته به طور سرشکن O(1) است.
+"""
+
+import threading
+from collections import OrderedDict, deque
+
+# Alert kinds
+# انواع هشدار
+VERTICAL_SCAN = 'vertical-scan'
+HORIZONTAL_SCAN = 'horizontal-scan'
+SYN_FLOOD = 'syn-flood'
+ARP_STORM = 'arp-storm'
+
+ALERT_KINDS = (VERTICAL_SCAN, HORIZONTAL_SCAN, SYN_FLOOD, ARP_STORM)
+
+# Memory of one tracked key with an empty window, and of every distinct value
+# a window holds, measured with tracemalloc
+_KEY_STATE_BYTES = 335
+_DISTINCT_VALUE_BYTES = 60
+
+_TCP_SYN = 0x02
+_TCP_ACK = 0x10
+_ARP_WHO_HAS = 1
+
+
+class WindowCounter:
+    """
+    Event count over a sliding time window, kept in fixed time buckets
+
+    شمارنده رویدادها در یک پنجره زمانی لغزان با سطل‌های زمانی ثابت
+    """
+
+    __slots__ = ('bucket_width', 'counts', 'total', 'current', 'alerted')
+
+    def __init__(self, window, buckets=10):
+        """Initialize the counter
+
+        مقداردهی اولیه شمارنده
+
+        Args:
+            window (float): Window length in seconds
+                            طول پنجره بر حسب ثانیه
+            buckets (int): Number of buckets the window is split into
+                           تعداد سطل‌های پنجره
+        """
+        self.bucket_width = window / buckets
+        self.counts = [0] * buckets
+        self.total = 0
+        self.current = None
+        # Time of the last alert raised for this key
+        self.alerted = None
+
+    def add(self, now, amount=1):
+        """Count events and get the total over the window
+
+        شمارش رویدادها و دریافت مجموع در پنجره
+
+        Args:
+            now (float): Event time in seconds
+                         زمان رویداد بر حسب ثانیه
+            amount (int): Number of events
+                          تعداد رویدادها
+
+        Returns:
+            int: Events within the window ending at ``now``
+                 تعداد رویدادهای درون پنجره
+        """
+        counts = self.counts
+        bucket = int(now / self.bucket_width)
+        if self.current is None:
+            self.current = bucket
+        elif bucket > self.current:
+            # Clear the buckets that slid out; at most one full turn
+            for expired in range(self.current + 1, min(bucket, self.current + len(counts)) + 1):
+                index = expired % len(counts)
+                self.total -= counts[index]
+                counts[index] = 0
+            self.current = bucket
+        elif bucket < self.current - len(counts) + 1:
+            # Too old for the window (out-of-order timestamp)
+            return self.total
+        counts[bucket % len(counts)] += amount
+        self.total += amount
+        return self.total
+
+
+class DistinctWindow:
+    """
+    Distinct values seen within a sliding time window, capped in size
+
+    مقادیر متمایز دیده شده در یک پنجره زمانی لغزان با اندازه محدود
+    """
+
+    __slots__ = ('window', 'limit', 'seen', 'alerted')
+
+    def __init__(self, window, limit):
+        """Initialize the tracker
+
+        مقداردهی اولیه ردیاب
+
+        Args:
+            window (float): Window length in seconds
+                            طول پنجره بر حسب ثانیه
+            limit (int): Maximum number of values kept
+                         حداکثر تعداد مقادیر نگه‌داشته شده
+        """
+        self.window = window
+        self.limit = limit
+        # A plain dict keeps insertion order and is far smaller than an
+        # OrderedDict; values are re-inserted to move them to the end
+        self.seen = {}
+        self.alerted = None
+
+    def __len__(self):
+        return len(self.seen)
+
+    def add(self, now, value):
+        """Record a value and get the distinct count over the window
+
+        ثبت یک مقدار و دریافت تعداد مقادیر متمایز در پنجره
+
+        Args:
+            now (float): Time in seconds
+                         زمان بر حسب ثانیه
+            value: The value
+                   مقدار
+
+        Returns:
+            int: Distinct values seen within the window, at most ``limit``
+                 تعداد مقادیر متمایز درون پنجره
+        """
+        seen = self.seen
+        seen.pop(value, None)
+        seen[value] = now
+        # Values are ordered by last sighting, so expired ones are at the front
+        horizon = now - self.window
+        while seen:
+            oldest, last_seen = next(iter(seen.items()))
+            if last_seen >= horizon and len(seen) <= self.limit:
+                break
+            del seen[oldest]
+        return len(seen)
+
+
+class _LRUState(OrderedDict):
+    """Per-key trackers with LRU eviction
+
+    With ``sized`` trackers (DistinctWindow), ``values`` counts the values
+    the windows hold; the caller adds the growth reported by each update.
+    """
+
+    def __init__(self, max_keys, factory, sized=False):
+        super().__init__()
+        self.max_keys = max_keys
+        self.factory = factory
+        self.sized = sized
+        self.values = 0
+
+    def touch(self, key):
+        tracker = self.get(key)
+        if tracker is None:
+            tracker = self[key] = self.factory()
+            if len(self) > self.max_keys:
+                _, evicted = self.popitem(last=False)
+                if self.sized:
+                    self.values -= len(evicted)
+        else:
+            self.move_to_end(key)
+        return tracker
+
+
+class ThreatDetector:
+    """
+    Streaming detector for port scans, SYN floods and ARP storms
+
+    Port scans are counted from TCP connection attempts (SYN without ACK)
+    only. UDP has no connection opening to tell a probe from ordinary
+    traffic, so UDP scans are not detected.
+
+    تشخیص‌دهنده جریانی پویش پورت، سیل SYN و طوفان ARP
+    پویش پورت فقط از روی تلاش‌های اتصال TCP (SYN بدون ACK) شمرده می‌شود؛ UDP
+    آغاز اتصالی برای تمایز کاوش از ترافیک عادی ندارد، بنابراین پویش‌های UDP
+    تشخیص داده نمی‌شوند.
+    """
+
+    def __init__(self, window=10.0, scan_ports=50, scan_hosts=30, syn_flood_rate=500,
+                 arp_storm_rate=50, max_keys=10000, max_alerts=1000):
+        """Initialize the detector
+
+        مقداردهی اولیه تشخیص‌دهنده
+
+        Args:
+            window (float): Sliding window length in seconds
+                            طول پنجره لغزان بر حسب ثانیه
+            scan_ports (int): Distinct ports probed on one host that make a vertical scan
+                              تعداد پورت‌های متمایز یک میزبان برای پویش عمودی
+            scan_hosts (int): Distinct hosts probed on one port that make a horizontal scan
+                              تعداد میزبان‌های متمایز یک پورت برای پویش افقی
+            syn_flood_rate (float): SYNs per second to one host that make a SYN flood
+                                    تعداد SYN در ثانیه به یک میزبان برای سیل SYN
+            arp_storm_rate (float): ARP who-has requests per second from one sender
+                                    that make an ARP storm
+                                    تعداد درخواست ARP در ثانیه از یک فرستنده برای طوفان ARP
+            max_keys (int): Maximum keys tracked per detector
+                            حداکثر تعداد کلیدهای ردیابی شده در هر تشخیص‌دهنده
+            max_alerts (int): Number of most recent alerts kept
+                              تعداد آخرین هشدارهای نگه‌داشته شده
+        """
+        self.window = window
+        self.scan_ports = scan_ports
+        self.scan_hosts = scan_hosts
+        self.syn_flood_threshold = syn_flood_rate * window
+        self.arp_storm_threshold = arp_storm_rate * window
+        self.max_keys = max_keys
+        self.enabled = True
+
+        self.alerts = deque(maxlen=max_alerts)
+        self._alerts_lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Forget all per-key state and alerts
+
+        فراموش کردن تمام وضعیت‌ها و هشدارها
+        """
+        window = self.window
+        self._vertical = _LRUState(self.max_keys, lambda: DistinctWindow(window, self.scan_ports), sized=True)
+        self._horizontal = _LRUState(self.max_keys, lambda: DistinctWindow(window, self.scan_hosts), sized=True)
+        self._syn = _LRUState(self.max_keys, lambda: WindowCounter(window))
+        self._arp = _LRUState(self.max_keys, lambda: WindowCounter(window))
+        with self._alerts_lock:
+            self.alerts.clear()
+            self.alert_count = 0
+            self.alert_counts = {kind: 0 for kind in ALERT_KINDS}
+
+    def observe(self, info):
+        """Feed one dissected packet to all detectors
+
+        ارسال یک بسته تشریح شده به تمام تشخیص‌دهنده‌ها
+
+        Args:
+            info (dict): Packet information dictionary
+                         دیکشنری اطلاعات بسته
+        """
+        if not self.enabled:
+            return
+
+        now = info['timestamp']
+        flags = info.get('flags')
+        if flags is not None:
+            # A SYN without ACK opens a connection attempt
+            if flags & _TCP_SYN and not flags & _TCP_ACK:
+                source = info['source']
+                destination = info['destination']
+                dport = info['dport']
+                weight = info.get('weight', 1)
+
+                tracker = self._syn.touch(destination)
+                count = tracker.add(now, weight)
+                if count >= self.syn_flood_threshold:
+                    self._alert(tracker, now, SYN_FLOOD, '*', destination, count)
+
+                table = self._vertical
+                tracker = table.touch((source, destination))
+                before = len(tracker)
+                count = tracker.add(now, dport)
+                table.values += count - before
+                if count >= self.scan_ports:
+                    self._alert(tracker, now, VERTICAL_SCAN, source, destination, count)
+
+                table = self._horizontal
+                tracker = table.touch((source, dport))
+                before = len(tracker)
+                count = tracker.add(now, destination)
+                table.values += count - before
+                if count >= self.scan_hosts:
+                    self._alert(tracker, now, HORIZONTAL_SCAN, source, f"*:{dport}", count)
+
+        elif info.get('arp_op') == _ARP_WHO_HAS:
+            sender = info.get('src_mac') or info['source']
+            tracker = self._arp.touch(sender)
+            count = tracker.add(now, info.get('weight', 1))
+            if count >= self.arp_storm_threshold:
+                self._alert(tracker, now, ARP_STORM, sender, '*', count)
+
+    def _alert(self, tracker, now, kind, source, target, count):
+        # One alert per key and window while the condition persists
+        if tracker.alerted is not None and now - tracker.alerted < self.window:
+            return
+        tracker.alerted = now
+        alert = {
+            'time': now,
+            'kind': kind,
+            'source': source,
+            'target': target,
+            'count': count,
+            'window': self.window
+        }
+        with self._alerts_lock:
+            self.alerts.append(alert)
+            self.alert_count += 1
+            self.alert_counts[kind] += 1
+
+    def get_alerts(self, since=0):
+        """Get recent alerts
+
+        دریافت هشدارهای اخیر
+
+        Args:
+            since (int): Only return alerts raised after the first ``since``
+                         alerts (compare with ``alert_count``)
+                         فقط هشدارهای پس از ``since`` هشدار اول
+
+        Returns:
+            list: Alert dictionaries, oldest first
+                  دیکشنری‌های هشدار از قدیمی‌ترین
+        """
+        with self._alerts_lock:
+            new = self.alert_count - since
+            if new <= 0:
+                return []
+            alerts = list(self.alerts)
+        return alerts[-new:] if new < len(alerts) else alerts
+
+    def restore_alerts(self, alerts, alert_counts):
+        """Replace the alerts with saved ones, e.g. from a session file
+
+        Per-key state is not restored; detection starts afresh.
+
+        جایگزینی هشدارها با هشدارهای ذخیره شده
+
+        Args:
+            alerts (list): Alert dictionaries, oldest first
+                           دیکشنری‌های هشدار از قدیمی‌ترین
+            alert_counts (dict): Total alerts per kind
+                                 مجموع هشدارها به تفکیک نوع
+        """
+        with self._alerts_lock:
+            self.alerts.clear()
+            self.alerts.extend(alerts)
+            self.alert_counts = {kind: int(alert_counts.get(kind, 0)) for kind in ALERT_KINDS}
+            self.alert_count = max(sum(self.alert_counts.values()), len(self.alerts))
+
+    def describe(self):
+        """Get alert totals and tracked key counts
+
+        دریافت مجموع هشدارها و تعداد کلیدهای ردیابی شده
+
+        Returns:
+            dict: Alert counts per kind and keys tracked per detector
+                  تعداد هشدارها به تفکیک نوع و تعداد کلیدهای هر تشخیص‌دهنده
+        """
+        with self._alerts_lock:
+            counts = dict(self.alert_counts)
+        return {
+            'alerts': counts,
+            'tracked_keys': {
+                VERTICAL_SCAN: len(self._vertical),
+                HORIZONTAL_SCAN: len(self._horizontal),
+                SYN_FLOOD: len(self._syn),
+                ARP_STORM: len(self._arp)
+            }
+        }
+
+    def estimate_memory(self):
+        """Estimate the memory taken by the tracked keys and their windows
+
+        تخمین حافظه مصرفی کلیدهای ردیابی شده و پنجره‌های آن‌ها
+
+        Returns:
+            int: Estimated bytes
+                 حجم تخمینی بر حسب بایت
+        """
+        keys = len(self._vertical) + len(self._horizontal) + len(self._syn) + len(self._arp)
+        values = self._vertical.values + self._horizontal.values
+        return keys * _KEY_STATE_BYTES + values * _DISTINCT_VALUE_BYTES
@@ -0,0 +1,433 @@
+"""
+Protocol Dissector Registry
+
+This module provides a pluggable registry of protocol dissectors. Dissectors
+register themselves by link-layer type, EtherType, IP protocol number or
+TCP/UDP port, and a packet is decoded by walking these dispatch tables one
+layer at a time with a single dictionary lookup per layer.
+
+ماژول رجیستری تشریح‌گرهای پروتکل
+این ماژول یک رجیستری قابل توسعه از تشریح‌گرهای پروتکل فراهم می‌کند. هر تشریح‌گر
+بر اساس نوع لایه پیوند، EtherType، شماره پروتکل IP یا پورت TCP/UDP ثبت می‌شود
+و هر بسته با پیمایش لایه به لایه این جداول و تنها یک جستجوی دیکشنری در هر لایه
+تشریح می‌شود.
+"""
+
+import time
+
+from scapy.layers.inet import IP, TCP, UDP, ICMP
+from scapy.layers.inet6 import IPv6
+from scapy.layers.l2 import Ether, ARP, Dot1Q, GRE
+from scapy.layers.dns import DNS
+from scapy.layers.vxlan import VXLAN
+
+# Dispatch table names
+# نام جداول توزیع
+LINK = 'link'
+ETHERTYPE = 'ethertype'
+IP_PROTO = 'ip_proto'
+PORT = 'port'
+
+_TRANSPORT_NAMES = {6: 'TCP', 17: 'UDP'}
+
+
+class Dissector:
+    """
+    A single protocol dissector with its own hit and timing counters
+
+    یک تشریح‌گر پروتکل به همراه شمارنده‌های تعداد و زمان مخصوص به خود
+    """
+
+    __slots__ = ('name', 'func', 'layer_cls', 'hits', 'errors', 'time_ns')
+
+    def __init__(self, name, func, layer_cls=None):
+        """Initialize the dissector
+
+        مقداردهی اولیه تشریح‌گر
+
+        Args:
+            name (str): Protocol name
+                        نام پروتکل
+            func (callable): Function called as ``func(layer, info)``. It fills
+                             ``info`` and returns ``(table, key, next_layer)``
+                             to continue dispatching, or None to stop.
+                             تابعی که لایه را تشریح کرده و لایه بعدی را برمی‌گرداند
+            layer_cls (type): Expected scapy layer class, or None to accept any
+                              کلاس لایه scapy مورد انتظار
+        """
+        self.name = name
+        self.func = func
+        self.layer_cls = layer_cls
+        self.hits = 0
+        self.errors = 0
+        self.time_ns = 0
+
+
+class DissectorRegistry:
+    """
+    Registry of protocol dissectors organised as per-layer dispatch tables
+
+    رجیستری تشریح‌گرهای پروتکل که به صورت جداول توزیع هر لایه سازماندهی شده است
+    """
+
+    def __init__(self):
+        """Initialize an empty registry
+
+        مقداردهی اولیه یک رجیستری خالی
+        """
+        self.tables = {
+            LINK: {},
+            ETHERTYPE: {},
+            IP_PROTO: {},
+            PORT: {},
+        }
+        self._dissectors = {}
+        self.summaries = {}
+
+    def register(self, table, keys, name, layer_cls=None):
+        """Decorator registering a dissector function in a dispatch table
+
+        دکوراتور ثبت یک تابع تشریح‌گر در جدول توزیع
+
+        Args:
+            table (str): One of LINK, ETHERTYPE, IP_PROTO or PORT
+                         یکی از جداول LINK، ETHERTYPE، IP_PROTO یا PORT
+            keys: A key or a list of keys to register under
+                  یک کلید یا لیستی از کلیدها
+            name (str): Protocol name
+                        نام پروتکل
+            layer_cls (type): Expected scapy layer class
+                              کلاس لایه scapy مورد انتظار
+
+        Returns:
+            callable: Decorator returning the original function
+                      دکوراتوری که تابع اصلی را برمی‌گرداند
+        """
+        if table not in self.tables:
+            raise ValueError(f"Unknown dispatch table: {table}")
+        if not isinstance(keys, (list, tuple)):
+            keys = [keys]
+
+        def decorator(func):
+            # A function registered under several keys shares one set of counters
+            dissector = self._dissectors.get(func)
+            if dissector is None:
+                dissector = Dissector(name, func, layer_cls)
+                self._dissectors[func] = dissector
+            for key in keys:
+                self.tables[table][key] = dissector
+            return func
+
+        return decorator
+
+    def summary(self, protocols):
+        """Decorator registering the function that builds a protocol's info text
+
+        Summaries are only called when a row is displayed, so dissectors can
+        keep numeric fields on the capture path and leave formatting for later.
+
+        دکوراتور ثبت تابع ساخت متن اطلاعات یک پروتکل
+
+        Args:
+            protocols: A protocol name or a list of protocol names
+                       نام یک پروتکل یا لیستی از نام‌ها
+
+        Returns:
+            callable: Decorator returning the original function
+                      دکوراتوری که تابع اصلی را برمی‌گرداند
+        """
+        if not isinstance(protocols, (list, tuple)):
+            protocols = [protocols]
+
+        def decorator(func):
+            for protocol in protocols:
+                self.summaries[protocol] = func
+            return func
+
+        return decorator
+
+    def summarize(self, info):
+        """Build the info text of a dissected packet
+
+        ساخت متن اطلاعات یک بسته تشریح شده
+
+        Args:
+            info (dict): Packet information dictionary
+                         دیکشنری اطلاعات بسته
+
+        Returns:
+            str: Human-readable summary, or an empty string
+                 خلاصه قابل خواندن، یا رشته خالی
+        """
+        func = self.summaries.get(info.get('protocol'))
+        if func is None:
+            # Application protocols named by the flow classifier use the
+            # summary of their transport
+            func = self.summaries.get(_TRANSPORT_NAMES.get(info.get('ip_proto')))
+        try:
+            text = func(info) if func is not None else ''
+        except (KeyError, TypeError, ValueError):
+            text = ''
+        app_info = info.get('app_info')
+        if app_info:
+            return f"{app_info}  {text}" if text else app_info
+        return text
+
+    def dissect(self, packet, info):
+        """Walk the dispatch tables and fill ``info`` for the given packet
+
+        پیمایش جداول توزیع و پر کردن ``info`` برای بسته داده شده
+
+        Args:
+            packet: The scapy packet to dissect
+                    بسته scapy برای تشریح
+            info (dict): Packet information dictionary to fill
+                         دیکشنری اطلاعات بسته که باید پر شود
+        """
+        tables = self.tables
+        perf_counter_ns = time.perf_counter_ns
+        table, key, layer = LINK, type(packet), packet
+
+        while True:
+            if table == PORT:
+                ports = tables[PORT]
+                dissector = ports.get(key[0]) or ports.get(key[1])
+            else:
+                dissector = tables[table].get(key)
+            if dissector is None:
+                return
+            if dissector.layer_cls is not None and not isinstance(layer, dissector.layer_cls):
+                return
+
+            start = perf_counter_ns()
+            try:
+                result = dissector.func(layer, info)
+            except Exception:
+                dissector.errors += 1
+                raise
+            finally:
+                dissector.time_ns += perf_counter_ns() - start
+                dissector.hits += 1
+
+            if result is None:
+                return
+            table, key, layer = result
+
+    def get_stats(self):
+        """Get hit and timing counters of all registered dissectors
+
+        دریافت شمارنده‌های تعداد و زمان تمام تشریح‌گرهای ثبت شده
+
+        Returns:
+            dict: Dictionary keyed by protocol name with hits, errors,
+                  total time and mean time per hit in microseconds
+                  دیکشنری با نام پروتکل به عنوان کلید و آمار آن به عنوان مقدار
+        """
+        stats = {}
+        for dissector in self._dissectors.values():
+            stats[dissector.name] = {
+                'hits': dissector.hits,
+                'errors': dissector.errors,
+                'total_us': dissector.time_ns / 1000.0,
+                'mean_us': (dissector.time_ns / dissector.hits / 1000.0) if dissector.hits else 0.0
+            }
+        return stats
+
+    def reset_stats(self):
+        """Reset the counters of all registered dissectors
+
+        صفر کردن شمارنده‌های تمام تشریح‌گرهای ثبت شده
+        """
+        for dissector in self._dissectors.values():
+            dissector.hits = 0
+            dissector.errors = 0
+            dissector.time_ns = 0
+
+
+def get_tcp_flags(flags):
+    """Convert TCP flags to string representation
+
+    تبدیل پرچم‌های TCP به نمایش متنی
+
+    Args:
+        flags: TCP flags value
+               مقدار پرچم‌های TCP
+
+    Returns:
+        str: String representation of TCP flags
+             نمایش متنی پرچم‌های TCP
+    """
+    flag_names = []
+    if flags & 0x01: flag_names.append('FIN')
+    if flags & 0x02: flag_names.append('SYN')
+    if flags & 0x04: flag_names.append('RST')
+    if flags & 0x08: flag_names.append('PSH')
+    if flags & 0x10: flag_names.append('ACK')
+    if flags & 0x20: flag_names.append('URG')
+    if flags & 0x40: flag_names.append('ECE')
+    if flags & 0x80: flag_names.append('CWR')
+
+    return ', '.join(flag_names) if flag_names else 'None'
+
+
+def create_default_registry():
+    """Create a registry populated with the built-in dissectors
+
+    ایجاد یک رجیستری شامل تشریح‌گرهای داخلی
+
+    Returns:
+        DissectorRegistry: The populated registry
+                           رجیستری پر شده
+    """
+    registry = DissectorRegistry()
+
+    # Ethernet (also used for Transparent Ethernet Bridging inside GRE)
+    @registry.register(LINK, Ether, 'Ethernet', Ether)
+    @registry.register(ETHERTYPE, 0x6558, 'Ethernet', Ether)
+    def dissect_ether(eth, info):
+        info['src_mac'] = eth.src
+        info['dst_mac'] = eth.dst
+        info['protocol'] = 'Ethernet'
+        info['ethertype'] = eth.type
+        return ETHERTYPE, eth.type, eth.payload
+
+    @registry.summary('Ethernet')
+    def summarize_ether(info):
+        vlan = f"VLAN: {', '.join(map(str, info['vlan']))}, " if 'vlan' in info else ''
+        return f"{vlan}EtherType: 0x{info['ethertype']:04x}"
+
+    # 802.1Q / 802.1ad VLAN tags
+    @registry.register(ETHERTYPE, [0x8100, 0x88a8, 0x9100], '802.1Q', Dot1Q)
+    def dissect_vlan(vlan, info):
+        info.setdefault('vlan', []).append(vlan.vlan)
+        info['ethertype'] = vlan.type
+        return ETHERTYPE, vlan.type, vlan.payload
+
+    # IPv4
+    @registry.register(ETHERTYPE, 0x0800, 'IPv4', IP)
+    @registry.register(IP_PROTO, 4, 'IPv4', IP)
+    def dissect_ipv4(ip, info):
+        info['source'] = ip.src
+        info['destination'] = ip.dst
+        info['protocol'] = 'IPv4'
+        info['ip_proto'] = ip.proto
+        return IP_PROTO, ip.proto, ip.payload
+
+    # IPv6
+    @registry.register(ETHERTYPE, 0x86dd, 'IPv6', IPv6)
+    @registry.register(IP_PROTO, 41, 'IPv6', IPv6)
+    def dissect_ipv6(ip6, info):
+        info['source'] = ip6.src
+        info['destination'] = ip6.dst
+        info['protocol'] = 'IPv6'
+        info['ip_proto'] = ip6.nh
+        return IP_PROTO, ip6.nh, ip6.payload
+
+    @registry.summary('IPv4')
+    def summarize_ipv4(info):
+        return f"Protocol: {info['ip_proto']}"
+
+    @registry.summary('IPv6')
+    def summarize_ipv6(info):
+        return f"Next Header: {info['ip_proto']}"
+
+    # ARP
+    @registry.register(ETHERTYPE, 0x0806, 'ARP', ARP)
+    def dissect_arp(arp, info):
+        info['protocol'] = 'ARP'
+        info['source'] = arp.psrc
+        info['destination'] = arp.pdst
+        info['arp_op'] = arp.op
+        info['operation'] = 'who-has' if arp.op == 1 else 'is-at'
+        return None
+
+    @registry.summary('ARP')
+    def summarize_arp(info):
+        return f"{info['arp_op']}: {info['source']} -> {info['destination']}"
+
+    # TCP
+    @registry.register(IP_PROTO, 6, 'TCP', TCP)
+    def dissect_tcp(tcp, info):
+        info['protocol'] = 'TCP'
+        info['sport'] = tcp.sport
+        info['dport'] = tcp.dport
+        info['flags'] = int(tcp.flags)
+        return PORT, (tcp.dport, tcp.sport), tcp.payload
+
+    @registry.summary('TCP')
+    def summarize_tcp(info):
+        return (f"{info['source']}:{info['sport']} -> {info['destination']}:{info['dport']} "
+                f"[{get_tcp_flags(info['flags'])}]")
+
+    # UDP
+    @registry.register(IP_PROTO, 17, 'UDP', UDP)
+    def dissect_udp(udp, info):
+        info['protocol'] = 'UDP'
+        info['sport'] = udp.sport
+        info['dport'] = udp.dport
+        return PORT, (udp.dport, udp.sport), udp.payload
+
+    @registry.summary('UDP')
+    def summarize_udp(info):
+        return f"{info['source']}:{info['sport']} -> {info['destination']}:{info['dport']}"
+
+    # ICMP
+    @registry.register(IP_PROTO, 1, 'ICMP', ICMP)
+    def dissect_icmp(icmp, info):
+        info['protocol'] = 'ICMP'
+        info['type'] = icmp.type
+        info['code'] = icmp.code
+        return None
+
+    # ICMPv6 (scapy decodes each message type into its own class)
+    @registry.register(IP_PROTO, 58, 'ICMPv6')
+    def dissect_icmpv6(icmp6, info):
+        info['protocol'] = 'ICMPv6'
+        info['type'] = icmp6.type
+        info['code'] = icmp6.code
+        return None
+
+    @registry.summary(['ICMP', 'ICMPv6'])
+    def summarize_icmp(info):
+        return f"Type: {info['type']}, Code: {info['code']}"
+
+    # GRE tunnels carry an EtherType for the encapsulated protocol
+    @registry.register(IP_PROTO, 47, 'GRE', GRE)
+    def dissect_gre(gre, info):
+        info.setdefault('tunnel', []).append('GRE')
+        info['protocol'] = 'GRE'
+        info['ethertype'] = gre.proto
+        return ETHERTYPE, gre.proto, gre.payload
+
+    @registry.summary('GRE')
+    def summarize_gre(info):
+        return f"GRE: 0x{info['ethertype']:04x}"
+
+    # VXLAN tunnels carry a full inner Ethernet frame
+    @registry.register(PORT, [4789, 8472], 'VXLAN', VXLAN)
+    def dissect_vxlan(vxlan, info):
+        info.setdefault('tunnel', []).append('VXLAN')
+        info['protocol'] = 'VXLAN'
+        info['vni'] = vxlan.vni
+        payload = vxlan.payload
+        return LINK, type(payload), payload
+
+    @registry.summary('VXLAN')
+    def summarize_vxlan(info):
+        return f"VNI: {info['vni']}"
+
+    # DNS
+    @registry.register(PORT, [53, 5353], 'DNS', DNS)
+    def dissect_dns(dns, info):
+        info['protocol'] = 'DNS'
+        info['dns_qr'] = dns.qr
+        question = dns.qd[0] if isinstance(dns.qd, list) and dns.qd else dns.qd
+        info['dns_query'] = question.qname if dns.qdcount and question else b''
+        return None
+
+    @registry.summary('DNS')
+    def summarize_dns(info):
+        query = info['dns_query'].decode(errors='replace')
+        return f"{'Response' if info['dns_qr'] else 'Query'} {query}".rstrip()
+
+    return registry
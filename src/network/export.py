@@ -0,0 +1,272 @@
+"""
+Capture Export Module
+
+This module streams captured packet metadata to Parquet or Arrow IPC files
+in fixed-size record batches with typed columns, so exports run in bounded
+memory regardless of the number of packets. Batches are built either from
+packet dictionaries or directly from the columns of the packet store.
+
+ماژول خروجی گرفتن از ضبط
+این ماژول فراداده بسته‌های ضبط شده را به صورت دسته‌های با اندازه ثابت و ستون‌های
+نوع‌دار در فایل‌های Parquet یا Arrow IPC می‌نویسد تا خروجی گرفتن صرف‌نظر از تعداد
+بسته‌ها با حافظه محدود انجام شود. دسته‌ها از دیکشنری‌های بسته یا مستقیماً از ستون‌های
+ذخیره‌ساز بسته‌ها ساخته می‌شوند.
+"""
+
+import itertools
+import os
+
+import numpy as np
+
+# Export formats
+# قالب‌های خروجی
+FORMAT_PARQUET = 'parquet'
+FORMAT_ARROW = 'arrow'
+
+_EXTENSIONS = {
+    '.parquet': FORMAT_PARQUET,
+    '.pq': FORMAT_PARQUET,
+    '.arrow': FORMAT_ARROW,
+    '.feather': FORMAT_ARROW,
+    '.ipc': FORMAT_ARROW
+}
+
+DEFAULT_CHUNK_SIZE = 65536
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow
+    except ImportError as e:
+        raise ImportError("Exporting captures requires pyarrow (pip install pyarrow)") from e
+    return pyarrow
+
+
+def export_schema():
+    """Get the Arrow schema of exported packet metadata
+
+    دریافت طرح‌واره Arrow فراداده بسته‌های خروجی
+
+    Returns:
+        pyarrow.Schema: The export schema
+                        طرح‌واره خروجی
+    """
+    pa = _require_pyarrow()
+    return pa.schema([
+        ('timestamp', pa.timestamp('us', tz='UTC')),
+        ('source', pa.string()),
+        ('destination', pa.string()),
+        ('src_mac', pa.string()),
+        ('dst_mac', pa.string()),
+        ('interface', pa.string()),
+        ('protocol', pa.string()),
+        ('ip_proto', pa.uint8()),
+        ('sport', pa.uint16()),
+        ('dport', pa.uint16()),
+        ('tcp_flags', pa.uint16()),
+        ('length', pa.uint32()),
+        ('weight', pa.uint32())
+    ])
+
+
+def guess_format(path):
+    """Guess the export format from a file name
+
+    تشخیص قالب خروجی از روی نام فایل
+
+    Args:
+        path (str): Output file path
+                    مسیر فایل خروجی
+
+    Returns:
+        str: FORMAT_PARQUET or FORMAT_ARROW
+             قالب خروجی
+    """
+    return _EXTENSIONS.get(os.path.splitext(path)[1].lower(), FORMAT_PARQUET)
+
+
+def packets_to_batch(packets, schema=None):
+    """Convert a chunk of packet dictionaries to an Arrow record batch
+
+    تبدیل دسته‌ای از دیکشنری‌های بسته به یک دسته رکورد Arrow
+
+    Args:
+        packets (list): Packet information dictionaries
+                        دیکشنری‌های اطلاعات بسته‌ها
+        schema (pyarrow.Schema): Export schema, defaults to export_schema()
+                                 طرح‌واره خروجی
+
+    Returns:
+        pyarrow.RecordBatch: The record batch
+                             دسته رکورد
+    """
+    pa = _require_pyarrow()
+    schema = schema or export_schema()
+    count = len(packets)
+
+    timestamps = np.fromiter((p['timestamp'] for p in packets), dtype=np.float64, count=count)
+    lengths = np.fromiter((p['length'] for p in packets), dtype=np.uint32, count=count)
+    weights = np.fromiter((p.get('weight', 1) for p in packets), dtype=np.uint32, count=count)
+
+    columns = [
+        pa.array((timestamps * 1e6).astype(np.int64), type=pa.int64()).cast(schema.field('timestamp').type),
+        pa.array([p['source'] or None for p in packets], type=pa.string()),
+        pa.array([p['destination'] or None for p in packets], type=pa.string()),
+        pa.array([p.get('src_mac') for p in packets], type=pa.string()),
+        pa.array([p.get('dst_mac') for p in packets], type=pa.string()),
+        pa.array([p.get('interface') for p in packets], type=pa.string()),
+        pa.array([str(p['protocol']) for p in packets], type=pa.string()),
+        pa.array([p.get('ip_proto') for p in packets], type=pa.uint8()),
+        pa.array([p.get('sport') for p in packets], type=pa.uint16()),
+        pa.array([p.get('dport') for p in packets], type=pa.uint16()),
+        pa.array([p.get('flags') for p in packets], type=pa.uint16()),
+        pa.array(lengths, type=pa.uint32()),
+        pa.array(weights, type=pa.uint32())
+    ]
+    return pa.RecordBatch.from_arrays(columns, schema=schema)
+
+
+def arrays_to_batch(arrays, schema=None):
+    """Convert a chunk of store columns to an Arrow record batch
+
+    تبدیل دسته‌ای از ستون‌های ذخیره‌ساز به یک دسته رکورد Arrow
+
+    Args:
+        arrays (dict): Columns as returned by PacketStore.arrays(), with
+                       string columns as codes plus ``<name>_categories``
+                       ستون‌ها به شکلی که PacketStore.arrays() برمی‌گرداند
+        schema (pyarrow.Schema): Export schema, defaults to export_schema()
+                                 طرح‌واره خروجی
+
+    Returns:
+        pyarrow.RecordBatch: The record batch
+                             دسته رکورد
+    """
+    pa = _require_pyarrow()
+    schema = schema or export_schema()
+
+    def strings(name):
+        # Code -1 picks the appended None, so missing values become nulls
+        categories = np.append(arrays[f'{name}_categories'], None)
+        return pa.array(categories[arrays[name]], type=pa.string())
+
+    def optional(name, arrow_type):
+        values = arrays[name]
+        return pa.array(values, mask=values < 0, type=arrow_type)
+
+    timestamps = (arrays['timestamp'] * 1e6).astype(np.int64)
+    columns = [
+        pa.array(timestamps, type=pa.int64()).cast(schema.field('timestamp').type),
+        strings('source'),
+        strings('destination'),
+        strings('src_mac'),
+        strings('dst_mac'),
+        strings('interface'),
+        strings('protocol'),
+        optional('ip_proto', pa.uint8()),
+        optional('sport', pa.uint16()),
+        optional('dport', pa.uint16()),
+        optional('tcp_flags', pa.uint16()),
+        pa.array(arrays['length'], type=pa.uint32()),
+        pa.array(arrays['weight'], type=pa.uint32())
+    ]
+    return pa.RecordBatch.from_arrays(columns, schema=schema)
+
+
+def _open_writer(path, schema, file_format, compression):
+    if file_format == FORMAT_PARQUET:
+        import pyarrow.parquet as pq
+        return pq.ParquetWriter(path, schema, compression=compression)
+    if file_format == FORMAT_ARROW:
+        import pyarrow.ipc as ipc
+        options = ipc.IpcWriteOptions(compression=compression) if compression else None
+        return ipc.new_file(path, schema, options=options)
+    raise ValueError(f"Unknown export format: {file_format}")
+
+
+def write_batches(batches, path, file_format=None, compression='zstd', progress=None):
+    """Stream record batches to a Parquet or Arrow IPC file
+
+    Each batch becomes one Parquet row group.
+
+    نوشتن جریانی دسته‌های رکورد در فایل Parquet یا Arrow IPC
+
+    Args:
+        batches (iterable): Record batches following export_schema()
+                            دسته‌های رکورد مطابق export_schema()
+        path (str): Output file path
+                    مسیر فایل خروجی
+        file_format (str): FORMAT_PARQUET or FORMAT_ARROW, guessed from the
+                           file extension when None
+                           قالب خروجی
+        compression (str): Compression codec, or None
+                           الگوریتم فشرده‌سازی
+        progress (callable): Called with the number of rows written so far
+                             تابعی که با تعداد سطرهای نوشته شده فراخوانی می‌شود
+
+    Returns:
+        int: Number of rows written
+             تعداد سطرهای نوشته شده
+    """
+    _require_pyarrow()
+    file_format = file_format or guess_format(path)
+    writer = _open_writer(path, export_schema(), file_format, compression)
+    written = 0
+
+    try:
+        for batch in batches:
+            if not batch.num_rows:
+                continue
+            if file_format == FORMAT_PARQUET:
+                writer.write_batch(batch, row_group_size=batch.num_rows)
+            else:
+                writer.write_batch(batch)
+            written += batch.num_rows
+            if progress is not None:
+                progress(written)
+    finally:
+        writer.close()
+
+    return written
+
+
+def export_packets(packets, path, file_format=None, chunk_size=DEFAULT_CHUNK_SIZE,
+                   compression='zstd', progress=None):
+    """Stream packet metadata to a Parquet or Arrow IPC file
+
+    Packets are consumed lazily from ``packets`` in chunks of ``chunk_size``
+    rows; each chunk becomes one record batch (one Parquet row group), so
+    memory use depends on the chunk size only.
+
+    نوشتن جریانی فراداده بسته‌ها در فایل Parquet یا Arrow IPC
+
+    Args:
+        packets (iterable): Packet information dictionaries
+                            دیکشنری‌های اطلاعات بسته‌ها
+        path (str): Output file path
+                    مسیر فایل خروجی
+        file_format (str): FORMAT_PARQUET or FORMAT_ARROW, guessed from the
+                           file extension when None
+                           قالب خروجی
+        chunk_size (int): Rows per record batch
+                          تعداد سطرها در هر دسته
+        compression (str): Compression codec, or None
+                           الگوریتم فشرده‌سازی
+        progress (callable): Called with the number of rows written so far
+                             تابعی که با تعداد سطرهای نوشته شده فراخوانی می‌شود
+
+    Returns:
+        int: Number of rows written
+             تعداد سطرهای نوشته شده
+    """
+    schema = export_schema()
+    iterator = iter(packets)
+
+    def batches():
+        while True:
+            chunk = list(itertools.islice(iterator, chunk_size))
+            if not chunk:
+                return
+            yield packets_to_batch(chunk, schema)
+
+    return write_batches(batches(), path, file_format, compression, progress)
@@ -0,0 +1,233 @@
+"""
+Offline GeoIP/ASN Lookup
+
+This module tags addresses with their country and autonomous system from
+local MaxMind-format (.mmdb) database files, such as GeoLite2-Country,
+GeoLite2-City and GeoLite2-ASN, without any network lookups. Results are
+kept in an LRU cache keyed by address, so repeat talkers cost a dictionary
+hit. Lookups are made lazily for displayed rows and summaries, never on the
+capture path.
+
+ماژول مکان‌یابی آفلاین GeoIP/ASN
+این ماژول کشور و سیستم خودمختار (ASN) آدرس‌ها را از فایل‌های پایگاه داده محلی با
+قالب MaxMind (.mmdb) مانند GeoLite2-Country، GeoLite2-City و GeoLite2-ASN و بدون
+هیچ درخواست شبکه‌ای تعیین می‌کند. نتایج در یک حافظه نهان LRU با کلید آدرس نگه‌داری
+می‌شوند تا آدرس‌های تکراری فقط یک جستجوی دیکشنری هزینه داشته باشند. جستجوها به صورت
+تنبل برای سطرهای نمایش داده شده و خلاصه‌ها انجام می‌شوند و هرگز در مسیر ضبط نیستند.
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_SIZE = 65536
+
+# Memory of one cached lookup, measured with tracemalloc
+_CACHE_ENTRY_BYTES = 200
+
+_MISSING = object()
+
+
+def _require_maxminddb():
+    try:
+        import maxminddb
+    except ImportError as e:
+        raise ImportError("GeoIP lookups require maxminddb (pip install maxminddb)") from e
+    return maxminddb
+
+
+class GeoIPResolver:
+    """
+    Country and ASN lookup over local MaxMind databases with an LRU cache
+
+    جستجوی کشور و ASN در پایگاه‌های داده محلی MaxMind با حافظه نهان LRU
+    """
+
+    def __init__(self, paths=(), cache_size=DEFAULT_CACHE_SIZE):
+        """Initialize the resolver
+
+        مقداردهی اولیه مکان‌یاب
+
+        Args:
+            paths (iterable): Database files to open, see add_database()
+                              فایل‌های پایگاه داده برای باز کردن
+            cache_size (int): Maximum number of addresses cached
+                              حداکثر تعداد آدرس‌های نگه‌داشته شده در حافظه نهان
+        """
+        self.cache_size = cache_size
+        self.country_readers = []
+        self.asn_readers = []
+        self.hits = 0
+        self.misses = 0
+        # Bumped whenever the databases change, so memoized labels can expire
+        self.generation = 0
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        for path in paths:
+            self.add_database(path)
+
+    def add_database(self, path):
+        """Open a MaxMind database file
+
+        ASN databases are recognised by their database type; every other
+        database is read for the country.
+
+        باز کردن یک فایل پایگاه داده MaxMind
+
+        Args:
+            path (str): Path of the .mmdb file
+                        مسیر فایل .mmdb
+
+        Returns:
+            str: The database type, e.g. 'GeoLite2-ASN'
+                 نوع پایگاه داده
+
+        Raises:
+            ImportError: If maxminddb is not installed
+                         در صورت نصب نبودن maxminddb
+            Exception: If the file is not a valid database
+                       در صورت نامعتبر بودن فایل
+        """
+        maxminddb = _require_maxminddb()
+        reader = maxminddb.open_database(path, maxminddb.MODE_AUTO)
+        database_type = reader.metadata().database_type
+        if 'ASN' in database_type.upper():
+            self.asn_readers.append(reader)
+        else:
+            self.country_readers.append(reader)
+        self.clear_cache()
+        logger.info(f"Loaded GeoIP database {path} ({database_type})")
+        return database_type
+
+    @property
+    def loaded(self):
+        """Whether any database is open
+
+        آیا پایگاه داده‌ای باز است
+        """
+        return bool(self.country_readers or self.asn_readers)
+
+    def lookup(self, address):
+        """Get the country and autonomous system of an address
+
+        دریافت کشور و سیستم خودمختار یک آدرس
+
+        Args:
+            address (str): IPv4 or IPv6 address
+                           آدرس IPv4 یا IPv6
+
+        Returns:
+            dict: Dictionary with ``country`` (ISO code), ``asn`` and
+                  ``organization``, or None for unknown, private and non-IP
+                  addresses
+                  دیکشنری شامل کشور، ASN و سازمان، یا None برای آدرس‌های ناشناخته
+        """
+        cache = self._cache
+        with self._lock:
+            location = cache.get(address, _MISSING)
+            if location is not _MISSING:
+                cache.move_to_end(address)
+                self.hits += 1
+                return location
+            self.misses += 1
+            generation = self.generation
+
+        location = self._resolve(address)
+
+        with self._lock:
+            # A database added or the cache cleared meanwhile makes the
+            # result stale; return it but do not keep it
+            if self.generation == generation:
+                cache[address] = location
+                if len(cache) > self.cache_size:
+                    cache.popitem(last=False)
+        return location
+
+    def _resolve(self, address):
+        country = asn = organization = None
+        try:
+            for reader in self.country_readers:
+                record = reader.get(address)
+                if record:
+                    country = (record.get('country') or record.get('registered_country') or {}).get('iso_code')
+                    if country:
+                        break
+            for reader in self.asn_readers:
+                record = reader.get(address)
+                if record:
+                    asn = record.get('autonomous_system_number')
+                    organization = record.get('autonomous_system_organization')
+                    break
+        except (ValueError, TypeError):
+            # Not an IP address (e.g. a MAC address of a non-IP frame)
+            return None
+        if country is None and asn is None:
+            return None
+        return {'country': country, 'asn': asn, 'organization': organization}
+
+    def describe(self, address):
+        """Get a short location label such as 'DE, AS3320'
+
+        دریافت برچسب کوتاه مکان
+
+        Args:
+            address (str): IPv4 or IPv6 address
+                           آدرس IPv4 یا IPv6
+
+        Returns:
+            str: Location label, or '' if unknown
+                 برچسب مکان
+        """
+        location = self.lookup(address)
+        if location is None:
+            return ''
+        parts = []
+        if location['country']:
+            parts.append(location['country'])
+        if location['asn']:
+            parts.append(f"AS{location['asn']}")
+        return ', '.join(parts)
+
+    def clear_cache(self):
+        """Forget all cached lookups
+
+        پاک کردن تمام جستجوهای نگه‌داشته شده
+        """
+        with self._lock:
+            self._cache.clear()
+            self.generation += 1
+
+    def get_stats(self):
+        """Get the cache counters
+
+        دریافت شمارنده‌های حافظه نهان
+
+        Returns:
+            dict: Dictionary with ``hits``, ``misses`` and cached ``entries``
+                  دیکشنری شامل تعداد موفق، ناموفق و ورودی‌های حافظه نهان
+        """
+        return {'hits': self.hits, 'misses': self.misses, 'entries': len(self._cache)}
+
+    def estimate_memory(self):
+        """Estimate the memory taken by the lookup cache
+
+        تخمین حافظه مصرفی حافظه نهان جستجوها
+
+        Returns:
+            int: Estimated bytes
+                 حجم تخمینی بر حسب بایت
+        """
+        return len(self._cache) * _CACHE_ENTRY_BYTES
+
+    def close(self):
+        """Close all databases
+
+        بستن تمام پایگاه‌های داده
+        """
+        for reader in self.country_readers + self.asn_readers:
+            reader.close()
+        self.country_readers = []
+        self.asn_readers = []
+        self.clear_cache()
@@ -0,0 +1,158 @@
+"""
+Time-Ordered Stream Merge
+
+This module merges several packet streams, each already in timestamp order,
+into one timeline. Records are buffered per stream and released through a
+heap once no open stream can still deliver an earlier record; a lag bound
+keeps a silent stream from holding the others back forever.
+
+ماژول ادغام زمان‌مرتب جریان‌ها
+این ماژول چند جریان بسته را که هر کدام به ترتیب زمانی هستند در یک خط زمانی واحد
+ادغام می‌کند. رکوردها برای هر جریان بافر شده و زمانی از طریق هیپ آزاد می‌شوند که
+هیچ جریان بازی نتواند رکورد زودتری تحویل دهد؛ یک کران تأخیر مانع می‌شود که جریان
+ساکت، بقیه را برای همیشه متوقف کند.
+"""
+
+import heapq
+import threading
+from collections import deque
+
+
+class StreamMerger:
+    """
+    Heap-based merge of timestamp-ordered packet streams
+
+    ادغام مبتنی بر هیپ جریان‌های بسته مرتب بر اساس زمان
+    """
+
+    def __init__(self, max_lag=1.0):
+        """Initialize the merger
+
+        مقداردهی اولیه ادغام‌کننده
+
+        Args:
+            max_lag (float): Seconds of capture time a stream may lag behind
+                             the newest record before it stops holding back
+                             the merge, or None to always wait
+                             حداکثر تأخیر مجاز یک جریان بر حسب ثانیه
+        """
+        self.max_lag = max_lag
+        self._pending = {}
+        self._latest = {}
+        self._open = set()
+        self._lock = threading.Lock()
+
+    def add_stream(self, stream):
+        """Register a stream that will deliver records
+
+        ثبت جریانی که رکورد تحویل خواهد داد
+
+        Args:
+            stream: Hashable stream identifier
+                    شناسه جریان
+        """
+        with self._lock:
+            self._pending.setdefault(stream, deque())
+            self._latest.setdefault(stream, None)
+            self._open.add(stream)
+
+    def remove_stream(self, stream):
+        """Mark a stream as finished; its buffered records are still released
+
+        علامت‌گذاری پایان یک جریان؛ رکوردهای بافر شده آن همچنان آزاد می‌شوند
+
+        Args:
+            stream: Stream identifier
+                    شناسه جریان
+        """
+        with self._lock:
+            self._open.discard(stream)
+
+    @property
+    def streams(self):
+        """Identifiers of the open streams
+
+        شناسه‌های جریان‌های باز
+        """
+        with self._lock:
+            return set(self._open)
+
+    def pending(self):
+        """Number of buffered records
+
+        تعداد رکوردهای بافر شده
+        """
+        with self._lock:
+            return sum(len(records) for records in self._pending.values())
+
+    def push(self, stream, records):
+        """Buffer records of one stream
+
+        بافر کردن رکوردهای یک جریان
+
+        Args:
+            stream: Stream identifier
+                    شناسه جریان
+            records (list): Packet dictionaries in timestamp order
+                            دیکشنری‌های بسته به ترتیب زمانی
+        """
+        if not records:
+            return
+        with self._lock:
+            if stream not in self._pending:
+                self._pending[stream] = deque()
+                self._open.add(stream)
+            self._pending[stream].extend(records)
+            self._latest[stream] = records[-1]['timestamp']
+
+    def _watermark(self):
+        if not self._open:
+            return float('inf')
+        latest = [self._latest.get(stream) for stream in self._open]
+        known = [timestamp for timestamp in latest if timestamp is not None]
+        newest = max((t for t in self._latest.values() if t is not None), default=None)
+        if newest is None:
+            return None
+        watermark = min(known) if len(known) == len(latest) and known else float('-inf')
+        if self.max_lag is not None:
+            watermark = max(watermark, newest - self.max_lag)
+        return watermark
+
+    def pop_ready(self, flush=False):
+        """Release the records that can no longer be preceded by another one
+
+        آزاد کردن رکوردهایی که دیگر رکورد زودتری پیش از آن‌ها نخواهد آمد
+
+        Args:
+            flush (bool): Release everything buffered regardless of open streams
+                          آزاد کردن همه رکوردهای بافر شده
+
+        Returns:
+            list: Packet dictionaries in timestamp order
+                  دیکشنری‌های بسته به ترتیب زمانی
+        """
+        with self._lock:
+            watermark = float('inf') if flush else self._watermark()
+            if watermark is None:
+                return []
+
+            pending = self._pending
+            heap = [(records[0]['timestamp'], order, stream)
+                    for order, (stream, records) in enumerate(pending.items()) if records]
+            heapq.heapify(heap)
+
+            ready = []
+            while heap and heap[0][0] <= watermark:
+                _, order, stream = heap[0]
+                records = pending[stream]
+                ready.append(records.popleft())
+                if records:
+                    heapq.heapreplace(heap, (records[0]['timestamp'], order, stream))
+                else:
+                    heapq.heappop(heap)
+
+            # Forget finished streams once drained
+            for stream in [s for s, records in pending.items() if not records and s not in self._open]:
+                del pending[stream]
+                del self._latest[stream]
+            return ready
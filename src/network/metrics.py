@@ -0,0 +1,303 @@
+"""
+Capture Pipeline Metrics
+
+This module provides low-overhead counters, gauges and latency histograms
+used to instrument the capture pipeline and the GUI refresh loop.
+
+ماژول معیارهای خط لوله ضبط
+این ماژول شمارنده‌ها، سنجه‌ها و هیستوگرام‌های تأخیر کم‌هزینه را برای
+اندازه‌گیری خط لوله ضبط و حلقه به‌روزرسانی رابط کاربری فراهم می‌کند.
+"""
+
+import threading
+
+
+class Counter:
+    """
+    A monotonically increasing counter
+
+    یک شمارنده صعودی
+    """
+
+    __slots__ = ('value',)
+
+    def __init__(self):
+        """Initialize the counter
+
+        مقداردهی اولیه شمارنده
+        """
+        self.value = 0
+
+    def inc(self, amount=1):
+        """Increase the counter
+
+        افزایش شمارنده
+
+        Args:
+            amount (int): Amount to add
+                          مقدار افزایش
+        """
+        self.value += amount
+
+    def reset(self):
+        """Reset the counter to zero
+
+        صفر کردن شمارنده
+        """
+        self.value = 0
+
+    def snapshot(self):
+        """Get the current value
+
+        دریافت مقدار فعلی
+
+        Returns:
+            int: Current value
+                 مقدار فعلی
+        """
+        return self.value
+
+
+class Gauge:
+    """
+    A value that goes up and down, with its high-water mark
+
+    مقداری که کم و زیاد می‌شود به همراه بیشینه آن
+    """
+
+    __slots__ = ('value', 'max')
+
+    def __init__(self):
+        """Initialize the gauge
+
+        مقداردهی اولیه سنجه
+        """
+        self.value = 0
+        self.max = 0
+
+    def set(self, value):
+        """Set the current value
+
+        تنظیم مقدار فعلی
+
+        Args:
+            value: New value
+                   مقدار جدید
+        """
+        self.value = value
+        if value > self.max:
+            self.max = value
+
+    def reset(self):
+        """Reset the gauge and its high-water mark
+
+        صفر کردن سنجه و بیشینه آن
+        """
+        self.value = 0
+        self.max = 0
+
+    def snapshot(self):
+        """Get the current value and high-water mark
+
+        دریافت مقدار فعلی و بیشینه
+
+        Returns:
+            dict: Dictionary with ``value`` and ``max``
+                  دیکشنری شامل ``value`` و ``max``
+        """
+        return {'value': self.value, 'max': self.max}
+
+
+class LatencyHistogram:
+    """
+    Latency histogram in nanoseconds with power-of-two buckets
+
+    Recording a sample is a ``bit_length`` and a list increment, so it can be
+    used on the per-packet path. Percentiles are reported as the upper bound
+    of the bucket that contains them.
+
+    هیستوگرام تأخیر بر حسب نانوثانیه با بازه‌های توان دو
+    """
+
+    __slots__ = ('buckets', 'count', 'total', 'max')
+
+    BUCKETS = 64
+
+    def __init__(self):
+        """Initialize the histogram
+
+        مقداردهی اولیه هیستوگرام
+        """
+        self.buckets = [0] * self.BUCKETS
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def observe(self, value_ns):
+        """Record one sample
+
+        ثبت یک نمونه
+
+        Args:
+            value_ns (int): Sample value in nanoseconds
+                            مقدار نمونه بر حسب نانوثانیه
+        """
+        if value_ns < 0:
+            value_ns = 0
+        self.buckets[min(value_ns.bit_length(), self.BUCKETS - 1)] += 1
+        self.count += 1
+        self.total += value_ns
+        if value_ns > self.max:
+            self.max = value_ns
+
+    def percentile(self, fraction):
+        """Get an approximate percentile
+
+        دریافت صدک تقریبی
+
+        Args:
+            fraction (float): Percentile as a fraction between 0 and 1
+                              صدک به صورت کسری بین ۰ و ۱
+
+        Returns:
+            int: Upper bound of the bucket containing the percentile, in nanoseconds
+                 کران بالای بازه شامل صدک بر حسب نانوثانیه
+        """
+        if not self.count:
+            return 0
+        rank = fraction * self.count
+        seen = 0
+        for index, hits in enumerate(self.buckets):
+            seen += hits
+            if seen >= rank and hits:
+                return min((1 << index) - 1, self.max) if index else 0
+        return self.max
+
+    def reset(self):
+        """Clear all samples
+
+        پاک کردن تمام نمونه‌ها
+        """
+        self.buckets = [0] * self.BUCKETS
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def snapshot(self):
+        """Get a summary of the recorded samples in microseconds
+
+        دریافت خلاصه نمونه‌های ثبت شده بر حسب میکروثانیه
+
+        Returns:
+            dict: Dictionary with count, mean, p50, p90, p99 and max
+                  دیکشنری شامل تعداد، میانگین، صدک‌ها و بیشینه
+        """
+        return {
+            'count': self.count,
+            'mean_us': (self.total / self.count / 1000.0) if self.count else 0.0,
+            'p50_us': self.percentile(0.50) / 1000.0,
+            'p90_us': self.percentile(0.90) / 1000.0,
+            'p99_us': self.percentile(0.99) / 1000.0,
+            'max_us': self.max / 1000.0
+        }
+
+
+class MetricsRegistry:
+    """
+    Named collection of counters, gauges and histograms
+
+    Metrics are created once and then updated without any locking of their
+    own; updates come from a single thread per metric, or are serialized by
+    the caller (the capture threads of several interfaces share one lock),
+    and readers only take snapshots.
+
+    مجموعه‌ای نام‌گذاری شده از شمارنده‌ها، سنجه‌ها و هیستوگرام‌ها
+    """
+
+    def __init__(self):
+        """Initialize an empty registry
+
+        مقداردهی اولیه یک رجیستری خالی
+        """
+        self._lock = threading.Lock()
+        self.counters = {}
+        self.gauges = {}
+        self.histograms = {}
+
+    def _get(self, collection, name, factory):
+        metric = collection.get(name)
+        if metric is None:
+            with self._lock:
+                metric = collection.setdefault(name, factory())
+        return metric
+
+    def counter(self, name):
+        """Get or create a counter
+
+        دریافت یا ایجاد یک شمارنده
+
+        Args:
+            name (str): Metric name
+                        نام معیار
+
+        Returns:
+            Counter: The counter
+                     شمارنده
+        """
+        return self._get(self.counters, name, Counter)
+
+    def gauge(self, name):
+        """Get or create a gauge
+
+        دریافت یا ایجاد یک سنجه
+
+        Args:
+            name (str): Metric name
+                        نام معیار
+
+        Returns:
+            Gauge: The gauge
+                   سنجه
+        """
+        return self._get(self.gauges, name, Gauge)
+
+    def histogram(self, name):
+        """Get or create a latency histogram
+
+        دریافت یا ایجاد یک هیستوگرام تأخیر
+
+        Args:
+            name (str): Metric name
+                        نام معیار
+
+        Returns:
+            LatencyHistogram: The histogram
+                              هیستوگرام
+        """
+        return self._get(self.histograms, name, LatencyHistogram)
+
+    def reset(self):
+        """Reset all metrics
+
+        صفر کردن تمام معیارها
+        """
+        with self._lock:
+            for collection in (self.counters, self.gauges, self.histograms):
+                for metric in collection.values():
+                    metric.reset()
+
+    def snapshot(self):
+        """Get a snapshot of all metrics
+
+        دریافت تصویری از تمام معیارها
+
+        Returns:
+            dict: Dictionary with ``counters``, ``gauges`` and ``histograms``
+                  دیکشنری شامل شمارنده‌ها، سنجه‌ها و هیستوگرام‌ها
+        """
+        with self._lock:
+            return {
+                'counters': {name: metric.snapshot() for name, metric in self.counters.items()},
+                'gauges': {name: metric.snapshot() for name, metric in self.gauges.items()},
+                'histograms': {name: metric.snapshot() for name, metric in self.histograms.items()}
+            }
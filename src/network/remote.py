@@ -0,0 +1,705 @@
+"""
+Remote Sensor and Collector Module
+
+This module lets headless sensors stream compact packet summaries to a
+central collector over TCP. A sensor reads new rows straight from the
+columns of its packet store, packs them as little-endian arrays together
+with the strings (addresses, protocols) interned since the previous batch,
+compresses the batch with zlib and sends it. The collector acknowledges
+every batch; when the connection drops the sensor reconnects with backoff and
+resends from the oldest packet not acknowledged yet, and the collector skips
+the rows it already has.
+The collector merges the sensor streams by timestamp and feeds the result
+into a NetworkSniffer, so the GUI can browse the combined capture.
+
+ماژول حسگر راه دور و جمع‌آوری‌کننده
+این ماژول به حسگرهای بدون رابط کاربری اجازه می‌دهد خلاصه فشرده بسته‌ها را از طریق
+TCP به یک جمع‌آوری‌کننده مرکزی ارسال کنند. حسگر سطرهای جدید را مستقیماً از
+ستون‌های ذخیره‌ساز می‌خواند، آن‌ها را همراه با رشته‌های جدید در دسته‌های فشرده شده با
+zlib ارسال می‌کند. جمع‌آوری‌کننده دریافت هر دسته را تأیید می‌کند و در صورت قطع اتصال،
+حسگر دوباره متصل شده و ارسال را از قدیمی‌ترین بسته تأیید نشده از سر می‌گیرد.
+جمع‌آوری‌کننده جریان‌های حسگرها را بر اساس زمان ادغام کرده و به یک NetworkSniffer
+می‌دهد تا رابط کاربری بتواند ضبط ترکیبی را مرور کند.
+"""
+
+import json
+import logging
+import select
+import socket
+import struct
+import threading
+import time
+import uuid
+import zlib
+
+import numpy as np
+
+from .merge import StreamMerger
+from .store import NUMERIC_COLUMNS, STRING_COLUMNS
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PORT = 47800
+PROTOCOL_VERSION = 3
+
+# Message framing: magic, message type, flags, payload length
+# قالب پیام: شناسه، نوع پیام، پرچم‌ها، طول محتوا
+_FRAME = struct.Struct('!4sBBI')
+_MAGIC = b'NSRB'
+MSG_HELLO = 1
+MSG_BATCH = 2
+MSG_ACK = 3
+FLAG_ZLIB = 0x01
+MAX_PAYLOAD = 64 * 1024 * 1024
+
+# Acknowledgement: sequence number of the first packet not received yet
+# تأیید دریافت: شماره ترتیب اولین بسته‌ای که هنوز دریافت نشده است
+_ACK = struct.Struct('<q')
+
+# Batch layout: first sequence number and row count, then per string column
+# the code of its first new string and the number of new strings, then the
+# columns as little-endian arrays
+# ساختار دسته: شماره ترتیب اول و تعداد سطرها، رشته‌های جدید هر ستون متنی و سپس ستون‌ها
+_BATCH_HEADER = struct.Struct('<qI')
+_STRINGS_HEADER = struct.Struct('<II')
+_STRING_LENGTH = struct.Struct('<H')
+
+WIRE_COLUMNS = tuple(name for name in NUMERIC_COLUMNS if name != 'seq') + STRING_COLUMNS
+WIRE_DTYPES = {name: np.dtype(NUMERIC_COLUMNS.get(name, np.int32)).newbyteorder('<') for name in WIRE_COLUMNS}
+
+# Optional numeric columns and their packet dictionary keys
+# ستون‌های عددی اختیاری و کلید آن‌ها در دیکشنری بسته
+_OPTIONAL_KEYS = (('ip_proto', 'ip_proto'), ('sport', 'sport'), ('dport', 'dport'), ('tcp_flags', 'flags'))
+
+
+class ProtocolError(Exception):
+    """Raised when a peer sends malformed data
+
+    در صورت دریافت داده نامعتبر از طرف مقابل ایجاد می‌شود
+    """
+
+
+def send_message(sock, msg_type, payload, compress_level=None):
+    """Send one framed message
+
+    ارسال یک پیام قاب‌بندی شده
+
+    Args:
+        sock (socket.socket): Connected socket
+                              سوکت متصل
+        msg_type (int): MSG_HELLO, MSG_BATCH or MSG_ACK
+                        نوع پیام
+        payload (bytes): Message payload
+                         محتوای پیام
+        compress_level (int): zlib level, or None to send uncompressed
+                              سطح فشرده‌سازی zlib
+
+    Returns:
+        int: Number of bytes sent
+             تعداد بایت‌های ارسال شده
+    """
+    flags = 0
+    if compress_level is not None:
+        payload = zlib.compress(payload, compress_level)
+        flags |= FLAG_ZLIB
+    sock.sendall(_FRAME.pack(_MAGIC, msg_type, flags, len(payload)) + payload)
+    return _FRAME.size + len(payload)
+
+
+def _recv_exact(sock, size):
+    chunks = []
+    while size:
+        chunk = sock.recv(min(size, 1 << 20))
+        if not chunk:
+            raise ConnectionError("Connection closed by peer")
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b''.join(chunks)
+
+
+def recv_message(sock):
+    """Receive one framed message
+
+    دریافت یک پیام قاب‌بندی شده
+
+    Args:
+        sock (socket.socket): Connected socket
+                              سوکت متصل
+
+    Returns:
+        tuple: (msg_type, payload, wire_size)
+               (نوع پیام، محتوا، اندازه ارسالی)
+
+    Raises:
+        ProtocolError: If the frame is malformed
+                       در صورت نامعتبر بودن قاب
+        ConnectionError: If the connection is closed
+                         در صورت بسته شدن اتصال
+    """
+    magic, msg_type, flags, length = _FRAME.unpack(_recv_exact(sock, _FRAME.size))
+    if magic != _MAGIC:
+        raise ProtocolError("Bad frame magic")
+    if length > MAX_PAYLOAD:
+        raise ProtocolError(f"Frame too large: {length} bytes")
+    payload = _recv_exact(sock, length)
+    if flags & FLAG_ZLIB:
+        try:
+            payload = zlib.decompress(payload)
+        except zlib.error as e:
+            raise ProtocolError(f"Bad compressed payload: {e}") from e
+    return msg_type, payload, _FRAME.size + length
+
+
+def encode_batch(first_seq, arrays, new_strings):
+    """Pack a range of store columns into a batch payload
+
+    بسته‌بندی بازه‌ای از ستون‌های ذخیره‌ساز در محتوای یک دسته
+
+    Args:
+        first_seq (int): Sequence number of the first row
+                         شماره ترتیب اولین سطر
+        arrays (dict): WIRE_COLUMNS arrays of equal length
+                       آرایه‌های ستون‌های ارسالی
+        new_strings (dict): For each string column, (base, values) with the
+                            strings interned since the previous batch
+                            رشته‌های جدید هر ستون متنی
+
+    Returns:
+        bytes: The batch payload
+               محتوای دسته
+    """
+    count = len(arrays['timestamp'])
+    parts = [_BATCH_HEADER.pack(first_seq, count)]
+    for name in STRING_COLUMNS:
+        base, values = new_strings[name]
+        parts.append(_STRINGS_HEADER.pack(base, len(values)))
+        for value in values:
+            data = value.encode('utf-8')[:0xffff]
+            parts.append(_STRING_LENGTH.pack(len(data)))
+            parts.append(data)
+    for name in WIRE_COLUMNS:
+        parts.append(arrays[name].astype(WIRE_DTYPES[name], copy=False).tobytes())
+    return b''.join(parts)
+
+
+def decode_batch(payload, tables):
+    """Unpack a batch payload
+
+    باز کردن محتوای یک دسته
+
+    Args:
+        payload (bytes): The batch payload
+                         محتوای دسته
+        tables (dict): Per string column list of strings received so far on
+                       this connection; updated in place
+                       فهرست رشته‌های دریافت شده هر ستون متنی که به‌روزرسانی می‌شود
+
+    Returns:
+        tuple: (first_seq, columns) with the columns as NumPy arrays
+               (شماره ترتیب اول، ستون‌ها)
+
+    Raises:
+        ProtocolError: If the payload is malformed
+                       در صورت نامعتبر بودن محتوا
+    """
+    try:
+        first_seq, count = _BATCH_HEADER.unpack_from(payload, 0)
+        offset = _BATCH_HEADER.size
+        for name in STRING_COLUMNS:
+            base, new = _STRINGS_HEADER.unpack_from(payload, offset)
+            offset += _STRINGS_HEADER.size
+            table = tables[name]
+            if base == 0:
+                table.clear()
+            elif base != len(table):
+                raise ProtocolError(f"String table {name} out of sync")
+            for _ in range(new):
+                (length,) = _STRING_LENGTH.unpack_from(payload, offset)
+                offset += _STRING_LENGTH.size
+                table.append(payload[offset:offset + length].decode('utf-8', errors='replace'))
+                offset += length
+
+        columns = {}
+        for name in WIRE_COLUMNS:
+            dtype = WIRE_DTYPES[name]
+            columns[name] = np.frombuffer(payload, dtype, count, offset)
+            offset += count * dtype.itemsize
+    except (struct.error, ValueError) as e:
+        raise ProtocolError(f"Truncated batch: {e}") from e
+    return first_seq, columns
+
+
+def batch_to_packets(columns, tables, sensor):
+    """Build packet dictionaries from decoded batch columns
+
+    ساخت دیکشنری‌های بسته از ستون‌های دسته باز شده
+
+    Args:
+        columns (dict): Columns returned by decode_batch()
+                        ستون‌های بازگردانده شده توسط decode_batch()
+        tables (dict): Per string column list of strings
+                       فهرست رشته‌های هر ستون متنی
+        sensor (str): Name of the sending sensor
+                      نام حسگر فرستنده
+
+    Returns:
+        list: Packet information dictionaries tagged with ``sensor``
+              دیکشنری‌های اطلاعات بسته با برچسب حسگر
+    """
+    lists = {name: column.tolist() for name, column in columns.items()}
+    strings = {name: tables[name] for name in STRING_COLUMNS}
+    packets = []
+    for row in range(len(lists['timestamp'])):
+        codes = {name: lists[name][row] for name in STRING_COLUMNS}
+        info = {
+            'timestamp': lists['timestamp'][row],
+            'length': lists['length'][row],
+            'weight': lists['weight'][row],
+            'source': strings['source'][codes['source']] if codes['source'] >= 0 else '',
+            'destination': strings['destination'][codes['destination']] if codes['destination'] >= 0 else '',
+            'protocol': strings['protocol'][codes['protocol']] if codes['protocol'] >= 0 else 'Unknown',
+            'sensor': sensor
+        }
+        for name in ('src_mac', 'dst_mac', 'interface'):
+            if codes[name] >= 0:
+                info[name] = strings[name][codes[name]]
+        for column, key in _OPTIONAL_KEYS:
+            value = lists[column][row]
+            if value >= 0:
+                info[key] = value
+        packets.append(info)
+    return packets
+
+
+class SensorClient:
+    """
+    Streams the packets of a local sniffer to a remote collector
+
+    ارسال بسته‌های یک اسنیفر محلی به جمع‌آوری‌کننده راه دور
+    """
+
+    def __init__(self, sniffer, host, port=DEFAULT_PORT, name=None, interval=0.5, batch_size=4096,
+                 compress_level=1, reconnect_delay=1.0, max_reconnect_delay=30.0, connect_timeout=5.0):
+        """Initialize the sensor client
+
+        مقداردهی اولیه کلاینت حسگر
+
+        Args:
+            sniffer (NetworkSniffer): Sniffer whose stored packets are sent
+                                      اسنیفری که بسته‌های ذخیره شده آن ارسال می‌شود
+            host (str): Collector host
+                        میزبان جمع‌آوری‌کننده
+            port (int): Collector port
+                        پورت جمع‌آوری‌کننده
+            name (str): Sensor name shown by the collector, defaults to the host name
+                        نام حسگر
+            interval (float): Seconds between batches
+                              فاصله بین دسته‌ها بر حسب ثانیه
+            batch_size (int): Maximum rows per batch
+                              حداکثر تعداد سطرها در هر دسته
+            compress_level (int): zlib level, or None to disable compression
+                                  سطح فشرده‌سازی zlib
+            reconnect_delay (float): Initial seconds to wait before reconnecting
+                                     مدت انتظار اولیه برای اتصال مجدد
+            max_reconnect_delay (float): Upper bound of the exponential backoff
+                                         حداکثر مدت انتظار برای اتصال مجدد
+            connect_timeout (float): Seconds to wait for a connection
+                                     مدت انتظار برای برقراری اتصال
+        """
+        self.sniffer = sniffer
+        self.host = host
+        self.port = port
+        self.name = name or socket.gethostname()
+        self.interval = interval
+        self.batch_size = batch_size
+        self.compress_level = compress_level
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.connect_timeout = connect_timeout
+
+        self.connected = False
+        self.batches_sent = 0
+        self.packets_sent = 0
+        self.packets_resent = 0
+        self.packets_lost = 0
+        self.bytes_sent = 0
+        self.raw_bytes = 0
+        self.reconnects = 0
+
+        self._sock = None
+        # Identifies this stream to the collector across reconnects
+        self._run_id = uuid.uuid4().hex
+        # Next packet to send, and first packet the collector has not acknowledged
+        self._next_seq = None
+        self._acked_seq = None
+        self._tables = {}
+        self._sent_strings = {}
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Start streaming in a background thread
+
+        شروع ارسال در یک نخ پس‌زمینه
+
+        Returns:
+            SensorClient: This client, for chaining
+                          همین کلاینت
+        """
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='sensor-client', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout=5.0):
+        """Send what is left and stop streaming
+
+        ارسال باقی‌مانده بسته‌ها و توقف ارسال
+
+        Args:
+            timeout (float): Seconds to wait for the worker thread
+                             مدت انتظار برای نخ ارسال
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def stats(self):
+        """Get transfer statistics
+
+        دریافت آمار انتقال
+
+        Returns:
+            dict: Connection state and batch, packet and byte counters;
+                  ``resent`` counts packets sent again after a reconnect,
+                  ``lost`` packets evicted before the collector acknowledged
+                  them and ``raw_bytes`` is the size before compression
+                  وضعیت اتصال و شمارنده‌های دسته، بسته و بایت
+        """
+        return {
+            'name': self.name,
+            'collector': f"{self.host}:{self.port}",
+            'connected': self.connected,
+            'batches': self.batches_sent,
+            'packets': self.packets_sent,
+            'resent': self.packets_resent,
+            'lost': self.packets_lost,
+            'bytes': self.bytes_sent,
+            'raw_bytes': self.raw_bytes,
+            'reconnects': self.reconnects
+        }
+
+    def _run(self):
+        delay = self.reconnect_delay
+        while not self._stop.is_set():
+            try:
+                self._connect()
+                delay = self.reconnect_delay
+                while not self._stop.wait(self.interval):
+                    self._send_pending()
+                self._send_pending()
+                self._wait_for_acks()
+            except (OSError, ProtocolError, ValueError) as e:
+                # ValueError: select() on a socket closed under the client
+                logger.warning(f"Sensor connection to {self.host}:{self.port} failed: {e}")
+                self._close()
+                self.reconnects += 1
+                self._stop.wait(delay)
+                delay = min(delay * 2, self.max_reconnect_delay)
+        self._close()
+
+    def _connect(self):
+        self._sock = socket.create_connection((self.host, self.port), timeout=self.connect_timeout)
+        self._sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        hello = json.dumps({'sensor': self.name, 'version': PROTOCOL_VERSION, 'run': self._run_id}).encode('utf-8')
+        send_message(self._sock, MSG_HELLO, hello)
+        # The collector starts with empty string tables on every connection
+        self._tables = {}
+        self._sent_strings = {}
+        # Batches still in flight when the connection dropped are sent again
+        if self._next_seq is not None and self._next_seq > self._acked_seq:
+            self.packets_resent += self._next_seq - self._acked_seq
+            self._next_seq = self._acked_seq
+        self.connected = True
+        logger.info(f"Sensor {self.name} connected to {self.host}:{self.port}")
+
+    def _close(self):
+        self.connected = False
+        if self._sock is not None:
+            try:
+                self._sock.close()
+            except OSError:
+                pass
+            self._sock = None
+
+    def _receive_acks(self, timeout=0):
+        # Acknowledgements are small and arrive in whole frames; read those
+        # that have arrived, waiting at most ``timeout`` for the first one
+        while select.select([self._sock], [], [], timeout)[0]:
+            msg_type, payload, _ = recv_message(self._sock)
+            if msg_type == MSG_ACK:
+                (acked,) = _ACK.unpack(payload)
+                self._acked_seq = max(self._acked_seq, acked)
+            timeout = 0
+
+    def _wait_for_acks(self):
+        # Give the collector a moment to acknowledge the last batches
+        deadline = time.monotonic() + self.connect_timeout
+        while self._next_seq is not None and self._acked_seq < self._next_seq:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            self._receive_acks(remaining)
+
+    def _send_pending(self):
+        while True:
+            if self._next_seq is not None:
+                self._receive_acks()
+            with self.sniffer.lock:
+                store = self.sniffer.store
+                if self._next_seq is None:
+                    self._next_seq = self._acked_seq = store.first_seq
+                if self._next_seq < store.first_seq:
+                    # Evicted before the collector acknowledged it, e.g. while
+                    # disconnected
+                    self.packets_lost += store.first_seq - self._next_seq
+                    self._next_seq = self._acked_seq = store.first_seq
+                if self._next_seq >= store.next_seq:
+                    return
+                arrays = store.seq_range_arrays(self._next_seq, self.batch_size, WIRE_COLUMNS, categories=False)
+                new_strings = {}
+                for name in STRING_COLUMNS:
+                    table = store.strings[name]
+                    if table is not self._tables.get(name):
+                        # New connection or cleared store: resend the table
+                        self._tables[name] = table
+                        self._sent_strings[name] = 0
+                    sent = self._sent_strings[name]
+                    new_strings[name] = (sent, table.values[sent:])
+
+            payload = encode_batch(self._next_seq, arrays, new_strings)
+            self.bytes_sent += send_message(self._sock, MSG_BATCH, payload, self.compress_level)
+            self.raw_bytes += len(payload)
+
+            count = len(arrays['timestamp'])
+            self._next_seq += count
+            for name, (base, values) in new_strings.items():
+                self._sent_strings[name] = base + len(values)
+            self.batches_sent += 1
+            self.packets_sent += count
+
+
+class Collector:
+    """
+    Receives sensor streams and merges them into one sniffer by timestamp
+
+    دریافت جریان‌های حسگرها و ادغام آن‌ها بر اساس زمان در یک اسنیفر
+    """
+
+    def __init__(self, sniffer, host='0.0.0.0', port=DEFAULT_PORT, max_lag=1.0, flush_interval=0.25):
+        """Initialize the collector
+
+        مقداردهی اولیه جمع‌آوری‌کننده
+
+        Args:
+            sniffer (NetworkSniffer): Sniffer that receives the merged packets
+                                      اسنیفری که بسته‌های ادغام شده را دریافت می‌کند
+            host (str): Address to listen on
+                        آدرس گوش دادن
+            port (int): Port to listen on, 0 for any free port
+                        پورت گوش دادن
+            max_lag (float): Seconds a quiet sensor may hold back the merge
+                             مدت مجاز عقب‌ماندگی یک حسگر ساکت
+            flush_interval (float): Seconds between merge flushes
+                                    فاصله بین تخلیه‌های ادغام
+        """
+        self.sniffer = sniffer
+        self.host = host
+        self.port = port
+        self.flush_interval = flush_interval
+        self.merger = StreamMerger(max_lag)
+        self.address = None
+
+        self._sensors = {}
+        # Per sensor name: (run id, next expected sequence number)
+        self._cursors = {}
+        self._connections = set()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._server = None
+        self._threads = []
+
+    def start(self):
+        """Start listening and merging in background threads
+
+        شروع گوش دادن و ادغام در نخ‌های پس‌زمینه
+
+        Returns:
+            Collector: This collector, for chaining
+                       همین جمع‌آوری‌کننده
+        """
+        self._stop.clear()
+        self._server = socket.create_server((self.host, self.port))
+        self._server.settimeout(0.5)
+        self.address = self._server.getsockname()[:2]
+        for target, name in ((self._accept_loop, 'collector-accept'), (self._flush_loop, 'collector-merge')):
+            thread = threading.Thread(target=target, name=name, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        logger.info(f"Collector listening on {self.address[0]}:{self.address[1]}")
+        return self
+
+    def stop(self):
+        """Disconnect all sensors and stop
+
+        قطع اتصال تمام حسگرها و توقف
+        """
+        self._stop.set()
+        with self._lock:
+            connections = list(self._connections)
+        for conn in connections:
+            try:
+                conn.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        for thread in self._threads:
+            thread.join(2.0)
+        self._threads = []
+        if self._server is not None:
+            self._server.close()
+            self._server = None
+        self._flush(final=True)
+
+    def get_sensors(self):
+        """Get per-sensor connection statistics
+
+        دریافت آمار اتصال هر حسگر
+
+        Returns:
+            list: Dictionaries with ``name``, ``address``, ``connected``,
+                  ``batches``, ``packets`` and ``bytes``
+                  دیکشنری‌های آمار حسگرها
+        """
+        with self._lock:
+            return [dict(stats) for stats in self._sensors.values()]
+
+    def _accept_loop(self):
+        while not self._stop.is_set():
+            try:
+                conn, address = self._server.accept()
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            conn.settimeout(None)
+            thread = threading.Thread(target=self._handle, args=(conn, address), name='collector-sensor', daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def _register(self, requested, address):
+        with self._lock:
+            name = requested
+            suffix = 2
+            while name in self._sensors and self._sensors[name]['connected']:
+                name = f"{requested}#{suffix}"
+                suffix += 1
+            stats = self._sensors.setdefault(name, {'name': name, 'batches': 0, 'packets': 0, 'bytes': 0})
+            stats['address'] = f"{address[0]}:{address[1]}"
+            stats['connected'] = True
+            return name, stats
+
+    def _handle(self, conn, address):
+        with self._lock:
+            self._connections.add(conn)
+        name = None
+        try:
+            msg_type, payload, _ = recv_message(conn)
+            if msg_type != MSG_HELLO:
+                raise ProtocolError("Expected hello")
+            hello = json.loads(payload.decode('utf-8'))
+            if hello.get('version') != PROTOCOL_VERSION:
+                raise ProtocolError(f"Unsupported protocol version {hello.get('version')}")
+            name, stats = self._register(str(hello.get('sensor') or f"{address[0]}:{address[1]}"), address)
+            run = hello.get('run')
+            with self._lock:
+                cursor_run, expected = self._cursors.get(name, (None, None))
+            if run is None or cursor_run != run:
+                # Sequence numbers only carry over a reconnect of the same run
+                expected = None
+            self.merger.add_stream(name)
+            logger.info(f"Sensor {name} connected from {address[0]}:{address[1]}")
+
+            tables = {column: [] for column in STRING_COLUMNS}
+            while not self._stop.is_set():
+                msg_type, payload, size = recv_message(conn)
+                if msg_type != MSG_BATCH:
+                    continue
+                first_seq, columns = decode_batch(payload, tables)
+                packets = batch_to_packets(columns, tables, name)
+                if expected is not None and first_seq < expected:
+                    # Resent after a reconnect; the first rows arrived before
+                    packets = packets[expected - first_seq:]
+                expected = max(expected or 0, first_seq + len(columns['timestamp']))
+                self.merger.push(name, packets)
+                with self._lock:
+                    self._cursors[name] = (run, expected)
+                send_message(conn, MSG_ACK, _ACK.pack(expected))
+                with self._lock:
+                    stats['batches'] += 1
+                    stats['packets'] += len(packets)
+                    stats['bytes'] += size
+        except (OSError, ProtocolError, ValueError) as e:
+            if not self._stop.is_set():
+                logger.info(f"Sensor {name or address} disconnected: {e}")
+        finally:
+            if name is not None:
+                self.merger.remove_stream(name)
+                with self._lock:
+                    self._sensors[name]['connected'] = False
+            with self._lock:
+                self._connections.discard(conn)
+            conn.close()
+
+    def _flush(self, final=False):
+        ready = self.merger.pop_ready(flush=final)
+        if ready:
+            self.sniffer.ingest_packets(ready)
+
+    def _flush_loop(self):
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self._flush()
+            except Exception as e:
+                logger.error(f"Error merging sensor streams: {e}", exc_info=True)
+
+
+def run_sensor(sniffer, host, port=DEFAULT_PORT, name=None, report_interval=10.0, **kwargs):
+    """Stream a running sniffer to a collector until interrupted
+
+    ارسال بسته‌های یک اسنیفر در حال اجرا به جمع‌آوری‌کننده تا زمان توقف
+
+    Args:
+        sniffer (NetworkSniffer): A sniffer that is already capturing
+                                  اسنیفری که در حال ضبط است
+        host (str): Collector host
+                    میزبان جمع‌آوری‌کننده
+        port (int): Collector port
+                    پورت جمع‌آوری‌کننده
+        name (str): Sensor name
+                    نام حسگر
+        report_interval (float): Seconds between logged statistics
+                                 فاصله ثبت آمار بر حسب ثانیه
+        **kwargs: Further SensorClient options
+                  سایر گزینه‌های SensorClient
+    """
+    client = SensorClient(sniffer, host, port, name, **kwargs).start()
+    try:
+        while sniffer.is_sniffing():
+            time.sleep(report_interval)
+            logger.info(f"Sensor stats: {client.stats()}")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        sniffer.stop_sniffing()
+        client.stop()
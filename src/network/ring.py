@@ -0,0 +1,451 @@
+"""
+Packet Ring Buffer with Subscriptions
+
+This module provides the shared ring buffer that hands newly captured
+packets to any number of consumers. Every packet is stored once; each
+subscription keeps its own cursor (a sequence number) into the ring, so
+consumers read at their own pace without copies of the data. A subscriber
+that falls a whole ring behind is overrun: the packets it missed are
+counted and its cursor jumps to the oldest packet still held. Subscriptions
+with the 'block' or 'drop-newest' policy instead hold the writer back while
+they are a full ring behind; a packet discarded that way is lost to, and
+counted by, every subscription.
+
+ماژول بافر حلقوی بسته‌ها با اشتراک‌ها
+این ماژول بافر حلقوی مشترکی را فراهم می‌کند که بسته‌های تازه ضبط شده را به هر
+تعداد مصرف‌کننده می‌رساند. هر بسته فقط یک بار ذخیره می‌شود و هر اشتراک مکان‌نمای
+خود (یک شماره ترتیب) را در بافر نگه می‌دارد، بنابراین مصرف‌کننده‌ها بدون کپی داده با
+سرعت خود می‌خوانند. مشترکی که یک دور کامل عقب بماند، بسته‌های از دست رفته‌اش شمرده
+شده و مکان‌نمای آن به قدیمی‌ترین بسته موجود منتقل می‌شود. اشتراک‌های با سیاست
+'block' یا 'drop-newest' در عوض نویسنده را متوقف می‌کنند؛ بسته‌ای که به این
+ترتیب حذف شود برای همه اشتراک‌ها از دست رفته و توسط همه شمرده می‌شود.
+"""
+
+import threading
+
+# Overflow policies
+# سیاست‌های سرریز
+DROP_NEWEST = 'drop-newest'
+DROP_OLDEST = 'drop-oldest'
+BLOCK = 'block'
+
+OVERFLOW_POLICIES = (DROP_NEWEST, DROP_OLDEST, BLOCK)
+
+
+class Subscription:
+    """
+    One consumer's cursor into a RingBuffer
+
+    مکان‌نمای یک مصرف‌کننده در بافر حلقوی
+    """
+
+    def __init__(self, ring, name, policy, block_timeout, cursor, on_publish):
+        self.ring = ring
+        self.name = name
+        self.policy = policy
+        self.block_timeout = block_timeout
+        self.cursor = cursor
+        self.on_publish = on_publish
+        self.delivered = 0
+        self.drops = {name: 0 for name in OVERFLOW_POLICIES}
+        self.closed = False
+
+    def __len__(self):
+        return self.lag
+
+    @property
+    def lag(self):
+        """Packets published but not read yet, including overrun ones
+
+        تعداد بسته‌های منتشر شده‌ای که هنوز خوانده نشده‌اند
+        """
+        return self.ring.head - self.cursor
+
+    @property
+    def overrun(self):
+        """Whether packets this subscriber has not read were overwritten
+
+        آیا بسته‌های خوانده نشده این مشترک بازنویسی شده‌اند
+        """
+        return self.cursor < self.ring.oldest
+
+    def poll(self, max_items=None):
+        """Read the packets published since the last poll
+
+        خواندن بسته‌های منتشر شده از آخرین خواندن
+
+        Args:
+            max_items (int): Maximum number of packets to read, or None for all
+                             حداکثر تعداد بسته‌های خوانده شده
+
+        Returns:
+            list: Packets in publishing order
+                  بسته‌ها به ترتیب انتشار
+        """
+        return self.ring.read(self, max_items)
+
+    def wait(self, timeout=None):
+        """Wait until a packet is available
+
+        انتظار تا زمان در دسترس بودن یک بسته
+
+        Args:
+            timeout (float): Maximum seconds to wait, or None
+                             حداکثر مدت انتظار بر حسب ثانیه
+
+        Returns:
+            bool: True if packets are available
+                  در صورت وجود بسته True
+        """
+        return self.ring.wait(self, timeout)
+
+    def configure(self, policy=None, block_timeout=None):
+        """Change the overflow policy of this subscription
+
+        تغییر سیاست سرریز این اشتراک
+
+        Args:
+            policy (str): 'drop-oldest', 'drop-newest' or 'block', or None to keep it
+                          سیاست سرریز جدید
+            block_timeout (float): New blocking timeout, or None to keep it
+                                   زمان انتظار جدید
+        """
+        self.ring.configure_subscription(self, policy, block_timeout)
+
+    def get_drop_counts(self):
+        """Get the packets this subscriber lost, per overflow policy
+
+        Overruns count as 'drop-oldest'. Packets the writer discarded count
+        under this subscription's own policy when it was the full one, and
+        otherwise under the policy of the subscription that held the writer
+        back.
+
+        دریافت تعداد بسته‌های از دست رفته این مشترک به تفکیک سیاست سرریز
+
+        Returns:
+            dict: Dictionary with policy names as keys and drop counts as values
+                  دیکشنری با نام سیاست‌ها به عنوان کلید و تعداد حذف به عنوان مقدار
+        """
+        ring = self.ring
+        with ring.lock:
+            drops = dict(self.drops)
+            # Packets already overwritten but not yet noticed by poll()
+            drops[DROP_OLDEST] += max(ring.oldest - self.cursor, 0)
+            return drops
+
+    def describe(self):
+        """Get the state of this subscription
+
+        دریافت وضعیت این اشتراک
+
+        Returns:
+            dict: Name, policy, cursor, lag, delivered and drop counts
+                  نام، سیاست، مکان‌نما، عقب‌ماندگی، تحویل شده و تعداد حذف‌ها
+        """
+        return {
+            'name': self.name,
+            'policy': self.policy,
+            'cursor': self.cursor,
+            'lag': self.lag,
+            'delivered': self.delivered,
+            'drops': self.get_drop_counts()
+        }
+
+    def close(self):
+        """Stop receiving packets
+
+        توقف دریافت بسته‌ها
+        """
+        self.ring.unsubscribe(self)
+
+
+class RingBuffer:
+    """
+    Fixed-size packet ring shared by independent subscriptions
+
+    بافر حلقوی با اندازه ثابت که بین اشتراک‌های مستقل مشترک است
+    """
+
+    def __init__(self, capacity=10000):
+        """Initialize the ring
+
+        مقداردهی اولیه بافر حلقوی
+
+        Args:
+            capacity (int): Number of packets held
+                            تعداد بسته‌های نگه‌داشته شده
+        """
+        if capacity < 1:
+            raise ValueError("Ring capacity must be at least 1")
+        self.capacity = capacity
+        self.head = 0
+        self.lock = threading.Lock()
+        self._slots = [None] * capacity
+        # Oldest sequence number still readable; raised by clear()
+        self._floor = 0
+        self._not_empty = threading.Condition(self.lock)
+        self._not_full = threading.Condition(self.lock)
+        self._subscriptions = ()
+        self._gating = ()
+        self._listeners = ()
+
+    @property
+    def oldest(self):
+        """Sequence number of the oldest packet still held
+
+        شماره ترتیب قدیمی‌ترین بسته موجود
+        """
+        return max(self.head - self.capacity, self._floor)
+
+    @property
+    def subscriptions(self):
+        """The open subscriptions
+
+        اشتراک‌های باز
+        """
+        return self._subscriptions
+
+    def subscribe(self, name=None, policy=DROP_OLDEST, block_timeout=0.1, from_oldest=False,
+                  on_publish=None):
+        """Open a new subscription
+
+        ایجاد یک اشتراک جدید
+
+        Args:
+            name (str): Name shown in diagnostics
+                        نام نمایش داده شده در عیب‌یابی
+            policy (str): What happens when the subscriber is a full ring
+                          behind: 'drop-oldest' (it is overrun), 'drop-newest'
+                          (new packets are discarded) or 'block' (the writer
+                          waits up to ``block_timeout``, then discards)
+                          رفتار در صورت عقب ماندن مشترک به اندازه یک دور کامل
+            block_timeout (float): Seconds the writer waits under 'block'
+                                   مدت انتظار نویسنده در سیاست 'block'
+            from_oldest (bool): Start at the oldest held packet instead of
+                                the next one published
+                                شروع از قدیمی‌ترین بسته موجود
+            on_publish (callable): Called with the subscription from the
+                                   writer's thread after every publish and
+                                   before the writer blocks; must not call
+                                   back into the ring
+                                   تابعی که پس از هر انتشار فراخوانی می‌شود
+
+        Returns:
+            Subscription: The new subscription
+                          اشتراک جدید
+        """
+        if policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {policy}")
+        with self.lock:
+            cursor = self.oldest if from_oldest else self.head
+            subscription = Subscription(self, name, policy, block_timeout, cursor, on_publish)
+            self._subscriptions = self._subscriptions + (subscription,)
+            self._update_roles()
+        return subscription
+
+    def unsubscribe(self, subscription):
+        """Close a subscription
+
+        بستن یک اشتراک
+
+        Args:
+            subscription (Subscription): The subscription
+                                         اشتراک
+        """
+        with self.lock:
+            subscription.closed = True
+            self._subscriptions = tuple(s for s in self._subscriptions if s is not subscription)
+            self._update_roles()
+            self._not_full.notify_all()
+            self._not_empty.notify_all()
+
+    def configure_subscription(self, subscription, policy=None, block_timeout=None):
+        """Change the overflow policy of a subscription
+
+        تغییر سیاست سرریز یک اشتراک
+        """
+        if policy is not None and policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {policy}")
+        with self.lock:
+            if policy is not None:
+                subscription.policy = policy
+            if block_timeout is not None:
+                subscription.block_timeout = block_timeout
+            self._update_roles()
+            self._not_full.notify_all()
+
+    def _update_roles(self):
+        subscriptions = self._subscriptions
+        self._gating = tuple(s for s in subscriptions if s.policy != DROP_OLDEST)
+        self._listeners = tuple(s for s in subscriptions if s.on_publish is not None)
+
+    def _full(self):
+        # Gating subscriptions that are a whole ring behind
+        limit = self.head - self.capacity
+        return [s for s in self._gating if s.cursor <= limit]
+
+    def _put(self, item):
+        if self._gating:
+            full = self._full()
+            if full:
+                if all(s.policy == BLOCK for s in full):
+                    # Let waiting readers catch up before blocking
+                    self._not_empty.notify_all()
+                    for subscription in self._listeners:
+                        subscription.on_publish(subscription)
+                    timeout = min(s.block_timeout for s in full)
+                    self._not_full.wait_for(lambda: not self._full(), timeout)
+                    full = self._full()
+                if full:
+                    # The packet is lost to every subscriber, not just the
+                    # full ones; the others count it under the policy that
+                    # discarded it
+                    cause = BLOCK if all(s.policy == BLOCK for s in full) else DROP_NEWEST
+                    for subscription in self._subscriptions:
+                        policy = subscription.policy if subscription in full else cause
+                        subscription.drops[policy] += 1
+                    return False
+        self._slots[self.head % self.capacity] = item
+        self.head += 1
+        return True
+
+    def publish(self, item):
+        """Publish a packet to all subscriptions
+
+        انتشار یک بسته برای تمام اشتراک‌ها
+
+        Args:
+            item: The packet
+                  بسته
+
+        Returns:
+            bool: True if the packet was published, False if a full
+                  'drop-newest' or 'block' subscription made it be discarded
+                  در صورت انتشار True و در صورت حذف False
+        """
+        with self.lock:
+            published = self._put(item)
+            if published:
+                self._not_empty.notify_all()
+        if published:
+            for subscription in self._listeners:
+                subscription.on_publish(subscription)
+        return published
+
+    def publish_many(self, items):
+        """Publish several packets in order
+
+        انتشار چند بسته به ترتیب
+
+        Args:
+            items (list): The packets
+                          بسته‌ها
+
+        Returns:
+            int: Number of packets published
+                 تعداد بسته‌های منتشر شده
+        """
+        with self.lock:
+            published = sum(1 for item in items if self._put(item))
+            if published:
+                self._not_empty.notify_all()
+        if published:
+            for subscription in self._listeners:
+                subscription.on_publish(subscription)
+        return published
+
+    def read(self, subscription, max_items=None):
+        """Read the packets after a subscription's cursor and advance it
+
+        خواندن بسته‌های بعد از مکان‌نمای یک اشتراک و جلو بردن آن
+
+        Args:
+            subscription (Subscription): The subscription
+                                         اشتراک
+            max_items (int): Maximum number of packets, or None for all
+                             حداکثر تعداد بسته‌ها
+
+        Returns:
+            list: Packets in publishing order
+                  بسته‌ها به ترتیب انتشار
+        """
+        with self.lock:
+            head = self.head
+            oldest = self.oldest
+            cursor = subscription.cursor
+            if cursor < oldest:
+                # Overrun: the writer lapped this subscriber
+                subscription.drops[DROP_OLDEST] += oldest - cursor
+                cursor = oldest
+            end = head if max_items is None else min(head, cursor + max_items)
+            if end <= cursor:
+                subscription.cursor = cursor
+                return []
+
+            capacity = self.capacity
+            slots = self._slots
+            start_index = cursor % capacity
+            end_index = start_index + (end - cursor)
+            if end_index <= capacity:
+                items = slots[start_index:end_index]
+            else:
+                items = slots[start_index:] + slots[:end_index - capacity]
+            subscription.cursor = end
+            subscription.delivered += end - cursor
+            if self._gating:
+                self._not_full.notify_all()
+            return items
+
+    def wait(self, subscription, timeout=None):
+        """Wait until a subscription has packets to read
+
+        انتظار تا زمان وجود بسته برای خواندن در یک اشتراک
+
+        Args:
+            subscription (Subscription): The subscription
+                                         اشتراک
+            timeout (float): Maximum seconds to wait, or None
+                             حداکثر مدت انتظار بر حسب ثانیه
+
+        Returns:
+            bool: True if packets are available
+                  در صورت وجود بسته True
+        """
+        with self.lock:
+            return self._not_empty.wait_for(
+                lambda: subscription.closed or self.head > subscription.cursor, timeout
+            ) and self.head > subscription.cursor
+
+    def clear(self):
+        """Drop all held packets; subscriptions continue with the next one published
+
+        حذف تمام بسته‌های نگه‌داشته شده؛ اشتراک‌ها از بسته بعدی ادامه می‌دهند
+        """
+        with self.lock:
+            self._slots = [None] * self.capacity
+            self._floor = self.head
+            for subscription in self._subscriptions:
+                subscription.cursor = self.head
+            self._not_full.notify_all()
+
+    def resize(self, capacity):
+        """Change the ring capacity, keeping the newest packets
+
+        تغییر ظرفیت بافر حلقوی با نگه‌داشتن جدیدترین بسته‌ها
+
+        Args:
+            capacity (int): New number of packets held
+                            تعداد جدید بسته‌های نگه‌داشته شده
+        """
+        if capacity < 1:
+            raise ValueError("Ring capacity must be at least 1")
+        with self.lock:
+            keep = max(self.head - capacity, self.oldest)
+            old_slots, old_capacity = self._slots, self.capacity
+            slots = [None] * capacity
+            for seq in range(keep, self.head):
+                slots[seq % capacity] = old_slots[seq % old_capacity]
+            self._slots = slots
+            self.capacity = capacity
+            self._floor = keep
+            self._not_full.notify_all()
@@ -0,0 +1,288 @@
+"""
+Packet Sampling Module
+
+This module provides the samplers used by the capture path to shed load
+under traffic bursts. Every kept packet carries a weight equal to the
+sampling rate in effect when it was kept, so counters can be scaled back
+up to estimated totals.
+
+ماژول نمونه‌برداری بسته‌ها
+این ماژول نمونه‌بردارهایی را فراهم می‌کند که مسیر ضبط برای کاهش بار در زمان
+افزایش ناگهانی ترافیک از آن‌ها استفاده می‌کند. هر بسته نگه‌داشته شده وزنی برابر
+با نرخ نمونه‌برداری در لحظه انتخاب دارد تا شمارنده‌ها به مجموع تخمینی تبدیل شوند.
+"""
+
+import struct
+import time
+import zlib
+
+# Sampling modes
+# حالت‌های نمونه‌برداری
+SAMPLING_NONE = 'none'
+SAMPLING_EVERY_NTH = 'every-nth'
+SAMPLING_FLOW = 'flow'
+SAMPLING_ADAPTIVE = 'adaptive'
+
+SAMPLING_MODES = (SAMPLING_NONE, SAMPLING_EVERY_NTH, SAMPLING_FLOW, SAMPLING_ADAPTIVE)
+
+_HASH_SPACE = 1 << 32
+_VLAN_TYPES = (0x8100, 0x88a8, 0x9100)
+
+
+def flow_hash(frame):
+    """Compute a direction-independent hash of a frame's conversation
+
+    The hash is computed straight from the frame bytes so it can be used
+    before dissection. Both directions of a conversation hash to the same
+    value, and the value is stable across processes and hosts.
+
+    محاسبه هش مستقل از جهت برای مکالمه یک فریم
+
+    Args:
+        frame (bytes): Raw Ethernet frame
+                       فریم خام اترنت
+
+    Returns:
+        int: 32-bit flow hash
+             هش ۳۲ بیتی جریان
+    """
+    if len(frame) < 14:
+        return zlib.crc32(frame)
+
+    offset = 12
+    ethertype = struct.unpack_from('!H', frame, offset)[0]
+    while ethertype in _VLAN_TYPES and len(frame) >= offset + 6:
+        offset += 4
+        ethertype = struct.unpack_from('!H', frame, offset)[0]
+    offset += 2
+
+    if ethertype == 0x0800 and len(frame) >= offset + 20:
+        ihl = (frame[offset] & 0x0f) * 4
+        proto = frame[offset + 9]
+        src = frame[offset + 12:offset + 16]
+        dst = frame[offset + 16:offset + 20]
+        l4 = offset + ihl
+    elif ethertype == 0x86dd and len(frame) >= offset + 40:
+        proto = frame[offset + 6]
+        src = frame[offset + 8:offset + 24]
+        dst = frame[offset + 24:offset + 40]
+        l4 = offset + 40
+    else:
+        # Non-IP traffic: the MAC address pair is the conversation
+        src, dst = frame[6:12], frame[0:6]
+        a, b = (src, dst) if src <= dst else (dst, src)
+        return zlib.crc32(a + b + frame[offset - 2:offset])
+
+    if proto in (6, 17) and len(frame) >= l4 + 4:
+        src += frame[l4:l4 + 2]
+        dst += frame[l4 + 2:l4 + 4]
+    a, b = (src, dst) if src <= dst else (dst, src)
+    return zlib.crc32(a + b + bytes((proto,)))
+
+
+class Sampler:
+    """
+    Base sampler that keeps every packet
+
+    نمونه‌بردار پایه که تمام بسته‌ها را نگه می‌دارد
+    """
+
+    mode = SAMPLING_NONE
+    adaptive = False
+
+    def __init__(self, rate=1):
+        """Initialize the sampler
+
+        مقداردهی اولیه نمونه‌بردار
+
+        Args:
+            rate (int): Keep one packet in ``rate``
+                        نگه‌داشتن یک بسته از هر ``rate`` بسته
+        """
+        self.rate = max(1, int(rate))
+
+    def sample(self, packet):
+        """Decide whether to keep a packet
+
+        تصمیم‌گیری درباره نگه‌داشتن یک بسته
+
+        Args:
+            packet: The captured packet
+                    بسته ضبط شده
+
+        Returns:
+            int: Weight of the kept packet, or 0 if the packet is dropped
+                 وزن بسته نگه‌داشته شده، یا ۰ در صورت حذف
+        """
+        return 1
+
+    def observe(self, latency_ns, queue_depth):
+        """Report the current pipeline load to the sampler
+
+        گزارش بار فعلی خط لوله به نمونه‌بردار
+
+        Args:
+            latency_ns (int): Dissect latency of the last packet in nanoseconds
+                              تأخیر تشریح آخرین بسته بر حسب نانوثانیه
+            queue_depth (int): Current depth of the new-packet queue
+                               عمق فعلی صف بسته‌های جدید
+        """
+
+    def describe(self):
+        """Get a short description of the sampler state
+
+        دریافت توضیح کوتاه از وضعیت نمونه‌بردار
+
+        Returns:
+            dict: Dictionary with ``mode`` and current ``rate``
+                  دیکشنری شامل حالت و نرخ فعلی
+        """
+        return {'mode': self.mode, 'rate': self.rate}
+
+
+class EveryNthSampler(Sampler):
+    """
+    Deterministic sampler keeping one packet in N
+
+    نمونه‌بردار قطعی که یک بسته از هر N بسته را نگه می‌دارد
+    """
+
+    mode = SAMPLING_EVERY_NTH
+
+    def __init__(self, rate=10):
+        super().__init__(rate)
+        self._count = 0
+
+    def sample(self, packet):
+        self._count += 1
+        if self._count >= self.rate:
+            self._count = 0
+            return self.rate
+        return 0
+
+
+class FlowSampler(Sampler):
+    """
+    Per-flow hash sampler keeping whole conversations
+
+    A flow is kept when its hash falls in the lowest 1/N of the hash space,
+    so raising N only ever removes flows and never splits a conversation.
+
+    نمونه‌بردار مبتنی بر هش جریان که کل مکالمه‌ها را نگه می‌دارد
+    """
+
+    mode = SAMPLING_FLOW
+
+    def __init__(self, rate=10):
+        super().__init__(rate)
+        self._threshold = _HASH_SPACE // self.rate
+
+    def set_rate(self, rate):
+        """Change the sampling rate
+
+        تغییر نرخ نمونه‌برداری
+
+        Args:
+            rate (int): Keep one flow in ``rate``
+                        نگه‌داشتن یک جریان از هر ``rate`` جریان
+        """
+        self.rate = max(1, int(rate))
+        self._threshold = _HASH_SPACE // self.rate
+
+    def sample(self, packet):
+        if self.rate == 1:
+            return 1
+        frame = getattr(packet, 'original', None) or bytes(packet)
+        return self.rate if flow_hash(frame) < self._threshold else 0
+
+
+class AdaptiveSampler(FlowSampler):
+    """
+    Flow sampler whose rate follows the pipeline load
+
+    The rate doubles when the smoothed dissect latency or the queue depth
+    crosses its threshold, and halves again once both fall below half of
+    their thresholds. Adjustments are made at most once per interval.
+
+    نمونه‌بردار جریان که نرخ آن بر اساس بار خط لوله تنظیم می‌شود
+    """
+
+    mode = SAMPLING_ADAPTIVE
+    adaptive = True
+
+    def __init__(self, latency_threshold_us=200.0, queue_threshold=5000,
+                 max_rate=1024, interval=0.5):
+        """Initialize the adaptive sampler
+
+        مقداردهی اولیه نمونه‌بردار تطبیقی
+
+        Args:
+            latency_threshold_us (float): Smoothed dissect latency that triggers shedding
+                                          آستانه تأخیر تشریح بر حسب میکروثانیه
+            queue_threshold (int): Queue depth that triggers shedding
+                                   آستانه عمق صف
+            max_rate (int): Highest sampling rate the sampler may reach
+                            بیشترین نرخ نمونه‌برداری مجاز
+            interval (float): Minimum seconds between rate changes
+                              حداقل فاصله بین تغییرات نرخ بر حسب ثانیه
+        """
+        super().__init__(1)
+        self.latency_threshold_ns = latency_threshold_us * 1000.0
+        self.queue_threshold = queue_threshold
+        self.max_rate = max_rate
+        self.interval = interval
+        self._latency_ewma = 0.0
+        self._queue_depth = 0
+        self._next_adjust = 0.0
+
+    def observe(self, latency_ns, queue_depth):
+        self._latency_ewma += (latency_ns - self._latency_ewma) * 0.05
+        self._queue_depth = queue_depth
+
+        now = time.monotonic()
+        if now < self._next_adjust:
+            return
+        self._next_adjust = now + self.interval
+
+        overloaded = (self._latency_ewma > self.latency_threshold_ns or
+                      queue_depth > self.queue_threshold)
+        relaxed = (self._latency_ewma < self.latency_threshold_ns / 2 and
+                   queue_depth < self.queue_threshold / 2)
+        if overloaded and self.rate < self.max_rate:
+            self.set_rate(self.rate * 2)
+        elif relaxed and self.rate > 1:
+            self.set_rate(self.rate // 2)
+
+    def describe(self):
+        description = super().describe()
+        description['latency_us'] = self._latency_ewma / 1000.0
+        description['queue_depth'] = self._queue_depth
+        return description
+
+
+def create_sampler(mode=SAMPLING_NONE, rate=10, **kwargs):
+    """Create a sampler for the given mode
+
+    ایجاد یک نمونه‌بردار برای حالت داده شده
+
+    Args:
+        mode (str): One of SAMPLING_NONE, SAMPLING_EVERY_NTH, SAMPLING_FLOW or SAMPLING_ADAPTIVE
+                    حالت نمونه‌برداری
+        rate (int): Sampling rate for the fixed-rate modes
+                    نرخ نمونه‌برداری برای حالت‌های با نرخ ثابت
+        **kwargs: Extra options passed to AdaptiveSampler
+                  گزینه‌های اضافه برای نمونه‌بردار تطبیقی
+
+    Returns:
+        Sampler: The sampler
+                 نمونه‌بردار
+    """
+    if mode == SAMPLING_NONE:
+        return Sampler()
+    if mode == SAMPLING_EVERY_NTH:
+        return EveryNthSampler(rate)
+    if mode == SAMPLING_FLOW:
+        return FlowSampler(rate)
+    if mode == SAMPLING_ADAPTIVE:
+        return AdaptiveSampler(**kwargs)
+    raise ValueError(f"Unknown sampling mode: {mode}")
@@ -0,0 +1,258 @@
+"""
+Payload Search Module
+
+This module scans the raw bytes of captured packets for a set of patterns
+(IOC strings or byte sequences) in a background thread. The patterns are
+compiled once into an Aho-Corasick automaton and packets are scanned in
+chunks, with progress reporting and cancellation between chunks.
+
+ماژول جستجوی محتوای بسته‌ها
+این ماژول بایت‌های خام بسته‌های ضبط شده را در یک نخ پس‌زمینه برای مجموعه‌ای از
+الگوها (رشته‌های IOC یا دنباله‌های بایتی) جستجو می‌کند. الگوها یک بار به ماشین
+Aho-Corasick تبدیل شده و بسته‌ها به صورت دسته‌ای با گزارش پیشرفت و امکان لغو
+پویش می‌شوند.
+"""
+
+import logging
+import threading
+
+from ..utils.aho_corasick import AhoCorasick
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 1000
+DEFAULT_MAX_MATCHES = 100000
+
+
+def parse_patterns(text):
+    """Parse a pattern list, one pattern per line
+
+    Lines starting with ``hex:`` are decoded as hexadecimal byte sequences;
+    other lines are searched as UTF-8 text. Blank lines are skipped.
+
+    تجزیه فهرست الگوها، یک الگو در هر خط
+
+    Args:
+        text (str): The pattern list
+                    فهرست الگوها
+
+    Returns:
+        list: Patterns as bytes
+              الگوها به صورت بایت
+
+    Raises:
+        ValueError: If a hex pattern is malformed
+                    در صورت نامعتبر بودن یک الگوی هگزادسیمال
+    """
+    patterns = []
+    for line in text.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        if line.lower().startswith('hex:'):
+            patterns.append(bytes.fromhex(line[4:].replace(':', ' ')))
+        else:
+            patterns.append(line.encode('utf-8'))
+    return patterns
+
+
+def frame_bytes(raw):
+    """Get the bytes of a captured frame without rebuilding it when possible
+
+    دریافت بایت‌های یک فریم ضبط شده در صورت امکان بدون بازسازی آن
+
+    Args:
+        raw: The captured scapy packet
+             بسته scapy ضبط شده
+
+    Returns:
+        bytes: Frame bytes, or b'' if unavailable
+               بایت‌های فریم
+    """
+    if raw is None:
+        return b''
+    original = getattr(raw, 'original', None)
+    if original:
+        return original
+    return bytes(raw)
+
+
+class PayloadSearch:
+    """
+    Background multi-pattern search over captured packets
+
+    جستجوی چندالگویی پس‌زمینه در بسته‌های ضبط شده
+    """
+
+    def __init__(self, patterns, packets, first_seq=0, chunk_size=DEFAULT_CHUNK_SIZE,
+                 max_matches=DEFAULT_MAX_MATCHES, progress=None, frames=None, spilled=None,
+                 spilled_count=0):
+        """Initialize the search
+
+        مقداردهی اولیه جستجو
+
+        Args:
+            patterns (iterable or AhoCorasick): Patterns, or a compiled automaton
+                                                الگوها یا ماشین کامپایل شده
+            packets (list): Packet information dictionaries to scan; None
+                            for packets read through ``frames``
+                            دیکشنری‌های اطلاعات بسته‌ها برای پویش
+            first_seq (int): Sequence number of the first packet
+                             شماره ترتیب اولین بسته
+            chunk_size (int): Packets scanned between progress reports
+                              تعداد بسته‌های پویش شده بین گزارش‌های پیشرفت
+            max_matches (int): Stop collecting matches after this many
+                               حداکثر تعداد تطابق‌های جمع‌آوری شده
+            progress (callable): Called from the worker thread with
+                                 (scanned, total) after every chunk
+                                 تابعی که پس از هر دسته با (پویش شده، کل) فراخوانی می‌شود
+            frames (callable): Called with the index of a packet that is None
+                               in ``packets`` to get its frame bytes; its
+                               matches have ``packet`` set to None
+                               تابع دریافت بایت‌های فریم بسته‌هایی که دیکشنری ندارند
+            spilled (iterable): (seq, metadata, scapy class, frame bytes)
+                                records of packets moved to disk, scanned
+                                before ``packets``; their matches have
+                                ``packet`` set to None
+                                رکوردهای بسته‌های منتقل شده به دیسک که پیش از بسته‌ها پویش می‌شوند
+            spilled_count (int): Number of records in ``spilled``
+                                 تعداد رکوردهای منتقل شده به دیسک
+        """
+        self.automaton = patterns if isinstance(patterns, AhoCorasick) else AhoCorasick(patterns)
+        self.packets = packets
+        self.first_seq = first_seq
+        self.chunk_size = chunk_size
+        self.max_matches = max_matches
+        self.progress = progress
+        self.frames = frames
+        self.spilled = spilled
+        self.spilled_count = spilled_count if spilled is not None else 0
+
+        self.total = self.spilled_count + len(packets)
+        self.scanned = 0
+        self.scanned_bytes = 0
+        self.matches = []
+        self.truncated = False
+        self.error = None
+        self._cancel = threading.Event()
+        self._done = threading.Event()
+        self._thread = None
+
+    @property
+    def patterns(self):
+        """The compiled patterns as bytes
+
+        الگوهای کامپایل شده به صورت بایت
+        """
+        return self.automaton.patterns
+
+    def start(self):
+        """Start scanning in a background thread
+
+        شروع پویش در یک نخ پس‌زمینه
+
+        Returns:
+            PayloadSearch: This search, for chaining
+                           همین جستجو
+        """
+        self._thread = threading.Thread(target=self.run, name='payload-search', daemon=True)
+        self._thread.start()
+        return self
+
+    def cancel(self):
+        """Request the search to stop after the current chunk
+
+        درخواست توقف جستجو پس از دسته جاری
+        """
+        self._cancel.set()
+
+    @property
+    def cancelled(self):
+        """Whether cancellation was requested
+
+        آیا لغو درخواست شده است
+        """
+        return self._cancel.is_set()
+
+    def is_done(self):
+        """Check whether the search has finished, was cancelled or failed
+
+        بررسی پایان، لغو یا شکست جستجو
+        """
+        return self._done.is_set()
+
+    def wait(self, timeout=None):
+        """Wait for the search to finish
+
+        انتظار برای پایان جستجو
+
+        Args:
+            timeout (float): Maximum seconds to wait, or None
+                             حداکثر مدت انتظار بر حسب ثانیه
+
+        Returns:
+            bool: True if the search has finished
+                  در صورت پایان جستجو True
+        """
+        return self._done.wait(timeout)
+
+    def run(self):
+        """Scan all packets in the calling thread
+
+        پویش تمام بسته‌ها در نخ فراخوانی کننده
+        """
+        try:
+            if self.spilled is not None:
+                self._scan_spilled()
+            for start in range(0, len(self.packets), self.chunk_size):
+                if self._cancel.is_set() or self.truncated:
+                    break
+                chunk = self.packets[start:start + self.chunk_size]
+                for index, packet in enumerate(chunk, start):
+                    if self.truncated:
+                        break
+                    if packet is None:
+                        data = self.frames(index)
+                    else:
+                        data = frame_bytes(packet.get('raw'))
+                    self._scan(self.first_seq + index, packet, data)
+                self.scanned = self.spilled_count + start + len(chunk)
+                if self.progress is not None:
+                    self.progress(self.scanned, self.total)
+        except Exception as e:
+            self.error = e
+            logger.error(f"Payload search failed: {e}", exc_info=True)
+        finally:
+            self._done.set()
+
+    def _scan_spilled(self):
+        scanned = 0
+        for seq, _, _, frame in self.spilled:
+            if self.truncated:
+                return
+            self._scan(seq, None, frame)
+            scanned += 1
+            if not scanned % self.chunk_size:
+                if self._cancel.is_set():
+                    return
+                self.scanned = scanned
+                if self.progress is not None:
+                    self.progress(self.scanned, self.total)
+        # Segments deleted by the disk budget meanwhile count as scanned
+        self.scanned = self.spilled_count
+        if self.progress is not None:
+            self.progress(self.scanned, self.total)
+
+    def _scan(self, seq, packet, data):
+        self.scanned_bytes += len(data)
+        matches = self.matches
+        for offset, pattern_index in self.automaton.iter_matches(data):
+            if len(matches) >= self.max_matches:
+                self.truncated = True
+                return
+            matches.append({
+                'seq': seq,
+                'packet': packet,
+                'pattern': pattern_index,
+                'offset': offset
+            })
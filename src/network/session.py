@@ -0,0 +1,272 @@
+"""
+Capture Session Files
+
+This module saves a whole capture session (packet columns, raw frames,
+counters and alerts) to one binary file and opens it again without parsing
+any packet. Every column is written as a raw, 64-byte aligned array and the
+file is memory-mapped on load, so opening takes the same time regardless of
+its size; packets are only dissected again when they are looked at.
+
+File layout: magic, data blocks, JSON manifest describing the blocks, and a
+trailer with the manifest offset and length.
+
+ماژول فایل‌های نشست ضبط
+این ماژول کل یک نشست ضبط (ستون‌های بسته‌ها، فریم‌های خام، شمارنده‌ها و هشدارها) را در
+یک فایل دودویی ذخیره کرده و بدون تجزیه هیچ بسته‌ای دوباره باز می‌کند. هر ستون به
+صورت یک آرایه خام هم‌تراز شده روی ۶۴ بایت نوشته می‌شود و فایل هنگام بارگذاری به
+حافظه نگاشت می‌شود، بنابراین زمان باز کردن به اندازه فایل بستگی ندارد؛ بسته‌ها فقط
+هنگام مشاهده دوباره تشریح می‌شوند.
+"""
+
+import json
+import mmap
+import os
+import struct
+
+import numpy as np
+from scapy.config import conf
+
+from .store import NUMERIC_COLUMNS, STRING_COLUMNS, StringTable
+
+SESSION_FORMAT = 'netscope-session'
+SESSION_VERSION = 2
+
+_MAGIC = b'NSSESS01'
+_TRAILER = struct.Struct('<QQ8s')
+_ALIGNMENT = 64
+
+
+def _linktype(cls):
+    # Frames are stored by link type, never by class name, so opening a
+    # session cannot import or call arbitrary code; None stands for frames
+    # of classes without a link type, which are read back as raw data
+    return conf.l2types.layer2num.get(cls)
+
+
+def _resolve_linktype(linktype):
+    if linktype is None:
+        return conf.raw_layer
+    return conf.l2types.get(linktype, conf.raw_layer)
+
+
+class _BlockWriter:
+    """Writes aligned data blocks and records where they are"""
+
+    def __init__(self, f):
+        self.f = f
+        self.blocks = {}
+
+    def _align(self):
+        padding = -self.f.tell() % _ALIGNMENT
+        if padding:
+            self.f.write(b'\0' * padding)
+
+    def array(self, name, array):
+        self._align()
+        array = np.ascontiguousarray(array)
+        self.blocks[name] = {
+            'offset': self.f.tell(),
+            'dtype': array.dtype.str,
+            'count': len(array)
+        }
+        self.f.write(array.tobytes())
+
+    def raw(self, name, data):
+        self._align()
+        self.blocks[name] = {'offset': self.f.tell(), 'length': len(data)}
+        self.f.write(data)
+
+
+def concat_columns(parts):
+    """Concatenate column sets that each have their own string tables
+
+    الحاق مجموعه‌های ستونی که هر کدام جدول رشته‌های خود را دارند
+
+    Args:
+        parts (list): (arrays, strings) pairs, where ``arrays`` maps every
+                      column in ALL_COLUMNS to an array and ``strings`` maps
+                      every string column to its values in code order
+                      جفت‌های (آرایه‌ها، رشته‌ها)
+
+    Returns:
+        tuple: (arrays, strings) of the concatenation; ``seq`` is renumbered
+               from 0
+               (آرایه‌ها، رشته‌ها) حاصل الحاق
+    """
+    arrays = {}
+    strings = {}
+    for name in NUMERIC_COLUMNS:
+        arrays[name] = np.concatenate([part[name] for part, _ in parts])
+    arrays['seq'] = np.arange(len(arrays['seq']), dtype=np.int64)
+    for name in STRING_COLUMNS:
+        table = StringTable()
+        chunks = []
+        for part, values in parts:
+            # Old code -> new code; the trailing -1 keeps missing values missing
+            remap = np.array([table.intern(value) for value in values[name]] + [-1], dtype=np.int32)
+            chunks.append(remap[part[name]])
+        arrays[name] = np.concatenate(chunks)
+        strings[name] = table.values
+    return arrays, strings
+
+
+def write_session(path, frames, columns, manifest):
+    """Write a session file
+
+    Frames are streamed to the file first, so they never have to be held in
+    memory together; the columns are requested afterwards.
+
+    نوشتن یک فایل نشست
+
+    Args:
+        path (str): Output file path
+                    مسیر فایل خروجی
+        frames (iterable): (scapy class or None, frame bytes) of every packet
+                           (کلاس scapy یا None، بایت‌های فریم) هر بسته
+        columns (callable): Called once ``frames`` is consumed; returns the
+                            (arrays, strings) of the packets, as returned by
+                            concat_columns()
+                            تابع دریافت (آرایه‌ها، رشته‌ها) بسته‌ها
+        manifest (dict): JSON-serializable session information (capture
+                         settings, counters, alerts)
+                         اطلاعات نشست قابل تبدیل به JSON
+
+    Returns:
+        int: Number of packets written
+             تعداد بسته‌های نوشته شده
+    """
+    temporary = f"{path}.tmp"
+    linktypes = {}
+    offsets = [0]
+    codes = []
+    with open(temporary, 'wb') as f:
+        f.write(_MAGIC)
+        writer = _BlockWriter(f)
+
+        writer._align()
+        start = f.tell()
+        for cls, frame in frames:
+            if cls is None:
+                codes.append(0)
+            else:
+                codes.append(linktypes.setdefault(_linktype(cls), len(linktypes) + 1))
+            f.write(frame)
+            offsets.append(offsets[-1] + len(frame))
+        writer.blocks['frames'] = {'offset': start, 'length': offsets[-1]}
+        writer.array('frame_offsets', np.array(offsets, dtype=np.uint64))
+        writer.array('frame_classes', np.array(codes, dtype=np.uint16))
+
+        arrays, strings = columns()
+        if len(arrays['seq']) != len(codes):
+            raise ValueError("Column and frame counts differ")
+        timestamps = arrays['timestamp']
+        for name in NUMERIC_COLUMNS:
+            writer.array(name, arrays[name].astype(NUMERIC_COLUMNS[name], copy=False))
+        for name in STRING_COLUMNS:
+            writer.array(name, arrays[name].astype(np.int32, copy=False))
+            data = '\n'.join(value.replace('\n', ' ') for value in strings[name])
+            writer.raw(f'{name}_strings', data.encode('utf-8'))
+
+        manifest = dict(manifest)
+        manifest.update({
+            'format': SESSION_FORMAT,
+            'version': SESSION_VERSION,
+            'packets': len(codes),
+            'sorted': bool(np.all(timestamps[1:] >= timestamps[:-1])),
+            'frame_linktypes': [linktype for linktype, _ in sorted(linktypes.items(), key=lambda item: item[1])],
+            'blocks': writer.blocks
+        })
+        data = json.dumps(manifest).encode('utf-8')
+        manifest_offset = f.tell()
+        f.write(data)
+        f.write(_TRAILER.pack(manifest_offset, len(data), _MAGIC))
+    os.replace(temporary, path)
+    return len(codes)
+
+
+class CaptureSession:
+    """
+    A saved capture session, memory-mapped for reading
+
+    یک نشست ضبط ذخیره شده که برای خواندن به حافظه نگاشت شده است
+    """
+
+    def __init__(self, path):
+        """Open a session file
+
+        باز کردن یک فایل نشست
+
+        Args:
+            path (str): Session file path
+                        مسیر فایل نشست
+
+        Raises:
+            ValueError: If the file is not a session file of a supported version
+                        در صورتی که فایل، فایل نشست با نسخه پشتیبانی شده نباشد
+        """
+        self.path = path
+        with open(path, 'rb') as f:
+            if f.read(len(_MAGIC)) != _MAGIC:
+                raise ValueError(f"{path} is not a session file")
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        manifest_offset, manifest_length, magic = _TRAILER.unpack_from(self._map, len(self._map) - _TRAILER.size)
+        if magic != _MAGIC:
+            raise ValueError(f"{path} is truncated")
+        self.manifest = json.loads(self._map[manifest_offset:manifest_offset + manifest_length])
+        if self.manifest.get('format') != SESSION_FORMAT or self.manifest.get('version') != SESSION_VERSION:
+            raise ValueError(f"Unsupported session file version: {self.manifest.get('version')}")
+
+        self.packets = self.manifest['packets']
+        self.sorted = self.manifest['sorted']
+        self.columns = {name: self._array(name) for name in tuple(NUMERIC_COLUMNS) + STRING_COLUMNS}
+        self.strings = {}
+        for name in STRING_COLUMNS:
+            data = self._raw(f'{name}_strings').decode('utf-8')
+            self.strings[name] = data.split('\n') if data else []
+        self.frame_offsets = self._array('frame_offsets')
+        self.frame_codes = self._array('frame_classes')
+        self.frame_classes = [None] + [_resolve_linktype(linktype) for linktype in self.manifest['frame_linktypes']]
+        self._frames_offset = self.manifest['blocks']['frames']['offset']
+
+    def _array(self, name):
+        block = self.manifest['blocks'][name]
+        return np.frombuffer(self._map, dtype=np.dtype(block['dtype']), count=block['count'],
+                             offset=block['offset'])
+
+    def _raw(self, name):
+        block = self.manifest['blocks'][name]
+        return self._map[block['offset']:block['offset'] + block['length']]
+
+    def __len__(self):
+        return self.packets
+
+    def frame_lengths(self):
+        """Get the frame length of every packet
+
+        دریافت طول فریم تمام بسته‌ها
+
+        Returns:
+            numpy.ndarray: Frame lengths, -1 for packets stored without a frame
+                           طول فریم‌ها، ۱- برای بسته‌های بدون فریم
+        """
+        lengths = np.diff(self.frame_offsets).astype(np.int64)
+        lengths[self.frame_codes == 0] = -1
+        return lengths
+
+    def frame(self, index):
+        """Get the raw frame of a packet
+
+        دریافت فریم خام یک بسته
+
+        Args:
+            index (int): Packet index in the session
+                         اندیس بسته در نشست
+
+        Returns:
+            tuple: (scapy class or None, frame bytes)
+                   (کلاس scapy یا None، بایت‌های فریم)
+        """
+        start = self._frames_offset + int(self.frame_offsets[index])
+        end = self._frames_offset + int(self.frame_offsets[index + 1])
+        return self.frame_classes[self.frame_codes[index]], self._map[start:end]
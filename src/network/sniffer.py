@@ -7,18 +7,37 @@ This module provides functionality for capturing and processing network packets.
 این ماژول قابلیت ضبط و پردازش بسته‌های شبکه را فراهم می‌کند.
 """
 
+import os
 import platform
 import socket
 import time
+import logging
 import threading
 from datetime import datetime
-from collections import deque
 import psutil
 from scapy.all import *
-from scapy.layers.inet import IP, TCP, UDP, ICMP
-from scapy.layers.l2 import Ether, ARP
 import netifaces as ni
 
+from .dissectors import create_default_registry, get_tcp_flags
+from .classify import create_default_classifier
+from .conversations import TrafficStatistics, STATISTICS_COLUMNS, ENDPOINTS_IP, CONVERSATIONS_IP
+from .metrics import MetricsRegistry
+from .ring import RingBuffer, DROP_OLDEST
+from .sampling import Sampler, create_sampler
+from .export import arrays_to_batch, export_schema, write_batches, DEFAULT_CHUNK_SIZE
+from .store import PacketStore, STRING_COLUMNS
+from .search import PayloadSearch, frame_bytes
+from .detection import ThreatDetector
+from .merge import StreamMerger
+from .capture import CaptureLoop, wire_length
+from .streaming import PacketStream, DEFAULT_BATCH_SIZE, DEFAULT_MAX_LATENCY
+from .geoip import GeoIPResolver
+from .spill import SegmentStore, estimate_packet_size, estimate_loaded_sizes
+from .session import CaptureSession, concat_columns, write_session
+from .capture_file import CaptureFileIndex, DEFAULT_CACHE_SIZE as DEFAULT_FILE_CACHE_SIZE
+
+logger = logging.getLogger(__name__)
+
 class NetworkSniffer:
     """
     Network sniffer class for capturing and analyzing network traffic
@@ -26,7 +45,19 @@ class NetworkSniffer:
     کلاس شبکه اسنیفر برای ضبط و تحلیل ترافیک شبکه
     """
     
-    def __init__(self, max_packets=1000):
+    # Seconds a quiet interface may hold back the merged timeline, and how
+    # often the merge releases packets
+    MERGE_MAX_LAG = 0.5
+    MERGE_INTERVAL = 0.05
+    # Packets dissected to estimate the memory of an opened session
+    SESSION_SIZE_SAMPLES = 16
+    # Share of the memory budget kept for stored packets even when flows and
+    # caches outgrow the rest, so the newest packets always stay in memory
+    MIN_HOT_SHARE = 0.25
+    
+    def __init__(self, max_packets=1000, dissectors=None, max_new_packets=10000,
+                 overflow_policy=DROP_OLDEST, block_timeout=0.1, detector=None, snaplen=None,
+                 memory_budget=None, disk_budget=None, spill_dir=None, classifier=None):
         """Initialize the network sniffer
         
         مقداردهی اولیه شبکه اسنیفر
@@ -34,15 +65,100 @@ class NetworkSniffer:
         Args:
             max_packets (int): Maximum number of packets to store in memory
                                حداکثر تعداد بسته‌های ذخیره شده در حافظه
+            dissectors (DissectorRegistry): Protocol dissector registry to use,
+                                            or None for the built-in dissectors
+                                            رجیستری تشریح‌گرهای پروتکل مورد استفاده
+            max_new_packets (int): Size of the ring of new packets shared by
+                                   get_new_packets() and all subscriptions
+                                   اندازه بافر حلقوی بسته‌های جدید
+            overflow_policy (str): What to do when get_new_packets() falls a
+                                   full ring behind: 'drop-newest', 'drop-oldest'
+                                   or 'block'
+                                   رفتار بسته‌های جدید در صورت عقب ماندن get_new_packets()
+            block_timeout (float): Seconds to wait for free space under the
+                                   'block' policy before dropping the packet
+                                   مدت انتظار در سیاست 'block' بر حسب ثانیه
+            detector (ThreatDetector): Streaming scan/flood detector to use,
+                                       or None for one with default thresholds
+                                       تشخیص‌دهنده جریانی پویش و سیل مورد استفاده
+            snaplen (int): Bytes captured of every frame, or None for whole
+                           frames; the wire length is still recorded
+                           تعداد بایت‌های ضبط شده از هر فریم
+            memory_budget (int): Bytes of memory for packets, flows and
+                                 caches; once full, the oldest packets move
+                                 to compressed segments on disk. None to
+                                 limit by max_packets only
+                                 بودجه حافظه بر حسب بایت؛ پس از پر شدن، قدیمی‌ترین
+                                 بسته‌ها به قطعه‌های فشرده روی دیسک منتقل می‌شوند
+            disk_budget (int): Maximum bytes of segments on disk, or None for
+                               no limit
+                               حداکثر حجم قطعه‌ها روی دیسک بر حسب بایت
+            spill_dir (str): Directory for the segments, or None for a
+                             temporary directory
+                             پوشه قطعه‌ها، یا None برای پوشه موقت
+            classifier (FlowClassifier): Application protocol classifier to
+                                         use, or None for the built-in signatures
+                                         طبقه‌بند پروتکل‌های کاربردی مورد استفاده
         """
         self.max_packets = max_packets
-        self.packets = deque(maxlen=max_packets)
-        self.new_packets = deque()
+        self.store = PacketStore(max_packets, on_evict=self._spill_packet)
+        self.memory_budget = None
+        self.disk_budget = disk_budget
+        self.spill_dir = spill_dir
+        self.spill = None
+        # Session file the loaded packets are read from, see load_session()
+        self.session = None
+        self._session_first_seq = 0
+        self.packet_ring = RingBuffer(max_new_packets)
+        self.new_packets = self.packet_ring.subscribe('default', overflow_policy, block_timeout)
         self.sniffing = False
         self.sniffer_thread = None
+        self.sniffer_threads = []
         self.interface = None
+        self.interfaces = []
         self.filter = None
+        self.snaplen = snaplen
         self.lock = threading.Lock()
+        self.dissectors = dissectors or create_default_registry()
+        self.detector = detector or ThreatDetector()
+        self.classifier = classifier or create_default_classifier()
+        # Endpoint and conversation tables, updated from the store's columns
+        # when read or before uncounted packets are evicted
+        self.traffic_stats = TrafficStatistics()
+        self._stats_seq = 0
+        
+        # Offline GeoIP/ASN lookups, made only when rows are displayed
+        self.geoip = GeoIPResolver()
+        
+        # Always-on pipeline instrumentation
+        self.metrics_registry = MetricsRegistry()
+        self._frames_received = self.metrics_registry.counter('frames_received')
+        self._frames_dissected = self.metrics_registry.counter('frames_dissected')
+        self._dissect_errors = self.metrics_registry.counter('dissect_errors')
+        self._extract_latency = self.metrics_registry.histogram('extract_packet_info')
+        self._lock_wait = self.metrics_registry.histogram('lock_wait')
+        self._queue_depth = self.metrics_registry.gauge('new_packets_depth')
+        self._frames_sampled_out = self.metrics_registry.counter('frames_sampled_out')
+        self._frames_ingested = self.metrics_registry.counter('frames_ingested')
+        
+        # Load shedding: keep every packet until sampling is enabled
+        self.sampler = Sampler()
+        self._estimated_packets = 0
+        self._estimated_bytes = 0
+        
+        # Capture loops per interface and multi-interface merge state
+        self._captures = {}
+        self._merger = None
+        self._merge_thread = None
+        self._active_captures = 0
+        self._captures_lock = threading.Lock()
+        # Serializes the capture threads of several interfaces over the
+        # sampler, the dissectors and the metrics, which have no locks of
+        # their own; the handler is pure Python, so little overlap is lost
+        self._handler_lock = threading.Lock()
+        
+        if memory_budget is not None:
+            self.set_memory_budget(memory_budget)
     
     def get_network_interfaces(self):
         """Get list of available network interfaces with friendly names
@@ -105,7 +221,7 @@ class NetworkSniffer:
             interfaces.sort(key=lambda x: (x['status'] != 'Up', x['friendly_name']))
                     
         except Exception as e:
-            print(f"Error getting network interfaces: {str(e)}")
+            logger.error(f"Error getting network interfaces: {str(e)}")
             # Fallback to basic interface list
             for iface in ni.interfaces():
                 interfaces.append({
@@ -119,33 +235,62 @@ class NetworkSniffer:
         return interfaces
     
     def start_sniffing(self, iface_index=0, filter_exp=None):
-        """Start packet sniffing on the specified interface
+        """Start packet sniffing on one or more interfaces
+        
+        Every interface gets its own capture thread. With several interfaces
+        the packets are merged into one timeline in capture time order before
+        they are stored.
         
-        شروع ضبط بسته‌ها در رابط شبکه مشخص شده
+        شروع ضبط بسته‌ها در یک یا چند رابط شبکه
         
         Args:
-            iface_index (int): Index of the network interface to use
-                              اندیس رابط شبکه مورد استفاده
+            iface_index (int or list): Index of the network interface to use,
+                                       or a list of indices
+                                       اندیس رابط شبکه مورد استفاده یا فهرستی از اندیس‌ها
             filter_exp (str): BPF filter expression
                              عبارت فیلتر BPF
         """
         if self.sniffing:
             return
         
+        indices = [iface_index] if isinstance(iface_index, int) else list(dict.fromkeys(iface_index))
         interfaces = self.get_network_interfaces()
-        if not interfaces or iface_index >= len(interfaces):
+        if not indices or not interfaces or any(not 0 <= index < len(interfaces) for index in indices):
             raise ValueError("Invalid network interface index")
         
-        self.interface = interfaces[iface_index]['name']
+        self.interfaces = [interfaces[index]['name'] for index in indices]
+        self.interface = self.interfaces[0]
         self.filter = filter_exp
         self.sniffing = True
         
-        # Start sniffing in a separate thread
-        self.sniffer_thread = threading.Thread(
-            target=self._sniff_thread,
-            daemon=True
-        )
-        self.sniffer_thread.start()
+        # Several interfaces are merged by capture time before storing
+        if len(self.interfaces) > 1:
+            self._merger = StreamMerger(self.MERGE_MAX_LAG)
+            for interface in self.interfaces:
+                self._merger.add_stream(interface)
+            self._merge_thread = threading.Thread(target=self._merge_loop, name='capture-merge', daemon=True)
+            self._merge_thread.start()
+        
+        # Start one capture loop and thread per interface
+        promisc = platform.system() != 'Windows'
+        self._captures = {
+            interface: CaptureLoop(
+                interface,
+                lambda packet, interface=interface: self._packet_handler(packet, interface),
+                filter_exp,
+                promisc,
+                self.snaplen
+            )
+            for interface in self.interfaces
+        }
+        self._active_captures = len(self.interfaces)
+        self.sniffer_threads = [
+            threading.Thread(target=self._sniff_thread, args=(interface,), name=f'capture-{interface}', daemon=True)
+            for interface in self.interfaces
+        ]
+        self.sniffer_thread = self.sniffer_threads[0]
+        for thread in self.sniffer_threads:
+            thread.start()
     
     def stop_sniffing(self):
         """Stop packet sniffing
@@ -153,9 +298,63 @@ class NetworkSniffer:
         توقف ضبط بسته‌ها
         """
         self.sniffing = False
-        if self.sniffer_thread and self.sniffer_thread.is_alive():
-            self.sniffer_thread.join(timeout=2.0)
+        # The loops wake up on the stop request even without traffic
+        for capture in self._captures.values():
+            capture.stop()
+        for thread in self.sniffer_threads:
+            if thread.is_alive():
+                thread.join(timeout=2.0)
+        self.sniffer_threads = []
         self.sniffer_thread = None
+        self._captures = {}
+        
+        if self._merge_thread is not None:
+            self._merge_thread.join(timeout=2.0)
+            self._merge_thread = None
+        if self._merger is not None:
+            # Store what the capture threads buffered before stopping
+            self._deliver_packets(self._merger.pop_ready(flush=True))
+            self._merger = None
+    
+    def set_filter(self, filter_exp):
+        """Change the BPF filter of a running capture without restarting it
+        
+        The new filter is installed on the open capture sockets, so no
+        packets are lost during the change.
+        
+        تغییر فیلتر BPF ضبط در حال اجرا بدون راه‌اندازی مجدد
+        
+        Args:
+            filter_exp (str): New filter expression, or None/'' for all packets
+                              عبارت فیلتر جدید
+                              
+        Raises:
+            Exception: If the filter cannot be compiled or applied
+                       در صورت عدم امکان کامپایل یا اعمال فیلتر
+        """
+        for capture in list(self._captures.values()):
+            capture.set_filter(filter_exp)
+        self.filter = filter_exp or None
+    
+    def set_snaplen(self, snaplen):
+        """Change how many bytes of every frame are captured
+        
+        Takes effect immediately on running captures. Frames cut short keep
+        their wire length in ``length`` and the captured size in
+        ``captured_length``.
+        
+        تغییر تعداد بایت‌های ضبط شده از هر فریم
+        
+        Args:
+            snaplen (int): Bytes kept per frame, e.g. SNAPLEN_HEADERS, or None
+                           for whole frames
+                           تعداد بایت‌های نگه‌داشته شده از هر فریم
+        """
+        if snaplen is not None and snaplen < 1:
+            raise ValueError("Snapshot length must be positive")
+        self.snaplen = snaplen
+        for capture in list(self._captures.values()):
+            capture.snaplen = snaplen
     
     def is_sniffing(self):
         """Check if sniffing is active
@@ -174,8 +373,18 @@ class NetworkSniffer:
         پاک کردن بسته‌های ضبط شده
         """
         with self.lock:
-            self.packets.clear()
-            self.new_packets.clear()
+            self.store.clear()
+            self._stats_seq = self.store.next_seq
+            self.session = None
+            if self.spill is not None:
+                self.spill.clear()
+            self._estimated_packets = 0
+            self._estimated_bytes = 0
+        self.packet_ring.clear()
+        self.detector.reset()
+        self.classifier.reset()
+        self.traffic_stats.reset()
+        self._queue_depth.set(0)
     
     def get_packets(self):
         """Get all captured packets
@@ -187,7 +396,554 @@ class NetworkSniffer:
                   لیست بسته‌های ضبط شده
         """
         with self.lock:
-            return list(self.packets)
+            return self.store.records()
+    
+    def get_packets_arrays(self, columns=None, start_time=None, end_time=None, copy=False):
+        """Get captured packet metadata as NumPy arrays
+        
+        The arrays are views into the packet store unless ``copy`` is set, so
+        no per-packet work is done. Views stay valid for at least
+        ``max_packets`` further captured packets, or under a memory budget
+        for as many packets as were kept in memory.
+        
+        دریافت فراداده بسته‌های ضبط شده به صورت آرایه‌های NumPy
+        
+        Args:
+            columns (list): Column names, or None for all columns
+                            نام ستون‌ها، یا None برای همه ستون‌ها
+            start_time (float): Inclusive lower bound in epoch seconds, or None
+                                کران پایین زمانی بر حسب ثانیه
+            end_time (float): Exclusive upper bound in epoch seconds, or None
+                              کران بالای زمانی بر حسب ثانیه
+            copy (bool): Return copies instead of views
+                         بازگرداندن کپی به جای view
+            
+        Returns:
+            dict: Column name to array. Missing numeric values are -1; string
+                  columns hold codes into the ``<name>_categories`` array.
+                  نگاشت نام ستون به آرایه
+        """
+        with self.lock:
+            return self.store.arrays(columns, start_time, end_time, copy)
+    
+    def get_packets_frame(self, columns=None, start_time=None, end_time=None):
+        """Get captured packet metadata as a pandas DataFrame
+        
+        Numeric columns share memory with the packet store and string columns
+        are categoricals built from the interned codes. ``timestamp`` is in
+        epoch seconds.
+        
+        دریافت فراداده بسته‌های ضبط شده به صورت DataFrame پانداس
+        
+        Args:
+            columns (list): Column names, or None for all columns
+                            نام ستون‌ها، یا None برای همه ستون‌ها
+            start_time (float): Inclusive lower bound in epoch seconds, or None
+                                کران پایین زمانی بر حسب ثانیه
+            end_time (float): Exclusive upper bound in epoch seconds, or None
+                              کران بالای زمانی بر حسب ثانیه
+            
+        Returns:
+            pandas.DataFrame: One row per stored packet
+                              یک سطر برای هر بسته ذخیره شده
+        """
+        import pandas as pd
+        
+        arrays = self.get_packets_arrays(columns, start_time, end_time)
+        data = {}
+        for name, array in arrays.items():
+            if name.endswith('_categories'):
+                continue
+            categories = arrays.get(f'{name}_categories')
+            if categories is None:
+                data[name] = array
+            else:
+                data[name] = pd.Categorical.from_codes(array, categories=pd.Index(categories))
+        return pd.DataFrame(data, copy=False)
+    
+    def export_packets(self, path, file_format=None, chunk_size=DEFAULT_CHUNK_SIZE, progress=None):
+        """Export captured packet metadata to a Parquet or Arrow IPC file
+        
+        خروجی گرفتن از فراداده بسته‌های ضبط شده در فایل Parquet یا Arrow IPC
+        
+        Args:
+            path (str): Output file path
+                        مسیر فایل خروجی
+            file_format (str): 'parquet' or 'arrow', guessed from the extension when None
+                               قالب خروجی
+            chunk_size (int): Rows written per batch
+                              تعداد سطرها در هر دسته
+            progress (callable): Called with the number of rows written so far
+                                 تابعی که با تعداد سطرهای نوشته شده فراخوانی می‌شود
+                                 
+        Returns:
+            int: Number of exported packets
+                 تعداد بسته‌های خروجی گرفته شده
+        """
+        with self.lock:
+            first_seq = self.store.first_seq
+            last_seq = self.store.next_seq
+        schema = export_schema()
+        
+        # Copy one chunk of columns at a time, so capture is only held up briefly
+        def batches():
+            seq = first_seq
+            while seq < last_seq:
+                with self.lock:
+                    seq = max(seq, self.store.first_seq)
+                    arrays = self.store.seq_range_arrays(seq, min(chunk_size, last_seq - seq))
+                count = len(arrays['seq'])
+                if not count:
+                    return
+                seq += count
+                yield arrays_to_batch(arrays, schema)
+        
+        return write_batches(batches(), path, file_format, progress=progress)
+    
+    def ingest_packets(self, packets):
+        """Add packets dissected elsewhere, e.g. received from remote sensors
+        
+        The packets go through the same detection, storage and new-packet
+        queue as locally captured ones.
+        
+        افزودن بسته‌هایی که در جای دیگری تشریح شده‌اند، مانند بسته‌های حسگرهای راه دور
+        
+        Args:
+            packets (list): Packet information dictionaries with at least
+                            ``timestamp``, ``length``, ``source``,
+                            ``destination`` and ``protocol``
+                            دیکشنری‌های اطلاعات بسته‌ها
+        """
+        if not packets:
+            return
+        with self._handler_lock:
+            self._frames_ingested.value += len(packets)
+            for packet_info in packets:
+                weight = packet_info.setdefault('weight', 1)
+                self._estimated_packets += weight
+                self._estimated_bytes += weight * packet_info['length']
+        self._deliver_packets(packets)
+    
+    def _deliver_packets(self, packets):
+        """Run detection on packets, then store and queue them in order
+        
+        اجرای تشخیص روی بسته‌ها و سپس ذخیره و قرار دادن آن‌ها در صف به ترتیب
+        
+        Args:
+            packets (list): Packet information dictionaries
+                            دیکشنری‌های اطلاعات بسته‌ها
+        """
+        if not packets:
+            return
+        for packet_info in packets:
+            self.detector.observe(packet_info)
+        
+        with self.lock:
+            for packet_info in packets:
+                self._store_packet(packet_info)
+        
+        self.packet_ring.publish_many(packets)
+        self._queue_depth.set(len(self.new_packets))
+    
+    def _store_packet(self, packet_info):
+        # Caller holds self.lock. Packet sizes only feed the byte budget, so
+        # they are not estimated without one
+        if self.memory_budget is None:
+            self.store.append(packet_info)
+            return
+        metadata_bytes, payload_bytes = estimate_packet_size(packet_info)
+        seq = self.store.append(packet_info, metadata_bytes, payload_bytes)
+        # Flows and caches change slowly; rebalance the hot tier now and then
+        if not seq & 1023:
+            self._update_hot_budget()
+    
+    def _spill_packet(self, seq, packet_info):
+        # Called by the store, under self.lock, for every packet it evicts
+        # while the packet is still stored
+        if seq >= self._stats_seq:
+            self._update_traffic_stats()
+        if self.spill is None:
+            return
+        self.spill.add(seq, packet_info)
+        # Views may still hold the dictionary; keep its metadata only
+        packet_info.pop('raw', None)
+    
+    def _update_traffic_stats(self):
+        # Caller holds self.lock. Count the stored packets the endpoint and
+        # conversation tables have not seen yet, as one batch
+        store = self.store
+        first_seq = max(self._stats_seq, store.first_seq)
+        if first_seq < store.next_seq:
+            self.traffic_stats.update(
+                store.seq_range_arrays(first_seq, store.next_seq - first_seq, STATISTICS_COLUMNS))
+        self._stats_seq = store.next_seq
+    
+    def _update_hot_budget(self):
+        # Caller holds self.lock
+        if self.memory_budget is None:
+            self.store.set_byte_budget(None)
+            return
+        other = (self.store.column_bytes + self.detector.estimate_memory() + self.classifier.estimate_memory()
+                 + self.traffic_stats.estimate_memory() + self.geoip.estimate_memory())
+        if self.spill is not None:
+            spill_stats = self.spill.get_stats()
+            other += spill_stats['buffers'] + spill_stats['cache']
+        minimum = int(self.memory_budget * self.MIN_HOT_SHARE)
+        self.store.set_byte_budget(max(minimum, self.memory_budget - other))
+    
+    def set_memory_budget(self, memory_budget, disk_budget=None):
+        """Change the memory budget
+        
+        Packets beyond the new budget move to disk right away.
+        
+        تغییر بودجه حافظه
+        
+        Args:
+            memory_budget (int): Bytes of memory for packets, flows and
+                                 caches, or None to limit by max_packets only
+                                 بودجه حافظه بر حسب بایت، یا None
+            disk_budget (int): New maximum bytes on disk, or None to keep the
+                               current limit
+                               حداکثر جدید حجم روی دیسک
+        """
+        if memory_budget is not None and memory_budget < 1:
+            raise ValueError("Memory budget must be positive")
+        if disk_budget is not None:
+            self.disk_budget = disk_budget
+        with self.lock:
+            if memory_budget is not None and self.memory_budget is None:
+                # Packets stored without a budget were not sized yet
+                self.store.charge(estimate_packet_size)
+            self.memory_budget = memory_budget
+            if memory_budget is not None and self.spill is None:
+                self.spill = SegmentStore(self.spill_dir, disk_budget=self.disk_budget)
+            if self.spill is not None:
+                self.spill.disk_budget = self.disk_budget
+            self._update_hot_budget()
+        logger.info(f"Memory budget set to {memory_budget} bytes")
+    
+    def memory_usage(self):
+        """Get the estimated memory and disk usage per tier
+        
+        دریافت میزان تخمینی استفاده از حافظه و دیسک به تفکیک لایه
+        
+        Returns:
+            dict: Dictionary with the ``budget``, the ``hot`` tier (stored
+                  ``packets``, their ``metadata`` and ``payloads``, and the
+                  ``columns``), ``flows``, ``caches``, ``buffers`` waiting to
+                  be written, the in-memory ``total`` and the ``disk`` tier
+                  (``segments``, ``packets``, ``bytes``, ``deleted``). Packet
+                  metadata and payloads are only estimated under a memory
+                  budget and are 0 without one
+                  دیکشنری شامل بودجه، لایه داغ، جریان‌ها، حافظه‌های نهان، بافرها و لایه دیسک؛
+                  حجم بسته‌ها فقط با بودجه حافظه تخمین زده می‌شود
+        """
+        with self.lock:
+            if self.memory_budget is not None:
+                self._update_hot_budget()
+            store = self.store
+            hot = {
+                'packets': len(store),
+                'metadata': store.metadata_bytes,
+                'payloads': store.payload_bytes,
+                'columns': store.column_bytes
+            }
+            spill_stats = self.spill.get_stats() if self.spill is not None else None
+        hot['bytes'] = hot['metadata'] + hot['payloads'] + hot['columns']
+        flows = (self.detector.estimate_memory() + self.classifier.estimate_memory()
+                 + self.traffic_stats.estimate_memory())
+        caches = self.geoip.estimate_memory()
+        buffers = 0
+        disk = {'segments': 0, 'packets': 0, 'bytes': 0, 'deleted': 0}
+        if spill_stats is not None:
+            caches += spill_stats['cache']
+            buffers = spill_stats['buffers']
+            disk = {name: spill_stats[name] for name in disk}
+        return {
+            'budget': self.memory_budget,
+            'hot': hot,
+            'flows': flows,
+            'caches': caches,
+            'buffers': buffers,
+            'total': hot['bytes'] + flows + caches + buffers,
+            'disk': disk
+        }
+    
+    def get_packet(self, seq):
+        """Get a captured packet by sequence number, from memory or disk
+        
+        Packets read back from disk are dissected again.
+        
+        دریافت یک بسته ضبط شده بر اساس شماره ترتیب، از حافظه یا دیسک
+        
+        Args:
+            seq (int): Sequence number, as stored in the packet's ``seq``
+                       شماره ترتیب
+                       
+        Returns:
+            dict: Packet information dictionary, or None if no longer kept
+                  دیکشنری اطلاعات بسته، یا None اگر دیگر نگه‌داشته نشده باشد
+        """
+        with self.lock:
+            packet = self.store.record(seq)
+            spill = self.spill
+        if packet is None and spill is not None:
+            packet = spill.get(seq)
+        return packet
+    
+    def save_session(self, path):
+        """Save the whole capture session to a session file
+        
+        All kept packets are written (including those moved to disk), along
+        with their raw frames, the counters, estimated totals and alerts.
+        The capture may keep running; packets arriving meanwhile are left out.
+        
+        ذخیره کل نشست ضبط در یک فایل نشست
+        
+        Args:
+            path (str): Output file path
+                        مسیر فایل خروجی
+                        
+        Returns:
+            int: Number of packets saved
+                 تعداد بسته‌های ذخیره شده
+        """
+        with self.lock:
+            spill = self.spill
+            spilled = spill.iter_records() if spill is not None else iter(())
+            spilled_count = len(spill) if spill is not None else 0
+            store = self.store
+            hot_first_seq = store.first_seq
+            # The columns in memory are copied as they are; the capture thread
+            # may evict packets and drop their frames meanwhile, so take the
+            # frames now too
+            hot_columns = store.arrays(copy=True)
+            hot_strings = {name: list(store.strings[name].values) for name in STRING_COLUMNS}
+            hot = [(info, info.get('raw') if info is not None else None) for info in store.records(load=False)]
+            session = self.session
+            estimated = {'packets': int(self._estimated_packets), 'bytes': int(self._estimated_bytes)}
+        
+        # Packets on disk only exist as records; rebuild their columns
+        spilled_store = PacketStore(max(1, spilled_count))
+        
+        def frames():
+            for _, metadata, cls, frame in spilled:
+                spilled_store.append(metadata)
+                yield cls, frame
+            for offset, (info, raw) in enumerate(hot):
+                if info is None:
+                    # Not requested since the session was opened: copy as is
+                    yield session.frame(hot_first_seq + offset - self._session_first_seq)
+                else:
+                    yield (type(raw) if raw is not None else None), frame_bytes(raw)
+        
+        def columns():
+            spilled_columns = spilled_store.arrays()
+            spilled_strings = {name: spilled_store.strings[name].values for name in STRING_COLUMNS}
+            return concat_columns([(spilled_columns, spilled_strings), (hot_columns, hot_strings)])
+        
+        manifest = {
+            'saved': time.time(),
+            'interfaces': list(self.interfaces),
+            'filter': self.filter,
+            'snaplen': self.snaplen,
+            'estimated': estimated,
+            'counters': self.metrics_registry.snapshot()['counters'],
+            'alerts': self.detector.get_alerts(),
+            'alert_counts': self.detector.describe()['alerts']
+        }
+        saved = write_session(path, frames(), columns, manifest)
+        logger.info(f"Saved {saved} packets to session {path}")
+        return saved
+    
+    def load_session(self, path):
+        """Open a session file saved by save_session()
+        
+        The packet columns are memory-mapped, so opening takes well under a
+        second regardless of the session size; packets are dissected again
+        from their frames only when requested. The current packets are
+        replaced.
+        
+        باز کردن یک فایل نشست ذخیره شده توسط save_session()
+        
+        Args:
+            path (str): Session file path
+                        مسیر فایل نشست
+                        
+        Returns:
+            int: Number of packets in the session
+                 تعداد بسته‌های نشست
+                 
+        Raises:
+            RuntimeError: If a capture is running
+                          در صورت فعال بودن ضبط
+            ValueError: If the file is not a supported session file
+                        در صورتی که فایل، فایل نشست پشتیبانی شده نباشد
+        """
+        if self.sniffing:
+            raise RuntimeError("Stop the capture before opening a session")
+        session = CaptureSession(path)
+        manifest = session.manifest
+        self.clear_packets()
+        with self.lock:
+            self.session = session
+            self._session_first_seq = int(session.columns['seq'][0]) if len(session) else 0
+            self.store.load(session.columns, session.strings, self._load_session_packet, session.sorted,
+                            self._session_sizes(session))
+            # Endpoint and conversation tables cover captured packets only
+            self._stats_seq = self.store.next_seq
+            self._estimated_packets = manifest['estimated']['packets']
+            self._estimated_bytes = manifest['estimated']['bytes']
+            if self.memory_budget is not None:
+                self._update_hot_budget()
+        for name, value in manifest['counters'].items():
+            self.metrics_registry.counter(name).value = value
+        self.detector.restore_alerts(manifest['alerts'], manifest['alert_counts'])
+        logger.info(f"Opened session {path} with {len(session)} packets")
+        return len(session)
+    
+    def _session_columns(self, session, index):
+        # Packet dictionary rebuilt from the stored columns only
+        columns = session.columns
+        info = {
+            'timestamp': float(columns['timestamp'][index]),
+            'length': int(columns['length'][index]),
+            'weight': int(columns['weight'][index]),
+            'source': '',
+            'destination': '',
+            'protocol': 'Unknown'
+        }
+        for name in ('ip_proto', 'sport', 'dport'):
+            value = int(columns[name][index])
+            if value >= 0:
+                info[name] = value
+        flags = int(columns['tcp_flags'][index])
+        if flags >= 0:
+            info['flags'] = flags
+        for name in STRING_COLUMNS:
+            code = columns[name][index]
+            if code >= 0:
+                info[name] = session.strings[name][code]
+        return info
+    
+    def _session_packet(self, session, index):
+        info = self._session_columns(session, index)
+        cls, frame = session.frame(index)
+        if cls is not None:
+            info = self._dissect_frame(cls, frame, info)
+        return info
+    
+    def _session_sizes(self, session):
+        # Memory the session packets will take once dissected, charged to
+        # the byte budget up front; a few packets spread over the session
+        # are dissected to calibrate the estimate
+        count = len(session)
+        step = max(count // self.SESSION_SIZE_SAMPLES, 1)
+        samples = [self._session_packet(session, index) for index in range(0, count, step)]
+        return estimate_loaded_sizes(samples, session.frame_lengths())
+    
+    def _load_session_packet(self, seq):
+        # Called by the store, under self.lock, the first time a loaded
+        # packet is requested
+        info = self._session_packet(self.session, seq - self._session_first_seq)
+        info['seq'] = seq
+        return info
+    
+    def _dissect_frame(self, cls, frame, info):
+        # Dissect a stored frame again; the recorded values in ``info`` win
+        # over the dissected ones, e.g. for the wire length
+        try:
+            packet = cls(frame)
+        except Exception:
+            packet = conf.raw_layer(frame)
+        packet.time = info['timestamp']
+        dissected = self._extract_packet_info(packet, track_flows=False)
+        dissected.pop('captured_length', None)
+        dissected.update(info)
+        if len(frame) < dissected['length']:
+            dissected['captured_length'] = len(frame)
+        return dissected
+    
+    def open_capture_file(self, path, progress=None, cache_size=DEFAULT_FILE_CACHE_SIZE):
+        """Open a pcap or pcapng file for browsing without loading it
+        
+        The file is indexed in a background thread; packets indexed so far
+        can be read right away with the returned index's packet(), which
+        dissects them on first access. Captured packets are not affected.
+        
+        باز کردن یک فایل pcap یا pcapng برای مرور بدون بارگذاری آن
+        
+        Args:
+            path (str): Capture file path
+                        مسیر فایل ضبط
+            progress (callable): Called from the indexing thread with
+                                 (packets, bytes indexed, file size)
+                                 تابع گزارش پیشرفت
+            cache_size (int): Dissected packets kept in memory
+                              تعداد بسته‌های تشریح شده نگه‌داشته شده در حافظه
+                              
+        Returns:
+            CaptureFileIndex: The index, already running
+                              فهرست در حال ساخت
+                              
+        Raises:
+            ValueError: If the file is neither pcap nor pcapng
+                        در صورتی که فایل pcap یا pcapng نباشد
+        """
+        interface = os.path.basename(path)
+        
+        def dissect(index, record):
+            cls = conf.l2types.get(record['linktype'], conf.raw_layer)
+            info = self._dissect_frame(cls, record['data'], {
+                'timestamp': float(record['timestamp']),
+                'length': record['length'],
+                'weight': 1,
+                'interface': interface
+            })
+            info['seq'] = index
+            return info
+        
+        return CaptureFileIndex(path, dissect, cache_size=cache_size, progress=progress).start()
+    
+    
+    def search_payloads(self, patterns, progress=None, max_matches=None):
+        """Search the raw bytes of the stored packets for a set of patterns
+        
+        The search runs over a snapshot of the stored packets in a background
+        thread; use the returned object to follow progress, cancel or read
+        the matches. Packets moved to disk by the memory budget are read
+        back from their segments and scanned first.
+        
+        جستجوی مجموعه‌ای از الگوها در بایت‌های خام بسته‌های ذخیره شده
+        
+        Args:
+            patterns (iterable): Patterns as bytes or str, or a compiled AhoCorasick
+                                 الگوها به صورت بایت یا رشته
+            progress (callable): Called from the worker thread with (scanned, total)
+                                 تابعی که با (پویش شده، کل) فراخوانی می‌شود
+            max_matches (int): Maximum number of matches to collect, or None for the default
+                               حداکثر تعداد تطابق‌ها
+                                 
+        Returns:
+            PayloadSearch: The running search
+                           جستجوی در حال اجرا
+        """
+        with self.lock:
+            packets = self.store.records(load=False)
+            first_seq = self.store.first_seq
+            session = self.session
+            if self.spill is not None:
+                # Taken under the same lock so no packet is in both or neither
+                kwargs = {'spilled': self.spill.iter_records(), 'spilled_count': len(self.spill)}
+            else:
+                kwargs = {}
+        if max_matches is not None:
+            kwargs['max_matches'] = max_matches
+        if session is not None:
+            # Scan the frames of an opened session without dissecting them
+            offset = first_seq - self._session_first_seq
+            kwargs['frames'] = lambda index: session.frame(offset + index)[1]
+        return PayloadSearch(patterns, packets, first_seq, progress=progress, **kwargs).start()
     
     def get_new_packets(self):
         """Get newly captured packets since last call
@@ -198,10 +954,166 @@ class NetworkSniffer:
             list: List of new packets
                   لیست بسته‌های جدید
         """
-        with self.lock:
-            new_packets = list(self.new_packets)
-            self.new_packets.clear()
-            return new_packets
+        new_packets = self.new_packets.poll()
+        self._queue_depth.set(0)
+        return new_packets
+    
+    def subscribe(self, name=None, policy=DROP_OLDEST, block_timeout=0.1, from_oldest=False):
+        """Subscribe to newly captured packets
+        
+        Every subscription has its own cursor into the shared packet ring,
+        so any number of consumers (recorders, alerting, the GUI) see every
+        packet without copying it. Call ``poll()`` on the subscription to
+        read and ``close()`` when done.
+        
+        اشتراک در بسته‌های تازه ضبط شده
+        
+        Args:
+            name (str): Name shown in the subscription diagnostics
+                        نام نمایش داده شده در عیب‌یابی اشتراک‌ها
+            policy (str): 'drop-oldest' (a lagging subscriber is overrun),
+                          'drop-newest' or 'block' (a lagging subscriber
+                          holds capture back)
+                          سیاست سرریز اشتراک
+            block_timeout (float): Seconds capture waits under 'block' before dropping
+                                   مدت انتظار ضبط در سیاست 'block'
+            from_oldest (bool): Start with the oldest packet still in the ring
+                                شروع از قدیمی‌ترین بسته موجود در بافر
+                                   
+        Returns:
+            Subscription: The subscription
+                          اشتراک
+        """
+        return self.packet_ring.subscribe(name, policy, block_timeout, from_oldest)
+    
+    def get_subscriptions(self):
+        """Get the state of all packet subscriptions
+        
+        دریافت وضعیت تمام اشتراک‌های بسته
+        
+        Returns:
+            list: Dictionaries with name, policy, cursor, lag, delivered and drops
+                  دیکشنری‌های شامل نام، سیاست، مکان‌نما، عقب‌ماندگی، تحویل و حذف‌ها
+        """
+        return [subscription.describe() for subscription in self.packet_ring.subscriptions]
+    
+    def stream(self, batch_size=DEFAULT_BATCH_SIZE, max_latency=DEFAULT_MAX_LATENCY,
+               overflow_policy=DROP_OLDEST, block_timeout=0.1, name='stream'):
+        """Stream newly captured packets to asyncio code
+        
+        Use as ``async with sniffer.stream() as stream: async for batch in stream``.
+        The stream is a subscription of its own, independent of
+        get_new_packets() and the GUI. By default a consumer that falls a
+        whole packet ring behind is overrun and only loses packets itself;
+        under 'block' or 'drop-newest' it holds capture back, and packets
+        dropped while it does are lost to every subscriber.
+        
+        ارسال بسته‌های تازه ضبط شده به کد asyncio
+        
+        Args:
+            batch_size (int): Maximum packets per batch
+                              حداکثر تعداد بسته‌ها در هر دسته
+            max_latency (float): Seconds a packet may wait for its batch to fill up
+                                 حداکثر مدت انتظار یک بسته برای پر شدن دسته
+            overflow_policy (str): 'drop-oldest', 'drop-newest' or 'block'
+                                   سیاست سرریز اشتراک
+            block_timeout (float): Seconds capture waits under 'block' before dropping
+                                   مدت انتظار ضبط در سیاست 'block'
+            name (str): Subscription name
+                        نام اشتراک
+                                   
+        Returns:
+            PacketStream: The stream, an async iterator of packet lists
+                          جریان، یک پیمایشگر ناهمگام از فهرست بسته‌ها
+        """
+        return PacketStream(self.packet_ring, batch_size, max_latency, name=name,
+                            policy=overflow_policy, block_timeout=block_timeout)
+    
+    def set_overflow_policy(self, policy=None, max_new_packets=None, block_timeout=None):
+        """Change the overflow policy of get_new_packets() or the packet ring size
+        
+        تغییر سیاست سرریز get_new_packets() یا اندازه بافر حلقوی بسته‌ها
+        
+        Args:
+            policy (str): 'drop-newest', 'drop-oldest' or 'block'
+                          سیاست سرریز
+            max_new_packets (int): Number of new packets the ring holds
+                                   تعداد بسته‌های جدید نگه‌داشته شده در بافر حلقوی
+            block_timeout (float): Seconds to wait under the 'block' policy
+                                   مدت انتظار در سیاست 'block'
+        """
+        if max_new_packets is not None:
+            self.packet_ring.resize(max_new_packets)
+        self.new_packets.configure(policy, block_timeout)
+    
+    def set_sampling(self, mode, rate=10, **kwargs):
+        """Enable, change or disable packet sampling
+        
+        فعال‌سازی، تغییر یا غیرفعال‌سازی نمونه‌برداری بسته‌ها
+        
+        Args:
+            mode (str): 'none', 'every-nth', 'flow' or 'adaptive'
+                        حالت نمونه‌برداری
+            rate (int): Keep one packet (or flow) in ``rate`` for the fixed-rate modes
+                        نرخ نمونه‌برداری برای حالت‌های با نرخ ثابت
+            **kwargs: Thresholds for the adaptive mode
+                      آستانه‌های حالت تطبیقی
+        """
+        self.sampler = create_sampler(mode, rate, **kwargs)
+    
+    def get_estimated_totals(self):
+        """Get packet and byte totals scaled up for sampling
+        
+        دریافت مجموع تخمینی بسته‌ها و بایت‌ها با در نظر گرفتن نمونه‌برداری
+        
+        Returns:
+            dict: Dictionary with estimated ``packets`` and ``bytes`` plus
+                  the sampler ``mode`` and current ``rate``
+                  دیکشنری شامل تعداد تخمینی بسته‌ها و بایت‌ها و وضعیت نمونه‌بردار
+        """
+        totals = self.sampler.describe()
+        totals['packets'] = self._estimated_packets
+        totals['bytes'] = self._estimated_bytes
+        return totals
+    
+    def get_alerts(self, since=0):
+        """Get alerts raised by the streaming threat detector
+        
+        دریافت هشدارهای تولید شده توسط تشخیص‌دهنده جریانی تهدیدها
+        
+        Args:
+            since (int): Only return alerts raised after the first ``since``
+                         alerts; pass the previous get_alert_count() to poll
+                         فقط هشدارهای پس از ``since`` هشدار اول
+                         
+        Returns:
+            list: Alert dictionaries with ``time``, ``kind``, ``source``,
+                  ``target``, ``count`` and ``window``, oldest first
+                  دیکشنری‌های هشدار از قدیمی‌ترین
+        """
+        return self.detector.get_alerts(since)
+    
+    def get_alert_count(self):
+        """Get the total number of alerts raised since the last clear
+        
+        دریافت تعداد کل هشدارها از آخرین پاک‌سازی
+        
+        Returns:
+            int: Number of alerts
+                 تعداد هشدارها
+        """
+        return self.detector.alert_count
+    
+    def get_drop_counts(self):
+        """Get the number of new packets get_new_packets() lost
+        
+        دریافت تعداد بسته‌های جدیدی که get_new_packets() از دست داده است
+        
+        Returns:
+            dict: Dictionary with overflow policy names as keys and drop counts as values
+                  دیکشنری با نام سیاست‌های سرریز به عنوان کلید و تعداد حذف به عنوان مقدار
+        """
+        return self.new_packets.get_drop_counts()
     
     def get_protocol_counts(self):
         """Get counts of different protocols in captured packets
@@ -209,46 +1121,231 @@ class NetworkSniffer:
         دریافت تعداد بسته‌های هر پروتکل در بسته‌های ضبط شده
         
         Returns:
-            dict: Dictionary with protocol names as keys and counts as values
+            dict: Dictionary with protocol names as keys and counts as values.
+                  Sampled packets are scaled up by their sampling weight.
                   دیکشنری با نام پروتکل‌ها به عنوان کلید و تعداد به عنوان مقدار
         """
-        protocol_counts = {}
         with self.lock:
-            for packet in self.packets:
-                protocol = packet.get('protocol', 'Other')
-                protocol_counts[protocol] = protocol_counts.get(protocol, 0) + 1
+            protocol_counts = self.store.protocol_totals()
         
         # Sort by count (descending)
         return dict(sorted(protocol_counts.items(), key=lambda x: x[1], reverse=True))
+    
+    def get_top_endpoints(self, kind=ENDPOINTS_IP, n=100, sort='bytes'):
+        """Get the busiest endpoints of the capture
+        
+        Counts are scaled up by the sampling weight and cover the live
+        capture; endpoints idle for a while are forgotten.
+        
+        دریافت پرترافیک‌ترین نقاط پایانی ضبط
+        
+        Args:
+            kind (str): 'ip' or 'mac'
+                        نوع نقطه پایانی
+            n (int): Number of endpoints
+                     تعداد نقاط پایانی
+            sort (str): 'bytes', 'packets' or 'rate'
+                        کلید مرتب‌سازی
+                        
+        Returns:
+            list: Endpoint statistics, busiest first, as returned by
+                  TrafficStatistics.top_endpoints()
+                  آمار نقاط پایانی از پرترافیک‌ترین
+        """
         with self.lock:
-            new_packets = list(self.new_packets)
-            self.new_packets.clear()
-            return new_packets
+            self._update_traffic_stats()
+        return self.traffic_stats.top_endpoints(kind, n, sort)
     
-    def _sniff_thread(self):
+    def get_top_conversations(self, kind=CONVERSATIONS_IP, n=100, sort='bytes'):
+        """Get the busiest conversations of the capture
+        
+        Counts are scaled up by the sampling weight and cover the live
+        capture; conversations idle for a while are forgotten.
+        
+        دریافت پرترافیک‌ترین مکالمه‌های ضبط
+        
+        Args:
+            kind (str): 'ip', 'tcp' or 'udp'
+                        نوع مکالمه
+            n (int): Number of conversations
+                     تعداد مکالمه‌ها
+            sort (str): 'bytes', 'packets' or 'rate'
+                        کلید مرتب‌سازی
+                        
+        Returns:
+            list: Conversation statistics, busiest first, as returned by
+                  TrafficStatistics.top_conversations()
+                  آمار مکالمه‌ها از پرترافیک‌ترین
+        """
+        with self.lock:
+            self._update_traffic_stats()
+        return self.traffic_stats.top_conversations(kind, n, sort)
+    
+    def metrics(self):
+        """Get a snapshot of the capture pipeline metrics
+        
+        دریافت تصویری از معیارهای خط لوله ضبط
+        
+        Returns:
+            dict: Dictionary with ``counters``, ``gauges``, ``histograms``
+                  (latencies in microseconds), per-protocol ``dissectors``,
+                  ``detection`` alert totals and packet ``subscriptions``
+                  دیکشنری شامل شمارنده‌ها، سنجه‌ها، هیستوگرام‌ها، آمار تشریح‌گرها و هشدارها
+        """
+        snapshot = self.metrics_registry.snapshot()
+        for policy, drops in self.new_packets.get_drop_counts().items():
+            snapshot['counters'][f'queue_drops_{policy}'] = drops
+        if self.geoip.loaded:
+            geoip_stats = self.geoip.get_stats()
+            snapshot['counters']['geoip_cache_hits'] = geoip_stats['hits']
+            snapshot['counters']['geoip_cache_misses'] = geoip_stats['misses']
+        snapshot['subscriptions'] = self.get_subscriptions()
+        snapshot['dissectors'] = self.dissectors.get_stats()
+        snapshot['detection'] = self.detector.describe()
+        snapshot['classification'] = self.classifier.describe()
+        snapshot['traffic_stats'] = self.traffic_stats.describe()
+        return snapshot
+    
+    def record_gui_refresh(self, duration_ns):
+        """Record how long one GUI refresh took
+        
+        ثبت مدت زمان یک به‌روزرسانی رابط کاربری
+        
+        Args:
+            duration_ns (int): Refresh duration in nanoseconds
+                               مدت زمان به‌روزرسانی بر حسب نانوثانیه
+        """
+        self.metrics_registry.histogram('gui_refresh').observe(duration_ns)
+    
+    def format_packet(self, packet):
+        """Get the display strings of a captured packet
+        
+        The strings are built on first use and memoized in the packet
+        dictionary, so the capture path never formats anything.
+        
+        دریافت رشته‌های نمایشی یک بسته ضبط شده
+        
+        Args:
+            packet (dict): Packet information dictionary
+                           دیکشنری اطلاعات بسته
+                           
+        Returns:
+            tuple: (time, source, destination, protocol, length, info) strings
+                   رشته‌های زمان، مبدأ، مقصد، پروتکل، طول و اطلاعات
+        """
+        display = packet.get('_display')
+        if display is None:
+            display = (
+                datetime.fromtimestamp(packet['timestamp']).strftime("%H:%M:%S.%f")[:-3],
+                str(packet['source']),
+                str(packet['destination']),
+                str(packet['protocol']),
+                str(packet['length']),
+                self.dissectors.summarize(packet)
+            )
+            packet['_display'] = display
+        
+        geoip = self.geoip
+        if geoip.loaded:
+            located = packet.get('_located')
+            if located is None or located[0] != geoip.generation:
+                source_location = geoip.describe(display[1])
+                destination_location = geoip.describe(display[2])
+                located = (geoip.generation, (
+                    display[0],
+                    f"{display[1]} [{source_location}]" if source_location else display[1],
+                    f"{display[2]} [{destination_location}]" if destination_location else display[2]
+                ) + display[3:])
+                packet['_located'] = located
+            return located[1]
+        return display
+    
+    def load_geoip_database(self, path):
+        """Open a MaxMind GeoIP/ASN database for tagging addresses
+        
+        Displayed sources and destinations are tagged with their country
+        and autonomous system, e.g. ``8.8.8.8 [US, AS15169]``.
+        
+        باز کردن یک پایگاه داده GeoIP/ASN با قالب MaxMind برای برچسب‌گذاری آدرس‌ها
+        
+        Args:
+            path (str): Path of the .mmdb file
+                        مسیر فایل .mmdb
+                        
+        Returns:
+            str: The database type, e.g. 'GeoLite2-ASN'
+                 نوع پایگاه داده
+        """
+        return self.geoip.add_database(path)
+    
+    def lookup_location(self, address):
+        """Get the country and autonomous system of an address
+        
+        دریافت کشور و سیستم خودمختار یک آدرس
+        
+        Args:
+            address (str): IPv4 or IPv6 address
+                           آدرس IPv4 یا IPv6
+                           
+        Returns:
+            dict: Dictionary with ``country``, ``asn`` and ``organization``,
+                  or None if unknown or no database is loaded
+                  دیکشنری شامل کشور، ASN و سازمان، یا None
+        """
+        if not self.geoip.loaded:
+            return None
+        return self.geoip.lookup(address)
+    
+    def get_dissector_stats(self):
+        """Get per-dissector hit and timing counters
+        
+        دریافت شمارنده‌های تعداد و زمان هر تشریح‌گر
+        
+        Returns:
+            dict: Dictionary with protocol names as keys and counters as values
+                  دیکشنری با نام پروتکل‌ها به عنوان کلید و شمارنده‌ها به عنوان مقدار
+        """
+        return self.dissectors.get_stats()
+    
+    def _sniff_thread(self, interface=None):
         """Internal method for packet sniffing in a separate thread
         
         متد داخلی برای ضبط بسته‌ها در یک رشته جداگانه
+        
+        Args:
+            interface (str): Interface to capture on, defaults to self.interface
+                             رابط شبکه برای ضبط
         """
+        interface = interface or self.interface
         try:
-            # Set promiscuous mode based on platform
-            promisc = platform.system() != 'Windows'
-            
-            # Start sniffing
-            sniff(
-                iface=self.interface,
-                prn=self._packet_handler,
-                filter=self.filter,
-                store=0,
-                promisc=promisc,
-                stop_filter=lambda x: not self.sniffing
-            )
+            self._captures[interface].run()
         except Exception as e:
-            print(f"Error in sniffing thread: {str(e)}")
+            logger.error(f"Error in sniffing thread for {interface}: {str(e)}", exc_info=True)
         finally:
-            self.sniffing = False
+            merger = self._merger
+            if merger is not None:
+                merger.remove_stream(interface)
+            # Capture stops once the last interface thread has ended
+            with self._captures_lock:
+                self._active_captures -= 1
+                if self._active_captures <= 0:
+                    self.sniffing = False
     
-    def _packet_handler(self, packet):
+    def _merge_loop(self):
+        """Release merged multi-interface packets in capture time order
+        
+        آزاد کردن بسته‌های ادغام شده چند رابط به ترتیب زمان ضبط
+        """
+        merger = self._merger
+        while self.sniffing:
+            time.sleep(self.MERGE_INTERVAL)
+            try:
+                self._deliver_packets(merger.pop_ready())
+            except Exception as e:
+                logger.error(f"Error merging captured packets: {str(e)}", exc_info=True)
+        self._deliver_packets(merger.pop_ready(flush=True))
+    
+    def _packet_handler(self, packet, interface=None):
         """Handle captured packets
         
         مدیریت بسته‌های ضبط شده
@@ -256,29 +1353,72 @@ class NetworkSniffer:
         Args:
             packet: The captured packet
                     بسته ضبط شده
+            interface (str): Interface the packet was captured on
+                             رابط شبکه‌ای که بسته از آن ضبط شده است
         """
         if not self.sniffing:
             return
         
+        perf_counter_ns = time.perf_counter_ns
+        
         try:
-            # Extract packet information
-            packet_info = self._extract_packet_info(packet)
-            if not packet_info:
+            with self._handler_lock:
+                self._frames_received.value += 1
+                
+                # Shed load before paying for dissection
+                sampler = self.sampler
+                weight = sampler.sample(packet)
+                if not weight:
+                    self._frames_sampled_out.value += 1
+                    return
+                
+                # Extract packet information
+                start = perf_counter_ns()
+                packet_info = self._extract_packet_info(packet)
+                latency = perf_counter_ns() - start
+                self._extract_latency.observe(latency)
+                if sampler.adaptive:
+                    sampler.observe(latency, len(self.new_packets))
+                if not packet_info:
+                    return
+                self._frames_dissected.value += 1
+                
+                # Scale counters back up to estimated totals
+                packet_info['weight'] = weight
+                self._estimated_packets += weight
+                self._estimated_bytes += weight * packet_info['length']
+            
+            # Keep the capture timestamp as a number; display strings are
+            # built by format_packet() only for rows that are shown
+            packet_info['timestamp'] = float(packet.time)
+            packet_info['interface'] = interface or self.interface
+            
+            # Several interfaces: the merge thread stores the packet in order
+            merger = self._merger
+            if merger is not None:
+                merger.push(packet_info['interface'], (packet_info,))
                 return
             
-            # Add timestamp
-            packet_info['timestamp'] = time.time()
-            packet_info['time'] = datetime.now().strftime("%H:%M:%S.%f")[:-3]
+            # Streaming scan/flood detection on the capture timestamp
+            self.detector.observe(packet_info)
             
             # Add to packet lists
+            start = perf_counter_ns()
             with self.lock:
-                self.packets.append(packet_info)
-                self.new_packets.append(packet_info)
+                self._lock_wait.observe(perf_counter_ns() - start)
+                self._store_packet(packet_info)
+            
+            # Hand over to subscribers; slow ones are overrun or hold capture
+            # back according to their overflow policy
+            self.packet_ring.publish(packet_info)
+            self._queue_depth.set(len(self.new_packets))
                 
         except Exception as e:
-            print(f"Error processing packet: {str(e)}")
+            with self._handler_lock:
+                self._dissect_errors.value += 1
+            logger.debug(f"Error processing packet: {str(e)}", exc_info=True)
     
-    def _extract_packet_info(self, packet):
+    def _extract_packet_info(self, packet, track_flows=True):
         """Extract relevant information from a packet
         
         استخراج اطلاعات مربوطه از یک بسته
@@ -286,75 +1426,36 @@ class NetworkSniffer:
         Args:
             packet: The packet to extract information from
                     بسته‌ای که اطلاعات از آن استخراج می‌شود
+            track_flows (bool): Classify the application protocol through the
+                                flow table; False for packets read back out of
+                                capture order
+                                طبقه‌بندی پروتکل کاربردی از طریق جدول جریان‌ها
                     
         Returns:
             dict: Dictionary containing packet information
                   دیکشنری حاوی اطلاعات بسته
         """
+        # Length of the captured bytes, without rebuilding the packet
+        length = len(frame_bytes(packet))
         packet_info = {
             'source': '',
             'destination': '',
             'protocol': 'Unknown',
-            'length': len(packet),
-            'info': '',
+            'length': length,
             'raw': packet
         }
         
-        # Ethernet layer
-        if Ether in packet:
-            eth = packet[Ether]
-            packet_info['src_mac'] = eth.src
-            packet_info['dst_mac'] = eth.dst
-            
-            # IP layer
-            if IP in packet:
-                ip = packet[IP]
-                packet_info['source'] = ip.src
-                packet_info['destination'] = ip.dst
-                packet_info['protocol'] = ip.proto
-                
-                # TCP
-                if TCP in packet:
-                    tcp = packet[TCP]
-                    packet_info['protocol'] = 'TCP'
-                    packet_info['sport'] = tcp.sport
-                    packet_info['dport'] = tcp.dport
-                    packet_info['flags'] = self._get_tcp_flags(tcp.flags)
-                    packet_info['info'] = f"{ip.src}:{tcp.sport} -> {ip.dst}:{tcp.dport} [{packet_info['flags']}]"
-                
-                # UDP
-                elif UDP in packet:
-                    udp = packet[UDP]
-                    packet_info['protocol'] = 'UDP'
-                    packet_info['sport'] = udp.sport
-                    packet_info['dport'] = udp.dport
-                    packet_info['info'] = f"{ip.src}:{udp.sport} -> {ip.dst}:{udp.dport}"
-                
-                # ICMP
-                elif ICMP in packet:
-                    icmp = packet[ICMP]
-                    packet_info['protocol'] = 'ICMP'
-                    packet_info['type'] = icmp.type
-                    packet_info['code'] = icmp.code
-                    packet_info['info'] = f"Type: {icmp.type}, Code: {icmp.code}"
-                
-                # Other IP protocols
-                else:
-                    packet_info['info'] = f"{ip.proto}"
-            
-            # ARP
-            elif ARP in packet:
-                arp = packet[ARP]
-                packet_info['protocol'] = 'ARP'
-                packet_info['source'] = arp.psrc
-                packet_info['destination'] = arp.pdst
-                packet_info['operation'] = 'who-has' if arp.op == 1 else 'is-at'
-                packet_info['info'] = f"{arp.op}: {arp.psrc} -> {arp.pdst}"
-            
-            # Other Ethernet protocols
-            else:
-                packet_info['protocol'] = 'Ethernet'
-                packet_info['info'] = f"EtherType: 0x{eth.type:04x}"
+        # Frames cut at the snapshot length are accounted at their wire length
+        snaplen = self.snaplen
+        if snaplen and length >= snaplen:
+            packet_info['length'] = wire_length(packet)
+            packet_info['captured_length'] = length
+        
+        # Walk the protocol dispatch tables
+        self.dissectors.dissect(packet, packet_info)
+        
+        # Name the application protocol of TCP/UDP flows
+        self.classifier.classify(packet, packet_info, track_flows)
         
         return packet_info
     
@@ -371,14 +1472,4 @@ class NetworkSniffer:
             str: String representation of TCP flags
                  نمایش متنی پرچم‌های TCP
         """
-        flag_names = []
-        if flags & 0x01: flag_names.append('FIN')
-        if flags & 0x02: flag_names.append('SYN')
-        if flags & 0x04: flag_names.append('RST')
-        if flags & 0x08: flag_names.append('PSH')
-        if flags & 0x10: flag_names.append('ACK')
-        if flags & 0x20: flag_names.append('URG')
-        if flags & 0x40: flag_names.append('ECE')
-        if flags & 0x80: flag_names.append('CWR')
-        
-        return ', '.join(flag_names) if flag_names else 'None'
+        return get_tcp_flags(flags)
@@ -0,0 +1,460 @@
+"""
+Packet Memory Accounting and Disk Spill
+
+This module estimates how much memory a stored packet takes and keeps
+packets evicted from memory in zlib-compressed segment files on disk, so a
+byte budget can bound memory use without throwing old packets away. A
+segment is compressed and written by a background thread once it is full;
+reading a packet back loads and caches its whole segment.
+
+ماژول محاسبه حافظه بسته‌ها و انتقال به دیسک
+این ماژول حافظه مصرفی هر بسته ذخیره شده را تخمین می‌زند و بسته‌هایی را که از
+حافظه خارج می‌شوند در فایل‌های قطعه فشرده شده با zlib روی دیسک نگه می‌دارد تا
+بودجه بایتی بتواند مصرف حافظه را بدون دور ریختن بسته‌های قدیمی محدود کند. هر قطعه
+پس از پر شدن توسط یک نخ پس‌زمینه فشرده و نوشته می‌شود؛ خواندن دوباره یک بسته کل
+قطعه آن را بارگذاری و در حافظه نهان نگه می‌دارد.
+"""
+
+import bisect
+import logging
+import os
+import pickle
+import queue
+import sys
+import tempfile
+import threading
+import zlib
+from collections import OrderedDict
+
+import numpy as np
+from scapy.config import conf
+
+from .search import frame_bytes
+
+logger = logging.getLogger(__name__)
+
+# Measured with tracemalloc on dissected scapy packets: every layer object
+# takes about 1 KB and the frame bytes are held about four times over
+# (original frame, per-layer caches and payload fields)
+# هزینه تقریبی هر لایه scapy و ضریب نگه‌داری بایت‌های فریم
+SCAPY_LAYER_BYTES = 1000
+SCAPY_FRAME_FACTOR = 4
+
+DEFAULT_SEGMENT_PACKETS = 1024
+DEFAULT_CACHED_SEGMENTS = 2
+DEFAULT_COMPRESS_LEVEL = 1
+
+# Keys of the packet dictionary that are not written to disk
+# کلیدهایی از دیکشنری بسته که روی دیسک نوشته نمی‌شوند
+_MEMORY_ONLY_KEYS = ('raw', '_display', '_located')
+
+_getsizeof = sys.getsizeof
+
+
+def estimate_packet_size(info):
+    """Estimate the memory taken by a stored packet
+
+    تخمین حافظه مصرفی یک بسته ذخیره شده
+
+    Args:
+        info (dict): Packet information dictionary
+                     دیکشنری اطلاعات بسته
+
+    Returns:
+        tuple: (metadata bytes, payload bytes), where the payload is the
+               retained scapy packet
+               (بایت‌های فراداده، بایت‌های محتوا)
+    """
+    metadata = _getsizeof(info)
+    for key, value in info.items():
+        if key != 'raw':
+            metadata += _getsizeof(value)
+
+    payload = 0
+    raw = info.get('raw')
+    if raw is not None:
+        layers = 0
+        layer = raw
+        while layer:
+            layers += 1
+            layer = layer.payload
+        original = getattr(raw, 'original', None)
+        frame_length = len(original) if original is not None else info.get('captured_length', info['length'])
+        payload = layers * SCAPY_LAYER_BYTES + frame_length * SCAPY_FRAME_FACTOR
+    return metadata, payload
+
+
+def estimate_loaded_sizes(samples, frame_lengths):
+    """Estimate the memory loaded packets will take once dissected
+
+    The dictionaries of a few dissected packets give the metadata size and
+    the per-packet layer overhead; the payload of every packet is then
+    scaled by its own frame length.
+
+    تخمین حافظه‌ای که بسته‌های بارگذاری شده پس از تشریح مصرف می‌کنند
+
+    Args:
+        samples (list): Dissected dictionaries of some of the packets
+                        دیکشنری‌های تشریح شده برخی از بسته‌ها
+        frame_lengths (numpy.ndarray): Frame length of every packet, -1 for
+                                       packets without a frame
+                                       طول فریم هر بسته، ۱- برای بسته‌های بدون فریم
+
+    Returns:
+        tuple: (metadata bytes, payload bytes) arrays, one entry per packet
+               آرایه‌های (بایت‌های فراداده، بایت‌های محتوا)
+    """
+    metadata = []
+    overheads = []
+    for info in samples:
+        info_metadata, payload = estimate_packet_size(info)
+        metadata.append(info_metadata)
+        if payload:
+            overheads.append(payload - info.get('captured_length', info['length']) * SCAPY_FRAME_FACTOR)
+    count = len(frame_lengths)
+    metadata_bytes = np.full(count, sum(metadata) // max(len(metadata), 1), dtype=np.uint32)
+    overhead = max(sum(overheads) // max(len(overheads), 1), 0)
+    payload_bytes = np.where(frame_lengths >= 0, overhead + frame_lengths * SCAPY_FRAME_FACTOR, 0)
+    return metadata_bytes, payload_bytes.astype(np.uint32)
+
+
+def _restore(record):
+    seq, metadata, cls, frame = record
+    info = dict(metadata)
+    if cls is not None:
+        try:
+            packet = cls(frame)
+        except Exception:
+            packet = conf.raw_layer(frame)
+        packet.time = info['timestamp']
+        info['raw'] = packet
+    return info
+
+
+class SegmentStore:
+    """
+    Compressed on-disk segments of packets evicted from memory
+
+    قطعه‌های فشرده روی دیسک از بسته‌های خارج شده از حافظه
+    """
+
+    def __init__(self, directory=None, segment_packets=DEFAULT_SEGMENT_PACKETS, disk_budget=None,
+                 cached_segments=DEFAULT_CACHED_SEGMENTS, compress_level=DEFAULT_COMPRESS_LEVEL):
+        """Initialize the segment store
+
+        مقداردهی اولیه ذخیره‌ساز قطعه‌ها
+
+        Args:
+            directory (str): Directory for the segment files, or None for a
+                             temporary directory removed on close()
+                             پوشه فایل‌های قطعه، یا None برای پوشه موقت
+            segment_packets (int): Packets per segment
+                                   تعداد بسته‌ها در هر قطعه
+            disk_budget (int): Maximum bytes on disk; the oldest segments are
+                               deleted beyond it. None for no limit
+                               حداکثر حجم روی دیسک بر حسب بایت
+            cached_segments (int): Decompressed segments kept for reads
+                                   تعداد قطعه‌های باز شده نگه‌داشته شده برای خواندن
+            compress_level (int): zlib compression level
+                                  سطح فشرده‌سازی zlib
+        """
+        if segment_packets < 1:
+            raise ValueError("Segments must hold at least 1 packet")
+        self._tempdir = None
+        if directory is None:
+            self._tempdir = tempfile.TemporaryDirectory(prefix='netscope-spill-')
+            directory = self._tempdir.name
+        else:
+            os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.segment_packets = segment_packets
+        self.disk_budget = disk_budget
+        self.cached_segments = cached_segments
+        self.compress_level = compress_level
+
+        self.lock = threading.Lock()
+        self._segments = []
+        self._first_seqs = []
+        self._pending = []
+        self._pending_bytes = 0
+        self._writing = OrderedDict()
+        self._writing_bytes = 0
+        self._cache = OrderedDict()
+        self._cache_bytes = 0
+        self._generation = 0
+        self._queue = queue.Queue()
+        self._writer = None
+
+        self.disk_bytes = 0
+        self.packets_on_disk = 0
+        self.packets_deleted = 0
+
+    def add(self, seq, info):
+        """Queue an evicted packet for the next segment
+
+        قرار دادن یک بسته خارج شده از حافظه در صف قطعه بعدی
+
+        Args:
+            seq (int): Sequence number of the packet; packets must be added in
+                       increasing order
+                       شماره ترتیب بسته
+            info (dict): Packet information dictionary
+                         دیکشنری اطلاعات بسته
+        """
+        raw = info.get('raw')
+        frame = frame_bytes(raw)
+        metadata = {key: value for key, value in info.items() if key not in _MEMORY_ONLY_KEYS}
+        record = (seq, metadata, type(raw) if raw is not None else None, frame)
+        size = _getsizeof(metadata) + _getsizeof(frame) + 64
+
+        with self.lock:
+            self._pending.append(record)
+            self._pending_bytes += size
+            if len(self._pending) >= self.segment_packets:
+                self._hand_over()
+
+    def _hand_over(self):
+        # Caller holds the lock
+        batch = self._pending
+        self._writing[batch[0][0]] = (batch, self._pending_bytes)
+        self._writing_bytes += self._pending_bytes
+        self._pending = []
+        self._pending_bytes = 0
+        self._queue.put((self._generation, batch))
+        if self._writer is None or not self._writer.is_alive():
+            self._writer = threading.Thread(target=self._write_loop, name='segment-writer', daemon=True)
+            self._writer.start()
+
+    def _write_loop(self):
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                self._write_segment(*item)
+            finally:
+                self._queue.task_done()
+
+    def _write_segment(self, generation, batch):
+        first_seq = batch[0][0]
+        path = os.path.join(self.directory, f'segment-{first_seq:012d}.bin')
+        try:
+            data = zlib.compress(pickle.dumps(batch, pickle.HIGHEST_PROTOCOL), self.compress_level)
+            with open(path, 'wb') as f:
+                f.write(data)
+        except Exception as e:
+            logger.error(f"Writing packet segment {path} failed: {e}", exc_info=True)
+            data = None
+
+        with self.lock:
+            entry = self._writing.pop(first_seq, None)
+            if entry is not None:
+                self._writing_bytes -= entry[1]
+            if generation != self._generation or data is None:
+                # Cleared while writing, or the write failed
+                if data is not None:
+                    self._remove_file(path)
+                else:
+                    self.packets_deleted += len(batch)
+                return
+            self._segments.append({
+                'first_seq': first_seq,
+                'count': len(batch),
+                'path': path,
+                'disk_bytes': len(data),
+                'memory_bytes': entry[1] if entry is not None else 0,
+                'first_time': batch[0][1]['timestamp'],
+                'last_time': batch[-1][1]['timestamp']
+            })
+            self._first_seqs.append(first_seq)
+            self.disk_bytes += len(data)
+            self.packets_on_disk += len(batch)
+
+            # Keep at least the newest segment
+            while self.disk_budget is not None and self.disk_bytes > self.disk_budget and len(self._segments) > 1:
+                self._delete_oldest()
+
+    def _delete_oldest(self):
+        # Caller holds the lock
+        segment = self._segments.pop(0)
+        self._first_seqs.pop(0)
+        self.disk_bytes -= segment['disk_bytes']
+        self.packets_on_disk -= segment['count']
+        self.packets_deleted += segment['count']
+        cached = self._cache.pop(segment['first_seq'], None)
+        if cached is not None:
+            self._cache_bytes -= segment['memory_bytes']
+        self._remove_file(segment['path'])
+
+    @staticmethod
+    def _remove_file(path):
+        try:
+            os.remove(path)
+        except OSError as e:
+            logger.warning(f"Could not remove packet segment {path}: {e}")
+
+    @property
+    def first_seq(self):
+        """Sequence number of the oldest packet kept, or None if empty
+
+        شماره ترتیب قدیمی‌ترین بسته نگه‌داشته شده
+        """
+        with self.lock:
+            if self._segments:
+                return self._segments[0]['first_seq']
+            if self._writing:
+                return next(iter(self._writing))
+            if self._pending:
+                return self._pending[0][0]
+        return None
+
+    def __len__(self):
+        with self.lock:
+            writing = sum(len(batch) for batch, _ in self._writing.values())
+            return self.packets_on_disk + writing + len(self._pending)
+
+    def get(self, seq):
+        """Read one packet back
+
+        The frame is dissected again, so ``raw`` is a fresh scapy packet.
+
+        خواندن دوباره یک بسته
+
+        Args:
+            seq (int): Sequence number
+                       شماره ترتیب
+
+        Returns:
+            dict: Packet information dictionary, or None if not kept
+                  دیکشنری اطلاعات بسته، یا None اگر نگه‌داشته نشده باشد
+        """
+        with self.lock:
+            for batch in [self._pending] + [batch for batch, _ in self._writing.values()]:
+                if batch and batch[0][0] <= seq <= batch[-1][0]:
+                    return _restore(batch[seq - batch[0][0]])
+
+            index = bisect.bisect_right(self._first_seqs, seq) - 1
+            if index < 0:
+                return None
+            segment = self._segments[index]
+            if seq >= segment['first_seq'] + segment['count']:
+                return None
+            batch = self._cache.get(segment['first_seq'])
+            if batch is not None:
+                self._cache.move_to_end(segment['first_seq'])
+                return _restore(batch[seq - segment['first_seq']])
+            generation = self._generation
+
+        try:
+            with open(segment['path'], 'rb') as f:
+                batch = pickle.loads(zlib.decompress(f.read()))
+        except OSError:
+            # Deleted by the disk budget in the meantime
+            return None
+
+        with self.lock:
+            index = bisect.bisect_left(self._first_seqs, segment['first_seq'])
+            kept = index < len(self._segments) and self._segments[index] is segment
+            if kept and generation == self._generation and segment['first_seq'] not in self._cache:
+                self._cache[segment['first_seq']] = batch
+                self._cache_bytes += segment['memory_bytes']
+                while len(self._cache) > self.cached_segments:
+                    first_seq, _ = self._cache.popitem(last=False)
+                    index = bisect.bisect_left(self._first_seqs, first_seq)
+                    self._cache_bytes -= self._segments[index]['memory_bytes']
+        return _restore(batch[seq - segment['first_seq']])
+
+    def iter_records(self):
+        """Iterate over the packets kept now, without dissecting them
+
+        Packets added after the call are not included.
+
+        پیمایش بسته‌های نگه‌داشته شده در این لحظه بدون تشریح آن‌ها
+
+        Returns:
+            iterator: (seq, metadata dict, scapy class or None, frame bytes)
+                      tuples, oldest first
+                      (شماره ترتیب، دیکشنری فراداده، کلاس scapy یا None، بایت‌های فریم)
+        """
+        with self.lock:
+            segments = list(self._segments)
+            batches = [batch for batch, _ in self._writing.values()] + [list(self._pending)]
+        return self._iter_snapshot(segments, batches)
+
+    @staticmethod
+    def _iter_snapshot(segments, batches):
+        for segment in segments:
+            try:
+                with open(segment['path'], 'rb') as f:
+                    yield from pickle.loads(zlib.decompress(f.read()))
+            except OSError:
+                continue  # Deleted by the disk budget in the meantime
+        for batch in batches:
+            yield from batch
+
+    def flush(self):
+        """Write the partly filled segment and wait for the writer
+
+        نوشتن قطعه نیمه‌پر و انتظار برای نخ نویسنده
+        """
+        with self.lock:
+            if self._pending:
+                self._hand_over()
+        self._queue.join()
+
+    def clear(self):
+        """Delete all segments and queued packets
+
+        حذف تمام قطعه‌ها و بسته‌های در صف
+        """
+        with self.lock:
+            self._generation += 1
+            for segment in self._segments:
+                self._remove_file(segment['path'])
+            self._segments = []
+            self._first_seqs = []
+            self._pending = []
+            self._pending_bytes = 0
+            self._writing.clear()
+            self._writing_bytes = 0
+            self._cache.clear()
+            self._cache_bytes = 0
+            self.disk_bytes = 0
+            self.packets_on_disk = 0
+            self.packets_deleted = 0
+
+    def close(self):
+        """Stop the writer and delete all segment files
+
+        توقف نخ نویسنده و حذف تمام فایل‌های قطعه
+        """
+        self.clear()
+        if self._writer is not None:
+            self._queue.put(None)
+            self._writer.join(timeout=5.0)
+            self._writer = None
+        if self._tempdir is not None:
+            self._tempdir.cleanup()
+            self._tempdir = None
+
+    def get_stats(self):
+        """Get the disk and buffer usage
+
+        دریافت میزان استفاده از دیسک و بافرها
+
+        Returns:
+            dict: Dictionary with ``segments``, ``packets`` and ``bytes`` on
+                  disk, packets ``deleted`` by the disk budget, and the memory
+                  taken by ``buffers`` waiting to be written and by the read
+                  ``cache``
+                  دیکشنری شامل قطعه‌ها، بسته‌ها و حجم روی دیسک و حافظه بافرها و حافظه نهان
+        """
+        with self.lock:
+            return {
+                'segments': len(self._segments),
+                'packets': self.packets_on_disk,
+                'bytes': self.disk_bytes,
+                'deleted': self.packets_deleted,
+                'buffers': self._pending_bytes + self._writing_bytes,
+                'cache': self._cache_bytes
+            }
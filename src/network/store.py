@@ -0,0 +1,601 @@
+"""
+Columnar Packet Store
+
+This module keeps captured packets in NumPy columns next to the packet
+dictionaries, so analytics can read typed arrays without per-row Python
+work. The live window is always contiguous: columns are allocated with room
+for twice the capacity and the window is moved back to the front only when
+it reaches the end, which keeps appends O(1) amortized and lets slices be
+handed out as views.
+
+ماژول ذخیره‌ساز ستونی بسته‌ها
+این ماژول بسته‌های ضبط شده را در ستون‌های NumPy در کنار دیکشنری‌های بسته نگه
+می‌دارد تا تحلیل‌ها بدون پردازش سطر به سطر پایتون، آرایه‌های نوع‌دار را بخوانند.
+پنجره داده‌های زنده همیشه پیوسته است و برش‌ها به صورت view بدون کپی ارائه می‌شوند.
+"""
+
+import numpy as np
+
+# Numeric columns and their dtypes; missing values are stored as -1
+# ستون‌های عددی و نوع داده آن‌ها؛ مقادیر ناموجود با -1 ذخیره می‌شوند
+NUMERIC_COLUMNS = {
+    'seq': np.int64,
+    'timestamp': np.float64,
+    'length': np.uint32,
+    'weight': np.uint32,
+    'ip_proto': np.int16,
+    'sport': np.int32,
+    'dport': np.int32,
+    'tcp_flags': np.int16
+}
+
+# String columns, stored as int32 codes into a per-column string table
+# ستون‌های متنی که به صورت کد int32 در جدول رشته‌های هر ستون ذخیره می‌شوند
+STRING_COLUMNS = ('protocol', 'source', 'destination', 'src_mac', 'dst_mac', 'interface')
+
+ALL_COLUMNS = tuple(NUMERIC_COLUMNS) + STRING_COLUMNS
+
+_INITIAL_ALLOCATION = 4096
+
+# Memory of one interned string with its code, measured with tracemalloc
+# for typical addresses
+_STRING_BYTES = 120
+
+# String tables smaller than this are never compacted
+_COMPACT_MIN_STRINGS = 1024
+
+
+class StringTable:
+    """
+    Interning table mapping strings to dense integer codes
+
+    جدول یکتاسازی رشته‌ها که هر رشته را به یک کد عددی متراکم نگاشت می‌کند
+    """
+
+    __slots__ = ('codes', 'values')
+
+    def __init__(self, values=None):
+        """Initialize the table
+
+        مقداردهی اولیه جدول
+
+        Args:
+            values (list): Existing values in code order; their codes are
+                           indexed on the first intern()
+                           مقادیر موجود به ترتیب کد
+        """
+        self.values = list(values) if values else []
+        # Built lazily for loaded tables, so opening a session stays cheap
+        self.codes = None if self.values else {}
+
+    def intern(self, value):
+        """Get the code of a value, adding it if needed
+
+        دریافت کد یک مقدار و افزودن آن در صورت نیاز
+
+        Args:
+            value: The value, or a falsy value for a missing entry
+                   مقدار، یا مقدار تهی برای داده ناموجود
+
+        Returns:
+            int: The code, or -1 for a missing value
+                 کد، یا -1 برای مقدار ناموجود
+        """
+        if not value and value != 0:
+            return -1
+        codes = self.codes
+        if codes is None:
+            codes = self.codes = {value: code for code, value in enumerate(self.values)}
+        code = codes.get(value)
+        if code is None:
+            code = len(self.values)
+            codes[value] = code
+            self.values.append(str(value))
+        return code
+
+    def categories(self):
+        """Get all interned values as an object array indexed by code
+
+        دریافت تمام مقادیر به صورت آرایه‌ای که با کد اندیس‌گذاری شده است
+
+        Returns:
+            numpy.ndarray: Object array of strings
+                           آرایه‌ای از رشته‌ها
+        """
+        return np.array(self.values, dtype=object)
+
+
+class PacketStore:
+    """
+    Bounded columnar store of captured packets
+
+    Not thread-safe on its own; NetworkSniffer guards it with its lock.
+
+    ذخیره‌ساز ستونی محدود بسته‌های ضبط شده
+    """
+
+    def __init__(self, capacity, byte_budget=None, on_evict=None):
+        """Initialize the store
+
+        مقداردهی اولیه ذخیره‌ساز
+
+        Args:
+            capacity (int): Maximum number of packets kept
+                            حداکثر تعداد بسته‌های نگه‌داشته شده
+            byte_budget (int): Maximum estimated bytes of the stored packets,
+                               or None to limit by count only
+                               حداکثر حجم تخمینی بسته‌های ذخیره شده بر حسب بایت
+            on_evict (callable): Called with (seq, info) for every packet
+                                 evicted to make room, while it is still stored
+                                 تابعی که برای هر بسته حذف شده فراخوانی می‌شود
+        """
+        if capacity < 1:
+            raise ValueError("Store capacity must be at least 1")
+        self.capacity = capacity
+        self.byte_budget = byte_budget
+        self.on_evict = on_evict
+        self._next_seq = 0
+        self.clear()
+
+    def clear(self):
+        """Remove all packets; sequence numbers keep increasing
+
+        حذف تمام بسته‌ها؛ شماره‌های ترتیب همچنان افزایش می‌یابند
+        """
+        self._allocated = min(2 * self.capacity, _INITIAL_ALLOCATION)
+        self._columns = {name: np.empty(self._allocated, dtype=dtype) for name, dtype in NUMERIC_COLUMNS.items()}
+        for name in STRING_COLUMNS:
+            self._columns[name] = np.empty(self._allocated, dtype=np.int32)
+        # Estimated memory of every packet, for the byte budget; the columns
+        # are added once a packet is charged
+        self.metadata_bytes = 0
+        self.payload_bytes = 0
+        self._records = [None] * self._allocated
+        self.strings = {name: StringTable() for name in STRING_COLUMNS}
+        self._start = 0
+        self._end = 0
+        self._sorted = True
+        self._last_timestamp = float('-inf')
+        # Builds the dictionaries of loaded packets on first access
+        self.loader = None
+        # Loaded packets may exceed the capacity or byte budget; they are
+        # evicted a few per append instead of all at once
+        self._over_limits = False
+
+    def load(self, columns, strings, loader, ordered=True, sizes=None):
+        """Replace the contents with loaded columns
+
+        The columns are used as they are (e.g. memory-mapped and read-only)
+        until the next append copies them; the packet dictionaries are
+        built by ``loader`` when first requested. Sequence numbers continue
+        from the ``seq`` column. Loaded packets beyond the capacity or the
+        byte budget are kept for now; every append then evicts up to two
+        packets until the store is back within its limits, so resuming
+        capture never builds and evicts the whole session at once.
+
+        جایگزینی محتوا با ستون‌های بارگذاری شده
+
+        Args:
+            columns (dict): Column name to array for every column in ALL_COLUMNS
+                            نگاشت نام ستون به آرایه برای تمام ستون‌ها
+            strings (dict): String column name to its list of values
+                            نگاشت نام ستون متنی به فهرست مقادیر آن
+            loader (callable): Called with a sequence number, returns the
+                               packet dictionary
+                               تابع ساخت دیکشنری بسته از روی شماره ترتیب
+            ordered (bool): Whether the timestamps are in order
+                           آیا برچسب‌های زمانی مرتب هستند
+            sizes (tuple): Estimated (metadata bytes, payload bytes) arrays of
+                           the packets once built, for the byte budget; None
+                           charges nothing
+                           آرایه‌های حجم تخمینی (فراداده، محتوا) بسته‌ها
+        """
+        self.clear()
+        count = len(columns['seq'])
+        if not count:
+            return
+        self._allocated = count
+        self._columns = {name: columns[name] for name in ALL_COLUMNS}
+        if sizes is not None:
+            self._columns['_metadata_bytes'] = np.asarray(sizes[0], dtype=np.uint32)
+            self._columns['_payload_bytes'] = np.asarray(sizes[1], dtype=np.uint32)
+            self.metadata_bytes = int(self._columns['_metadata_bytes'].sum())
+            self.payload_bytes = int(self._columns['_payload_bytes'].sum())
+        self._over_limits = True
+        self._records = [None] * count
+        self.strings = {name: StringTable(strings[name]) for name in STRING_COLUMNS}
+        self._end = count
+        self._next_seq = int(columns['seq'][-1]) + 1
+        self._sorted = ordered
+        self._last_timestamp = float(columns['timestamp'][-1])
+        self.loader = loader
+
+    def __len__(self):
+        return self._end - self._start
+
+    @property
+    def bytes(self):
+        """Estimated bytes of the stored packets
+
+        حجم تخمینی بسته‌های ذخیره شده بر حسب بایت
+        """
+        return self.metadata_bytes + self.payload_bytes
+
+    @property
+    def sorted(self):
+        """Whether the stored timestamps are in order
+
+        آیا برچسب‌های زمانی ذخیره شده مرتب هستند
+        """
+        return self._sorted
+
+    @property
+    def column_bytes(self):
+        """Bytes allocated for the columns, the record slots and the string tables
+
+        حجم تخصیص یافته برای ستون‌ها، جایگاه رکوردها و جدول‌های رشته
+        """
+        strings = sum(len(table.values) for table in self.strings.values())
+        return sum(column.nbytes for column in self._columns.values()) + 8 * self._allocated + strings * _STRING_BYTES
+
+    @property
+    def first_seq(self):
+        """Sequence number of the oldest stored packet
+
+        شماره ترتیب قدیمی‌ترین بسته ذخیره شده
+        """
+        return self._next_seq - len(self)
+
+    @property
+    def next_seq(self):
+        """Sequence number the next appended packet will get
+
+        شماره ترتیبی که بسته بعدی دریافت می‌کند
+        """
+        return self._next_seq
+
+    def _make_room(self):
+        size = self._end - self._start
+        # Under a byte budget the window may be far below capacity; grow only
+        # when it fills a quarter of the columns, otherwise move it back
+        grow = self.byte_budget is None or size > self._allocated // 4
+        loaded = not self._columns['seq'].flags.writeable
+        if (self._allocated < 2 * self.capacity and grow) or loaded:
+            # Grow; views handed out earlier keep pointing at the old buffers.
+            # Loaded (read-only) columns are always copied, with room for a
+            # window beyond the capacity to shrink in
+            allocated = min(self._allocated * 2, 2 * self.capacity)
+            if loaded:
+                allocated = max(allocated, 2 * size)
+            for name, column in self._columns.items():
+                grown = np.empty(allocated, dtype=column.dtype)
+                grown[:size] = column[self._start:self._end]
+                self._columns[name] = grown
+            self._records = self._records[self._start:self._end] + [None] * (allocated - size)
+            self._allocated = allocated
+        else:
+            # Move the window back to the front; the window starts at or past
+            # its own size here, so the copy never overlaps the data it reads
+            for column in self._columns.values():
+                column[:size] = column[self._start:self._end]
+            self._records[:size] = self._records[self._start:self._end]
+            for index in range(size, self._allocated):
+                self._records[index] = None
+            self._compact_strings(size)
+        self._start = 0
+        self._end = size
+
+    def _compact_strings(self, size):
+        # Strings of evicted packets are dropped once they make up most of a
+        # table. Only the moved window is rewritten, so views handed out
+        # earlier keep the codes of the categories they came with; the table
+        # is replaced rather than changed, which tells readers holding the
+        # old one (e.g. the remote sensor) to start over.
+        for name in STRING_COLUMNS:
+            table = self.strings[name]
+            count = len(table.values)
+            if count < _COMPACT_MIN_STRINGS:
+                continue
+            codes = self._columns[name][:size]
+            # Missing values (-1) land on the extra last slot
+            used = np.zeros(count + 1, dtype=bool)
+            used[codes] = True
+            live = np.flatnonzero(used[:count])
+            if 2 * len(live) > count:
+                continue
+            remap = np.full(count + 1, -1, dtype=np.int32)
+            remap[live] = np.arange(len(live), dtype=np.int32)
+            codes[:] = remap[codes]
+            values = table.values
+            self.strings[name] = StringTable([values[code] for code in live])
+
+    def _evict(self):
+        index = self._start
+        seq = self._next_seq - (self._end - index)
+        info = self._records[index]
+        if self.on_evict is not None:
+            if info is None and self.loader is not None:
+                info = self.loader(seq)
+            self.on_evict(seq, info)
+        self._records[index] = None
+        if '_metadata_bytes' in self._columns:
+            self.metadata_bytes -= int(self._columns['_metadata_bytes'][index])
+            self.payload_bytes -= int(self._columns['_payload_bytes'][index])
+        self._start = index + 1
+
+    def set_byte_budget(self, byte_budget):
+        """Change the byte budget, evicting packets beyond it
+
+        تغییر بودجه بایتی و حذف بسته‌های خارج از آن
+
+        While loaded packets exceed the limits, they are left to append().
+
+        Args:
+            byte_budget (int): Maximum estimated bytes, or None for no limit
+                               حداکثر حجم تخمینی، یا None برای بدون محدودیت
+        """
+        self.byte_budget = byte_budget
+        if byte_budget is not None and not self._over_limits:
+            while self._end > self._start and self.bytes > byte_budget:
+                self._evict()
+
+    def _add_size_columns(self):
+        # Packets stored before are charged nothing
+        if '_metadata_bytes' not in self._columns:
+            self._columns['_metadata_bytes'] = np.zeros(self._allocated, dtype=np.uint32)
+            self._columns['_payload_bytes'] = np.zeros(self._allocated, dtype=np.uint32)
+
+    def charge(self, estimate):
+        """Estimate the size of every stored packet again
+
+        Loaded packets not built yet keep the size they were loaded with.
+
+        تخمین دوباره حجم تمام بسته‌های ذخیره شده
+
+        Args:
+            estimate (callable): Called with a packet dictionary, returns its
+                                 (metadata bytes, payload bytes)
+                                 تابع تخمین (بایت‌های فراداده، بایت‌های محتوا) یک بسته
+        """
+        self._add_size_columns()
+        metadata_column = self._columns['_metadata_bytes']
+        payload_column = self._columns['_payload_bytes']
+        for index in range(self._start, self._end):
+            info = self._records[index]
+            if info is not None:
+                metadata_column[index], payload_column[index] = estimate(info)
+        self.metadata_bytes = int(metadata_column[self._start:self._end].sum())
+        self.payload_bytes = int(payload_column[self._start:self._end].sum())
+
+    def append(self, info, metadata_bytes=0, payload_bytes=0):
+        """Append a dissected packet, evicting the oldest ones when full
+
+        The sequence number is also stored in the packet as ``seq``.
+
+        افزودن یک بسته تشریح شده و حذف قدیمی‌ترین بسته‌ها در صورت پر بودن
+
+        Args:
+            info (dict): Packet information dictionary
+                         دیکشنری اطلاعات بسته
+            metadata_bytes (int): Estimated memory of the packet dictionary
+                                  حافظه تخمینی دیکشنری بسته
+            payload_bytes (int): Estimated memory of the retained frame
+                                 حافظه تخمینی فریم نگه‌داشته شده
+
+        Returns:
+            int: Sequence number given to the packet
+                 شماره ترتیب اختصاص یافته به بسته
+        """
+        byte_budget = self.byte_budget
+        needed = metadata_bytes + payload_bytes
+        evicted = 0
+        while self._end > self._start and (
+                self._end - self._start >= self.capacity
+                or (byte_budget is not None and self.bytes + needed > byte_budget)):
+            if self._over_limits and evicted == 2:
+                break
+            self._evict()
+            evicted += 1
+        else:
+            self._over_limits = False
+        if self._end == self._allocated:
+            self._make_room()
+
+        index = self._end
+        seq = self._next_seq
+        columns = self._columns
+        get = info.get
+
+        timestamp = info['timestamp']
+        if timestamp < self._last_timestamp:
+            self._sorted = False
+        self._last_timestamp = timestamp
+
+        columns['seq'][index] = seq
+        columns['timestamp'][index] = timestamp
+        columns['length'][index] = info['length']
+        columns['weight'][index] = get('weight', 1)
+        columns['ip_proto'][index] = get('ip_proto', -1)
+        columns['sport'][index] = get('sport', -1)
+        columns['dport'][index] = get('dport', -1)
+        columns['tcp_flags'][index] = get('flags', -1)
+        if metadata_bytes or payload_bytes:
+            if '_metadata_bytes' not in columns:
+                self._add_size_columns()
+            columns['_metadata_bytes'][index] = metadata_bytes
+            columns['_payload_bytes'][index] = payload_bytes
+            self.metadata_bytes += metadata_bytes
+            self.payload_bytes += payload_bytes
+        elif '_metadata_bytes' in columns:
+            columns['_metadata_bytes'][index] = 0
+            columns['_payload_bytes'][index] = 0
+        strings = self.strings
+        for name in STRING_COLUMNS:
+            columns[name][index] = strings[name].intern(get(name))
+
+        info['seq'] = seq
+        self._records[index] = info
+        self._end = index + 1
+        self._next_seq = seq + 1
+        return seq
+
+    def records(self, load=True):
+        """Get the stored packet dictionaries, oldest first
+
+        دریافت دیکشنری‌های بسته‌های ذخیره شده از قدیمی‌ترین
+
+        Args:
+            load (bool): Build the dictionaries of loaded packets not
+                         requested yet; with False they are None
+                         ساخت دیکشنری بسته‌های بارگذاری شده‌ای که هنوز درخواست نشده‌اند
+
+        Returns:
+            list: Packet information dictionaries
+                  دیکشنری‌های اطلاعات بسته‌ها
+        """
+        records = self._records[self._start:self._end]
+        if load and self.loader is not None and None in records:
+            first_seq = self.first_seq
+            for offset, info in enumerate(records):
+                if info is None:
+                    records[offset] = self._records[self._start + offset] = self.loader(first_seq + offset)
+        return records
+
+    def record(self, seq):
+        """Get one stored packet dictionary by sequence number
+
+        دریافت دیکشنری یک بسته ذخیره شده بر اساس شماره ترتیب
+
+        Args:
+            seq (int): Sequence number
+                       شماره ترتیب
+
+        Returns:
+            dict: Packet information dictionary, or None if no longer stored
+                  دیکشنری اطلاعات بسته، یا None اگر دیگر ذخیره نشده باشد
+        """
+        offset = seq - self.first_seq
+        if 0 <= offset < len(self):
+            index = self._start + offset
+            info = self._records[index]
+            if info is None and self.loader is not None:
+                info = self._records[index] = self.loader(seq)
+            return info
+        return None
+
+    def time_range(self, start_time=None, end_time=None):
+        """Get the window slice covering a time range
+
+        دریافت بازه‌ای از پنجره که یک بازه زمانی را پوشش می‌دهد
+
+        Args:
+            start_time (float): Inclusive lower bound in epoch seconds, or None
+                                کران پایین (شامل) بر حسب ثانیه
+            end_time (float): Exclusive upper bound in epoch seconds, or None
+                              کران بالا (غیرشامل) بر حسب ثانیه
+
+        Returns:
+            slice or numpy.ndarray: Absolute slice into the columns when the
+                                    timestamps are sorted, otherwise an index array
+                                    برش یا آرایه اندیس در ستون‌ها
+        """
+        if start_time is None and end_time is None:
+            return slice(self._start, self._end)
+
+        timestamps = self._columns['timestamp'][self._start:self._end]
+        if self._sorted:
+            low = 0 if start_time is None else int(np.searchsorted(timestamps, start_time, 'left'))
+            high = len(timestamps) if end_time is None else int(np.searchsorted(timestamps, end_time, 'left'))
+            return slice(self._start + low, self._start + max(low, high))
+
+        mask = np.ones(len(timestamps), dtype=bool)
+        if start_time is not None:
+            mask &= timestamps >= start_time
+        if end_time is not None:
+            mask &= timestamps < end_time
+        return np.flatnonzero(mask) + self._start
+
+    def arrays(self, columns=None, start_time=None, end_time=None, copy=False):
+        """Get stored columns as NumPy arrays
+
+        With ``copy=False`` and sorted timestamps the arrays are views into
+        the store. They stay valid for at least ``capacity`` further appends,
+        or under a byte budget for as many appends as packets were stored.
+
+        دریافت ستون‌های ذخیره شده به صورت آرایه‌های NumPy
+
+        Args:
+            columns (list): Column names, or None for all columns
+                            نام ستون‌ها، یا None برای همه ستون‌ها
+            start_time (float): Inclusive lower time bound, or None
+                                کران پایین زمانی
+            end_time (float): Exclusive upper time bound, or None
+                              کران بالای زمانی
+            copy (bool): Return copies instead of views
+                         بازگرداندن کپی به جای view
+
+        Returns:
+            dict: Column name to array. String columns hold int32 codes (-1 for
+                  missing) and come with a ``<name>_categories`` object array
+                  that maps codes to strings.
+                  نگاشت نام ستون به آرایه؛ ستون‌های متنی شامل کد و جدول دسته‌ها هستند
+        """
+        columns = list(columns) if columns else list(ALL_COLUMNS)
+        unknown = set(columns) - set(ALL_COLUMNS)
+        if unknown:
+            raise KeyError(f"Unknown columns: {', '.join(sorted(unknown))}")
+
+        selection = self.time_range(start_time, end_time)
+        result = {}
+        for name in columns:
+            array = self._columns[name][selection]
+            result[name] = array.copy() if copy and isinstance(selection, slice) else array
+            if name in self.strings:
+                result[f'{name}_categories'] = self.strings[name].categories()
+        return result
+
+    def seq_range_arrays(self, first_seq, count, columns=None, categories=True):
+        """Copy a range of stored packets, addressed by sequence number
+
+        کپی یک بازه از بسته‌های ذخیره شده بر اساس شماره ترتیب
+
+        Args:
+            first_seq (int): Sequence number of the first packet
+                             شماره ترتیب اولین بسته
+            count (int): Maximum number of packets
+                         حداکثر تعداد بسته‌ها
+            columns (list): Column names, or None for all columns
+                            نام ستون‌ها، یا None برای همه ستون‌ها
+            categories (bool): Include the ``<name>_categories`` arrays
+                               شامل کردن آرایه‌های دسته‌ها
+
+        Returns:
+            dict: Column name to array copy, as returned by arrays()
+                  نگاشت نام ستون به کپی آرایه
+        """
+        offset = max(0, first_seq - self.first_seq)
+        low = self._start + offset
+        high = min(self._end, low + count)
+        result = {}
+        for name in (columns or ALL_COLUMNS):
+            result[name] = self._columns[name][low:high].copy()
+            if categories and name in self.strings:
+                result[f'{name}_categories'] = self.strings[name].categories()
+        return result
+
+    def protocol_totals(self):
+        """Get weighted packet counts per protocol
+
+        دریافت تعداد وزن‌دار بسته‌ها به تفکیک پروتکل
+
+        Returns:
+            dict: Protocol name to weighted count
+                  نگاشت نام پروتکل به تعداد وزن‌دار
+        """
+        codes = self._columns['protocol'][self._start:self._end]
+        if not len(codes):
+            return {}
+        weights = self._columns['weight'][self._start:self._end]
+        values = self.strings['protocol'].values
+        totals = np.bincount(codes[codes >= 0], weights=weights[codes >= 0], minlength=len(values))
+        return {values[code]: int(total) for code, total in enumerate(totals) if total}
@@ -0,0 +1,164 @@
+"""
+Asyncio Packet Streaming
+
+This module lets asyncio code consume captured packets with
+``async for batch in sniffer.stream()``. Every stream reads through its own
+subscription to the sniffer's packet ring; the consumer is woken through
+``call_soon_threadsafe`` only when it is waiting and enough packets are
+ready, so there is no polling. A stream a full ring behind is overrun by
+default; with the 'block' overflow policy it blocks the capture thread
+instead, which is how a slow consumer pushes back on capture.
+
+ماژول جریان asyncio بسته‌ها
+این ماژول به کد asyncio اجازه می‌دهد بسته‌های ضبط شده را با
+``async for batch in sniffer.stream()`` دریافت کند. هر جریان از طریق اشتراک خود
+در بافر حلقوی اسنیفر می‌خواند؛ مصرف‌کننده فقط زمانی که منتظر است و بسته‌های کافی
+آماده شده‌اند از طریق ``call_soon_threadsafe`` بیدار می‌شود و نیازی به بررسی
+دوره‌ای نیست. جریانی که یک دور کامل عقب بماند به طور پیش‌فرض بسته‌ها را از دست
+می‌دهد؛ با سیاست سرریز 'block' در عوض نخ ضبط را متوقف کرده و به این ترتیب
+مصرف‌کننده کند، سرعت ضبط را محدود می‌کند.
+"""
+
+import asyncio
+
+DEFAULT_BATCH_SIZE = 256
+DEFAULT_MAX_LATENCY = 0.05
+
+
+class PacketStream:
+    """
+    Async iterator over batches of newly captured packets
+
+    پیمایشگر ناهمگام روی دسته‌های بسته‌های تازه ضبط شده
+    """
+
+    def __init__(self, ring, batch_size=DEFAULT_BATCH_SIZE, max_latency=DEFAULT_MAX_LATENCY,
+                 **subscribe_kwargs):
+        """Initialize the stream
+
+        مقداردهی اولیه جریان
+
+        Args:
+            ring (RingBuffer): Packet ring to subscribe to
+                               بافر حلقوی بسته‌ها برای اشتراک
+            batch_size (int): Maximum packets per batch; a full batch is
+                              delivered at once
+                              حداکثر تعداد بسته‌ها در هر دسته
+            max_latency (float): Seconds the first packet of a batch may wait
+                                 for the batch to fill up
+                                 حداکثر مدت انتظار اولین بسته یک دسته بر حسب ثانیه
+            **subscribe_kwargs: Passed to RingBuffer.subscribe(), e.g. the
+                                overflow ``policy`` and ``block_timeout``
+                                پارامترهای ارسالی به RingBuffer.subscribe()
+        """
+        if batch_size < 1:
+            raise ValueError("Batch size must be at least 1")
+        self.batch_size = batch_size
+        self.max_latency = max_latency
+        self._loop = None
+        self._event = None
+        self._batch = []
+        # Packets the consumer waits for; 0 while it is not waiting
+        self._wake_threshold = 0
+        self.subscription = ring.subscribe(on_publish=self._on_publish, **subscribe_kwargs)
+
+    @property
+    def closed(self):
+        """Whether the stream was closed
+
+        آیا جریان بسته شده است
+        """
+        return self.subscription.closed
+
+    def _on_publish(self, subscription):
+        # Runs on the capture side
+        threshold = self._wake_threshold
+        if threshold and subscription.lag >= threshold:
+            self._wake()
+
+    def _wake(self):
+        self._wake_threshold = 0
+        loop = self._loop
+        if loop is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(self._event.set)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self._loop is None:
+            self._loop = asyncio.get_running_loop()
+            self._event = asyncio.Event()
+
+        loop = self._loop
+        subscription = self.subscription
+        batch = self._batch
+        deadline = None
+        while True:
+            if len(batch) < self.batch_size:
+                batch.extend(subscription.poll(self.batch_size - len(batch)))
+            if len(batch) >= self.batch_size or (batch and subscription.closed):
+                break
+            if subscription.closed:
+                raise StopAsyncIteration
+            if batch:
+                if deadline is None:
+                    deadline = loop.time() + self.max_latency
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+            else:
+                timeout = None
+
+            # Arm the wakeup (first packet starts the latency clock, after that
+            # only a full batch), then re-check so a packet published in
+            # between is not missed
+            self._event.clear()
+            self._wake_threshold = self.batch_size - len(batch) if batch else 1
+            if subscription.lag >= self._wake_threshold:
+                self._wake_threshold = 0
+                continue
+            try:
+                await asyncio.wait_for(self._event.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+            finally:
+                self._wake_threshold = 0
+
+        self._batch = []
+        return batch
+
+    def close(self):
+        """Stop the stream; packets published before are still delivered
+
+        توقف جریان؛ بسته‌های منتشر شده پیش از آن همچنان تحویل داده می‌شوند
+        """
+        if self.closed:
+            return
+        self.subscription.close()
+        if self._loop is not None:
+            self._wake()
+
+    async def aclose(self):
+        """Close the stream from a coroutine
+
+        بستن جریان از داخل یک coroutine
+        """
+        self.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.close()
+
+    def get_drop_counts(self):
+        """Get the packets lost because the consumer fell behind
+
+        دریافت تعداد بسته‌های از دست رفته به دلیل عقب ماندن مصرف‌کننده
+
+        Returns:
+            dict: Dictionary with policy names as keys and drop counts as values
+                  دیکشنری با نام سیاست‌ها به عنوان کلید و تعداد حذف به عنوان مقدار
+        """
+        return self.subscription.get_drop_counts()
@@ -0,0 +1,145 @@
+"""
+Aho-Corasick Multi-Pattern Matcher
+
+This module compiles a set of byte patterns into an Aho-Corasick automaton.
+Failure links are folded into the transition tables at build time, so a scan
+does one dictionary lookup per input byte no matter how many patterns there
+are, and every match is reported with its offset.
+
+ماژول تطبیق چندالگویی Aho-Corasick
+این ماژول مجموعه‌ای از الگوهای بایتی را به یک ماشین Aho-Corasick تبدیل می‌کند.
+پیوندهای شکست در زمان ساخت در جدول‌های انتقال ادغام می‌شوند، بنابراین پویش
+صرف‌نظر از تعداد الگوها برای هر بایت ورودی تنها یک جستجوی دیکشنری انجام می‌دهد.
+"""
+
+from collections import deque
+
+
+class AhoCorasick:
+    """
+    Automaton matching many byte patterns in a single pass
+
+    ماشینی برای تطبیق الگوهای بایتی متعدد در یک گذر
+    """
+
+    def __init__(self, patterns):
+        """Compile the patterns
+
+        کامپایل الگوها
+
+        Args:
+            patterns (iterable): Patterns as bytes, or str encoded as UTF-8;
+                                 empty patterns are ignored
+                                 الگوها به صورت بایت یا رشته
+        """
+        self.patterns = []
+        for pattern in patterns:
+            if isinstance(pattern, str):
+                pattern = pattern.encode('utf-8')
+            pattern = bytes(pattern)
+            if pattern:
+                self.patterns.append(pattern)
+
+        # Trie of the patterns
+        goto = [{}]
+        outputs = [[]]
+        for index, pattern in enumerate(self.patterns):
+            state = 0
+            for byte in pattern:
+                next_state = goto[state].get(byte)
+                if next_state is None:
+                    next_state = len(goto)
+                    goto[state][byte] = next_state
+                    goto.append({})
+                    outputs.append([])
+                state = next_state
+            outputs[state].append(index)
+
+        # Breadth-first: resolve failure links into full transitions and merge
+        # the outputs of each state's longest proper suffix state
+        delta = [None] * len(goto)
+        delta[0] = dict(goto[0])
+        queue = deque()
+        fail = [0] * len(goto)
+        for state in goto[0].values():
+            queue.append(state)
+        while queue:
+            state = queue.popleft()
+            transitions = dict(delta[fail[state]])
+            transitions.update(goto[state])
+            delta[state] = transitions
+            outputs[state].extend(outputs[fail[state]])
+            for byte, child in goto[state].items():
+                fail[child] = delta[fail[state]].get(byte, 0)
+                queue.append(child)
+
+        self._delta = delta
+        self._outputs = [tuple(output) for output in outputs]
+        self._lengths = [len(pattern) for pattern in self.patterns]
+
+    def __len__(self):
+        return len(self.patterns)
+
+    @property
+    def state_count(self):
+        """Number of automaton states
+
+        تعداد حالت‌های ماشین
+        """
+        return len(self._delta)
+
+    def iter_matches(self, data):
+        """Find all pattern occurrences in data, including overlapping ones
+
+        یافتن تمام رخدادهای الگوها در داده، شامل رخدادهای هم‌پوشان
+
+        Args:
+            data (bytes): Data to scan
+                          داده مورد پویش
+
+        Yields:
+            tuple: (offset, pattern_index) with the offset of the first byte
+                   of the match, in order of the match end
+                   (موقعیت شروع تطابق، اندیس الگو)
+        """
+        delta = self._delta
+        outputs = self._outputs
+        lengths = self._lengths
+        state = 0
+        for position, byte in enumerate(data):
+            state = delta[state].get(byte, 0)
+            if outputs[state]:
+                for index in outputs[state]:
+                    yield position - lengths[index] + 1, index
+
+    def search(self, data):
+        """Find all pattern occurrences in data
+
+        یافتن تمام رخدادهای الگوها در داده
+
+        Args:
+            data (bytes): Data to scan
+                          داده مورد پویش
+
+        Returns:
+            list: List of (offset, pattern_index) tuples
+                  لیستی از زوج‌های (موقعیت، اندیس الگو)
+        """
+        return list(self.iter_matches(data))
+
+    def contains_any(self, data):
+        """Check whether any pattern occurs in data
+
+        بررسی وجود هر یک از الگوها در داده
+
+        Args:
+            data (bytes): Data to scan
+                          داده مورد پویش
+
+        Returns:
+            bool: True if at least one pattern matches
+                  در صورت تطابق حداقل یک الگو True
+        """
+        for _ in self.iter_matches(data):
+            return True
+        return False
@@ -0,0 +1,227 @@
+"""
+Level-of-Detail Decimation for Time Series
+
+This module keeps an append-only time series together with a min/max pyramid:
+every level stores the minimum and maximum of fixed-size buckets of the level
+below, and is extended incrementally as samples arrive. A view of any time
+range is served from the coarsest level that still has about one bucket per
+pixel, so drawing costs the same for a minute or a week of samples and no
+peak is lost to the decimation.
+
+ماژول کاهش جزئیات برای سری‌های زمانی
+این ماژول یک سری زمانی فقط-افزودنی را همراه با یک هرم کمینه/بیشینه نگه می‌دارد:
+هر سطح کمینه و بیشینه سطل‌هایی با اندازه ثابت از سطح پایین‌تر را ذخیره کرده و با
+رسیدن نمونه‌ها به تدریج گسترش می‌یابد. نمایش هر بازه زمانی از درشت‌ترین سطحی
+تهیه می‌شود که هنوز حدود یک سطل برای هر پیکسل دارد، بنابراین هزینه رسم برای یک
+دقیقه یا یک هفته نمونه یکسان است و هیچ قله‌ای در کاهش از دست نمی‌رود.
+"""
+
+import numpy as np
+
+
+class _Column:
+    """Growable float64 array with amortized O(1) append"""
+
+    def __init__(self, capacity=1024):
+        self._data = np.empty(capacity, dtype=np.float64)
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def append(self, value):
+        if self._size == len(self._data):
+            data = np.empty(len(self._data) * 2, dtype=np.float64)
+            data[:self._size] = self._data[:self._size]
+            self._data = data
+        self._data[self._size] = value
+        self._size += 1
+
+    def extend(self, values):
+        for value in values:
+            self.append(value)
+
+    @property
+    def view(self):
+        return self._data[:self._size]
+
+
+class MinMaxPyramid:
+    """
+    Time series with a min/max pyramid for pixel-resolution rendering
+
+    سری زمانی با هرم کمینه/بیشینه برای رسم با دقت پیکسل
+    """
+
+    def __init__(self, factor=4, max_samples=None):
+        """Initialize an empty series
+
+        مقداردهی اولیه یک سری خالی
+
+        Args:
+            factor (int): Samples of one level merged into a bucket of the next
+                          تعداد نمونه‌های هر سطح که در یک سطل سطح بعد ادغام می‌شوند
+            max_samples (int): Samples kept; when exceeded the older half is
+                               dropped and the pyramid rebuilt (None for no limit)
+                               تعداد نمونه‌های نگه‌داشته شده (None برای بدون محدودیت)
+        """
+        if factor < 2:
+            raise ValueError("factor must be at least 2")
+        self.factor = factor
+        self.max_samples = max_samples
+        self.clear()
+
+    def clear(self):
+        """Drop all samples
+
+        حذف تمام نمونه‌ها
+        """
+        self._times = _Column()
+        self._values = _Column()
+        # Level k: (bucket start times, minimums, maximums) over factor ** (k + 1) samples
+        self._levels = []
+
+    def __len__(self):
+        return len(self._times)
+
+    @property
+    def times(self):
+        """Sample times, oldest first (read-only view)
+
+        زمان نمونه‌ها از قدیمی‌ترین
+        """
+        return self._times.view
+
+    @property
+    def values(self):
+        """Sample values, oldest first (read-only view)
+
+        مقادیر نمونه‌ها از قدیمی‌ترین
+        """
+        return self._values.view
+
+    @property
+    def levels(self):
+        """Number of pyramid levels above the raw samples
+
+        تعداد سطوح هرم بالای نمونه‌های خام
+        """
+        return len(self._levels)
+
+    def append(self, time, value):
+        """Add a sample; times must not decrease
+
+        افزودن یک نمونه؛ زمان‌ها نباید کاهش یابند
+
+        Args:
+            time (float): Sample time
+                          زمان نمونه
+            value (float): Sample value
+                           مقدار نمونه
+        """
+        self._times.append(time)
+        self._values.append(value)
+        count = len(self._times)
+        factor = self.factor
+
+        # Close the bucket of every level whose size divides the sample count
+        level = 0
+        size = factor
+        while count % size == 0:
+            if level == len(self._levels):
+                self._levels.append((_Column(), _Column(), _Column()))
+            if level == 0:
+                times = self._times.view
+                minimums = maximums = self._values.view
+            else:
+                times, minimums, maximums = (column.view for column in self._levels[level - 1])
+            start = len(times) - factor
+            bucket_times, bucket_minimums, bucket_maximums = self._levels[level]
+            bucket_times.append(times[start])
+            bucket_minimums.append(minimums[start:].min())
+            bucket_maximums.append(maximums[start:].max())
+            level += 1
+            size *= factor
+
+        if self.max_samples is not None and count > self.max_samples:
+            keep = self.max_samples // 2
+            self._rebuild(self._times.view[-keep:].copy(), self._values.view[-keep:].copy())
+
+    def _rebuild(self, times, values):
+        self.clear()
+        self._times.extend(times)
+        self._values.extend(values)
+        factor = self.factor
+        minimums = maximums = values
+        while len(times) >= factor:
+            complete = len(times) // factor * factor
+            times = times[:complete:factor]
+            minimums = minimums[:complete].reshape(-1, factor).min(axis=1)
+            maximums = maximums[:complete].reshape(-1, factor).max(axis=1)
+            level = (_Column(len(times) + 1), _Column(len(times) + 1), _Column(len(times) + 1))
+            level[0].extend(times)
+            level[1].extend(minimums)
+            level[2].extend(maximums)
+            self._levels.append(level)
+
+    def decimate(self, start=None, end=None, pixels=1000):
+        """Get the points to draw a time range at a given width
+
+        Ranges that hold no more than two samples per pixel are returned as
+        they are. Otherwise every bucket of the chosen level contributes its
+        minimum and maximum, and the samples after the last complete bucket
+        come from the finer levels.
+
+        دریافت نقاط لازم برای رسم یک بازه زمانی در یک عرض مشخص
+
+        Args:
+            start (float): First time of the range (None for the first sample)
+                           ابتدای بازه زمانی
+            end (float): Last time of the range (None for the last sample)
+                         انتهای بازه زمانی
+            pixels (int): Width the range is drawn at, in pixels
+                          عرض رسم بازه بر حسب پیکسل
+
+        Returns:
+            tuple: (times, values) NumPy arrays, in time order
+                   آرایه‌های (زمان‌ها، مقادیر) به ترتیب زمان
+        """
+        times = self._times.view
+        values = self._values.view
+        first = 0 if start is None else int(np.searchsorted(times, start, side='right')) - 1
+        last = len(times) if end is None else int(np.searchsorted(times, end, side='left')) + 1
+        # One sample beyond each edge keeps the line running to the border
+        first = max(first, 0)
+        last = min(last, len(times))
+        if last - first <= 2 * max(pixels, 1) or not self._levels:
+            return times[first:last], values[first:last]
+
+        # Coarsest level with at least one bucket per pixel
+        level = 0
+        size = self.factor
+        while level + 1 < len(self._levels) and (last - first) // (size * self.factor) >= pixels:
+            level += 1
+            size *= self.factor
+
+        parts_times = []
+        parts_values = []
+        position = first
+        # Walk down the levels: whole buckets first, then the finer remainder
+        while level >= 0:
+            bucket_times, minimums, maximums = (column.view for column in self._levels[level])
+            begin = position // size
+            stop = min(last // size, len(bucket_times))
+            if stop > begin:
+                count = stop - begin
+                pair_times = np.repeat(bucket_times[begin:stop], 2)
+                pair_values = np.empty(count * 2, dtype=np.float64)
+                pair_values[0::2] = minimums[begin:stop]
+                pair_values[1::2] = maximums[begin:stop]
+                parts_times.append(pair_times)
+                parts_values.append(pair_values)
+                position = stop * size
+            level -= 1
+            size //= self.factor
+        parts_times.append(times[position:last])
+        parts_values.append(values[position:last])
+        return np.concatenate(parts_times), np.concatenate(parts_values)
@@ -69,6 +69,10 @@ class Translator:
                 'en': 'Graphs',
                 'fa': 'نمودارها'
             },
+            'Diagnostics': {
+                'en': 'Diagnostics',
+                'fa': 'عیب‌یابی'
+            },
             'Sniffing...': {
                 'en': 'Sniffing...',
                 'fa': 'در حال ضبط...'
@@ -103,6 +107,10 @@ class Translator:
                 'en': 'E&xit',
                 'fa': '&خروج'
             },
+            '&Export...': {
+                'en': '&Export...',
+                'fa': '&خروجی گرفتن...'
+            },
             '&About': {
                 'en': '&About',
                 'fa': '&درباره'
@@ -136,6 +144,19 @@ class Translator:
                 'fa': 'شروع ضبط بسته‌ها ناموفق بود:'
             },
             
+            'Export Packets': {
+                'en': 'Export Packets',
+                'fa': 'خروجی گرفتن از بسته‌ها'
+            },
+            'Exported': {
+                'en': 'Exported',
+                'fa': 'خروجی گرفته شد'
+            },
+            'Export failed:': {
+                'en': 'Export failed:',
+                'fa': 'خروجی گرفتن ناموفق بود:'
+            },
+            
             # Packet Table Headers
             'No.': {
                 'en': 'No.',
@@ -182,6 +203,440 @@ class Translator:
                 'fa': 'ترافیک شبکه'
             },
             
+            # Queue Overflow
+            'Queue Overflow Policy': {
+                'en': 'Queue Overflow Policy',
+                'fa': 'سیاست سرریز صف'
+            },
+            'drop-newest': {
+                'en': 'Drop newest',
+                'fa': 'حذف جدیدترین'
+            },
+            'drop-oldest': {
+                'en': 'Drop oldest',
+                'fa': 'حذف قدیمی‌ترین'
+            },
+            'block': {
+                'en': 'Block with timeout',
+                'fa': 'انتظار با مهلت'
+            },
+            'Dropped': {
+                'en': 'Dropped',
+                'fa': 'حذف شده'
+            },
+            
+            # Refresh Rate
+            'Refresh Rate': {
+                'en': 'Refresh Rate',
+                'fa': 'نرخ به‌روزرسانی'
+            },
+            'Interactive': {
+                'en': 'Interactive',
+                'fa': 'تعاملی'
+            },
+            'Normal': {
+                'en': 'Normal',
+                'fa': 'عادی'
+            },
+            'Low CPU': {
+                'en': 'Low CPU',
+                'fa': 'مصرف کم پردازنده'
+            },
+            
+            # Sampling
+            'Sampling': {
+                'en': 'Sampling',
+                'fa': 'نمونه‌برداری'
+            },
+            'Off': {
+                'en': 'Off',
+                'fa': 'خاموش'
+            },
+            '1 in 10 packets': {
+                'en': '1 in 10 packets',
+                'fa': 'یک از هر ۱۰ بسته'
+            },
+            '1 in 100 packets': {
+                'en': '1 in 100 packets',
+                'fa': 'یک از هر ۱۰۰ بسته'
+            },
+            '1 in 10 flows': {
+                'en': '1 in 10 flows',
+                'fa': 'یک از هر ۱۰ جریان'
+            },
+            '1 in 100 flows': {
+                'en': '1 in 100 flows',
+                'fa': 'یک از هر ۱۰۰ جریان'
+            },
+            'Adaptive': {
+                'en': 'Adaptive',
+                'fa': 'تطبیقی'
+            },
+            'Estimated total': {
+                'en': 'Estimated total',
+                'fa': 'مجموع تخمینی'
+            },
+            'packets': {
+                'en': 'packets',
+                'fa': 'بسته'
+            },
+            'bytes': {
+                'en': 'bytes',
+                'fa': 'بایت'
+            },
+            
+            # Diagnostics Tab
+            'Counters': {
+                'en': 'Counters',
+                'fa': 'شمارنده‌ها'
+            },
+            'Metric': {
+                'en': 'Metric',
+                'fa': 'معیار'
+            },
+            'Value': {
+                'en': 'Value',
+                'fa': 'مقدار'
+            },
+            'Max': {
+                'en': 'Max',
+                'fa': 'بیشینه'
+            },
+            'Count': {
+                'en': 'Count',
+                'fa': 'تعداد'
+            },
+            'Mean': {
+                'en': 'Mean',
+                'fa': 'میانگین'
+            },
+            'Latency (µs)': {
+                'en': 'Latency (µs)',
+                'fa': 'تأخیر (میکروثانیه)'
+            },
+            'Dissectors': {
+                'en': 'Dissectors',
+                'fa': 'تشریح‌گرها'
+            },
+            'Hits': {
+                'en': 'Hits',
+                'fa': 'تعداد تطبیق'
+            },
+            'Errors': {
+                'en': 'Errors',
+                'fa': 'خطاها'
+            },
+            'Mean (µs)': {
+                'en': 'Mean (µs)',
+                'fa': 'میانگین (میکروثانیه)'
+            },
+            
+            # Payload Search
+            'Search Payloads...': {
+                'en': 'Search Payloads...',
+                'fa': 'جستجوی محتوای بسته‌ها...'
+            },
+            'Search Payloads': {
+                'en': 'Search Payloads',
+                'fa': 'جستجوی محتوای بسته‌ها'
+            },
+            'Patterns (one per line, prefix byte sequences with hex:)': {
+                'en': 'Patterns (one per line, prefix byte sequences with hex:)',
+                'fa': 'الگوها (هر خط یک الگو، دنباله‌های بایتی با پیشوند hex:)'
+            },
+            'Search': {
+                'en': 'Search',
+                'fa': 'جستجو'
+            },
+            'Cancel': {
+                'en': 'Cancel',
+                'fa': 'لغو'
+            },
+            'Packet': {
+                'en': 'Packet',
+                'fa': 'بسته'
+            },
+            'Pattern': {
+                'en': 'Pattern',
+                'fa': 'الگو'
+            },
+            'Offset': {
+                'en': 'Offset',
+                'fa': 'موقعیت'
+            },
+            'Invalid pattern:': {
+                'en': 'Invalid pattern:',
+                'fa': 'الگوی نامعتبر:'
+            },
+            'Matches': {
+                'en': 'Matches',
+                'fa': 'تطابق‌ها'
+            },
+            'Scanned': {
+                'en': 'Scanned',
+                'fa': 'پویش شده'
+            },
+            'Match limit reached': {
+                'en': 'Match limit reached',
+                'fa': 'به حداکثر تعداد تطابق رسید'
+            },
+            'Cancelled': {
+                'en': 'Cancelled',
+                'fa': 'لغو شد'
+            },
+            
+            # Alerts Tab
+            'Alerts': {
+                'en': 'Alerts',
+                'fa': 'هشدارها'
+            },
+            'Alert': {
+                'en': 'Alert',
+                'fa': 'هشدار'
+            },
+            'Type': {
+                'en': 'Type',
+                'fa': 'نوع'
+            },
+            'Target': {
+                'en': 'Target',
+                'fa': 'هدف'
+            },
+            'vertical-scan': {
+                'en': 'vertical-scan',
+                'fa': 'پویش عمودی پورت'
+            },
+            'horizontal-scan': {
+                'en': 'horizontal-scan',
+                'fa': 'پویش افقی پورت'
+            },
+            'syn-flood': {
+                'en': 'syn-flood',
+                'fa': 'سیل SYN'
+            },
+            'arp-storm': {
+                'en': 'arp-storm',
+                'fa': 'طوفان ARP'
+            },
+            
+            # Multi-Interface Capture
+            'More Interfaces': {
+                'en': 'More Interfaces',
+                'fa': 'رابط‌های بیشتر'
+            },
+            'Also capture on these interfaces': {
+                'en': 'Also capture on these interfaces',
+                'fa': 'ضبط همزمان از این رابط‌ها'
+            },
+            
+            # Live Filter
+            'Failed to apply filter:': {
+                'en': 'Failed to apply filter:',
+                'fa': 'اعمال فیلتر ناموفق بود:'
+            },
+            'Filter applied': {
+                'en': 'Filter applied',
+                'fa': 'فیلتر اعمال شد'
+            },
+            
+            # Capture length
+            'Capture Length': {
+                'en': 'Capture Length',
+                'fa': 'طول ضبط'
+            },
+            'Full frames': {
+                'en': 'Full frames',
+                'fa': 'فریم‌های کامل'
+            },
+            'Headers only (128 bytes)': {
+                'en': 'Headers only (128 bytes)',
+                'fa': 'فقط سرآیندها (۱۲۸ بایت)'
+            },
+            
+            # GeoIP
+            'Load &GeoIP Database...': {
+                'en': 'Load &GeoIP Database...',
+                'fa': 'بارگذاری پایگاه داده &GeoIP...'
+            },
+            'Load GeoIP Database': {
+                'en': 'Load GeoIP Database',
+                'fa': 'بارگذاری پایگاه داده GeoIP'
+            },
+            'GeoIP database loaded': {
+                'en': 'GeoIP database loaded',
+                'fa': 'پایگاه داده GeoIP بارگذاری شد'
+            },
+            'Loading GeoIP database failed:': {
+                'en': 'Loading GeoIP database failed:',
+                'fa': 'بارگذاری پایگاه داده GeoIP ناموفق بود:'
+            },
+            
+            # Memory budget
+            'Memory Budget': {
+                'en': 'Memory Budget',
+                'fa': 'بودجه حافظه'
+            },
+            'Memory': {
+                'en': 'Memory',
+                'fa': 'حافظه'
+            },
+            'flows': {
+                'en': 'flows',
+                'fa': 'جریان‌ها'
+            },
+            'caches': {
+                'en': 'caches',
+                'fa': 'حافظه‌های نهان'
+            },
+            'Disk': {
+                'en': 'Disk',
+                'fa': 'دیسک'
+            },
+            
+            # Capture Sessions
+            '&Open Session...': {
+                'en': '&Open Session...',
+                'fa': '&باز کردن نشست...'
+            },
+            '&Save Session...': {
+                'en': '&Save Session...',
+                'fa': '&ذخیره نشست...'
+            },
+            'Save Session': {
+                'en': 'Save Session',
+                'fa': 'ذخیره نشست'
+            },
+            'Open Session': {
+                'en': 'Open Session',
+                'fa': 'باز کردن نشست'
+            },
+            'Saved': {
+                'en': 'Saved',
+                'fa': 'ذخیره شد'
+            },
+            'Opened': {
+                'en': 'Opened',
+                'fa': 'باز شد'
+            },
+            'Saving session failed:': {
+                'en': 'Saving session failed:',
+                'fa': 'ذخیره نشست ناموفق بود:'
+            },
+            'Opening session failed:': {
+                'en': 'Opening session failed:',
+                'fa': 'باز کردن نشست ناموفق بود:'
+            },
+            'Stop the capture before opening a session': {
+                'en': 'Stop the capture before opening a session',
+                'fa': 'پیش از باز کردن نشست، ضبط را متوقف کنید'
+            },
+            
+            # Capture Files
+            'Open &Capture File...': {
+                'en': 'Open &Capture File...',
+                'fa': 'باز کردن فایل &ضبط...'
+            },
+            'Open Capture File': {
+                'en': 'Open Capture File',
+                'fa': 'باز کردن فایل ضبط'
+            },
+            'Stop the capture before opening a file': {
+                'en': 'Stop the capture before opening a file',
+                'fa': 'پیش از باز کردن فایل، ضبط را متوقف کنید'
+            },
+            'Opening capture file failed:': {
+                'en': 'Opening capture file failed:',
+                'fa': 'باز کردن فایل ضبط ناموفق بود:'
+            },
+            'Indexing': {
+                'en': 'Indexing',
+                'fa': 'در حال فهرست‌سازی'
+            },
+            'Indexing stopped:': {
+                'en': 'Indexing stopped:',
+                'fa': 'فهرست‌سازی متوقف شد:'
+            },
+            
+            # Packet Details
+            'Field': {
+                'en': 'Field',
+                'fa': 'فیلد'
+            },
+            'Frame': {
+                'en': 'Frame',
+                'fa': 'فریم'
+            },
+            'bytes on wire': {
+                'en': 'bytes on wire',
+                'fa': 'بایت روی سیم'
+            },
+            'bytes captured': {
+                'en': 'bytes captured',
+                'fa': 'بایت ضبط شده'
+            },
+            
+            # Endpoints and Conversations
+            'Endpoints': {
+                'en': 'Endpoints',
+                'fa': 'نقاط پایانی'
+            },
+            'Conversations': {
+                'en': 'Conversations',
+                'fa': 'مکالمه‌ها'
+            },
+            'Sort by': {
+                'en': 'Sort by',
+                'fa': 'مرتب‌سازی بر اساس'
+            },
+            'Address': {
+                'en': 'Address',
+                'fa': 'آدرس'
+            },
+            'Bytes': {
+                'en': 'Bytes',
+                'fa': 'بایت‌ها'
+            },
+            'Rate': {
+                'en': 'Rate',
+                'fa': 'نرخ'
+            },
+            'Duration': {
+                'en': 'Duration',
+                'fa': 'مدت'
+            },
+            'Tx Packets': {
+                'en': 'Tx Packets',
+                'fa': 'بسته‌های ارسالی'
+            },
+            'Tx Bytes': {
+                'en': 'Tx Bytes',
+                'fa': 'بایت‌های ارسالی'
+            },
+            'Rx Packets': {
+                'en': 'Rx Packets',
+                'fa': 'بسته‌های دریافتی'
+            },
+            'Rx Bytes': {
+                'en': 'Rx Bytes',
+                'fa': 'بایت‌های دریافتی'
+            },
+            'Packets A → B': {
+                'en': 'Packets A → B',
+                'fa': 'بسته‌های A → B'
+            },
+            'Bytes A → B': {
+                'en': 'Bytes A → B',
+                'fa': 'بایت‌های A → B'
+            },
+            'Packets B → A': {
+                'en': 'Packets B → A',
+                'fa': 'بسته‌های B → A'
+            },
+            'Bytes B → A': {
+                'en': 'Bytes B → A',
+                'fa': 'بایت‌های B → A'
+            },
+            
             # About Dialog
             'Version 1.0.0': {
                 'en': 'Version 1.0.0',